@@ -6,30 +6,20 @@ import asyncio
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
-from langgraph.graph import StateGraph, END
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 from pathlib import Path
 
+# LangGraph, LangChain/OpenAI and the tool modules are imported on first use
+# so that short commands and worker spin-up do not pay for them
 try:
     from ..core.state import RunState, JobMetadata, DEFAULT_CONFIG
-    from ..obs.beautiful_logging import setup_beautiful_logging, StageAwareLogger
-    from ..tools.github import SearchGitHubRepos, ExtractPeople, EnrichGitHubUser, FindCommitEmails, EnrichGitHubUsers, FindCommitEmailsBatch
-    from ..tools.hygiene import MXCheck, ICPScores
-    from ..tools.personalization import RenderCopy, SendInstantly
-    from ..tools.crm import SyncAttio, SyncLinear
-    from ..tools.export import ExportCSV, Done
     from ..tools.base import ToolResult
+    from ..tools.registry import ToolRegistry
 except ImportError:
     # Handle relative import issues when running as standalone
     try:
         from core.state import RunState, JobMetadata, DEFAULT_CONFIG
-        from tools.github import SearchGitHubRepos, ExtractPeople, EnrichGitHubUser, FindCommitEmails, EnrichGitHubUsers, FindCommitEmailsBatch
-        from tools.hygiene import MXCheck, ICPScores
-        from tools.personalization import RenderCopy, SendInstantly
-        from tools.crm import SyncAttio, SyncLinear
-        from tools.export import ExportCSV, Done
         from tools.base import ToolResult
+        from tools.registry import ToolRegistry
     except ImportError:
         # Create minimal fallback classes for testing
         from typing import Dict, Any, List
@@ -70,60 +60,39 @@ except ImportError:
 
         DEFAULT_CONFIG = {}
 
-        # Mock tool classes
-        class SearchGitHubRepos:
-            def __init__(self, token): pass
-            async def execute(self, **kwargs): return ToolResult(True)
+        # No tool modules available: start with an empty registry
+        class ToolRegistry(dict):
+            def __init__(self, config):
+                super().__init__()
 
-        class ExtractPeople:
-            def __init__(self, token): pass
-            async def execute(self, **kwargs): return ToolResult(True)
-
-        class EnrichGitHubUser:
-            def __init__(self, token): pass
-            async def execute(self, **kwargs): return ToolResult(True)
-
-        class FindCommitEmails:
-            def __init__(self, token): pass
-            async def execute(self, **kwargs): return ToolResult(True)
-
-        class EnrichGitHubUsers:
-            def __init__(self, token): pass
-            async def execute(self, **kwargs): return ToolResult(True)
-
-        class FindCommitEmailsBatch:
-            def __init__(self, token): pass
-            async def execute(self, **kwargs): return ToolResult(True)
-
-        class MXCheck:
-            async def execute(self, **kwargs): return ToolResult(True)
-
-        class ICPScores:
-            async def execute(self, **kwargs): return ToolResult(True)
+try:
+    from ..core.lead_store import LeadStore, is_valid_email
+    from ..core.llm_cache import wrap_llm_with_cache
+except ImportError:
+    from core.lead_store import LeadStore, is_valid_email
+    from core.llm_cache import wrap_llm_with_cache
 
-        class RenderCopy:
-            async def execute(self, **kwargs): return ToolResult(True)
+logger = logging.getLogger(__name__)
 
-        class SendInstantly:
-            def __init__(self, token): pass
-            async def execute(self, **kwargs): return ToolResult(True)
+# Compiled LangGraph workflows keyed by config hash (see CMOAgent.graph)
+_compiled_graphs: Dict[str, Any] = {}
+_MAX_COMPILED_GRAPHS = 32
 
-        class SyncAttio:
-            def __init__(self, api_key, workspace_id): pass
-            async def execute(self, **kwargs): return ToolResult(True)
 
-        class SyncLinear:
-            def __init__(self, token): pass
-            async def execute(self, **kwargs): return ToolResult(True)
+def _config_hash(config: Dict[str, Any]) -> str:
+    import hashlib
+    import json
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
 
-        class ExportCSV:
-            def __init__(self, export_dir="./exports"): pass
-            async def execute(self, **kwargs): return ToolResult(True)
 
-        class Done:
-            async def execute(self, **kwargs): return ToolResult(True, data={"completed_at": "2024-01-01T00:00:00"})
+async def _agent_node(state: RunState, config) -> Dict[str, Any]:
+    """Graph node that dispatches to the agent carried in the run config
 
-logger = logging.getLogger(__name__)
+    `config` is left unannotated: LangGraph only injects it for parameters
+    that are untyped or typed as RunnableConfig.
+    """
+    return await config["configurable"]["agent"]._agent_step(state)
 
 
 class CMOAgent:
@@ -164,27 +133,11 @@ class CMOAgent:
         except Exception:
             # Non-fatal; leave as-is if anything goes wrong
             pass
-        # Initialize all tools first
+        # Declare tools; each tool module is imported and its client built on first use
         self.tools = self._initialize_tools()
 
-        # Create tool schemas for binding to LLM
-        tool_schemas = self._create_tool_schemas()
-
-        # Initialize LLM with tool binding
-        llm_cfg = self.config.get("llm", {}) if isinstance(self.config.get("llm"), dict) else {}
-        model_name = llm_cfg.get("model", "gpt-4o-mini")
-        temperature = float(llm_cfg.get("temperature", 0.0))
-        self.llm = ChatOpenAI(
-            model=model_name,
-            temperature=temperature,
-        )
-
-        # Bind tools to LLM
-        if tool_schemas:
-            self.llm = self.llm.bind_tools(tool_schemas)
-
-        # Build LangGraph
-        self.graph = self._build_graph()
+        # The LLM client and the compiled LangGraph are also built lazily (see `llm` / `graph`)
+        self._llm = None
 
         # Statistics
         self.stats = {
@@ -193,6 +146,9 @@ class CMOAgent:
             "errors_encountered": 0,
         }
 
+        # Keyed lead/candidate stores per job (see core/lead_store.py)
+        self._lead_stores: Dict[str, LeadStore] = {}
+
         # Pause/Resume state management (per-job to avoid cross-job interference)
         self._pause_requested = set()  # set of job_ids
         self._job_states = {}  # job_id -> saved state for resume
@@ -252,6 +208,54 @@ class CMOAgent:
         """Check if pause has been requested for this job"""
         return job_id in self._pause_requested
 
+    @property
+    def llm(self):
+        """Tool-bound chat model, created on first use"""
+        if self._llm is None:
+            self._llm = self._build_llm()
+        return self._llm
+
+    @llm.setter
+    def llm(self, value):
+        self._llm = value
+
+    def _build_llm(self):
+        """Initialize the LLM with tool binding and the optional response cache"""
+        from langchain_openai import ChatOpenAI
+
+        # Create tool schemas for binding to LLM
+        tool_schemas = self._create_tool_schemas()
+
+        llm_cfg = self.config.get("llm", {}) if isinstance(self.config.get("llm"), dict) else {}
+        model_name = llm_cfg.get("model", "gpt-4o-mini")
+        temperature = float(llm_cfg.get("temperature", 0.0))
+        llm = ChatOpenAI(
+            model=model_name,
+            temperature=temperature,
+        )
+
+        # Bind tools to LLM
+        if tool_schemas:
+            llm = llm.bind_tools(tool_schemas)
+
+        # Optional content-addressed response cache / record-replay (see core/llm_cache.py)
+        return wrap_llm_with_cache(llm, model_name, tool_schemas, self.config.get("llm_cache"))
+
+    @property
+    def graph(self):
+        """Compiled LangGraph workflow, shared by agents with the same config"""
+        key = _config_hash(self.config)
+        graph = _compiled_graphs.get(key)
+        if graph is None:
+            if len(_compiled_graphs) >= _MAX_COMPILED_GRAPHS:
+                _compiled_graphs.pop(next(iter(_compiled_graphs)))
+            graph = _compiled_graphs[key] = self._build_graph()
+        return graph
+
+    def _graph_run_config(self, max_steps: int) -> Dict[str, Any]:
+        # The compiled graph is shared, so the agent that runs it travels in the run config
+        return {"recursion_limit": max_steps + 10, "configurable": {"agent": self}}
+
     def _create_tool_schemas(self) -> List[Dict[str, Any]]:
         """Create tool schemas for LLM binding"""
         tool_schemas = []
@@ -468,6 +472,11 @@ class CMOAgent:
                             "type": "string",
                             "description": "Output file path",
                             "default": "leads.csv"
+                        },
+                        "format": {
+                            "type": "string",
+                            "enum": ["csv", "jsonl", "parquet"],
+                            "description": "Output format (defaults to the path suffix, else csv)"
                         }
                     },
                     "required": ["rows"]
@@ -491,56 +500,21 @@ class CMOAgent:
 
         return tool_schemas
 
-    def _initialize_tools(self) -> Dict[str, Any]:
-        """Initialize all tools with configuration"""
-        tools = {}
-
-        # GitHub tools
-        if self.config.get("GITHUB_TOKEN"):
-            tools["search_github_repos"] = SearchGitHubRepos(self.config["GITHUB_TOKEN"], default_icp=self.config.get("default_icp", {}))
-            tools["extract_people"] = ExtractPeople(self.config["GITHUB_TOKEN"])
-            tools["enrich_github_user"] = EnrichGitHubUser(self.config["GITHUB_TOKEN"])
-            tools["find_commit_emails"] = FindCommitEmails(self.config["GITHUB_TOKEN"])
-            # Add batched versions for efficiency
-            tools["enrich_github_users"] = EnrichGitHubUsers(self.config["GITHUB_TOKEN"])
-            tools["find_commit_emails_batch"] = FindCommitEmailsBatch(self.config["GITHUB_TOKEN"])
-
-        # Hygiene tools
-        tools["mx_check"] = MXCheck()
-        tools["score_icp"] = ICPScores()
-
-        # Personalization tools
-        if self.config.get("INSTANTLY_API_KEY"):
-            tools["render_copy"] = RenderCopy()
-            tools["send_instantly"] = SendInstantly(self.config["INSTANTLY_API_KEY"])
+    def _initialize_tools(self) -> ToolRegistry:
+        """Declare the tools enabled by the configuration (see tools/registry.py)"""
+        return ToolRegistry(self.config)
 
-        # CRM tools
-        # Attio: prefer access token, fall back to legacy API key for compatibility
-        attio_token = self.config.get("ATTIO_ACCESS_TOKEN") or self.config.get("ATTIO_API_KEY")
-        if attio_token and self.config.get("ATTIO_WORKSPACE_ID"):
-            tools["sync_attio"] = SyncAttio(
-                attio_token,
-                self.config["ATTIO_WORKSPACE_ID"]
-            )
-
-        if self.config.get("LINEAR_API_KEY"):
-            tools["sync_linear"] = SyncLinear(self.config["LINEAR_API_KEY"])
-
-        # Export tools
-        tools["export_csv"] = ExportCSV(self.config.get("EXPORT_DIR", "./exports"))
-        tools["done"] = Done()
-
-        return tools
-
-    def _build_graph(self) -> StateGraph:
+    def _build_graph(self):
         """Build the LangGraph workflow"""
-        from langgraph.graph import END
+        from langgraph.graph import StateGraph, END
+
+        max_steps = self.config.get("max_steps", 40)
 
         # Create simple workflow - agent executes tools directly
         workflow = StateGraph(RunState)
 
         # Add main agent node (handles both reasoning and tool execution)
-        workflow.add_node("agent", self._agent_step)
+        workflow.add_node("agent", _agent_node)
 
         # Set entry point
         workflow.set_entry_point("agent")
@@ -549,7 +523,7 @@ class CMOAgent:
         def should_end(state: RunState) -> str:
             if state.get("ended"):
                 return END
-            if state.get("counters", {}).get("steps", 0) >= self.config.get("max_steps", 40):
+            if state.get("counters", {}).get("steps", 0) >= max_steps:
                 # Mark state as ended due to max steps for clearer finalization
                 try:
                     state["ended"] = True
@@ -567,6 +541,8 @@ class CMOAgent:
 
     async def _agent_step(self, state: RunState) -> Dict[str, Any]:
         """Main agent step - decides what tool to use next and executes it"""
+        from langchain_core.messages import HumanMessage, SystemMessage
+
         tool_calls = []  # Initialize to avoid scoping issues
 
         try:
@@ -790,6 +766,15 @@ class CMOAgent:
 
     # _create_tool_node is not used in the single-node workflow and has been removed for clarity
 
+    def _lead_store(self, state: RunState) -> LeadStore:
+        """Keyed store over state["leads"]/state["candidates"], rebuilt only if the lists were replaced"""
+        job_id = state.get("job_id")
+        store = self._lead_stores.get(job_id)
+        if store is None or not store.is_bound_to(state):
+            store = LeadStore.from_state(state)
+            self._lead_stores[job_id] = store
+        return store
+
     def _reduce_tool_result(self, state: RunState, tool_name: str, result: ToolResult) -> Dict[str, Any]:
         """Reduce tool result into the RunState"""
         # Store tool result
@@ -817,54 +802,33 @@ class CMOAgent:
             state["current_stage"] = "discovery"
 
         elif tool_name == "extract_people" and result.success:
-            state["candidates"] = result.data.get("candidates", [])
+            # Merge by login; people already known as candidates or leads are not duplicated
+            self._lead_store(state).add_candidates(result.data.get("candidates", []))
             state["current_stage"] = "extraction"
 
         elif tool_name == "enrich_github_user" and result.success:
             # Only treat as a lead if an email is present; otherwise keep as candidate
             profile = result.data.get("profile", {})
-            state.setdefault("leads", [])
-            state.setdefault("candidates", [])
-
-            def _valid_email(addr: str) -> bool:
-                return bool(addr) and "@" in addr and not str(addr).endswith("@users.noreply.github.com")
-
+            store = self._lead_store(state)
             login = profile.get("login")
             email = profile.get("email")
-            leads_index = {lead.get("login"): idx for idx, lead in enumerate(state["leads"]) if lead.get("login")}
-            cand_index = {cand.get("login"): idx for idx, cand in enumerate(state["candidates"]) if isinstance(cand, dict) and cand.get("login")}
 
-            if _valid_email(email):
-                if login in leads_index:
-                    i = leads_index[login]
-                    state["leads"][i] = {**state["leads"][i], **profile, "email": email}
+            if is_valid_email(email):
+                # Merge into an existing lead or promote the candidate
+                if store.has_lead(login):
+                    store.upsert_lead({**profile, "email": email})
                 else:
-                    state["leads"].append({**profile, "email": email})
-                # Remove from candidates if present
-                if login in cand_index:
-                    try:
-                        state["candidates"].pop(cand_index[login])
-                    except Exception:
-                        pass
-            else:
+                    store.promote(login, {**profile, "email": email})
+            elif store.has_candidate(login):
                 # Keep/update under candidates; do not add to leads yet
-                if login in cand_index:
-                    j = cand_index[login]
-                    state["candidates"][j] = {**state["candidates"][j], **profile}
-                else:
-                    state["candidates"].append({**profile, "enriched": True})
+                store.upsert_candidate(profile)
+            else:
+                store.upsert_candidate({**profile, "enriched": True})
 
         elif tool_name == "enrich_github_users" and result.success:
             # Handle batched user enrichment; only add to leads if email present
             profiles = result.data.get("profiles", [])
-            state.setdefault("leads", [])
-            state.setdefault("candidates", [])
-
-            def _valid_email(addr: str) -> bool:
-                return bool(addr) and "@" in addr and not str(addr).endswith("@users.noreply.github.com")
-
-            leads_index = {lead.get("login"): idx for idx, lead in enumerate(state["leads"]) if lead.get("login")}
-            cand_index = {cand.get("login"): idx for idx, cand in enumerate(state["candidates"]) if isinstance(cand, dict) and cand.get("login")}
+            store = self._lead_store(state)
 
             for profile in profiles:
                 if profile.get("enriched") == False:
@@ -872,79 +836,38 @@ class CMOAgent:
                     continue
                 login = profile.get("login")
                 email = profile.get("email")
-                if _valid_email(email):
-                    if login in leads_index:
-                        i = leads_index[login]
-                        state["leads"][i] = {**state["leads"][i], **profile, "email": email}
+                if is_valid_email(email):
+                    if store.has_lead(login):
+                        store.upsert_lead({**profile, "email": email})
                     else:
-                        state["leads"].append({**profile, "email": email})
-                        leads_index[login] = len(state["leads"]) - 1
-                    # Remove from candidates if present
-                    if login in cand_index:
-                        try:
-                            state["candidates"].pop(cand_index[login])
-                        except Exception:
-                            pass
-                else:
+                        store.promote(login, {**profile, "email": email})
+                elif store.has_candidate(login):
                     # Keep/update as candidate until we find an email
-                    if login in cand_index:
-                        j = cand_index[login]
-                        state["candidates"][j] = {**state["candidates"][j], **profile}
-                    else:
-                        state["candidates"].append({**profile, "enriched": True})
-                        cand_index[login] = len(state["candidates"]) - 1
+                    store.upsert_candidate(profile)
+                else:
+                    store.upsert_candidate({**profile, "enriched": True})
             state["current_stage"] = "enrichment"
 
         elif tool_name == "find_commit_emails" and result.success:
             # Move profile to leads when an email is discovered
             login = result.data.get("login")
             emails = result.data.get("emails", [])
-            if login and emails:
-                email = emails[0]
-                leads_index = {lead.get("login"): idx for idx, lead in enumerate(state.get("leads", [])) if lead.get("login")}
-                if login in leads_index:
-                    state["leads"][leads_index[login]]["email"] = email
-                else:
-                    # Try to find in candidates and move it over
-                    cand_list = state.get("candidates", [])
-                    cand_index = {cand.get("login"): idx for idx, cand in enumerate(cand_list) if isinstance(cand, dict) and cand.get("login")}
-                    if login in cand_index:
-                        profile = {**cand_list[cand_index[login]], "email": email}
-                        try:
-                            cand_list.pop(cand_index[login])
-                        except Exception:
-                            pass
-                        state.setdefault("leads", []).append(profile)
-                    else:
-                        # As a fallback, create a minimal lead with login/email
-                        state.setdefault("leads", []).append({"login": login, "email": email})
+            if login:
+                store = self._lead_store(state)
+                store.mark_email_searched([login])
+                if emails:
+                    store.set_email(login, emails[0])
             state["current_stage"] = "validation"
 
         elif tool_name == "find_commit_emails_batch" and result.success:
             # Handle batched email lookup; move from candidates into leads as emails are found
             user_emails = result.data.get("user_emails", {})
-            state.setdefault("leads", [])
-            leads_index = {lead.get("login"): idx for idx, lead in enumerate(state.get("leads", [])) if lead.get("login")}
-            cand_list = state.get("candidates", [])
-            cand_index = {cand.get("login"): idx for idx, cand in enumerate(cand_list) if isinstance(cand, dict) and cand.get("login")}
+            store = self._lead_store(state)
+            store.mark_email_searched(user_emails.keys())
             for login, email_data in user_emails.items():
                 emails = (email_data or {}).get("emails", [])
-                if not emails:
-                    continue
-                email = emails[0]
-                if login in leads_index:
-                    state["leads"][leads_index[login]]["email"] = email
-                elif login in cand_index:
-                    profile = {**cand_list[cand_index[login]], "email": email}
-                    try:
-                        cand_list.pop(cand_index[login])
-                    except Exception:
-                        pass
-                    state["leads"].append(profile)
-                    leads_index[login] = len(state["leads"]) - 1
-                else:
-                    state["leads"].append({"login": login, "email": email})
-                    leads_index[login] = len(state["leads"]) - 1
+                if emails:
+                    store.set_email(login, emails[0])
             state["current_stage"] = "validation"
 
         elif tool_name == "mx_check" and result.success:
@@ -968,18 +891,19 @@ class CMOAgent:
                 login = m.group(1) if m else None
             else:
                 login = None
-            if login:
-                index = {lead.get("login"): idx for idx, lead in enumerate(state.get("leads", [])) if lead.get("login")}
-                if login in index:
-                    lead = state["leads"][index[login]]
-                    lead["icp_score"] = final_score
-                    lead["icp_qualified"] = is_qualified
+            lead = self._lead_store(state).get_lead(login) if login else None
+            if lead is not None:
+                lead["icp_score"] = final_score
+                lead["icp_qualified"] = is_qualified
             state["current_stage"] = "scoring"
 
         elif tool_name == "render_copy" and result.success:
-            # Add rendered email to to_send
+            # Add rendered email(s) to to_send; batch renders carry one entry per lead
             state.setdefault("to_send", [])
-            state["to_send"].append(result.data)
+            if "results" in result.data:
+                state["to_send"].extend(result.data["results"])
+            else:
+                state["to_send"].append(result.data)
             state["current_stage"] = "personalization"
 
         elif tool_name == "send_instantly" and result.success:
@@ -1035,7 +959,7 @@ class CMOAgent:
                 count = len(state.get("leads", []))
                 return f"{prefix}{tool_name}: enriched {count} profiles total."
             if tool_name == "find_commit_emails_batch":
-                count = len([l for l in state.get("leads", []) if l.get("email")])
+                count = self._lead_store(state).count_with_email()
                 if extra_info and "before" in extra_info and "after" in extra_info:
                     return f"{prefix}find_commit_emails_batch: emails on leads {extra_info['before']} -> {extra_info['after']} (now {count} leads have emails)."
                 return f"{prefix}find_commit_emails_batch: now {count} leads have emails."
@@ -1171,7 +1095,7 @@ class CMOAgent:
             if tool_name == "export_csv":
                 # Requires rows and path
                 if "rows" not in hydrated or not hydrated.get("rows"):
-                    leads_with_email = [l for l in state.get("leads", []) if l.get("email")]
+                    leads_with_email = self._lead_store(state).leads_with_email()
                     fallback_rows = leads_with_email or state.get("to_send", []) or state.get("leads", [])
                     if not fallback_rows:
                         return None, "[auto] export_csv skipped: no data rows available in state."
@@ -1314,6 +1238,7 @@ Available tools: {', '.join(self.tools.keys())}
             job_meta = JobMetadata(goal, created_by)
 
             # Initialize beautiful logging for this job
+            from ..obs.beautiful_logging import setup_beautiful_logging
             self.beautiful_logger = setup_beautiful_logging(self.config, job_meta.job_id)
             self.beautiful_logger.start_stage("initialization", f"Starting campaign: {goal}")
 
@@ -1344,45 +1269,59 @@ Available tools: {', '.join(self.tools.keys())}
             final_state = None
             max_steps = self.config.get("max_steps", 40)
 
-            # Use astream to properly handle state transitions
-            try:
-                final_state = initial_state
-                async for step_result in self.graph.astream(initial_state, {"recursion_limit": max_steps + 10}):
-                    final_state = step_result
-
-                    # Extract and persist progress information
-                    progress_info = self._extract_progress_info(step_result)
-                    if hasattr(step_result, 'setdefault'):
-                        step_result.setdefault("progress", {})
-                        step_result["progress"] = progress_info
-                    if progress_callback:
-                        await progress_callback(progress_info)
-
-                    # Check for pause request (per-job)
-                    if self.is_pause_requested(job_meta.job_id):
-                        logger.info(f"Pause detected for job {job_meta.job_id}, saving state and stopping")
-                        # Save current state for resume
-                        self.save_job_state(job_meta.job_id, step_result)
-                        await self._save_checkpoint(job_meta.job_id, step_result, "paused")
-
-                        # Return partial result
-                        return {
-                            "success": False,
-                            "job_id": job_meta.job_id,
-                            "final_state": step_result,
-                            "paused": True,
-                            "message": "Job paused by user request",
-                        }
-
-                    # Periodic checkpointing (per-job schedule)
-                    if await self._should_checkpoint(step_result):
-                        await self._save_checkpoint(job_meta.job_id, step_result, "periodic")
-
-                logger.info("Job finished via astream; evaluating final status")
+            # Pipeline mode: deterministic streaming stage DAG, LLM only plans the initial query
+            if self.config.get("execution_mode", "agent") == "pipeline":
+                from .pipeline import StreamingPipeline
+                pipeline = StreamingPipeline(self, progress_callback=progress_callback)
+                final_state = await pipeline.run(initial_state)
+                if pipeline.paused:
+                    return {
+                        "success": False,
+                        "job_id": job_meta.job_id,
+                        "final_state": final_state,
+                        "paused": True,
+                        "message": "Job paused by user request",
+                    }
+            else:
+                # Use astream to properly handle state transitions
+                try:
+                    final_state = initial_state
+                    async for step_result in self.graph.astream(initial_state, self._graph_run_config(max_steps)):
+                        final_state = step_result
+
+                        # Extract and persist progress information
+                        progress_info = self._extract_progress_info(step_result)
+                        if hasattr(step_result, 'setdefault'):
+                            step_result.setdefault("progress", {})
+                            step_result["progress"] = progress_info
+                        if progress_callback:
+                            await progress_callback(progress_info)
+
+                        # Check for pause request (per-job)
+                        if self.is_pause_requested(job_meta.job_id):
+                            logger.info(f"Pause detected for job {job_meta.job_id}, saving state and stopping")
+                            # Save current state for resume
+                            self.save_job_state(job_meta.job_id, step_result)
+                            await self._save_checkpoint(job_meta.job_id, step_result, "paused")
+
+                            # Return partial result
+                            return {
+                                "success": False,
+                                "job_id": job_meta.job_id,
+                                "final_state": step_result,
+                                "paused": True,
+                                "message": "Job paused by user request",
+                            }
+
+                        # Periodic checkpointing (per-job schedule)
+                        if await self._should_checkpoint(step_result):
+                            await self._save_checkpoint(job_meta.job_id, step_result, "periodic")
+
+                    logger.info("Job finished via astream; evaluating final status")
 
-            except Exception as e:
-                logger.error(f"Job execution failed via astream: {e}")
-                raise
+                except Exception as e:
+                    logger.error(f"Job execution failed via astream: {e}")
+                    raise
 
             # Update stats
             self.stats["jobs_processed"] += 1
@@ -1485,7 +1424,7 @@ Available tools: {', '.join(self.tools.keys())}
         max_steps = self.config.get("max_steps", 40)
 
         try:
-            async for step_result in self.graph.astream(saved_state, {"recursion_limit": max_steps + 10}):
+            async for step_result in self.graph.astream(saved_state, self._graph_run_config(max_steps)):
                 final_state = step_result
 
                 # Extract and persist progress information
@@ -1634,7 +1573,6 @@ Available tools: {', '.join(self.tools.keys())}
     async def _save_checkpoint(self, job_id: str, state: RunState, checkpoint_type: str = "periodic"):
         """Save a checkpoint of the current job state"""
         try:
-            import json
             from pathlib import Path
 
             # Create checkpoints directory
@@ -1677,6 +1615,9 @@ Available tools: {', '.join(self.tools.keys())}
                                     _sanitize_for_checkpoint(m, depth + 1)
                                     for m in v[-50:]
                                 ]
+                            elif k == "email_searched" and isinstance(v, list):
+                                # Login strings; truncating would re-search emails on resume
+                                sanitized[k] = list(v)
                             elif k in ("repos", "candidates", "leads") and isinstance(v, list) and len(v) > 1000:
                                 # Cap extremely large top-level collections
                                 sanitized[k] = v[:1000] + [f"__omitted_{len(v)-1000}_items__"]
@@ -1706,9 +1647,14 @@ Available tools: {', '.join(self.tools.keys())}
                 "progress": sanitized_state.get("progress", {}),
             }
 
-            # Save to file (UTF-8, preserve Unicode characters)
-            with open(checkpoint_file, 'w', encoding='utf-8') as f:
-                json.dump(checkpoint_data, f, indent=2, default=str, ensure_ascii=False)
+            # Save to file (UTF-8, preserve Unicode characters) behind a summary header,
+            # and record it in the directory catalog so the UX reads only headers
+            try:
+                from ..ux.state_loader import build_summary, write_checkpoint
+            except ImportError:
+                from ux.state_loader import build_summary, write_checkpoint
+            summary = build_summary(state, job_id, checkpoint_type, checkpoint_data["timestamp"])
+            write_checkpoint(checkpoint_file, checkpoint_data, summary)
 
             # Add to state's checkpoints list
             state.setdefault("checkpoints", []).append({
@@ -1858,6 +1804,13 @@ Available tools: {', '.join(self.tools.keys())}
 
                 logger.info(f"Cleaned up {len(checkpoints_to_delete)} old checkpoints for job {job_id}")
 
+                # Drop catalog entries for the deleted files
+                try:
+                    from ..ux.state_loader import compact_catalog
+                except ImportError:
+                    from ux.state_loader import compact_catalog
+                compact_catalog(checkpoints_dir)
+
         except Exception as e:
             logger.error(f"Failed to cleanup checkpoints for job {job_id}: {e}")
 
@@ -2260,6 +2213,7 @@ Available tools: {', '.join(self.tools.keys())}
 
             # Clear job state from memory
             self.clear_job_state(job_id)
+            self._lead_stores.pop(job_id, None)
 
             logger.info(f"Cleaned up resources for job {job_id}")
 
@@ -2794,23 +2748,21 @@ Available tools: {', '.join(self.tools.keys())}
                     logger.warning(f"Auto-progress enrich_github_users failed: {e}")
 
         # If we have enriched leads but missing emails and have candidates mapping, find emails in batch
+        store = self._lead_store(state)
         if state.get("leads") and "find_commit_emails_batch" in self.tools and not state.get("email_search_exhausted"):
-            leads_without_email = [l for l in state.get("leads", []) if not l.get("email") and not l.get("no_email_found")]
+            leads_without_email = store.leads_without_email()
             if leads_without_email and candidates:
-                user_repo_pairs = []
-                for c in candidates:
-                    login = c.get("login")
-                    repo_full_name = c.get("from_repo")
-                    if login and repo_full_name:
-                        user_repo_pairs.append({"login": login, "repo_full_name": repo_full_name})
+                # Only candidates whose commit emails were not searched yet
+                user_repo_pairs = store.unsearched_candidate_pairs(limit=50)
                 if user_repo_pairs:
                     logger.info("Auto-progress: executing find_commit_emails_batch for leads without email")
                     try:
-                        before_with_email = len([l for l in state.get("leads", []) if l.get("email")])
+                        before_with_email = store.count_with_email()
                         tool = self.tools["find_commit_emails_batch"]
-                        result = await self.error_handler.execute_with_retry(tool.execute, user_repo_pairs=user_repo_pairs[:50], days=90)
+                        result = await self.error_handler.execute_with_retry(tool.execute, user_repo_pairs=user_repo_pairs, days=90)
                         state = self._reduce_tool_result(state, "find_commit_emails_batch", result)
-                        after_with_email = len([l for l in state.get("leads", []) if l.get("email")])
+                        store = self._lead_store(state)
+                        after_with_email = store.count_with_email()
                         self.stats["tools_executed"] += 1
                         try:
                             summary_msg = self._summarize_tool_result(
@@ -2831,12 +2783,11 @@ Available tools: {', '.join(self.tools.keys())}
                             streak = state["counters"].get("email_find_noop_streak", 0) + 1
                             state["counters"]["email_find_noop_streak"] = streak
                             if streak >= 2:
-                                for lead in state.get("leads", []):
-                                    if not lead.get("email"):
-                                        attempts = lead.get("_email_attempts", 0) + 1
-                                        lead["_email_attempts"] = attempts
-                                        if attempts >= 2:
-                                            lead["no_email_found"] = True
+                                for lead in store.leads_without_email():
+                                    attempts = lead.get("_email_attempts", 0) + 1
+                                    lead["_email_attempts"] = attempts
+                                    if attempts >= 2:
+                                        store.mark_no_email_found(lead["login"])
                                 state["email_search_exhausted"] = True
                                 logger.info("Auto-progress: email search exhausted; marking unresolvable leads and stopping further attempts")
                         else:
@@ -2847,7 +2798,7 @@ Available tools: {', '.join(self.tools.keys())}
                         logger.warning(f"Auto-progress find_commit_emails_batch failed: {e}")
 
         # Auto-finalization: if we have leads with emails, export and finish if LLM doesn't
-        leads_with_email = [l for l in state.get("leads", []) if l.get("email")]
+        leads_with_email = store.leads_with_email() if store.count_with_email() else []
         if leads_with_email and not state.get("ended"):
             try:
                 if "export_csv" in self.tools:
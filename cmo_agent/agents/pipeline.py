@@ -0,0 +1,386 @@
+"""
+Streaming pipeline execution mode for CMO Agent
+
+Runs the same tools as the LangGraph agent loop, but as a deterministic stage DAG:
+repos flow into extract_people, candidates into enrich_github_users and leads into
+find_commit_emails_batch as soon as they arrive, with bounded queues between stages.
+The LLM is consulted once, to plan the initial repository search query.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+try:
+    from ..core.state import RunState
+except ImportError:
+    from core.state import RunState
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's input stream; one is sent per downstream worker
+_END = object()
+
+DEFAULT_PIPELINE_CONFIG = {
+    "queue_size": 100,           # max items buffered between two stages
+    "repo_batch_size": 10,       # repos per extract_people call
+    "enrich_batch_size": 20,     # logins per enrich_github_users call
+    "email_batch_size": 25,      # user/repo pairs per find_commit_emails_batch call
+    "copy_batch_size": 50,       # leads per render_copy call (rendered against one campaign)
+    "top_authors_per_repo": 5,
+    "workers": {"extraction": 1, "enrichment": 1, "email": 1, "personalization": 1},
+    "plan_with_llm": True,
+    "personalize": True,
+}
+
+
+class PipelinePaused(Exception):
+    """Raised inside a stage worker when a pause was requested for the job"""
+
+
+class StreamingPipeline:
+    """Deterministic discovery → extraction → enrichment → email → personalization pipeline"""
+
+    def __init__(self, agent, progress_callback: Optional[callable] = None):
+        self.agent = agent
+        self.progress_callback = progress_callback
+        cfg = agent.config.get("pipeline", {}) if isinstance(agent.config.get("pipeline"), dict) else {}
+        self.config = {**DEFAULT_PIPELINE_CONFIG, **cfg}
+        self.workers = {**DEFAULT_PIPELINE_CONFIG["workers"], **(cfg.get("workers") or {})}
+        self.paused = False
+        self.stage_stats: Dict[str, Dict[str, Any]] = {}
+        # login -> repo the candidate was discovered in (needed for commit email search)
+        self._from_repo: Dict[str, str] = {}
+        self._seen_logins = set()
+        self._queued_for_copy = set()
+
+    async def run(self, state: RunState) -> RunState:
+        """Run the pipeline to completion (or pause) and return the final state"""
+        agent = self.agent
+        state = agent._ensure_state_basics(state)
+        job_id = state.get("job_id")
+        size = int(self.config["queue_size"])
+
+        search_args = await self._plan_query(state)
+
+        repo_q: asyncio.Queue = asyncio.Queue(maxsize=size)
+        cand_q: asyncio.Queue = asyncio.Queue(maxsize=size)
+        email_q: asyncio.Queue = asyncio.Queue(maxsize=size)
+        copy_q: asyncio.Queue = asyncio.Queue(maxsize=size)
+
+        personalize = bool(self.config.get("personalize")) and "render_copy" in agent.tools
+        email_workers = self.workers["email"] if "find_commit_emails_batch" in agent.tools else 0
+
+        stages = [
+            self._run_stage("discovery", 1, lambda: self._discover(state, search_args, repo_q),
+                            repo_q, self.workers["extraction"]),
+            self._run_stage("extraction", self.workers["extraction"], lambda: self._extract(state, repo_q, cand_q),
+                            cand_q, self.workers["enrichment"]),
+            self._run_stage("enrichment", self.workers["enrichment"],
+                            lambda: self._enrich(state, cand_q, email_q if email_workers else None, copy_q if personalize else None),
+                            email_q if email_workers else None, email_workers),
+        ]
+        if email_workers:
+            stages.append(self._run_stage("email", email_workers,
+                                          lambda: self._find_emails(state, email_q, copy_q if personalize else None),
+                                          None, 0))
+        if personalize:
+            stages.append(self._run_stage("personalization", self.workers["personalization"],
+                                          lambda: self._personalize(state, copy_q), None, 0))
+
+        tasks = [asyncio.create_task(stage) for stage in stages]
+        if personalize:
+            # copy_q has two producers (enrichment and email); close it once both are done
+            producers = tasks[2:4] if email_workers else tasks[2:3]
+            tasks.append(asyncio.create_task(self._close_after(producers, copy_q, self.workers["personalization"])))
+
+        try:
+            await asyncio.gather(*tasks)
+        except PipelinePaused:
+            self.paused = True
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            logger.info(f"Pipeline paused for job {job_id}")
+            return state
+        except Exception:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        state.setdefault("reports", {})["pipeline"] = self.stage_stats
+        return await self._finalize(state)
+
+    async def _plan_query(self, state: RunState) -> Dict[str, Any]:
+        """Use a single LLM call to turn the goal into search_github_repos arguments"""
+        args: Dict[str, Any] = {}
+        if self.config.get("plan_with_llm", True):
+            messages = [
+                SystemMessage(content=(
+                    "You plan GitHub repository searches for an outbound campaign. "
+                    "Call search_github_repos exactly once with the best query for the goal."
+                )),
+                HumanMessage(content=state["goal"]),
+            ]
+            llm_timeout = (
+                self.agent.config.get("timeouts", {}).get("openai_llm")
+                if isinstance(self.agent.config.get("timeouts"), dict)
+                else None
+            ) or 60
+            try:
+                response = await asyncio.wait_for(self.agent.llm.ainvoke(messages), timeout=llm_timeout)
+                for call in getattr(response, "tool_calls", None) or []:
+                    if call.get("name") == "search_github_repos":
+                        args = dict(call.get("args") or {})
+                        break
+            except Exception as e:
+                logger.warning(f"Pipeline query planning failed, falling back to goal: {e}")
+                state.setdefault("errors", []).append({
+                    "stage": "pipeline_planning",
+                    "error": str(e),
+                    "error_type": type(e).__name__,
+                    "timestamp": datetime.now().isoformat(),
+                })
+
+        hydrated, _ = self.agent._hydrate_tool_args("search_github_repos", args, state)
+        hydrated = dict(hydrated or {})
+        hydrated.setdefault("max_repos", int(self.agent.config.get("max_repos", 600)))
+        state.setdefault("history", []).append({
+            "type": "ai",
+            "content": f"[pipeline] planned search_github_repos query: {hydrated.get('q')}",
+            "timestamp": datetime.now().isoformat(),
+        })
+        return hydrated
+
+    async def _run_stage(self, name: str, workers: int, worker_factory, out_q: Optional[asyncio.Queue], downstream_workers: int):
+        """Run N workers of a stage, then signal end-of-stream to the downstream workers"""
+        self.stage_stats.setdefault(name, {"calls": 0, "items_in": 0, "items_out": 0, "seconds": 0.0})
+        await asyncio.gather(*(worker_factory() for _ in range(max(1, workers))))
+        if out_q is not None:
+            for _ in range(downstream_workers):
+                await out_q.put(_END)
+
+    async def _close_after(self, producers: List[asyncio.Task], out_q: asyncio.Queue, downstream_workers: int):
+        await asyncio.gather(*producers)
+        for _ in range(downstream_workers):
+            await out_q.put(_END)
+
+    async def _call_tool(self, state: RunState, stage: str, tool_name: str, **args):
+        """Execute a tool, reduce its result into state and emit progress/checkpoints"""
+        agent = self.agent
+        tool = agent.tools[tool_name]
+        args.setdefault("job_id", state.get("job_id"))
+        args.setdefault("dry_run", bool(agent.config.get("features", {}).get("dry_run", False)))
+        args["beautiful_logger"] = agent.beautiful_logger
+
+        started = asyncio.get_running_loop().time()
+        try:
+            result = await agent.error_handler.execute_with_retry(tool.execute, **args)
+        except Exception as e:
+            logger.error(f"Pipeline stage {stage} tool {tool_name} failed: {e}")
+            result = None
+            state = agent._reduce_tool_result(state, tool_name, _failed_result(str(e)))
+            agent.stats["errors_encountered"] += 1
+        else:
+            state = agent._reduce_tool_result(state, tool_name, result)
+            agent.stats["tools_executed"] += 1
+            summary_msg = agent._summarize_tool_result(tool_name, result, state, auto_progress=True)
+            if summary_msg:
+                state.setdefault("history", []).append({
+                    "type": "ai",
+                    "content": summary_msg.replace("[auto]", "[pipeline]", 1),
+                    "timestamp": datetime.now().isoformat(),
+                })
+                agent._trim_history(state)
+
+        stats = self.stage_stats[stage]
+        stats["calls"] += 1
+        stats["seconds"] += asyncio.get_running_loop().time() - started
+        state["counters"]["steps"] = state["counters"].get("steps", 0) + 1
+        await self._after_step(state)
+        return result
+
+    async def _after_step(self, state: RunState):
+        """Progress callback, pause detection and periodic checkpoints after each tool call"""
+        agent = self.agent
+        job_id = state.get("job_id")
+        progress_info = agent._extract_progress_info(state)
+        state["progress"] = progress_info
+        if self.progress_callback:
+            await self.progress_callback(progress_info)
+
+        if agent.is_pause_requested(job_id):
+            logger.info(f"Pause detected for job {job_id}, saving state and stopping pipeline")
+            agent.save_job_state(job_id, state)
+            await agent._save_checkpoint(job_id, state, "paused")
+            raise PipelinePaused(job_id)
+
+        if await agent._should_checkpoint(state):
+            await agent._save_checkpoint(job_id, state, "periodic")
+
+    async def _discover(self, state: RunState, search_args: Dict[str, Any], repo_q: asyncio.Queue):
+        if "search_github_repos" not in self.agent.tools:
+            logger.warning("Pipeline: search_github_repos unavailable (no GITHUB_TOKEN); nothing to do")
+            return
+        result = await self._call_tool(state, "discovery", "search_github_repos", **search_args)
+        if not result or not result.success:
+            return
+        repos = result.data.get("repos", [])
+        self.stage_stats["discovery"]["items_out"] += len(repos)
+        batch = int(self.config["repo_batch_size"])
+        for i in range(0, len(repos), batch):
+            await repo_q.put(repos[i:i + batch])
+
+    async def _extract(self, state: RunState, repo_q: asyncio.Queue, cand_q: asyncio.Queue):
+        stats = self.stage_stats["extraction"]
+        while True:
+            repos = await repo_q.get()
+            if repos is _END:
+                return
+            stats["items_in"] += len(repos)
+            if "extract_people" not in self.agent.tools:
+                continue
+            # The extract_people reducer merges candidates into the keyed lead store
+            result = await self._call_tool(
+                state, "extraction", "extract_people",
+                repos=repos, top_authors_per_repo=int(self.config["top_authors_per_repo"]),
+            )
+            fresh = []
+            if result and result.success:
+                for cand in result.data.get("candidates", []):
+                    login = cand.get("login")
+                    if login and login not in self._seen_logins:
+                        self._seen_logins.add(login)
+                        self._from_repo[login] = cand.get("from_repo")
+                        fresh.append(cand)
+            if fresh:
+                stats["items_out"] += len(fresh)
+                await cand_q.put(fresh)
+
+    async def _enrich(self, state: RunState, cand_q: asyncio.Queue, email_q: Optional[asyncio.Queue], copy_q: Optional[asyncio.Queue]):
+        stats = self.stage_stats["enrichment"]
+        batch_size = int(self.config["enrich_batch_size"])
+        pending: List[str] = []
+
+        async def flush(logins: List[str]):
+            if not logins or "enrich_github_users" not in self.agent.tools:
+                return
+            result = await self._call_tool(state, "enrichment", "enrich_github_users", logins=logins)
+            if not result or not result.success:
+                return
+            store = self.agent._lead_store(state)
+            need_email = []
+            for profile in result.data.get("profiles", []):
+                login = profile.get("login")
+                if profile.get("enriched") is False or not login:
+                    continue
+                lead = store.get_lead(login)
+                if lead and lead.get("email"):
+                    stats["items_out"] += 1
+                    await self._queue_for_copy(copy_q, lead)
+                elif self._from_repo.get(login):
+                    need_email.append({"login": login, "repo_full_name": self._from_repo[login]})
+            if email_q is not None:
+                email_batch = int(self.config["email_batch_size"])
+                for i in range(0, len(need_email), email_batch):
+                    await email_q.put(need_email[i:i + email_batch])
+
+        while True:
+            cands = await cand_q.get()
+            if cands is _END:
+                await flush(pending)
+                return
+            stats["items_in"] += len(cands)
+            pending.extend(c["login"] for c in cands if c.get("login"))
+            while len(pending) >= batch_size:
+                batch = pending[:batch_size]
+                del pending[:batch_size]
+                await flush(batch)
+
+    async def _find_emails(self, state: RunState, email_q: asyncio.Queue, copy_q: Optional[asyncio.Queue]):
+        stats = self.stage_stats["email"]
+        es = self.agent.config.get("email_search", {}) if isinstance(self.agent.config.get("email_search"), dict) else {}
+        while True:
+            pairs = await email_q.get()
+            if pairs is _END:
+                return
+            stats["items_in"] += len(pairs)
+            result = await self._call_tool(
+                state, "email", "find_commit_emails_batch",
+                user_repo_pairs=pairs,
+                days=int(es.get("days", 90)),
+                batch_size=int(es.get("batch_size", 5)),
+                repos_per_user=int(es.get("repos_per_user", 5)),
+                commits_per_repo=int(es.get("commits_per_repo", 10)),
+                include_committer_email=bool(es.get("include_committer_email", False)),
+            )
+            if not result or not result.success:
+                continue
+            store = self.agent._lead_store(state)
+            for login, data in result.data.get("user_emails", {}).items():
+                lead = store.get_lead(login) if (data or {}).get("emails") else None
+                if lead is not None and lead.get("email"):
+                    stats["items_out"] += 1
+                    await self._queue_for_copy(copy_q, lead)
+
+    async def _queue_for_copy(self, copy_q: Optional[asyncio.Queue], lead: Dict[str, Any]):
+        login = lead.get("login")
+        if copy_q is None or login in self._queued_for_copy:
+            return
+        self._queued_for_copy.add(login)
+        await copy_q.put(lead)
+
+    async def _personalize(self, state: RunState, copy_q: asyncio.Queue):
+        stats = self.stage_stats["personalization"]
+        batch_size = max(1, int(self.config["copy_batch_size"]))
+        ended = False
+        while not ended:
+            # Wait for one lead, then take whatever else is already queued up to the batch size
+            leads = []
+            item = await copy_q.get()
+            while True:
+                if item is _END:
+                    ended = True
+                    break
+                leads.append(item)
+                if len(leads) >= batch_size or copy_q.empty():
+                    break
+                item = copy_q.get_nowait()
+            if not leads:
+                continue
+            stats["items_in"] += len(leads)
+            result = await self._call_tool(state, "personalization", "render_copy", leads=leads)
+            if result and result.success:
+                stats["items_out"] += result.data.get("rendered", 0)
+
+    async def _finalize(self, state: RunState) -> RunState:
+        """Export leads with email and mark the job done, mirroring auto-finalization"""
+        agent = self.agent
+        leads_with_email = agent._lead_store(state).leads_with_email()
+        if leads_with_email and "export_csv" in agent.tools:
+            self.stage_stats.setdefault("export", {"calls": 0, "items_in": 0, "items_out": 0, "seconds": 0.0})
+            await self._call_tool(
+                state, "export", "export_csv",
+                rows=leads_with_email, path=f"{state.get('job_id', 'job')}_leads.csv",
+            )
+        if "done" in agent.tools:
+            self.stage_stats.setdefault("done", {"calls": 0, "items_in": 0, "items_out": 0, "seconds": 0.0})
+            summary_text = (
+                f"Pipeline completed: {len(leads_with_email)} leads with emails, "
+                f"repos={len(state.get('repos', []))}, candidates={len(state.get('candidates', []))}."
+            )
+            await self._call_tool(state, "done", "done", summary=summary_text)
+        state["ended"] = True
+        state["end_reason"] = "pipeline_completed"
+        return state
+
+
+def _failed_result(error: str):
+    try:
+        from ..tools.base import ToolResult
+    except ImportError:
+        from tools.base import ToolResult
+    return ToolResult(success=False, error=error)
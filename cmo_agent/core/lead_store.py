@@ -0,0 +1,270 @@
+"""
+LeadStore - keyed, incrementally indexed view over RunState leads/candidates
+
+RunState keeps `leads` and `candidates` as plain lists (the shape checkpoints and
+exports serialize). LeadStore wraps those same list objects with a login index and
+secondary indexes ("has email", "still needs email", "unsearched candidates",
+lifecycle stage), so reducers can update a batch in O(batch) and the auto-progress
+loop can find work without rescanning every lead.
+
+Records are shared by reference between the lists and the index: updating a record
+through the store updates the list entry in place. The "email searched" flag is kept
+out of the records (exports write every record key as a CSV column) and persisted in
+the state's `email_searched` login list instead. Candidate removal is O(1) via
+swap-with-last, so candidate order is not preserved across removals.
+"""
+from typing import Dict, Any, List, Optional, Iterable, Set
+
+
+def is_valid_email(addr: Optional[str]) -> bool:
+    """True for deliverable-looking addresses (GitHub noreply addresses excluded)"""
+    return bool(addr) and "@" in str(addr) and not str(addr).endswith("@users.noreply.github.com")
+
+
+class LeadStore:
+    """Login-keyed store bound to a RunState's leads and candidates lists"""
+
+    # Lifecycle stages tracked in the stage index
+    STAGE_CANDIDATE = "candidate"
+    STAGE_ENRICHED = "enriched"
+    STAGE_LEAD = "lead"
+
+    def __init__(self, leads: List[Dict[str, Any]], candidates: List[Dict[str, Any]],
+                 email_searched: Optional[List[str]] = None):
+        self.leads = leads
+        self.candidates = candidates
+        self.email_searched_logins = email_searched if email_searched is not None else []
+        self._lead_by_login: Dict[str, Dict[str, Any]] = {}
+        self._cand_pos: Dict[str, int] = {}
+        self._with_email: Set[str] = set()
+        # Insertion-ordered sets (dict keys) so batches come out in a stable order
+        self._without_email: Dict[str, None] = {}
+        self._unsearched: Dict[str, None] = {}
+        self._email_searched: Set[str] = set()
+        self._stage_of: Dict[str, str] = {}
+        self._by_stage: Dict[str, Set[str]] = {}
+        self._rebuild()
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "LeadStore":
+        state.setdefault("leads", [])
+        state.setdefault("candidates", [])
+        state.setdefault("email_searched", [])
+        return cls(state["leads"], state["candidates"], state["email_searched"])
+
+    def is_bound_to(self, state: Dict[str, Any]) -> bool:
+        """True if the state still holds this store's lists and nobody appended behind our back"""
+        return (
+            state.get("leads") is self.leads
+            and state.get("candidates") is self.candidates
+            and state.get("email_searched") is self.email_searched_logins
+            and len(self.leads) == self._lead_count
+            and len(self.candidates) == len(self._cand_pos) + self._unkeyed_candidates
+        )
+
+    def _rebuild(self):
+        """Full O(n) index build; only needed when binding to new lists"""
+        self._lead_by_login.clear()
+        self._cand_pos.clear()
+        self._with_email.clear()
+        self._without_email.clear()
+        self._unsearched.clear()
+        self._stage_of.clear()
+        self._by_stage.clear()
+        self._email_searched.clear()
+        self._email_searched.update(self.email_searched_logins)
+        self._unkeyed_candidates = 0
+
+        for idx, cand in enumerate(self.candidates):
+            login = cand.get("login") if isinstance(cand, dict) else None
+            if not login:
+                self._unkeyed_candidates += 1
+                continue
+            self._cand_pos[login] = idx
+            self._index_unsearched(login, cand)
+            self._set_stage(login, self.STAGE_ENRICHED if cand.get("enriched") else self.STAGE_CANDIDATE)
+
+        for lead in self.leads:
+            login = lead.get("login") if isinstance(lead, dict) else None
+            if not login:
+                continue
+            self._lead_by_login[login] = lead
+            self._index_email(login, lead)
+            self._set_stage(login, self.STAGE_LEAD)
+        self._lead_count = len(self.leads)
+
+    def _index_email(self, login: str, lead: Dict[str, Any]):
+        if lead.get("email"):
+            self._with_email.add(login)
+            self._without_email.pop(login, None)
+        elif login in self._with_email or lead.get("no_email_found"):
+            self._without_email.pop(login, None)
+        else:
+            self._without_email[login] = None
+
+    def _index_unsearched(self, login: str, cand: Dict[str, Any]):
+        if cand.get("from_repo") and login not in self._email_searched:
+            self._unsearched[login] = None
+        else:
+            self._unsearched.pop(login, None)
+
+    # ---- stage index -------------------------------------------------------
+
+    def _set_stage(self, login: str, stage: str):
+        previous = self._stage_of.get(login)
+        if previous == stage:
+            return
+        if previous is not None:
+            self._by_stage.get(previous, set()).discard(login)
+        self._stage_of[login] = stage
+        self._by_stage.setdefault(stage, set()).add(login)
+
+    def set_stage(self, login: str, stage: str):
+        """Record a custom lifecycle stage (e.g. "validated", "scored") for a login"""
+        if login in self._stage_of:
+            self._set_stage(login, stage)
+
+    def stage_of(self, login: str) -> Optional[str]:
+        return self._stage_of.get(login)
+
+    def logins_in_stage(self, stage: str) -> Set[str]:
+        return set(self._by_stage.get(stage, ()))
+
+    def stage_counts(self) -> Dict[str, int]:
+        return {stage: len(logins) for stage, logins in self._by_stage.items() if logins}
+
+    # ---- lookups -----------------------------------------------------------
+
+    def get_lead(self, login: str) -> Optional[Dict[str, Any]]:
+        return self._lead_by_login.get(login)
+
+    def get_candidate(self, login: str) -> Optional[Dict[str, Any]]:
+        pos = self._cand_pos.get(login)
+        return self.candidates[pos] if pos is not None else None
+
+    def has_lead(self, login: str) -> bool:
+        return login in self._lead_by_login
+
+    def has_candidate(self, login: str) -> bool:
+        return login in self._cand_pos
+
+    def count_with_email(self) -> int:
+        return len(self._with_email)
+
+    def leads_with_email(self) -> List[Dict[str, Any]]:
+        return [lead for lead in self.leads if isinstance(lead, dict) and lead.get("login") in self._with_email]
+
+    def leads_without_email(self) -> List[Dict[str, Any]]:
+        """Leads still needing an email (excludes leads marked no_email_found)"""
+        return [self._lead_by_login[login] for login in self._without_email]
+
+    def email_searched(self, login: str) -> bool:
+        return login in self._email_searched
+
+    def unsearched_candidate_pairs(self, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """(login, repo) pairs for candidates whose commit emails were not searched yet"""
+        pairs = []
+        for login in self._unsearched:
+            if limit is not None and len(pairs) >= limit:
+                break
+            pairs.append({"login": login, "repo_full_name": self.candidates[self._cand_pos[login]]["from_repo"]})
+        return pairs
+
+    # ---- mutations (all O(1) per record) -----------------------------------
+
+    def upsert_lead(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge profile into an existing lead or append a new one"""
+        login = profile.get("login")
+        lead = self._lead_by_login.get(login) if login else None
+        if lead is not None:
+            lead.update(profile)
+        else:
+            lead = dict(profile)
+            self.leads.append(lead)
+            self._lead_count += 1
+            if login:
+                self._lead_by_login[login] = lead
+        if login:
+            self._index_email(login, lead)
+            self._set_stage(login, self.STAGE_LEAD)
+        return lead
+
+    def upsert_candidate(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge profile into an existing candidate or append a new one"""
+        login = profile.get("login")
+        pos = self._cand_pos.get(login) if login else None
+        if pos is not None:
+            cand = self.candidates[pos]
+            cand.update(profile)
+        else:
+            cand = dict(profile)
+            self.candidates.append(cand)
+            if login:
+                self._cand_pos[login] = len(self.candidates) - 1
+            else:
+                self._unkeyed_candidates += 1
+        if login and login in self._cand_pos:
+            self._index_unsearched(login, cand)
+        if login and login not in self._lead_by_login:
+            self._set_stage(login, self.STAGE_ENRICHED if cand.get("enriched") else self.STAGE_CANDIDATE)
+        return cand
+
+    def add_candidates(self, candidates: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Append candidates not already known (as candidate or lead); returns the new ones"""
+        added = []
+        for cand in candidates:
+            login = cand.get("login") if isinstance(cand, dict) else None
+            if not login or login in self._cand_pos or login in self._lead_by_login:
+                continue
+            added.append(self.upsert_candidate(cand))
+        return added
+
+    def remove_candidate(self, login: str) -> Optional[Dict[str, Any]]:
+        """Remove a candidate in O(1) by swapping the last entry into its slot"""
+        pos = self._cand_pos.pop(login, None)
+        if pos is None:
+            return None
+        self._unsearched.pop(login, None)
+        last = self.candidates.pop()
+        if pos < len(self.candidates):
+            removed = self.candidates[pos]
+            self.candidates[pos] = last
+            last_login = last.get("login") if isinstance(last, dict) else None
+            if last_login:
+                self._cand_pos[last_login] = pos
+            return removed
+        return last
+
+    def promote(self, login: str, fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Move a candidate (if any) into leads, merging extra fields such as email"""
+        cand = self.remove_candidate(login)
+        profile = {**(cand or {"login": login}), **(fields or {})}
+        return self.upsert_lead(profile)
+
+    def set_email(self, login: str, email: str) -> Dict[str, Any]:
+        """Attach an email to a lead, promoting the candidate if needed"""
+        lead = self._lead_by_login.get(login)
+        if lead is not None:
+            lead["email"] = email
+            self._index_email(login, lead)
+            return lead
+        return self.promote(login, {"email": email})
+
+    def mark_email_searched(self, logins: Iterable[str]):
+        """Flag logins whose commit emails were searched (persisted in the state's `email_searched` list)"""
+        for login in logins:
+            if login not in self._email_searched:
+                self._email_searched.add(login)
+                self.email_searched_logins.append(login)
+            self._unsearched.pop(login, None)
+
+    def mark_no_email_found(self, login: str):
+        """Flag a lead as unresolvable so it drops out of `leads_without_email`"""
+        lead = self._lead_by_login.get(login)
+        if lead is not None:
+            lead["no_email_found"] = True
+            self._without_email.pop(login, None)
+
+    def to_lists(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Serialized shape used by checkpoints and exports"""
+        return {"leads": self.leads, "candidates": self.candidates}
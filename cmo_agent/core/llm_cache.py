@@ -0,0 +1,250 @@
+"""
+Content-addressed LLM response cache with record/replay for the CMO Agent
+
+Responses are keyed by sha256(model + normalized messages + tool schemas). Job ids
+and ISO timestamps are masked during normalization so repeated jobs with the same
+goal hit the same entries. Entries live one JSON file per key under `cache_dir`,
+with TTL expiry and LRU eviction bounded by entry count and total bytes.
+
+Modes:
+    off         - no caching, calls pass straight through
+    read_write  - serve hits from cache, call the LLM and store on miss
+    record      - always call the LLM and (over)write the entry
+    replay      - serve only from cache; a miss raises LLMReplayMiss (fully offline)
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ("off", "read_write", "record", "replay")
+
+DEFAULT_LLM_CACHE_CONFIG = {
+    "mode": "off",
+    "cache_dir": "./data/llm_cache",
+    "ttl_seconds": 7 * 24 * 3600,
+    "max_entries": 5000,
+    "max_bytes": 200 * 1024 * 1024,
+}
+
+_JOB_ID_RE = re.compile(r"cmo-\d{8}-\d{6}(?:-\d{6})?-[0-9a-f]{6}")
+_ISO_TS_RE = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})?")
+
+
+class LLMReplayMiss(Exception):
+    """Raised in replay mode when no recorded response exists for a request"""
+
+
+def _normalize_text(text: Any) -> str:
+    text = text if isinstance(text, str) else json.dumps(text, sort_keys=True, default=str)
+    text = _JOB_ID_RE.sub("<job_id>", text)
+    return _ISO_TS_RE.sub("<ts>", text)
+
+
+def normalize_messages(messages: List[Any]) -> List[Dict[str, str]]:
+    """Reduce LangChain messages (or dicts) to [{role, content}] with volatile ids/timestamps masked"""
+    normalized = []
+    for msg in messages:
+        if isinstance(msg, dict):
+            role = msg.get("role") or msg.get("type") or "unknown"
+            content = msg.get("content", "")
+        else:
+            role = getattr(msg, "type", None) or type(msg).__name__
+            content = getattr(msg, "content", "")
+        normalized.append({"role": str(role), "content": _normalize_text(content)})
+    return normalized
+
+
+def make_cache_key(model: str, messages: List[Any], tool_schemas: Optional[List[Dict[str, Any]]] = None) -> str:
+    payload = {
+        "model": model,
+        "messages": normalize_messages(messages),
+        "tools": tool_schemas or [],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class CachedResponse:
+    """Minimal stand-in for an AIMessage: exposes .content and .tool_calls"""
+
+    def __init__(self, content: str = "", tool_calls: Optional[List[Dict[str, Any]]] = None, cached: bool = True):
+        self.content = content
+        self.tool_calls = tool_calls or []
+        self.cached = cached
+
+    @staticmethod
+    def serialize(response: Any) -> Dict[str, Any]:
+        calls = []
+        for call in getattr(response, "tool_calls", None) or []:
+            if not isinstance(call, dict):
+                call = call.dict() if hasattr(call, "dict") else dict(call)
+            calls.append({"name": call.get("name"), "args": call.get("args", {}), "id": call.get("id")})
+        return {"content": getattr(response, "content", "") or "", "tool_calls": calls}
+
+
+class LLMResponseCache:
+    """On-disk content-addressed store with TTL and size-bounded LRU eviction"""
+
+    def __init__(self, cache_dir: str, ttl_seconds: float = 0, max_entries: int = 0, max_bytes: int = 0):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "expired": 0, "evicted": 0}
+        # key -> [last_access, size]; built once from the directory, then maintained incrementally
+        self._index: Dict[str, List[float]] = {}
+        self._total_bytes = 0
+        for path in self.cache_dir.glob("*.json"):
+            st = path.stat()
+            self._index[path.stem] = [st.st_mtime, st.st_size]
+            self._total_bytes += st.st_size
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if key not in self._index:
+            self.stats["misses"] += 1
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self._drop(key)
+            self.stats["misses"] += 1
+            return None
+
+        if self.ttl_seconds and time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            self._drop(key)
+            self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            return None
+
+        now = time.time()
+        self._index[key][0] = now
+        try:
+            os.utime(self._path(key), (now, now))
+        except OSError:
+            pass
+        self.stats["hits"] += 1
+        return entry.get("response")
+
+    def put(self, key: str, response: Dict[str, Any], model: str = ""):
+        entry = {"key": key, "model": model, "created_at": time.time(), "response": response}
+        data = json.dumps(entry, ensure_ascii=False, default=str)
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        size = len(data.encode("utf-8"))
+        if key in self._index:
+            self._total_bytes -= self._index[key][1]
+        self._index[key] = [time.time(), size]
+        self._total_bytes += size
+        self.stats["writes"] += 1
+        self._evict()
+
+    def _drop(self, key: str):
+        meta = self._index.pop(key, None)
+        if meta:
+            self._total_bytes -= meta[1]
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def _evict(self):
+        over_entries = self.max_entries and len(self._index) > self.max_entries
+        over_bytes = self.max_bytes and self._total_bytes > self.max_bytes
+        if not (over_entries or over_bytes):
+            return
+        # Least recently used first
+        for key, _ in sorted(self._index.items(), key=lambda kv: kv[1][0]):
+            if not ((self.max_entries and len(self._index) > self.max_entries)
+                    or (self.max_bytes and self._total_bytes > self.max_bytes)):
+                break
+            self._drop(key)
+            self.stats["evicted"] += 1
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+class CachedLLM:
+    """Wraps a (tool-bound) chat model's ainvoke with the response cache"""
+
+    def __init__(self, llm: Any, model: str, tool_schemas: Optional[List[Dict[str, Any]]], cache: LLMResponseCache, mode: str = "read_write"):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown llm_cache mode '{mode}', expected one of {CACHE_MODES}")
+        self.llm = llm
+        self.model = model
+        self.tool_schemas = tool_schemas or []
+        self.cache = cache
+        self.mode = mode
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+
+    async def ainvoke(self, messages: List[Any], *args, **kwargs):
+        if self.mode == "off":
+            return await self._call(messages, *args, **kwargs)
+
+        key = make_cache_key(self.model, messages, self.tool_schemas)
+        if self.mode in ("read_write", "replay"):
+            cached = self.cache.get(key)
+            if cached is not None:
+                return CachedResponse(cached.get("content", ""), cached.get("tool_calls", []))
+            if self.mode == "replay":
+                raise LLMReplayMiss(f"No recorded LLM response for key {key[:12]}")
+
+        response = await self._call(messages, *args, **kwargs)
+        try:
+            self.cache.put(key, CachedResponse.serialize(response), model=self.model)
+        except Exception as e:
+            logger.warning(f"Failed to store LLM response in cache: {e}")
+        return response
+
+    async def _call(self, messages, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await self.llm.ainvoke(messages, *args, **kwargs)
+        finally:
+            self.llm_calls += 1
+            self.llm_seconds += time.perf_counter() - started
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "entries": len(self.cache),
+            "llm_calls": self.llm_calls,
+            "llm_seconds": round(self.llm_seconds, 3),
+            **self.cache.stats,
+        }
+
+    def __getattr__(self, name):
+        # Delegate everything else (bind_tools, model_name, ...) to the wrapped model
+        return getattr(self.llm, name)
+
+
+def wrap_llm_with_cache(llm: Any, model: str, tool_schemas: Optional[List[Dict[str, Any]]], cache_config: Optional[Dict[str, Any]]) -> Any:
+    """Return llm wrapped in CachedLLM according to config (unchanged when mode is off)"""
+    cfg = {**DEFAULT_LLM_CACHE_CONFIG, **(cache_config or {})}
+    mode = cfg.get("mode") or "off"
+    if mode == "off":
+        return llm
+    cache = LLMResponseCache(
+        cfg["cache_dir"],
+        ttl_seconds=float(cfg.get("ttl_seconds") or 0),
+        max_entries=int(cfg.get("max_entries") or 0),
+        max_bytes=int(cfg.get("max_bytes") or 0),
+    )
+    logger.info(f"LLM response cache enabled (mode={mode}, dir={cfg['cache_dir']}, entries={len(cache)})")
+    return CachedLLM(llm, model, tool_schemas, cache, mode=mode)
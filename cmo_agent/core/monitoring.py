@@ -534,6 +534,7 @@ class MetricsLogger:
         try:
             exporter = _PrometheusExporter(port)
             exporter.start()
+            exporter.register_request_metrics()
             self._prom_exporter = exporter
             self.structured_logger.logger.info(f"Prometheus metrics exporter started on :{port}")
         except Exception as e:
@@ -648,6 +649,38 @@ class _PrometheusExporter:
                 # Ignore bad value updates
                 pass
 
+    def register_request_metrics(self, metrics=None):
+        """Expose the middleware's in-memory request histograms/status counts at scrape time."""
+        if getattr(self, "_request_collector", None) is not None:
+            return
+        from prometheus_client.core import REGISTRY, HistogramMetricFamily, CounterMetricFamily
+        try:
+            from ..obs.http_metrics import get_request_metrics
+        except ImportError:
+            from obs.http_metrics import get_request_metrics
+        source = metrics or get_request_metrics()
+
+        class _RequestCollector:
+            def collect(self):
+                snap = source.snapshot()
+                latency = HistogramMetricFamily(
+                    "http_request_duration_seconds",
+                    "Time to response start per route",
+                    labels=["method", "route"],
+                )
+                for r in snap["routes"]:
+                    latency.add_metric([r["method"], r["route"]], r["buckets"], r["sum"])
+                responses = CounterMetricFamily(
+                    "http_responses", "Responses per route and status", labels=["method", "route", "status"]
+                )
+                for s in snap["statuses"]:
+                    responses.add_metric([s["method"], s["route"], str(s["status"])], s["count"])
+                yield latency
+                yield responses
+
+        self._request_collector = _RequestCollector()
+        REGISTRY.register(self._request_collector)
+
 
 def _flatten_metrics(d: Dict[str, Any], parent: str = "") -> Dict[str, Any]:
     result: Dict[str, Any] = {}
@@ -51,6 +51,7 @@ class RunState(TypedDict, total=False):
     completed_at: str
     progress: Dict[str, Any]
     email_search_exhausted: bool
+    email_searched: List[str]  # logins whose commit emails were searched (see core/lead_store.py)
 
 
 class JobMetadata:
@@ -1,23 +1,90 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from .obs.logging import log, with_request_context
+"""
+Pure ASGI request middleware: per-route latency histograms, status counts and
+sampled request logging.
+
+Unlike BaseHTTPMiddleware this adds no task or body stream wrapper; `send` is
+only observed for the response start, so streaming (SSE) responses pass
+through untouched. Latency is measured to the response start, which is
+meaningful for both regular and long-lived streaming responses.
+"""
+import random
 import time
+from typing import Optional
+
+from .obs.http_metrics import RequestMetrics, get_request_metrics
+from .obs.logging import log, bind_request_id
+
+
+def _route_label(scope) -> str:
+    """Route template set by the router (bounded cardinality), never the raw path"""
+    route = scope.get("route")
+    path = getattr(route, "path", None) or getattr(route, "path_format", None)
+    if path:
+        return path
+    endpoint = scope.get("endpoint")
+    if endpoint is not None:
+        return getattr(endpoint, "__name__", "endpoint")
+    return "unmatched"
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers") or ():
+        if key == name:
+            return value.decode("latin-1")
+    return None
 
 
-class RequestLogMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):  # noqa: D401
-        with_request_context(request)
+class RequestLogMiddleware:
+    """Records request metrics and logs a sample of requests (errors and slow ones always)."""
+
+    def __init__(self, app, sample_rate: float = 0.05, slow_ms: int = 1000,
+                 metrics: Optional[RequestMetrics] = None):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.metrics = metrics or get_request_metrics()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        bind_request_id(_header(scope, b"x-request-id"))
         start = time.perf_counter()
+        status = 0
+        first_byte = None
+
+        async def send_wrapper(message):
+            nonlocal status, first_byte
+            if first_byte is None and message["type"] == "http.response.start":
+                first_byte = time.perf_counter() - start
+                status = int(message.get("status", 0))
+            await send(message)
+
         try:
-            log.info("http_req", evt="http_req", method=request.method, path=request.url.path)
-            response: Response = await call_next(request)
-            return response
+            await self.app(scope, receive, send_wrapper)
+        except BaseException:
+            if first_byte is None:
+                status = 500
+                first_byte = time.perf_counter() - start
+            raise
         finally:
-            dur_ms = int((time.perf_counter() - start) * 1000)
-            status = 0
-            try:
-                status = int(getattr(response, "status_code", 0))  # type: ignore[name-defined]
-            except Exception:
-                pass
-            log.info("http_res", evt="http_res", status=status, path=request.url.path, latency_ms=dur_ms)
+            if first_byte is None:
+                # App returned without starting a response (e.g. client disconnected)
+                first_byte = time.perf_counter() - start
+            method = scope.get("method", "")
+            route = _route_label(scope)
+            self.metrics.observe(method, route, status, first_byte)
+
+            ttfb_ms = int(first_byte * 1000)
+            if status >= 500 or ttfb_ms >= self.slow_ms or random.random() < self.sample_rate:
+                log.info(
+                    "http_req",
+                    evt="http_req",
+                    method=method,
+                    path=scope.get("path", ""),
+                    route=route,
+                    status=status,
+                    latency_ms=ttfb_ms,
+                    duration_ms=int((time.perf_counter() - start) * 1000),
+                )
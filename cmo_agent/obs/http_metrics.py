@@ -0,0 +1,102 @@
+"""
+In-memory HTTP request metrics: per-route latency histograms and status counts.
+
+Recorded by the ASGI RequestLogMiddleware and exported through the Prometheus
+exporter in core.monitoring. Routes are labelled by their template (e.g.
+/api/jobs/{job_id}) so label cardinality stays bounded.
+"""
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Tuple
+
+# Upper bounds in seconds; the final +Inf bucket is implicit
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, n_buckets: int):
+        self.counts = [0] * (n_buckets + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class RequestMetrics:
+    """Latency histograms keyed by (method, route) plus (method, route, status) counts"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._histograms: Dict[Tuple[str, str], _Histogram] = {}
+        self._statuses: Dict[Tuple[str, str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route)
+        idx = bisect_left(self.buckets, seconds)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = _Histogram(len(self.buckets))
+            hist.counts[idx] += 1
+            hist.sum += seconds
+            hist.count += 1
+            skey = (method, route, status)
+            self._statuses[skey] = self._statuses.get(skey, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of the current state with cumulative bucket counts (Prometheus `le` semantics)"""
+        with self._lock:
+            histograms = {k: (list(h.counts), h.sum, h.count) for k, h in self._histograms.items()}
+            statuses = dict(self._statuses)
+        routes: List[Dict[str, Any]] = []
+        for (method, route), (counts, total, count) in sorted(histograms.items()):
+            cumulative, running = [], 0
+            for c in counts:
+                running += c
+                cumulative.append(running)
+            bounds = [str(b) for b in self.buckets] + ["+Inf"]
+            routes.append({
+                "method": method,
+                "route": route,
+                "buckets": list(zip(bounds, cumulative)),
+                "sum": total,
+                "count": count,
+            })
+        return {
+            "routes": routes,
+            "statuses": [
+                {"method": m, "route": r, "status": s, "count": n}
+                for (m, r, s), n in sorted(statuses.items())
+            ],
+        }
+
+    def quantile(self, method: str, route: str, q: float) -> Optional[float]:
+        """Upper bucket bound containing the q-quantile (None if no observations)"""
+        with self._lock:
+            hist = self._histograms.get((method, route))
+            if hist is None or hist.count == 0:
+                return None
+            target, running = q * hist.count, 0
+            for i, c in enumerate(hist.counts):
+                running += c
+                if running >= target:
+                    return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._statuses.clear()
+
+
+_request_metrics = RequestMetrics()
+
+
+def get_request_metrics() -> RequestMetrics:
+    """Process-wide request metrics recorded by RequestLogMiddleware"""
+    return _request_metrics
@@ -97,10 +97,15 @@ def configure_logging(level: str = "INFO") -> None:
 
 def with_request_context(req, thread_id: Optional[str] = None) -> None:
     """Bind request-level correlation IDs to the context."""
+    bind_request_id(req.headers.get("x-request-id"), thread_id)
+
+
+def bind_request_id(request_id: Optional[str], thread_id: Optional[str] = None) -> None:
+    """Bind a request ID (generated when absent) without needing a Request object."""
     if _HAS_STRUCTLOG and bind_contextvars is not None and clear_contextvars is not None:
         clear_contextvars()
         bind_contextvars(
-            reqId=req.headers.get("x-request-id", str(uuid.uuid4())),
+            reqId=request_id or str(uuid.uuid4()),
             threadId=thread_id,
         )
 
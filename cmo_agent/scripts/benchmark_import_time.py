@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold import time of the CLI/web entry points, measured with `python -X importtime`.
+Each entry point is imported in a fresh interpreter several times; the median cumulative
+import time is reported together with the packages that dominate it. Results can be saved
+as a baseline and later runs compared against it to catch cold-start regressions.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+project_root = str(Path(__file__).resolve().parents[2])
+
+ENTRY_POINTS = {
+    "run_agent": "cmo_agent.scripts.run_agent",
+    "run_web": "cmo_agent.scripts.run_web",
+    "icp_wizard_cli": "icp_wizard_cli",
+}
+DEFAULT_BASELINE = Path(project_root) / ".cache" / "import_times.json"
+
+
+def parse_importtime(stderr: str, module: str) -> Tuple[Optional[float], Dict[str, float]]:
+    """Cumulative microseconds for `module` and self time summed per top-level package"""
+    total = None
+    by_package: Dict[str, float] = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header row
+        self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2].strip()
+        by_package[name.split(".")[0]] += self_us
+        if name == module:
+            total = float(cumulative_us)
+    return total, dict(by_package)
+
+
+def measure(module: str, runs: int) -> Dict[str, object]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [project_root, os.environ.get("PYTHONPATH")])))
+    totals: List[float] = []
+    walls: List[float] = []
+    packages: Dict[str, float] = defaultdict(float)
+    for _ in range(runs):
+        started = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                              cwd=project_root, env=env, capture_output=True, text=True)
+        walls.append(time.perf_counter() - started)
+        if proc.returncode != 0:
+            error = (proc.stderr.strip().splitlines() or ["import failed"])[-1]
+            return {"error": error}
+        total, by_package = parse_importtime(proc.stderr, module)
+        if total is None:
+            return {"error": f"{module} missing from -X importtime output"}
+        totals.append(total)
+        for package, us in by_package.items():
+            packages[package] += us / runs
+    return {
+        "import_ms": statistics.median(totals) / 1000,
+        "wall_ms": statistics.median(walls) * 1000,
+        "packages": dict(sorted(packages.items(), key=lambda item: -item[1])),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark entry point import time (python -X importtime)")
+    parser.add_argument("entry_points", nargs="*",
+                        help=f"Entry points to measure (default: all of {', '.join(ENTRY_POINTS)})")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per entry point")
+    parser.add_argument("--top", type=int, default=8, help="Heaviest packages to list per entry point")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON to compare against")
+    parser.add_argument("--save", action="store_true", help="Write this run's results as the new baseline")
+    parser.add_argument("--max-regression", type=float, default=None,
+                        help="Exit non-zero if any entry point is this many percent slower than the baseline")
+    args = parser.parse_args()
+
+    names = args.entry_points or list(ENTRY_POINTS)
+    unknown = [name for name in names if name not in ENTRY_POINTS]
+    if unknown:
+        parser.error(f"unknown entry point(s): {', '.join(unknown)}")
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+
+    print(f"🧪 Measuring cold imports ({args.runs} runs each) with {sys.executable}")
+    results = {}
+    regressions = []
+    for name in names:
+        module = ENTRY_POINTS[name]
+        result = measure(module, args.runs)
+        print(f"\n⏱️  {name} ({module})")
+        if "error" in result:
+            print(f"   ❌ {result['error']}")
+            continue
+        results[name] = {"import_ms": round(result["import_ms"], 1), "wall_ms": round(result["wall_ms"], 1)}
+        line = f"   {result['import_ms']:,.1f} ms imports, {result['wall_ms']:,.1f} ms interpreter wall time"
+        previous = (baseline.get(name) or {}).get("import_ms")
+        if previous:
+            change = (result["import_ms"] - previous) / previous * 100
+            line += f" ({change:+.0f}% vs baseline {previous:,.1f} ms)"
+            if args.max_regression is not None and change > args.max_regression:
+                regressions.append(name)
+        print(line)
+        for package, us in list(result["packages"].items())[:args.top]:
+            print(f"     {package:<28} {us / 1000:8.1f} ms")
+
+    if args.save and results:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline.update(results)
+        baseline_path.write_text(json.dumps(baseline, indent=2, sort_keys=True))
+        print(f"\n💾 Baseline saved to {baseline_path}")
+
+    if regressions:
+        print(f"\n❌ Import time regressed more than {args.max_regression:.0f}%: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
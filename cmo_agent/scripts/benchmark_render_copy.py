@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: RenderCopy renders/sec for one campaign over a synthetic lead batch.
+Compares recompiling templates per lead (the old behaviour), the compiled-template
+cache through execute(), and a single render_many() call.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+project_root = str(Path(__file__).resolve().parents[2])
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from cmo_agent.tools.personalization import RenderCopy
+
+
+def make_leads(count: int):
+    return [
+        {
+            "login": f"dev{i}",
+            "name": f"Dev Person{i}",
+            "email": f"dev{i}@example.com",
+            "company": f"Company {i % 50}",
+            "primary_repo": f"org{i % 200}/repo{i}",
+            "primary_language": "Python",
+            "why_now": f"Your last release shipped {i % 30} days ago.",
+        }
+        for i in range(count)
+    ]
+
+
+async def run_per_lead(tool: RenderCopy, leads, campaign, recompile: bool) -> float:
+    started = time.perf_counter()
+    for lead in leads:
+        if recompile:
+            tool._template_cache.clear()
+        result = await tool.execute(lead=lead, campaign=campaign)
+        assert result.success, result.error
+    return time.perf_counter() - started
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark RenderCopy rendering throughput")
+    parser.add_argument("--leads", type=int, default=10_000, help="Leads to render per mode")
+    args = parser.parse_args()
+
+    tool = RenderCopy()
+    campaign = tool._get_default_campaign()
+    leads = make_leads(args.leads)
+    print(f"🧪 Rendering {args.leads:,} leads against campaign '{campaign['id']}'")
+
+    timings = {}
+    timings["recompile per lead"] = await run_per_lead(tool, leads, campaign, recompile=True)
+    timings["cached templates"] = await run_per_lead(tool, leads, campaign, recompile=False)
+
+    started = time.perf_counter()
+    result = tool.render_many(leads, campaign)
+    timings["render_many"] = time.perf_counter() - started
+    assert result.success and result.data["rendered"] == args.leads
+
+    baseline = timings["recompile per lead"]
+    for mode, seconds in timings.items():
+        print(f"\n⏱️  {mode}")
+        print(f"   {args.leads / seconds:,.0f} renders/sec ({seconds:.2f}s, {baseline / seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -66,7 +66,7 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
     return config
 
 
-async def run_campaign(goal: str, config_path: Optional[str] = None, dry_run: bool = False, no_emoji: bool = False, interactive: bool = False):
+async def run_campaign(goal: str, config_path: Optional[str] = None, dry_run: bool = False, no_emoji: bool = False, interactive: bool = False, mode: Optional[str] = None, llm_cache: Optional[str] = None):
     """Run a CMO Agent campaign"""
     try:
         logger.info(f"Starting CMO Agent campaign: {goal}")
@@ -77,6 +77,10 @@ async def run_campaign(goal: str, config_path: Optional[str] = None, dry_run: bo
         # Load configuration
         config = load_config(config_path)
         logger.info(f"Loaded configuration from {config_path or 'defaults'}")
+        if mode:
+            config['execution_mode'] = mode
+        if llm_cache:
+            config.setdefault('llm_cache', {})['mode'] = llm_cache
         # Reconfigure logging and monitoring according to loaded config
         _setup_logging_from_config(config)
         configure_metrics_from_config(config)
@@ -174,7 +178,7 @@ async def run_campaign(goal: str, config_path: Optional[str] = None, dry_run: bo
                 answer = input(("Run another campaign? (y/N): "))
                 if answer.strip().lower() in ["y", "yes"]:
                     next_goal = input("Enter goal for next campaign: ")
-                    return await run_campaign(next_goal, config_path=config_path, dry_run=dry_run, no_emoji=no_emoji, interactive=interactive)
+                    return await run_campaign(next_goal, config_path=config_path, dry_run=dry_run, no_emoji=no_emoji, interactive=interactive, mode=mode, llm_cache=llm_cache)
         else:
             cross = "❌ " if not no_emoji else ""
             print(f"\n{cross}Campaign failed: {result.get('error', 'Unknown error')}")
@@ -211,6 +215,16 @@ def main():
         action="store_true",
         help="Disable emoji in CLI output"
     )
+    parser.add_argument(
+        "--mode",
+        choices=["agent", "pipeline"],
+        help="Execution mode: LLM-driven agent loop or deterministic streaming pipeline"
+    )
+    parser.add_argument(
+        "--llm-cache",
+        choices=["off", "read_write", "record", "replay"],
+        help="LLM response cache mode (replay runs offline from recorded responses)"
+    )
     parser.add_argument(
         "--interactive",
         action="store_true",
@@ -227,7 +241,7 @@ def main():
     Path("./logs").mkdir(exist_ok=True)
 
     # Run the campaign
-    result = asyncio.run(run_campaign(args.goal, args.config, dry_run=args.dry_run, no_emoji=args.no_emoji, interactive=args.interactive))
+    result = asyncio.run(run_campaign(args.goal, args.config, dry_run=args.dry_run, no_emoji=args.no_emoji, interactive=args.interactive, mode=args.mode, llm_cache=args.llm_cache))
 
     # Exit with appropriate code
     sys.exit(0 if result.get('success', False) else 1)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the buffered analytics sink behind ux.analytics.emit:
+- emit stays sub-microsecond on the hot path and never touches the filesystem
+- events reach disk in batches, flush drains everything
+- size-based rotation and the drop/sample overflow policies
+"""
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = str(Path(__file__).resolve().parents[2])
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from cmo_agent.ux import analytics
+
+
+def _read_events(path: Path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        analytics.EVENT_LOG_PATH = Path(tmp) / "logs" / "product_events.jsonl"
+
+        print("[1] Hot-path cost and delivery...")
+        # Time bursts with the writer idle, flushing between them, so only the
+        # caller-side cost at a steady queue depth is measured
+        n, burst = 100_000, 1000
+        analytics.configure(max_queue=10_000, batch_size=burst + 1, flush_interval=60)
+        props = {"run": "abc", "step": 1}
+        elapsed = 0.0
+        for _ in range(n // burst):
+            started = time.perf_counter()
+            for _ in range(burst):
+                analytics.emit("ui.step", props)
+            elapsed += time.perf_counter() - started
+            assert analytics.flush(10), "queue did not drain"
+        per_call = elapsed / n
+        events = _read_events(analytics.EVENT_LOG_PATH)
+        assert len(events) == n and events[0]["event"] == "ui.step"
+        assert events[0]["props"] == props and events[0]["timestamp"].endswith("Z")
+        assert analytics.get_stats()["written"] == n
+        print(f"    ✓ {per_call * 1e9:.0f}ns per emit, {n:,} events written")
+        assert per_call < 1e-6, f"emit too slow: {per_call * 1e9:.0f}ns"
+
+        print("[2] Rotation by size...")
+        analytics.EVENT_LOG_PATH.unlink()
+        analytics.configure(batch_size=100, flush_interval=0.05, max_bytes=20_000, backup_count=2)
+        for i in range(2000):
+            analytics.emit("ui.rotate", {"i": i})
+        assert analytics.flush(10)
+        rotated = sorted(p.name for p in analytics.EVENT_LOG_PATH.parent.iterdir())
+        assert rotated == ["product_events.jsonl", "product_events.jsonl.1", "product_events.jsonl.2"], rotated
+        assert analytics.get_stats()["rotations"] >= 2
+        print(f"    ✓ rotated into {rotated}")
+
+        print("[3] Overflow policies...")
+        for policy, expected_key in (("drop", "dropped"), ("sample", "sampled_out")):
+            analytics.configure(max_queue=10, batch_size=10_000, flush_interval=60, overflow=policy, sample_every=5)
+            for i in range(60):
+                analytics.emit("ui.burst", {"i": i})
+            stats = analytics.get_stats()
+            assert stats["queued"] == 10, stats
+            assert stats[expected_key] == 40 if policy == "sample" else stats[expected_key] == 50, stats
+            analytics.flush(5)
+            print(f"    ✓ {policy}: {stats[expected_key]} discarded, queue held at {stats['queued']}")
+
+        try:
+            analytics.configure(overflow="block")
+            raise AssertionError("invalid overflow policy accepted")
+        except ValueError:
+            pass
+
+        print("[4] Shutdown drains pending events...")
+        analytics.configure(flush_interval=60)
+        before = len(_read_events(analytics.EVENT_LOG_PATH))
+        analytics.emit("ui.last", {})
+        analytics.shutdown()
+        events = _read_events(analytics.EVENT_LOG_PATH)
+        assert len(events) == before + 1 and events[-1]["event"] == "ui.last"
+        print("    ✓ pending event written on shutdown")
+
+    print("All analytics sink tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Tests for checkpoint summary headers and the checkpoint catalog:
+- agent checkpoints stay valid JSON and start with a fixed-size summary header
+- the latest checkpoint comes from catalog.jsonl; legacy directories fall back to mtime
+- dashboard/queue counters come from the header; other sections load lazily
+- an append racing a compaction is kept
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+project_root = str(Path(__file__).resolve().parents[2])
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from cmo_agent.ux import state_loader
+from cmo_agent.ux.state_loader import (
+    CATALOG_FILENAME,
+    HEADER_SIZE,
+    CheckpointState,
+    compact_catalog,
+    find_latest_checkpoint,
+    load_latest_state,
+    read_checkpoint_summary,
+    write_checkpoint,
+)
+
+
+def _state(job_id, n):
+    return {
+        "job_id": job_id,
+        "goal": "Find Python maintainers",
+        "current_stage": "personalization",
+        "paused": False,
+        "created_at": "2026-01-01T10:00:00",
+        "counters": {"steps": n, "api_calls": 2 * n},
+        "repos": [{"full_name": f"org/repo{i}"} for i in range(n)],
+        "candidates": [{"login": f"dev{i}"} for i in range(n // 2)],
+        "leads": [{"email": f"dev{i}@example.com"} for i in range(3)],
+        "to_send": [],
+        "errors": [{"error": "boom"}],
+        "reports": {"instantly": {"sends": [
+            {"email": f"dev{i}@example.com", "status": "queued", "timestamp": "2026-01-01T11:00:00",
+             "body": "x" * 500}
+            for i in range(n)
+        ]}},
+    }
+
+
+async def _save(agent_cls, fake, job_id, state, checkpoint_type="periodic"):
+    path = await agent_cls._save_checkpoint(fake, job_id, state, checkpoint_type)
+    assert path, "checkpoint was not written"
+    return Path(path)
+
+
+async def main() -> int:
+    from cmo_agent.agents.cmo_agent import CMOAgent
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ckpt_dir = Path(tmp) / "checkpoints"
+
+        class FakeAgent:
+            config = {"directories": {"checkpoints": str(ckpt_dir)}, "persistence": {"max_checkpoints": 2}}
+
+            async def _cleanup_checkpoints(self, job_id):
+                await CMOAgent._cleanup_checkpoints(self, job_id)
+
+        fake = FakeAgent()
+
+        print("[1] Agent checkpoints carry a summary header...")
+        first = await _save(CMOAgent, fake, "job-a", _state("job-a", 1200), "manual")
+        with first.open("rb") as f:
+            assert f.read(HEADER_SIZE).endswith(b"\n")
+        full = json.loads(first.read_text(encoding="utf-8"))
+        assert full["state"]["job_id"] == "job-a" and full["summary"]["sizes"]["repos"] == 1200
+        summary = read_checkpoint_summary(first)
+        assert summary["current_stage"] == "personalization" and summary["counters"]["steps"] == 1200
+        assert summary["sizes"] == {"repos": 1200, "candidates": 600, "leads": 3, "to_send": 0, "errors": 1,
+                                    "sends": 1200}
+        assert len(summary["sends"]) == 50 and "body" not in summary["sends"][0]
+        print(f"    ✓ valid JSON, {HEADER_SIZE}-byte header with true (unsanitized) collection sizes")
+
+        print("[2] Latest checkpoint comes from the catalog...")
+        time.sleep(0.01)
+        second = await _save(CMOAgent, fake, "job-b", _state("job-b", 10), "manual")
+        # Touch the older file: the catalog, not mtime, decides what is latest
+        later = time.time() + 60
+        os.utime(first, (later, later))
+        assert find_latest_checkpoint([ckpt_dir]) == second
+        legacy_dir = Path(tmp) / "legacy"
+        legacy_dir.mkdir()
+        legacy = legacy_dir / "job-old_periodic.json"
+        legacy.write_text(json.dumps({"state": _state("job-old", 4)}), encoding="utf-8")
+        earlier = time.time() - 3600
+        os.utime(legacy, (earlier, earlier))
+        assert find_latest_checkpoint([legacy_dir]) == legacy
+        assert find_latest_checkpoint([ckpt_dir, legacy_dir]) == second
+        second.unlink()
+        assert find_latest_checkpoint([ckpt_dir]) == first
+        print("    ✓ newest live catalog entry wins; directories without a catalog use mtime")
+
+        print("[3] Dashboard and queue read only the header...")
+        loaded = load_latest_state([ckpt_dir])
+        state = loaded.state
+        assert isinstance(state, CheckpointState) and loaded.summary["job_id"] == "job-a"
+        assert state.get("goal") == "Find Python maintainers" and state["counters"]["api_calls"] == 2400
+        assert state.count("repos") == 1200 and state.count("errors") == 1
+        assert [s["email"] for s in state.queue_sends(50)][:2] == ["dev0@example.com", "dev1@example.com"]
+        assert not state.is_loaded
+        print("    ✓ counters, sizes and recent sends served without parsing the body")
+
+        print("[4] Other sections load lazily, once...")
+        repos = state.get("repos")
+        assert state.is_loaded and len(repos) == 1001 and repos[0]["full_name"] == "org/repo0"
+        assert state.get("reports")["instantly"]["sends"][0]["body"] == "x" * 500
+        legacy_state = load_latest_state([legacy_dir]).state
+        assert legacy_state.count("repos") == 4 and legacy_state.queue_sends(2)[1]["email"] == "dev1@example.com"
+        print("    ✓ full state unwrapped from 'state'; legacy checkpoints still load")
+
+        print("[5] Oversized summaries are trimmed to fit the header...")
+        noisy = _state("job-c", 5)
+        noisy["reports"]["instantly"]["sends"] = [
+            {"email": "é" * 200 + f"{i}@example.com", "status": "queued"} for i in range(50)
+        ]
+        third = await _save(CMOAgent, fake, "job-c", noisy, "manual")
+        summary = read_checkpoint_summary(third)
+        assert 0 < len(summary["sends"]) < 50 and summary["sizes"]["sends"] == 50
+        assert len(load_latest_state([ckpt_dir]).state.queue_sends(50)) == 50
+        print(f"    ✓ kept {len(summary['sends'])} sends in the header; queue view falls back to the body")
+
+        print("[6] Cleanup compacts the catalog...")
+        for i in range(3):
+            (ckpt_dir / f"job-d_periodic_{i}.json").write_text("{}", encoding="utf-8")
+        await _save(CMOAgent, fake, "job-d", _state("job-d", 2), "periodic")
+        entries = [json.loads(line) for line in (ckpt_dir / CATALOG_FILENAME).read_text().splitlines()]
+        assert all((ckpt_dir / e["path"]).exists() for e in entries), entries
+        assert compact_catalog(ckpt_dir) == len(entries)
+        print(f"    ✓ {len(entries)} live catalog entries after cleanup")
+
+        print("[7] Catalog tail reads handle long catalogs...")
+        state_loader.CATALOG_TAIL_BYTES, saved = 256, state_loader.CATALOG_TAIL_BYTES
+        try:
+            with (ckpt_dir / CATALOG_FILENAME).open("a", encoding="utf-8") as f:
+                for i in range(50):
+                    f.write(json.dumps({"path": f"gone_{i}.json", "written_at": time.time()}) + "\n")
+            assert find_latest_checkpoint([ckpt_dir]).name.startswith("job-d_periodic_")
+        finally:
+            state_loader.CATALOG_TAIL_BYTES = saved
+        print("    ✓ stale entries skipped past the tail window")
+
+        print("[8] An append during compaction is not lost...")
+        racer = ckpt_dir / "job-e_periodic.json"
+        appender = threading.Thread(target=write_checkpoint, args=(
+            racer, {"state": _state("job-e", 1)}, {"job_id": "job-e", "checkpoint_type": "periodic"}))
+        read_entries = state_loader.iter_catalog
+
+        def iter_then_append(directory):
+            # Compaction has read the catalog; start an append before it writes the new one
+            yield from read_entries(directory)
+            appender.start()
+            appender.join(0.3)
+
+        state_loader.iter_catalog = iter_then_append
+        try:
+            compact_catalog(ckpt_dir)
+        finally:
+            state_loader.iter_catalog = read_entries
+        appender.join()
+        assert find_latest_checkpoint([ckpt_dir]) == racer
+        assert compact_catalog(ckpt_dir) == len(entries) + 1
+        print("    ✓ the appender waited for the compacted catalog and its entry survived")
+
+    print("All checkpoint catalog tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming export engine behind ExportCSV:
+- list input keeps the previous headers/coercion
+- async iterators stream in chunks with flat memory and a responsive event loop
+- jsonl output, declared schemas, unsampled columns, parquet dependency errors
+"""
+import asyncio
+import csv
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+project_root = str(Path(__file__).resolve().parents[2])
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from cmo_agent.tools.export import ExportCSV
+
+N_STREAMED = 100_000
+
+
+async def _lead_stream(n):
+    for i in range(n):
+        yield {"login": f"user{i}", "email": f"user{i}@example.com", "stars": i, "topics": ["a", "b"]}
+        if i % 1000 == 0:
+            await asyncio.sleep(0)
+
+
+async def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        export = ExportCSV(tmp)
+
+        print("[1] List input (previous behaviour)...")
+        rows = [{"id": 1, "name": "octo"}, {"id": 2, "name": "cat", "extra": {"k": 1}}, {"id": 3, "name": None}]
+        res = await export.execute(rows=rows, path="list.csv", field_order=["name"])
+        assert res.success, res.error
+        assert res.data["headers"] == ["name", "extra", "id"] and res.data["count"] == 3
+        with open(res.data["path"], newline="") as f:
+            parsed = list(csv.DictReader(f))
+        assert parsed[1]["extra"] == "{'k': 1}" and parsed[2]["name"] == ""
+        assert not (await export.execute(rows=[], path="empty.csv")).success
+        assert not (await export.execute(rows=rows, path="list.csv", allow_overwrite=False)).success
+        print("    ✓ headers, coercion, empty and overwrite guards unchanged")
+
+        print(f"[2] Streaming {N_STREAMED:,} rows from an async iterator...")
+        ticks = 0
+        stop = asyncio.Event()
+
+        async def _ticker():
+            nonlocal ticks
+            while not stop.is_set():
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticker = asyncio.create_task(_ticker())
+        tracemalloc.start()
+        started = time.perf_counter()
+        res = await export.execute(rows=_lead_stream(N_STREAMED), path="stream.csv", chunk_size=2000)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stop.set()
+        await ticker
+        assert res.success, res.error
+        assert res.data["count"] == N_STREAMED
+        with open(res.data["path"]) as f:
+            assert sum(1 for _ in f) == N_STREAMED + 1
+        assert peak < 20 * 1024 * 1024, f"peak memory {peak / 1e6:.1f}MB is not flat"
+        assert ticks > 5, "event loop was blocked during export"
+        print(f"    ✓ {elapsed:.2f}s, peak traced memory {peak / 1e6:.1f}MB, {ticks} loop ticks during export")
+
+        print("[3] JSONL, declared schema, unsampled fields...")
+        def _gen():
+            yield {"login": "a", "email": "a@x.io"}
+            yield {"login": "b", "email": "b@x.io", "late_field": 1}
+        res = await export.execute(rows=_gen(), path="leads.jsonl", sample_size=1)
+        assert res.success and res.data["format"] == "jsonl"
+        assert res.data["unsampled_fields"] == ["late_field"]
+        with open(res.data["path"]) as f:
+            lines = [json.loads(l) for l in f]
+        assert lines == [{"email": "a@x.io", "login": "a"}, {"email": "b@x.io", "login": "b"}]
+        res = await export.execute(rows=_gen(), path="declared.csv", fields=["login"])
+        assert res.success and res.data["headers"] == ["login"] and res.data["count"] == 2
+        print("    ✓ jsonl written; declared schema honoured; late columns reported")
+
+        print("[4] Parquet...")
+        res = await export.execute(rows=rows, path="leads.parquet")
+        try:
+            import pyarrow  # noqa: F401
+            assert res.success and res.data["format"] == "parquet"
+            print("    ✓ parquet written")
+        except ImportError:
+            assert not res.success and "pyarrow" in res.error
+            assert not list(Path(tmp).glob("*.tmp")), "temp file left behind"
+            print("    ✓ clear error without pyarrow, no temp files left")
+
+    print("All export engine tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for lazy agent start-up:
+- constructing CMOAgent imports no tool module, LangChain/OpenAI client or LangGraph
+- tools are declared from config and built on first access
+- the compiled graph is shared per config hash and dispatches to the running agent
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = str(Path(__file__).resolve().parents[2])
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from cmo_agent.agents.cmo_agent import CMOAgent, _compiled_graphs
+
+HEAVY_MODULES = ("cmo_agent.tools.github", "cmo_agent.tools.hygiene", "cmo_agent.tools.personalization",
+                 "cmo_agent.tools.crm", "langchain_openai", "langgraph.graph")
+
+
+async def main() -> int:
+    print("[1] Constructing the agent imports nothing heavy...")
+    agent = CMOAgent({"GITHUB_TOKEN": "t", "LINEAR_API_KEY": "l"})
+    loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+    assert not loaded, f"imported at construction: {loaded}"
+    print("    ✓ no tool modules, LLM client or LangGraph loaded")
+
+    print("[2] Tools are declared by config and built on first use...")
+    tools = agent.tools
+    assert "search_github_repos" in tools and "sync_linear" in tools and "export_csv" in tools
+    assert "send_instantly" not in tools and "sync_attio" not in tools
+    assert list(tools)[:2] == ["search_github_repos", "extract_people"]
+    assert tools.loaded == [] and "cmo_agent.tools.github" not in sys.modules
+    done = tools["done"]
+    assert tools["done"] is done and tools.loaded == ["done"]
+    assert "cmo_agent.tools.github" not in sys.modules
+    try:
+        tools["send_instantly"]
+        raise AssertionError("disabled tool should not be built")
+    except KeyError:
+        pass
+    agent.toolbelt.register_tool("custom", done)
+    assert "custom" in agent.tools and agent.tools["custom"] is done
+    print(f"    ✓ {len(tools)} tools declared, only {tools.loaded[0]!r} built")
+
+    print("[3] Compiled graph is shared per config hash...")
+    _compiled_graphs.clear()
+    other = CMOAgent({"GITHUB_TOKEN": "t", "LINEAR_API_KEY": "l"})
+    assert agent.graph is other.graph and len(_compiled_graphs) == 1
+    other.config["max_steps"] = 3
+    assert other.graph is not agent.graph and len(_compiled_graphs) == 2
+    print("    ✓ one compile for identical configs, a new one when the config changes")
+
+    print("[4] The shared graph runs the agent passed in the run config...")
+    ran = []
+
+    def fake_step(owner):
+        async def step(state):
+            ran.append(owner)
+            steps = state["counters"]["steps"] + 1
+            return {**state, "counters": {"steps": steps}, "ended": owner == "agent" and steps >= 2}
+        return step
+
+    agent._agent_step = fake_step("agent")
+    other._agent_step = fake_step("other")
+    state = {"job_id": "j", "goal": "g", "counters": {"steps": 0}}
+    final = await agent.graph.ainvoke(state, agent._graph_run_config(10))
+    assert ran == ["agent", "agent"] and final["ended"]
+    ran.clear()
+    final = await other.graph.ainvoke(state, other._graph_run_config(10))
+    assert ran == ["other"] * 3 and final["counters"]["steps"] == 3
+    print("    ✓ nodes dispatch to the calling agent; max_steps comes from its config")
+
+    print("All lazy registry tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
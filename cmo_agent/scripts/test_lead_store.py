@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the keyed LeadStore over RunState leads/candidates:
+- promotion keeps indexes valid inside batch loops (no list.pop index shifting)
+- secondary indexes (has email, email searched, stage) stay in sync
+- the lists keep the same shape for checkpoints/exports
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+project_root = str(Path(__file__).resolve().parents[2])
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from cmo_agent.core.lead_store import LeadStore
+from cmo_agent.tools.export_engine import compute_headers
+
+
+def main() -> int:
+    state = {
+        "candidates": [{"login": f"user{i}x", "from_repo": f"org/repo{i % 3}"} for i in range(10)],
+        "leads": [],
+    }
+    store = LeadStore.from_state(state)
+
+    print("[1] Promoting every other candidate in one batch...")
+    for i in range(0, 10, 2):
+        store.promote(f"user{i}x", {"email": f"user{i}x@example.com"})
+    assert len(state["leads"]) == 5 and len(state["candidates"]) == 5
+    assert {c["login"] for c in state["candidates"]} == {f"user{i}x" for i in range(1, 10, 2)}
+    assert all(store.get_candidate(c["login"]) is c for c in state["candidates"])
+    assert store.count_with_email() == 5
+    print("    ✓ candidates/leads consistent after batch promotion")
+
+    print("[2] Secondary indexes...")
+    store.upsert_candidate({"login": "user1x", "name": "One", "enriched": True})
+    assert store.stage_of("user1x") == LeadStore.STAGE_ENRICHED
+    store.mark_email_searched(["user1x", "user3x"])
+    pairs = store.unsearched_candidate_pairs()
+    assert {p["login"] for p in pairs} == {"user5x", "user7x", "user9x"}
+    store.set_email("user3x", "three@example.com")
+    assert store.stage_of("user3x") == LeadStore.STAGE_LEAD
+    assert store.count_with_email() == 6
+    assert store.stage_counts()[LeadStore.STAGE_LEAD] == 6
+    assert state["email_searched"] == ["user1x", "user3x"]
+    records = state["leads"] + state["candidates"]
+    assert not any(k.startswith("_") for k in compute_headers(records)), compute_headers(records)
+    print("    ✓ has-email / email-searched / stage indexes in sync; no private keys in export headers")
+
+    print("[2b] Work-finding indexes...")
+    store.upsert_lead({"login": "noemail1"})
+    store.upsert_lead({"login": "noemail2", "email": ""})
+    assert [l["login"] for l in store.leads_without_email()] == ["noemail1", "noemail2"]
+    store.set_email("noemail1", "n1@example.com")
+    store.mark_no_email_found("noemail2")
+    assert store.leads_without_email() == [] and state["leads"][-1]["no_email_found"]
+    assert [p["login"] for p in store.unsearched_candidate_pairs(limit=2)] == ["user5x", "user7x"]
+    store.upsert_candidate({"login": "user11x", "from_repo": "org/new"})
+    store.upsert_candidate({"login": "user12x"})
+    store.remove_candidate("user7x")
+    store.mark_email_searched(["user5x"])
+    assert [p["login"] for p in store.unsearched_candidate_pairs()] == ["user9x", "user11x"]
+    assert store.unsearched_candidate_pairs(limit=1) == [{"login": "user9x", "repo_full_name": "org/repo0"}]
+    store.upsert_candidate({"login": "user12x", "from_repo": "org/late"})
+    store.promote("user9x")
+    assert [l["login"] for l in store.leads_without_email()] == ["user9x"]
+    assert [p["login"] for p in store.unsearched_candidate_pairs()] == ["user11x", "user12x"]
+    pairs = store.unsearched_candidate_pairs()
+    print("    ✓ leads-without-email and unsearched-candidate indexes follow every mutation")
+
+    print("[3] Serialized shape and rebinding...")
+    payload = json.loads(json.dumps(store.to_lists()))
+    assert isinstance(payload["leads"], list) and isinstance(payload["candidates"], list)
+    assert store.is_bound_to(state)
+    state["leads"] = list(state["leads"])
+    assert not store.is_bound_to(state)
+    rebuilt = LeadStore.from_state(state)
+    assert rebuilt.email_searched("user3x") and rebuilt.count_with_email() == 7
+    assert sorted(rebuilt.unsearched_candidate_pairs(), key=str) == sorted(pairs, key=str)
+    assert rebuilt.leads_without_email() == store.leads_without_email()
+    print("    ✓ lists serialize as-is; replaced lists are detected and re-indexed")
+
+    print("[4] Batch reduction cost does not grow with total leads...")
+    big = {"candidates": [{"login": f"c{i}", "from_repo": "o/r"} for i in range(200_000)], "leads": []}
+    big_store = LeadStore.from_state(big)
+    started = time.perf_counter()
+    for i in range(0, 2_000, 2):
+        big_store.promote(f"c{i}", {"email": f"c{i}@example.com"})
+    elapsed = time.perf_counter() - started
+    assert len(big["leads"]) == 1_000 and len(big["candidates"]) == 199_000
+    print(f"    ✓ 1,000 promotions over 200k candidates in {elapsed * 1000:.1f}ms")
+
+    print("All LeadStore tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed LLM response cache:
+- keys are stable across jobs (job ids / timestamps masked) and change with tools/model
+- TTL expiry and entry/byte-bounded LRU eviction
+- record a scripted agent run, then replay the whole agent loop offline and
+  report per-step overhead with the LLM out of the picture
+"""
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = str(Path(__file__).resolve().parents[2])
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from cmo_agent.agents.cmo_agent import CMOAgent
+from cmo_agent.core.llm_cache import (
+    CachedLLM, LLMReplayMiss, LLMResponseCache, make_cache_key, wrap_llm_with_cache,
+)
+from cmo_agent.core.state import JobMetadata, RunState
+from cmo_agent.tools.base import ToolResult
+
+SCRIPT = [
+    ("search_github_repos", {"q": "language:python topic:pytest"}),
+    ("extract_people", {}),
+    ("enrich_github_users", {}),
+    ("find_commit_emails_batch", {}),
+    ("export_csv", {}),
+    ("done", {"summary": "Completed"}),
+]
+LLM_LATENCY = 0.02
+
+
+class ScriptedLLM:
+    """Stands in for the tool-bound chat model; picks the next tool from the tool summaries seen so far"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        await asyncio.sleep(LLM_LATENCY)
+        names = tuple(f"{name}:" for name, _ in SCRIPT)
+        done_tools = sum(1 for m in messages if str(getattr(m, "content", "")).startswith(names))
+        name, args = SCRIPT[min(done_tools, len(SCRIPT) - 1)]
+        return type("Resp", (), {"content": "", "tool_calls": [{"name": name, "args": dict(args), "id": f"call_{self.calls}"}]})()
+
+
+class FakeTool:
+    def __init__(self, handler):
+        self.handler = handler
+
+    async def execute(self, **kwargs):
+        return ToolResult(True, data=self.handler(**kwargs))
+
+
+def _offline_tools():
+    return {
+        "search_github_repos": FakeTool(lambda q=None, **kw: {"repos": [{"full_name": f"org/repo{i}", "name": f"repo{i}"} for i in range(5)]}),
+        "extract_people": FakeTool(lambda repos=None, **kw: {"candidates": [
+            {"login": f"{r['name']}-dev{j}", "from_repo": r["full_name"]} for r in (repos or []) for j in range(3)
+        ]}),
+        "enrich_github_users": FakeTool(lambda logins=None, **kw: {"profiles": [{"login": l} for l in (logins or [])]}),
+        "find_commit_emails_batch": FakeTool(lambda user_repo_pairs=None, **kw: {"user_emails": {
+            p["login"]: {"emails": [f"{p['login']}@example.com"]} for p in (user_repo_pairs or [])
+        }}),
+        "export_csv": FakeTool(lambda rows=None, path=None, **kw: {"path": path, "count": len(rows or [])}),
+        "done": FakeTool(lambda summary=None, **kw: {"completed_at": "now"}),
+    }
+
+
+async def _run_agent_loop(cache_config, llm=None, max_steps=20):
+    agent = CMOAgent({"llm_cache": cache_config, "features": {"enable_auto_progress": False}})
+    agent.tools = _offline_tools()
+    agent.toolbelt = None
+    if llm is not None:
+        agent.llm = wrap_llm_with_cache(llm, "gpt-4o-mini", agent._create_tool_schemas(), cache_config)
+    meta = JobMetadata("Find pytest maintainers", "tester")
+    state = RunState(**meta.to_dict(), counters={"steps": 0}, repos=[], candidates=[], leads=[], history=[])
+    started = time.perf_counter()
+    while not state.get("ended") and state["counters"]["steps"] < max_steps:
+        state = await agent._agent_step(state)
+    return agent, state, time.perf_counter() - started
+
+
+async def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        print("[1] Cache keys...")
+        msgs_a = [{"role": "system", "content": "job cmo-20250101-101010-123456-abcdef at 2025-01-01T10:10:10.5"}]
+        msgs_b = [{"role": "system", "content": "job cmo-20260202-202020-654321-fedcba at 2026-02-02T20:20:20"}]
+        assert make_cache_key("m", msgs_a) == make_cache_key("m", msgs_b)
+        assert make_cache_key("m", msgs_a) != make_cache_key("other", msgs_a)
+        assert make_cache_key("m", msgs_a) != make_cache_key("m", msgs_a, [{"name": "done"}])
+        print("    ✓ job ids/timestamps masked; model and tool schemas are part of the key")
+
+        print("[2] TTL and eviction...")
+        cache = LLMResponseCache(f"{tmp}/evict", ttl_seconds=0, max_entries=3)
+        for i in range(5):
+            cache.put(f"k{i}", {"content": str(i), "tool_calls": []})
+        assert len(cache) == 3 and cache.get("k0") is None and cache.get("k4")["content"] == "4"
+        assert cache.stats["evicted"] == 2
+        sized = LLMResponseCache(f"{tmp}/bytes", max_bytes=400)
+        for i in range(10):
+            sized.put(f"k{i}", {"content": "x" * 100, "tool_calls": []})
+        assert sized._total_bytes <= 400 and sized.get("k9") is not None
+        expiring = LLMResponseCache(f"{tmp}/ttl", ttl_seconds=0.01)
+        expiring.put("k", {"content": "old", "tool_calls": []})
+        time.sleep(0.02)
+        assert expiring.get("k") is None and expiring.stats["expired"] == 1
+        reopened = LLMResponseCache(f"{tmp}/evict", max_entries=3)
+        assert len(reopened) == 3
+        print("    ✓ LRU bounded by entries and bytes; expired entries dropped; index reloads from disk")
+
+        print("[3] Record, then replay the agent loop offline...")
+        cache_dir = f"{tmp}/agent"
+        llm = ScriptedLLM()
+        _, recorded, record_secs = await _run_agent_loop({"mode": "record", "cache_dir": cache_dir}, llm=llm)
+        assert recorded.get("end_reason") == "done", recorded.get("errors")
+        assert len(recorded["leads"]) == 15
+
+        offline = ScriptedLLM()
+        agent, replayed, replay_secs = await _run_agent_loop({"mode": "replay", "cache_dir": cache_dir}, llm=offline)
+        stats = agent.llm.get_stats()
+        assert offline.calls == 0, "replay must not call the LLM"
+        assert stats["hits"] == llm.calls and stats["misses"] == 0
+        assert replayed.get("end_reason") == "done" and len(replayed["leads"]) == len(recorded["leads"])
+        steps = replayed["counters"]["steps"]
+        print(f"    ✓ record: {record_secs / steps * 1000:.1f}ms/step, replay: {replay_secs / steps * 1000:.1f}ms/step "
+              f"({steps} steps, {stats['hits']} cache hits, 0 LLM calls)")
+
+        print("[4] Replay miss...")
+        empty = CachedLLM(ScriptedLLM(), "m", [], LLMResponseCache(f"{tmp}/empty"), mode="replay")
+        try:
+            await empty.ainvoke([{"role": "human", "content": "unseen"}])
+            raise AssertionError("expected LLMReplayMiss")
+        except LLMReplayMiss:
+            pass
+        print("    ✓ replay misses raise instead of calling the LLM")
+
+    print("All LLM cache tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Offline test for the streaming pipeline execution mode:
+- LLM is called once (query planning only)
+- repos → candidates → leads flow through every stage with bounded queues
+- progress callbacks fire for each tool call
+"""
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+project_root = str(Path(__file__).resolve().parents[2])
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from cmo_agent.agents.cmo_agent import CMOAgent
+from cmo_agent.agents.pipeline import StreamingPipeline
+from cmo_agent.core.state import JobMetadata, RunState
+from cmo_agent.tools.base import ToolResult
+
+N_REPOS = 30
+AUTHORS_PER_REPO = 4
+
+
+class FakeLLM:
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return type("Resp", (), {
+            "content": "",
+            "tool_calls": [{"name": "search_github_repos", "args": {"q": "language:python topic:pytest"}}],
+        })()
+
+
+class FakeTool:
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = 0
+
+    async def execute(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return ToolResult(True, data=self.handler(**kwargs))
+
+
+def _search(q, **kwargs):
+    return {"repos": [{"full_name": f"org/repo{i}", "name": f"repo{i}"} for i in range(N_REPOS)]}
+
+
+def _extract(repos, top_authors_per_repo=5, **kwargs):
+    return {"candidates": [
+        {"login": f"{r['name']}-dev{j}", "from_repo": r["full_name"]}
+        for r in repos for j in range(AUTHORS_PER_REPO)
+    ]}
+
+
+def _enrich(logins, **kwargs):
+    # Every other user has a public profile email
+    return {"profiles": [
+        {"login": l, "email": f"{l}@example.com" if i % 2 == 0 else None}
+        for i, l in enumerate(logins)
+    ]}
+
+
+def _emails(user_repo_pairs, **kwargs):
+    return {"user_emails": {p["login"]: {"emails": [f"{p['login']}@commits.dev"]} for p in user_repo_pairs}}
+
+
+def _directories(tmp: Path) -> dict:
+    # Keep checkpoints, catalog and log/export files out of the working tree
+    return {name: str(tmp / name) for name in ("checkpoints", "logs", "exports")}
+
+
+async def main() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        return await _run(Path(tmp))
+
+
+async def _run(tmp: Path) -> int:
+    agent = CMOAgent({"execution_mode": "pipeline", "pipeline": {"queue_size": 2, "repo_batch_size": 5},
+                      "directories": _directories(tmp)})
+    agent.llm = FakeLLM()
+    tools = {
+        "search_github_repos": FakeTool(_search),
+        "extract_people": FakeTool(_extract),
+        "enrich_github_users": FakeTool(_enrich),
+        "find_commit_emails_batch": FakeTool(_emails),
+        "export_csv": FakeTool(lambda rows, path, **kw: {"path": path, "count": len(rows)}),
+        "done": FakeTool(lambda summary, **kw: {"completed_at": "now"}),
+    }
+    agent.tools = tools
+    agent.config["job_config"] = {"checkpoints": {"time_interval": 10 ** 9, "enable_stage": False}}
+
+    progress = []
+
+    async def on_progress(info):
+        progress.append(info)
+
+    meta = JobMetadata("Find pytest maintainers", "tester")
+    state = RunState(**meta.to_dict(), counters={"steps": 0}, repos=[], candidates=[], leads=[])
+
+    print("[1] Running pipeline...")
+    pipeline = StreamingPipeline(agent, progress_callback=on_progress)
+    final_state = await pipeline.run(state)
+
+    total_people = N_REPOS * AUTHORS_PER_REPO
+    assert agent.llm.calls == 1, f"LLM should be called once, got {agent.llm.calls}"
+    assert len(final_state["leads"]) == total_people, f"expected {total_people} leads, got {len(final_state['leads'])}"
+    assert all(l.get("email") for l in final_state["leads"]), "every lead should have an email"
+    assert final_state["ended"] and final_state["current_stage"] == "completed"
+    assert tools["extract_people"].calls == N_REPOS // 5
+    assert tools["find_commit_emails_batch"].calls >= 1
+    assert len(progress) == final_state["counters"]["steps"]
+    print(f"    ✓ {len(final_state['leads'])} leads, {final_state['counters']['steps']} tool calls, 1 LLM call")
+    print(f"    ✓ stage stats: {final_state['reports']['pipeline']}")
+
+    print("[2] Pause stops the pipeline and keeps state for resume...")
+    agent2 = CMOAgent({"execution_mode": "pipeline", "directories": _directories(tmp)})
+    agent2.llm = FakeLLM()
+    agent2.tools = dict(tools)
+    meta2 = JobMetadata("Pause me", "tester")
+    agent2.request_pause(meta2.job_id)
+    state2 = RunState(**meta2.to_dict(), counters={"steps": 0}, repos=[], candidates=[], leads=[])
+    pipeline2 = StreamingPipeline(agent2)
+    await pipeline2.run(state2)
+    assert pipeline2.paused
+    assert agent2.get_job_state(meta2.job_id) is not None
+    print("    ✓ paused")
+
+    print("All pipeline mode tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for RenderCopy template caching and batch rendering:
+- campaign templates compile once per instance (keyed by template hash)
+- render_many returns the same per-lead shapes as execute, and isolates bad leads
+- the pipeline personalization stage renders queued leads in batches
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = str(Path(__file__).resolve().parents[2])
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from cmo_agent.tools.personalization import RenderCopy
+
+CAMPAIGN = {
+    "id": "camp1",
+    "seq_id": "seq-42",
+    "subject_template": "{{first_name}}, a fix for {{repo}}",
+    "body_template": "Hi {{first_name}},\n{{why_now}}\n{{unsub_link}}",
+    "unsub_link": "https://example.com/u",
+}
+
+
+def _lead(i):
+    return {"login": f"dev{i}", "name": f"Dev Person{i}", "email": f"dev{i}@example.com",
+            "primary_repo": f"org/repo{i}", "company": "Acme" if i % 2 else None}
+
+
+async def main() -> int:
+    tool = RenderCopy()
+
+    print("[1] Templates compile once per campaign...")
+    for i in range(20):
+        result = await tool.execute(lead=_lead(i), campaign=CAMPAIGN)
+        assert result.success, result.error
+    assert tool.template_cache_stats["misses"] == 2, tool.template_cache_stats
+    assert tool.template_cache_stats["hits"] == 38
+    changed = dict(CAMPAIGN, subject_template="New subject for {{repo}}")
+    assert (await tool.execute(lead=_lead(0), campaign=changed)).data["subject"] == "New subject for org/repo0"
+    assert tool.template_cache_stats["misses"] == 3
+    print("    ✓ 2 compilations for 20 leads; edited template recompiled")
+
+    print("[2] render_many matches execute per lead...")
+    leads = [_lead(i) for i in range(10)]
+    batch = tool.render_many(leads, CAMPAIGN)
+    assert batch.success and batch.data["rendered"] == 10 and not batch.data["failed"]
+    for lead, rendered in zip(leads, batch.data["results"]):
+        single = (await tool.execute(lead=lead, campaign=CAMPAIGN)).data
+        assert rendered == single
+    first = batch.data["results"][1]
+    assert first["email_payload"] == {
+        "recipient": "dev1@example.com", "subject": "Dev, a fix for org/repo1",
+        "body_text": first["body"], "sequence_id": "seq-42", "schedule_at": "",
+    }
+    assert first["instantly_contact"]["last_name"] == "Person1" and first["instantly_contact"]["company"] == "Acme"
+    via_execute = await tool.execute(leads=leads, campaign=CAMPAIGN)
+    assert via_execute.data["results"] == batch.data["results"]
+    print("    ✓ identical email_payload / instantly_contact shapes, also via execute(leads=...)")
+
+    print("[3] Bad leads are reported, not fatal...")
+    mixed = tool.render_many([_lead(1), None, _lead(2)], CAMPAIGN)
+    assert mixed.success and mixed.data["rendered"] == 2
+    assert [f["index"] for f in mixed.data["failed"]] == [1]
+    assert not tool.render_many([None], CAMPAIGN).success
+    assert tool.render_many([], CAMPAIGN).success
+    broken = tool.render_many(leads, dict(CAMPAIGN, body_template="{% if %}"))
+    assert not broken.success and broken.error
+    print("    ✓ per-lead failures listed; template syntax errors fail the batch")
+
+    print("[4] Pipeline personalization stage batches queued leads...")
+    from cmo_agent.agents.pipeline import StreamingPipeline, _END
+
+    calls = []
+
+    class FakeAgent:
+        config = {"pipeline": {"copy_batch_size": 4}}
+
+    pipeline = StreamingPipeline(FakeAgent())
+    pipeline.stage_stats["personalization"] = {"calls": 0, "items_in": 0, "items_out": 0, "seconds": 0.0}
+
+    async def fake_call_tool(state, stage, tool_name, **args):
+        calls.append(len(args["leads"]))
+        return tool.render_many(args["leads"], CAMPAIGN)
+
+    pipeline._call_tool = fake_call_tool
+    copy_q: asyncio.Queue = asyncio.Queue()
+    for i in range(10):
+        copy_q.put_nowait(_lead(i))
+    copy_q.put_nowait(_END)
+    await pipeline._personalize({}, copy_q)
+    assert calls == [4, 4, 2], calls
+    assert pipeline.stage_stats["personalization"]["items_out"] == 10
+    print(f"    ✓ 10 queued leads rendered in {len(calls)} calls")
+
+    print("All RenderCopy tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
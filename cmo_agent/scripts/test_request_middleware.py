@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the pure-ASGI RequestLogMiddleware:
+- per-route latency histograms and status counts keyed by route template
+- streaming responses pass through unchanged, chunk by chunk
+- errors are counted as 500 and re-raised; sampling keeps logs bounded
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+project_root = str(Path(__file__).resolve().parents[2])
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from cmo_agent.middleware import RequestLogMiddleware
+from cmo_agent.obs.http_metrics import RequestMetrics
+
+
+class _Route:
+    def __init__(self, path):
+        self.path = path
+
+
+async def _app(scope, receive, send):
+    """Tiny router: sets scope['route'] like Starlette and serves three endpoints"""
+    path = scope["path"]
+    if path.startswith("/api/jobs/") and path.endswith("/events"):
+        scope["route"] = _Route("/api/jobs/{job_id}/events")
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/event-stream")]})
+        for i in range(3):
+            await send({"type": "http.response.body", "body": f"data: {i}\n\n".encode(), "more_body": True})
+            await asyncio.sleep(0.01)
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+    elif path.startswith("/api/jobs/"):
+        scope["route"] = _Route("/api/jobs/{job_id}")
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+    elif path == "/boom":
+        scope["route"] = _Route("/boom")
+        raise RuntimeError("boom")
+    else:
+        await send({"type": "http.response.start", "status": 404, "headers": []})
+        await send({"type": "http.response.body", "body": b"not found"})
+
+
+async def _request(mw, path):
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "headers": [(b"x-request-id", b"req-1")]}
+    await mw(scope, receive, send)
+    return sent
+
+
+async def main() -> int:
+    metrics = RequestMetrics()
+    mw = RequestLogMiddleware(_app, sample_rate=0.0, metrics=metrics)
+
+    print("[1] Route-template histograms...")
+    for i in range(20):
+        await _request(mw, f"/api/jobs/job-{i}")
+    await _request(mw, "/random/scan/path")
+    snap = metrics.snapshot()
+    routes = {(r["method"], r["route"]): r for r in snap["routes"]}
+    assert ("GET", "/api/jobs/{job_id}") in routes and routes[("GET", "/api/jobs/{job_id}")]["count"] == 20
+    assert ("GET", "unmatched") in routes, "raw paths must not become labels"
+    assert routes[("GET", "/api/jobs/{job_id}")]["buckets"][-1] == ("+Inf", 20)
+    assert metrics.quantile("GET", "/api/jobs/{job_id}", 0.95) is not None
+    print(f"    ✓ {len(snap['routes'])} route series for 21 requests")
+
+    print("[2] Streaming passthrough...")
+    sent = await _request(mw, "/api/jobs/abc/events")
+    bodies = [m["body"] for m in sent if m["type"] == "http.response.body"]
+    assert bodies == [b"data: 0\n\n", b"data: 1\n\n", b"data: 2\n\n", b""]
+    assert all(m.get("more_body") for m in sent[1:4])
+    sse = next(r for r in metrics.snapshot()["routes"] if r["route"] == "/api/jobs/{job_id}/events")
+    assert sse["sum"] < 0.02, "latency should be time to response start, not stream lifetime"
+    print("    ✓ chunks forwarded unchanged; latency measured to response start")
+
+    print("[3] Errors and status counts...")
+    try:
+        await _request(mw, "/boom")
+        raise AssertionError("exception swallowed")
+    except RuntimeError:
+        pass
+    statuses = {(s["route"], s["status"]): s["count"] for s in metrics.snapshot()["statuses"]}
+    assert statuses[("/boom", 500)] == 1 and statuses[("unmatched", 404)] == 1
+    print("    ✓ exception counted as 500 and re-raised")
+
+    print("[4] Sampled logging...")
+    logged = []
+    import cmo_agent.middleware as middleware_module
+    original_log = middleware_module.log
+
+    class _Capture:
+        def info(self, msg, **kwargs):
+            logged.append(kwargs)
+
+    middleware_module.log = _Capture()
+    try:
+        sampled = RequestLogMiddleware(_app, sample_rate=0.1, metrics=RequestMetrics())
+        for i in range(1000):
+            await _request(sampled, f"/api/jobs/j{i}")
+        try:
+            await _request(sampled, "/boom")
+        except RuntimeError:
+            pass
+    finally:
+        middleware_module.log = original_log
+    assert 30 < len(logged) < 200, len(logged)
+    assert logged[-1]["status"] == 500, "errors are always logged"
+    print(f"    ✓ {len(logged)} log lines for 1001 requests (one line per logged request)")
+
+    print("All request middleware tests passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
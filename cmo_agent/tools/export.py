@@ -1,15 +1,11 @@
 """
 Export and finalization tools
 """
-import csv
-import json
 import logging
 import sys
 import os
 from pathlib import Path
 from typing import Dict, Any, List, Iterable, Sequence, Optional
-import asyncio
-from tempfile import NamedTemporaryFile
 
 # Add current directory to path for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -21,7 +17,15 @@ if current_dir not in sys.path:
 
 try:
     from .base import BaseTool, ToolResult
+    from .export_engine import (
+        EXPORT_FORMATS, DEFAULT_CHUNK_SIZE, DEFAULT_SAMPLE_SIZE, RowSource,
+        compute_headers, coerce_row, infer_format, stream_export,
+    )
 except ImportError:
+    from export_engine import (
+        EXPORT_FORMATS, DEFAULT_CHUNK_SIZE, DEFAULT_SAMPLE_SIZE, RowSource,
+        compute_headers, coerce_row, infer_format, stream_export,
+    )
     try:
         from base import BaseTool, ToolResult
     except ImportError:
@@ -64,14 +68,21 @@ class ExportCSV(BaseTool):
 
     async def execute(
         self,
-        rows: List[Dict[str, Any]],
+        rows: RowSource,
         path: str,
         **kwargs,
     ) -> ToolResult:
-        """Export data to CSV with safe paths and atomic write.
+        """Export data to CSV/JSONL/Parquet with safe paths and atomic write.
+
+        `rows` may be a list, any iterable, or an async iterator; rows are streamed
+        to disk in chunks from a single writer thread.
 
         kwargs supports optional keys:
+        - format: "csv" | "jsonl" | "parquet" (default inferred from path suffix, else csv)
+        - fields: Sequence[str] declared schema (skips sampling)
         - field_order: Sequence[str]
+        - sample_size: int rows sampled for headers when rows is not a list
+        - chunk_size: int rows per write
         - include_bom: bool
         - allow_overwrite: bool
         - newline: str
@@ -81,7 +92,7 @@ class ExportCSV(BaseTool):
         """
         try:
             dry_run: bool = bool(kwargs.get("dry_run", False))
-            if not rows:
+            if rows is None or (isinstance(rows, (list, tuple)) and not rows):
                 return ToolResult(success=False, error="No data to export")
 
             # Resolve destination within export root and guard traversal
@@ -96,70 +107,55 @@ class ExportCSV(BaseTool):
             except ValueError:
                 return ToolResult(success=False, error=f"Illegal export path outside base dir: {dest}")
 
-            # Compute headers deterministically, honoring optional field_order
-            headers = self._compute_headers(rows, kwargs.get("field_order"))
+            fmt = infer_format(dest, kwargs.get("format"))
+            if fmt not in EXPORT_FORMATS:
+                return ToolResult(success=False, error=f"Unsupported export format: {fmt}")
+
+            allow_overwrite = bool(kwargs.get("allow_overwrite", True))
+            if not dry_run and dest.exists() and not allow_overwrite:
+                return ToolResult(success=False, error=f"File already exists: {dest}")
+
+            options = {k: kwargs[k] for k in ("include_bom", "newline", "quoting", "dialect", "extrasaction", "compression") if k in kwargs}
+            written = await stream_export(
+                rows,
+                dest,
+                fmt=fmt,
+                fields=kwargs.get("fields"),
+                field_order=kwargs.get("field_order"),
+                sample_size=int(kwargs.get("sample_size", DEFAULT_SAMPLE_SIZE)),
+                chunk_size=int(kwargs.get("chunk_size", DEFAULT_CHUNK_SIZE)),
+                dry_run=dry_run,
+                **options,
+            )
+            if not written["count"]:
+                return ToolResult(success=False, error="No data to export")
 
             if dry_run:
                 # Simulate export in dry-run
                 result_data = {
                     "path": str(dest),
-                    "count": len(rows),
-                    "headers": headers,
+                    "count": written["count"],
+                    "headers": written["headers"],
+                    "format": fmt,
                     "file_size_bytes": 0,
                     "file_size_mb": 0.0,
                     "status": "dry_run",
                 }
                 return ToolResult(success=True, data=result_data)
-            else:
-                # Atomic write via temp file then replace
-                include_bom = bool(kwargs.get("include_bom", False))
-                encoding = "utf-8-sig" if include_bom else "utf-8"
-                newline = kwargs.get("newline", "")
-                quoting = int(kwargs.get("quoting", csv.QUOTE_MINIMAL))
-                dialect = kwargs.get("dialect")
-                extrasaction = kwargs.get("extrasaction", "ignore")
-                allow_overwrite = bool(kwargs.get("allow_overwrite", True))
-
-                if dest.exists() and not allow_overwrite:
-                    return ToolResult(success=False, error=f"File already exists: {dest}")
-
-                async def _write_file():
-                    from contextlib import suppress
-                    mode_kwargs = dict(newline=newline, encoding=encoding)
-                    with NamedTemporaryFile("w", delete=False, dir=base, suffix=".tmp") as tf:
-                        tmp_path = Path(tf.name)
-                    try:
-                        with tmp_path.open("w", **mode_kwargs) as f:
-                            if dialect:
-                                writer = csv.DictWriter(f, fieldnames=headers, dialect=dialect, extrasaction=extrasaction)
-                            else:
-                                writer = csv.DictWriter(f, fieldnames=headers, quoting=quoting, extrasaction=extrasaction)
-                            writer.writeheader()
-                            for r in rows:
-                                writer.writerow(self._coerce_row(r, headers))
-                        os.replace(tmp_path, dest)
-                    except Exception:
-                        with suppress(FileNotFoundError):
-                            try:
-                                tmp_path.unlink(missing_ok=True)
-                            except TypeError:
-                                # py<3.8 compatibility
-                                if tmp_path.exists():
-                                    tmp_path.unlink()
-                        raise
-
-                await asyncio.to_thread(lambda: asyncio.run(_write_file()))
 
             # Get file stats
             file_stats = dest.stat()
 
             result_data = {
                 "path": str(dest),
-                "count": len(rows),
-                "headers": headers,
+                "count": written["count"],
+                "headers": written["headers"],
+                "format": fmt,
                 "file_size_bytes": file_stats.st_size,
                 "file_size_mb": round(file_stats.st_size / (1024 * 1024), 2),
             }
+            if written["unsampled_fields"]:
+                result_data["unsampled_fields"] = written["unsampled_fields"]
 
             return ToolResult(success=True, data=result_data)
 
@@ -171,28 +167,11 @@ class ExportCSV(BaseTool):
     def _compute_headers(rows: Iterable[Dict[str, Any]], field_order: Optional[Sequence[str]]) -> List[str]:
         if not rows:
             return []
-        all_keys = set()
-        for r in rows:
-            if isinstance(r, dict):
-                all_keys.update(r.keys())
-        if field_order:
-            ordered = [k for k in field_order if k in all_keys]
-            tail = sorted(all_keys - set(ordered))
-            return ordered + tail
-        return sorted(all_keys)
+        return compute_headers(rows, field_order)
 
     @staticmethod
     def _coerce_row(r: Dict[str, Any], headers: Sequence[str]) -> Dict[str, Any]:
-        out: Dict[str, Any] = {}
-        for h in headers:
-            v = r.get(h)
-            if v is None:
-                out[h] = ""
-            elif isinstance(v, (str, int, float, bool)):
-                out[h] = v
-            else:
-                out[h] = str(v)
-        return out
+        return coerce_row(r, headers)
 
 
 class Done(BaseTool):
@@ -0,0 +1,237 @@
+"""
+Streaming export engine used by ExportCSV
+
+Rows can come from a list, any iterable, or an async iterator. Columns come from a
+declared schema (`fields`) or are sampled from the first rows; rows are then
+written in chunks by a single dedicated worker thread while the event loop keeps
+producing the next chunk, so memory stays flat at roughly one chunk in flight.
+
+Formats: csv (default), jsonl, and parquet (requires pyarrow).
+"""
+import asyncio
+import csv
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Dict, Any, List, Iterable, Sequence, Optional, AsyncIterator, Union
+
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_SAMPLE_SIZE = 1000
+
+RowSource = Union[Iterable[Dict[str, Any]], AsyncIterator[Dict[str, Any]]]
+
+
+def infer_format(path: Union[str, Path], explicit: Optional[str] = None) -> str:
+    """Pick the export format from an explicit value or the file suffix"""
+    if explicit:
+        fmt = explicit.lower().lstrip(".")
+    else:
+        suffix = Path(path).suffix.lower().lstrip(".")
+        fmt = {"ndjson": "jsonl", "pq": "parquet"}.get(suffix, suffix)
+    if fmt not in EXPORT_FORMATS:
+        return "csv" if not explicit else fmt
+    return fmt
+
+
+async def aiter_rows(source: RowSource) -> AsyncIterator[Dict[str, Any]]:
+    """Normalize lists, iterables and async iterators into one async iterator"""
+    if source is None:
+        return
+    if hasattr(source, "__aiter__"):
+        async for row in source:
+            yield row
+    else:
+        for row in source:
+            yield row
+
+
+def compute_headers(rows: Iterable[Dict[str, Any]], field_order: Optional[Sequence[str]] = None) -> List[str]:
+    """Union of keys across rows; field_order first, the rest sorted"""
+    all_keys = set()
+    for r in rows:
+        if isinstance(r, dict):
+            all_keys.update(r.keys())
+    if field_order:
+        ordered = [k for k in field_order if k in all_keys]
+        tail = sorted(all_keys - set(ordered))
+        return ordered + tail
+    return sorted(all_keys)
+
+
+def coerce_value(v: Any) -> Any:
+    if v is None:
+        return ""
+    if isinstance(v, (str, int, float, bool)):
+        return v
+    return str(v)
+
+
+def coerce_row(r: Dict[str, Any], headers: Sequence[str]) -> Dict[str, Any]:
+    return {h: coerce_value(r.get(h)) for h in headers}
+
+
+class _CSVSink:
+    def __init__(self, path: Path, headers: List[str], options: Dict[str, Any]):
+        include_bom = bool(options.get("include_bom", False))
+        self._f = path.open("w", newline=options.get("newline", ""), encoding="utf-8-sig" if include_bom else "utf-8")
+        extrasaction = options.get("extrasaction", "ignore")
+        if options.get("dialect"):
+            self._writer = csv.DictWriter(self._f, fieldnames=headers, dialect=options["dialect"], extrasaction=extrasaction)
+        else:
+            quoting = int(options.get("quoting", csv.QUOTE_MINIMAL))
+            self._writer = csv.DictWriter(self._f, fieldnames=headers, quoting=quoting, extrasaction=extrasaction)
+        self._headers = headers
+        self._writer.writeheader()
+
+    def write(self, rows: List[Dict[str, Any]]):
+        self._writer.writerows(coerce_row(r, self._headers) for r in rows)
+
+    def close(self):
+        self._f.close()
+
+
+class _JSONLSink:
+    def __init__(self, path: Path, headers: List[str], options: Dict[str, Any]):
+        self._f = path.open("w", encoding="utf-8")
+        self._headers = headers
+
+    def write(self, rows: List[Dict[str, Any]]):
+        self._f.writelines(
+            json.dumps({h: r.get(h) for h in self._headers}, ensure_ascii=False, default=str) + "\n" for r in rows
+        )
+
+    def close(self):
+        self._f.close()
+
+
+class _ParquetSink:
+    def __init__(self, path: Path, headers: List[str], options: Dict[str, Any]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+        self._pa = pa
+        self._headers = headers
+        # All columns as strings: schema stays stable across chunks regardless of per-row types
+        self._schema = pa.schema([(h, pa.string()) for h in headers])
+        self._writer = pq.ParquetWriter(str(path), self._schema, compression=options.get("compression", "snappy"))
+
+    def write(self, rows: List[Dict[str, Any]]):
+        columns = {h: [] for h in self._headers}
+        for r in rows:
+            for h in self._headers:
+                v = r.get(h)
+                columns[h].append(None if v is None else str(v))
+        self._writer.write_table(self._pa.Table.from_pydict(columns, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+_SINKS = {"csv": _CSVSink, "jsonl": _JSONLSink, "parquet": _ParquetSink}
+
+
+async def stream_export(
+    rows: RowSource,
+    dest: Path,
+    fmt: str = "csv",
+    fields: Optional[Sequence[str]] = None,
+    field_order: Optional[Sequence[str]] = None,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dry_run: bool = False,
+    **options,
+) -> Dict[str, Any]:
+    """Stream rows into dest atomically; returns count, headers and dropped-column info.
+
+    Lists are sampled in full (headers identical to a whole-list scan); other sources
+    sample the first `sample_size` rows. Keys first seen after sampling are not added
+    as columns and are reported in `unsampled_fields`.
+    """
+    if fmt not in _SINKS:
+        raise ValueError(f"Unsupported export format '{fmt}', expected one of {EXPORT_FORMATS}")
+
+    iterator = aiter_rows(rows).__aiter__()
+    if fields:
+        limit = 1  # only peek to detect an empty source
+    elif isinstance(rows, (list, tuple)):
+        limit = len(rows)
+    else:
+        limit = max(1, sample_size)
+    sample: List[Dict[str, Any]] = []
+    async for row in iterator:
+        sample.append(row)
+        if len(sample) >= limit:
+            break
+    if not sample:
+        return {"count": 0, "headers": [], "unsampled_fields": []}
+    headers = list(fields) if fields else compute_headers(sample, field_order)
+
+    if dry_run:
+        count = len(sample)
+        async for _ in iterator:
+            count += 1
+        return {"count": count, "headers": headers, "unsampled_fields": []}
+
+    base = dest.parent
+    with NamedTemporaryFile("w", delete=False, dir=base, suffix=".tmp") as tf:
+        tmp_path = Path(tf.name)
+
+    header_set = set(headers)
+    unsampled = set()
+    count = 0
+    loop = asyncio.get_running_loop()
+    # One worker thread owns the file; at most one chunk is being written while the next is built
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export-writer")
+    pending = None
+    sink = None
+    try:
+        sink = await loop.run_in_executor(executor, _SINKS[fmt], tmp_path, headers, options)
+
+        async def _submit(chunk):
+            nonlocal pending
+            if pending is not None:
+                await pending
+            pending = loop.run_in_executor(executor, sink.write, chunk)
+
+        chunk = [r for r in sample if isinstance(r, dict)]
+        count += len(chunk)
+        sample = None
+        if len(chunk) >= chunk_size:
+            await _submit(chunk)
+            chunk = []
+        async for row in iterator:
+            if not isinstance(row, dict):
+                continue
+            if not fields and not header_set.issuperset(row.keys()):
+                unsampled.update(k for k in row.keys() if k not in header_set)
+            chunk.append(row)
+            count += 1
+            if len(chunk) >= chunk_size:
+                await _submit(chunk)
+                chunk = []
+        if chunk:
+            await _submit(chunk)
+        if pending is not None:
+            await pending
+        await loop.run_in_executor(executor, sink.close)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        if pending is not None:
+            with suppress(BaseException):
+                await pending
+        if sink is not None:
+            with suppress(Exception):
+                sink.close()
+        with suppress(FileNotFoundError):
+            tmp_path.unlink()
+        raise
+    finally:
+        executor.shutdown(wait=False)
+
+    return {"count": count, "headers": headers, "unsampled_fields": sorted(unsampled)}
@@ -1,8 +1,10 @@
 """
 Personalization and sending tools
 """
+import hashlib
 import logging
 import os
+from collections import OrderedDict
 import jinja2
 from typing import Dict, Any, List, Optional, Tuple
 
@@ -45,6 +47,9 @@ logger = logging.getLogger(__name__)
 class RenderCopy(BaseTool):
     """Copy rendering and personalization tool"""
 
+    # Compiled templates kept per tool instance (campaigns rarely use more than a handful)
+    TEMPLATE_CACHE_SIZE = 256
+
     def __init__(self):
         super().__init__(
             name="render_copy",
@@ -59,72 +64,131 @@ class RenderCopy(BaseTool):
             trim_blocks=True,
             lstrip_blocks=True
         )
-
-    async def execute(self, lead: Dict[str, Any], campaign: Dict[str, Any] = None, **kwargs) -> ToolResult:
-        """Render personalized copy"""
+        # sha1(template source) -> compiled template
+        self._template_cache: "OrderedDict[str, jinja2.Template]" = OrderedDict()
+        self.template_cache_stats = {"hits": 0, "misses": 0}
+
+    def _compile(self, source: str) -> jinja2.Template:
+        """Compiled template for `source`, compiling it only the first time it is seen"""
+        key = hashlib.sha1(source.encode("utf-8")).hexdigest()
+        template = self._template_cache.get(key)
+        if template is not None:
+            self._template_cache.move_to_end(key)
+            self.template_cache_stats["hits"] += 1
+            return template
+        template = self.env.from_string(source)
+        self._template_cache[key] = template
+        if len(self._template_cache) > self.TEMPLATE_CACHE_SIZE:
+            self._template_cache.popitem(last=False)
+        self.template_cache_stats["misses"] += 1
+        return template
+
+    async def execute(self, lead: Dict[str, Any] = None, campaign: Dict[str, Any] = None,
+                      leads: Optional[List[Dict[str, Any]]] = None, **kwargs) -> ToolResult:
+        """Render personalized copy for one lead, or for a whole batch when `leads` is given"""
+        if leads is not None:
+            return self.render_many(leads, campaign)
         try:
             if campaign is None:
                 campaign = self._get_default_campaign()
 
-            # Prepare template variables
-            template_vars = self._prepare_template_vars(lead, campaign)
-
-            # Render subject line
-            subject_template = self.env.from_string(campaign.get("subject_template", ""))
-            subject = subject_template.render(**template_vars)
-
-            # Render email body
-            body_template = self.env.from_string(campaign.get("body_template", ""))
-            body = body_template.render(**template_vars)
-
-            # Generate personalization payload (from spec)
-            personalization = self._create_personalization_payload(lead)
-
-            # EmailPayload shape (non-breaking addition)
-            recipient_email = lead.get("best_email", lead.get("email"))
-            email_payload = {
-                "recipient": recipient_email or "",
-                "subject": subject,
-                "body_text": body,
-                # Prefer explicit sequence/seq id if provided, else fall back to campaign id
-                "sequence_id": campaign.get("sequence_id") or campaign.get("seq_id") or campaign.get("id", ""),
-                # Optional scheduling (ISO8601) if provided by caller
-                "schedule_at": campaign.get("schedule_at", ""),
-            }
+            subject_template = self._compile(campaign.get("subject_template", ""))
+            body_template = self._compile(campaign.get("body_template", ""))
+            return ToolResult(success=True, data=self._render_lead(lead, campaign, subject_template, body_template))
 
-            # Instantly contact mapping (aligned with SendInstantly expectations)
-            first_name, last_name = self._split_name(self._extract_first_name(lead), lead.get("name", ""))
-            instantly_contact = {
-                "email": recipient_email or "",
-                "first_name": first_name,
-                "last_name": last_name,
-                "custom_subject": subject,
-                "custom_body": body,
-            }
-            if lead.get("company"):
-                instantly_contact["company"] = lead["company"]
-            if lead.get("linkedin"):
-                instantly_contact["linkedin"] = lead["linkedin"]
-
-            result_data = {
-                # Backward-compatible fields
-                "email": recipient_email,
-                "subject": subject,
-                "body": body,
-                "personalization": personalization,
-                "campaign_id": campaign.get("id", "default"),
-                "template_vars": template_vars,
-                # Additions
-                "email_payload": email_payload,
-                "instantly_contact": instantly_contact,
-            }
+        except Exception as e:
+            logger.error(f"Copy rendering failed: {e}")
+            return ToolResult(success=False, error=str(e))
 
-            return ToolResult(success=True, data=result_data)
+    def render_many(self, leads: List[Dict[str, Any]], campaign: Dict[str, Any] = None) -> ToolResult:
+        """Render a batch of leads against one campaign in a single call
 
+        `data["results"]` holds one entry per successfully rendered lead, with
+        the same shape `execute` returns for a single lead. Leads that fail to
+        render are listed in `data["failed"]` instead of failing the batch.
+        """
+        try:
+            if campaign is None:
+                campaign = self._get_default_campaign()
+            subject_template = self._compile(campaign.get("subject_template", ""))
+            body_template = self._compile(campaign.get("body_template", ""))
         except Exception as e:
             logger.error(f"Copy rendering failed: {e}")
             return ToolResult(success=False, error=str(e))
 
+        results = []
+        failed = []
+        for index, lead in enumerate(leads):
+            try:
+                results.append(self._render_lead(lead, campaign, subject_template, body_template))
+            except Exception as e:
+                failed.append({"index": index, "login": (lead or {}).get("login"), "error": str(e)})
+        if failed:
+            logger.warning(f"Copy rendering failed for {len(failed)}/{len(leads)} leads")
+
+        return ToolResult(
+            success=bool(results) or not leads,
+            data={
+                "results": results,
+                "rendered": len(results),
+                "failed": failed,
+                "campaign_id": campaign.get("id", "default"),
+            },
+            error=None if results or not leads else f"Copy rendering failed for all {len(leads)} leads",
+        )
+
+    def _render_lead(self, lead: Dict[str, Any], campaign: Dict[str, Any],
+                     subject_template: jinja2.Template, body_template: jinja2.Template) -> Dict[str, Any]:
+        """Render one lead with precompiled templates"""
+        # Prepare template variables
+        template_vars = self._prepare_template_vars(lead, campaign)
+
+        # Render subject line and email body
+        subject = subject_template.render(template_vars)
+        body = body_template.render(template_vars)
+
+        # Generate personalization payload (from spec)
+        personalization = self._create_personalization_payload(lead)
+
+        # EmailPayload shape (non-breaking addition)
+        recipient_email = lead.get("best_email", lead.get("email"))
+        email_payload = {
+            "recipient": recipient_email or "",
+            "subject": subject,
+            "body_text": body,
+            # Prefer explicit sequence/seq id if provided, else fall back to campaign id
+            "sequence_id": campaign.get("sequence_id") or campaign.get("seq_id") or campaign.get("id", ""),
+            # Optional scheduling (ISO8601) if provided by caller
+            "schedule_at": campaign.get("schedule_at", ""),
+        }
+
+        # Instantly contact mapping (aligned with SendInstantly expectations)
+        first_name, last_name = self._split_name(self._extract_first_name(lead), lead.get("name", ""))
+        instantly_contact = {
+            "email": recipient_email or "",
+            "first_name": first_name,
+            "last_name": last_name,
+            "custom_subject": subject,
+            "custom_body": body,
+        }
+        if lead.get("company"):
+            instantly_contact["company"] = lead["company"]
+        if lead.get("linkedin"):
+            instantly_contact["linkedin"] = lead["linkedin"]
+
+        return {
+            # Backward-compatible fields
+            "email": recipient_email,
+            "subject": subject,
+            "body": body,
+            "personalization": personalization,
+            "campaign_id": campaign.get("id", "default"),
+            "template_vars": template_vars,
+            # Additions
+            "email_payload": email_payload,
+            "instantly_contact": instantly_contact,
+        }
+
     def _prepare_template_vars(self, lead: Dict[str, Any], campaign: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Prepare template variables from lead and campaign data"""
         unsub_link = ""  # default empty if not provided
@@ -0,0 +1,128 @@
+"""
+Lazy tool registry - tools are declared by name and built on first use
+"""
+import importlib
+import logging
+from collections.abc import MutableMapping
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """Declaration of a tool: where its class lives, when it is enabled and how to build it"""
+    name: str
+    module: str  # module inside the tools package, e.g. "github"
+    class_name: str
+    factory: Callable[[type, Dict[str, Any]], Any] = lambda cls, config: cls()
+    enabled: Callable[[Dict[str, Any]], Any] = lambda config: True
+
+    def load_class(self) -> type:
+        package = __package__ or ""
+        module_name = f"{package}.{self.module}" if package else self.module
+        return getattr(importlib.import_module(module_name), self.class_name)
+
+    def build(self, config: Dict[str, Any]) -> Any:
+        return self.factory(self.load_class(), config)
+
+
+def _github_token(config: Dict[str, Any]) -> Optional[str]:
+    return config.get("GITHUB_TOKEN")
+
+
+def _attio_token(config: Dict[str, Any]) -> Optional[str]:
+    # Attio: prefer access token, fall back to legacy API key for compatibility
+    return config.get("ATTIO_ACCESS_TOKEN") or config.get("ATTIO_API_KEY")
+
+
+def _github(name: str, class_name: str) -> ToolSpec:
+    return ToolSpec(name, "github", class_name, lambda cls, config: cls(config["GITHUB_TOKEN"]), _github_token)
+
+
+# Declaration order is the order tools are listed to the LLM
+TOOL_SPECS: Tuple[ToolSpec, ...] = (
+    # GitHub tools
+    ToolSpec("search_github_repos", "github", "SearchGitHubRepos",
+             lambda cls, config: cls(config["GITHUB_TOKEN"], default_icp=config.get("default_icp", {})),
+             _github_token),
+    _github("extract_people", "ExtractPeople"),
+    _github("enrich_github_user", "EnrichGitHubUser"),
+    _github("find_commit_emails", "FindCommitEmails"),
+    # Batched versions for efficiency
+    _github("enrich_github_users", "EnrichGitHubUsers"),
+    _github("find_commit_emails_batch", "FindCommitEmailsBatch"),
+
+    # Hygiene tools
+    ToolSpec("mx_check", "hygiene", "MXCheck"),
+    ToolSpec("score_icp", "hygiene", "ICPScores"),
+
+    # Personalization tools
+    ToolSpec("render_copy", "personalization", "RenderCopy",
+             enabled=lambda config: config.get("INSTANTLY_API_KEY")),
+    ToolSpec("send_instantly", "personalization", "SendInstantly",
+             lambda cls, config: cls(config["INSTANTLY_API_KEY"]),
+             lambda config: config.get("INSTANTLY_API_KEY")),
+
+    # CRM tools
+    ToolSpec("sync_attio", "crm", "SyncAttio",
+             lambda cls, config: cls(_attio_token(config), config["ATTIO_WORKSPACE_ID"]),
+             lambda config: _attio_token(config) and config.get("ATTIO_WORKSPACE_ID")),
+    ToolSpec("sync_linear", "crm", "SyncLinear",
+             lambda cls, config: cls(config["LINEAR_API_KEY"]),
+             lambda config: config.get("LINEAR_API_KEY")),
+
+    # Export tools
+    ToolSpec("export_csv", "export", "ExportCSV",
+             lambda cls, config: cls(config.get("EXPORT_DIR", "./exports"))),
+    ToolSpec("done", "export", "Done"),
+)
+
+
+class ToolRegistry(MutableMapping):
+    """Mapping of tool name -> tool instance that imports and builds tools on first access
+
+    Membership, iteration and `keys()` only consult the declarations, so
+    listing tools or checking availability never imports a tool module or
+    opens a client. Tools assigned directly (tests, `Toolbelt.register_tool`)
+    are stored as-is.
+    """
+
+    def __init__(self, config: Dict[str, Any], specs: Tuple[ToolSpec, ...] = TOOL_SPECS):
+        self.config = config
+        self._specs: Dict[str, ToolSpec] = {spec.name: spec for spec in specs if spec.enabled(config)}
+        self._names: Dict[str, None] = dict.fromkeys(self._specs)
+        self._instances: Dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        tool = self._instances.get(name)
+        if tool is None:
+            if name not in self._names:
+                raise KeyError(name)
+            tool = self._instances[name] = self._specs[name].build(self.config)
+            logger.debug(f"Initialized tool {name}")
+        return tool
+
+    def __setitem__(self, name: str, tool: Any) -> None:
+        self._names[name] = None
+        self._instances[name] = tool
+
+    def __delitem__(self, name: str) -> None:
+        del self._names[name]
+        self._specs.pop(name, None)
+        self._instances.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._names))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def loaded(self) -> List[str]:
+        """Names of tools that have been built so far"""
+        return [name for name in self._names if name in self._instances]
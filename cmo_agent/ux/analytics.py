@@ -3,18 +3,28 @@ Lightweight analytics emitter for CMO Agent UX events.
 
 Writes JSONL events to logs/product_events.jsonl to avoid external dependencies.
 This can later be swapped for your preferred analytics sink.
+
+`emit` only appends to a bounded in-memory queue; a background thread batches
+events to disk, rotates the file by size, and drains the queue on shutdown.
 """
 from __future__ import annotations
 
+import atexit
 import json
+import os
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass, asdict
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 
 EVENT_LOG_PATH = Path("./logs/product_events.jsonl")
 
+OVERFLOW_POLICIES = ("drop", "sample")
+
 
 def _ensure_log_dir():
     try:
@@ -30,16 +40,183 @@ class AnalyticsEvent:
     timestamp: str
 
 
+class _BufferedSink:
+    """Bounded queue drained by a daemon writer thread.
+
+    Overflow policies when the queue is full:
+    - "drop": new events are discarded
+    - "sample": one in `sample_every` new events is kept, evicting the oldest queued event
+    """
+
+    def __init__(self, max_queue: int = 10_000, batch_size: int = 500,
+                 flush_interval: float = 0.5, max_bytes: int = 10 * 1024 * 1024,
+                 backup_count: int = 5, overflow: str = "drop", sample_every: int = 10):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}, got {overflow!r}")
+        self.max_queue = max(1, int(max_queue))
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.overflow = overflow
+        self.sample_every = max(1, int(sample_every))
+
+        # deque.append/popleft are atomic, so the hot path takes no lock
+        self._queue: deque = deque(maxlen=self.max_queue)
+        self._wake = threading.Event()
+        self._idle = threading.Condition()
+        self._stopping = False
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.stats = {"written": 0, "dropped": 0, "sampled_out": 0, "evicted": 0,
+                      "write_errors": 0, "rotations": 0}
+        self._overflow_seen = 0
+
+    def put(self, item) -> None:
+        queue = self._queue
+        if len(queue) >= self.max_queue:
+            self._overflow(item)
+            return
+        queue.append(item)
+        if self._thread is None:
+            self._start()
+        elif len(queue) >= self.batch_size:
+            self._wake.set()
+
+    def _overflow(self, item) -> None:
+        self._overflow_seen += 1
+        if self.overflow == "drop" or self._overflow_seen % self.sample_every:
+            self.stats["dropped" if self.overflow == "drop" else "sampled_out"] += 1
+            return
+        # deque(maxlen) evicts the oldest event to make room
+        self.stats["evicted"] += 1
+        self._queue.append(item)
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None or self._stopping:
+                return
+            _ensure_log_dir()
+            self._thread = threading.Thread(target=self._run, name="analytics-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._drain()
+            if self._stopping and not self._queue:
+                return
+
+    def _drain(self) -> None:
+        queue = self._queue
+        self._busy = True
+        while queue:
+            lines = []
+            try:
+                while queue and len(lines) < self.batch_size:
+                    lines.append(self._serialize(queue.popleft()))
+            except IndexError:
+                pass
+            self._write(lines)
+        with self._idle:
+            self._busy = False
+            self._idle.notify_all()
+
+    @staticmethod
+    def _serialize(item) -> str:
+        event, props, ts = item
+        timestamp = datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        try:
+            return json.dumps(asdict(AnalyticsEvent(event=event, props=props, timestamp=timestamp)))
+        except (TypeError, ValueError):
+            payload = asdict(AnalyticsEvent(event=event, props={}, timestamp=timestamp))
+            payload["props_repr"] = repr(props)
+            return json.dumps(payload)
+
+    def _write(self, lines) -> None:
+        if not lines:
+            return
+        try:
+            self._maybe_rotate()
+            with EVENT_LOG_PATH.open("a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            self.stats["written"] += len(lines)
+        except Exception:
+            # Best-effort; never crash the writer
+            self.stats["write_errors"] += 1
+
+    def _maybe_rotate(self) -> None:
+        if not self.max_bytes:
+            return
+        try:
+            if EVENT_LOG_PATH.stat().st_size < self.max_bytes:
+                return
+        except FileNotFoundError:
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            src = EVENT_LOG_PATH.with_name(f"{EVENT_LOG_PATH.name}.{i}")
+            if src.exists():
+                os.replace(src, EVENT_LOG_PATH.with_name(f"{EVENT_LOG_PATH.name}.{i + 1}"))
+        if self.backup_count > 0:
+            os.replace(EVENT_LOG_PATH, EVENT_LOG_PATH.with_name(f"{EVENT_LOG_PATH.name}.1"))
+        else:
+            EVENT_LOG_PATH.unlink()
+        self.stats["rotations"] += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far is on disk; True if drained in time"""
+        if self._thread is None or not self._thread.is_alive():
+            _ensure_log_dir()
+            self._drain()
+            return not self._queue
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while (self._queue or self._busy) and time.monotonic() < deadline:
+                self._wake.set()
+                self._idle.wait(min(0.05, max(0.0, deadline - time.monotonic())))
+            return not self._queue and not self._busy
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the writer after draining the queue"""
+        self._stopping = True
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._wake.set()
+            thread.join(timeout)
+        else:
+            self._drain()
+
+
+_sink = _BufferedSink()
+atexit.register(lambda: _sink.shutdown())
+
+
+def configure(**options: Any) -> None:
+    """Replace the sink (e.g. max_queue, batch_size, flush_interval, max_bytes,
+    backup_count, overflow, sample_every). Pending events are flushed first."""
+    global _sink
+    old = _sink
+    _sink = _BufferedSink(**options)
+    old.shutdown()
+
+
 def emit(event: str, props: Optional[Dict[str, Any]] = None) -> None:
-    _ensure_log_dir()
-    payload = AnalyticsEvent(
-        event=event,
-        props=props or {},
-        timestamp=datetime.utcnow().isoformat() + "Z",
-    )
-    try:
-        with EVENT_LOG_PATH.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(asdict(payload)) + "\n")
-    except Exception:
-        # Best-effort; do not crash the caller
-        pass
+    # Hot path: no I/O, no serialization, no copy. props is serialized later on the
+    # writer thread, so callers must not mutate it after emitting.
+    _sink.put((event, props or {}, time.time()))
+
+
+def flush(timeout: float = 5.0) -> bool:
+    return _sink.flush(timeout)
+
+
+def shutdown(timeout: float = 5.0) -> None:
+    _sink.shutdown(timeout)
+
+
+def get_stats() -> Dict[str, int]:
+    stats = dict(_sink.stats)
+    stats["queued"] = len(_sink._queue)
+    return stats
@@ -12,7 +12,7 @@ import os
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import List, Mapping, Optional
 
 
 def _ensure_rich_installed():
@@ -33,7 +33,7 @@ from rich.panel import Panel  # type: ignore  # noqa: E402
 from rich.text import Text  # type: ignore  # noqa: E402
 from rich.align import Align  # type: ignore  # noqa: E402
 
-from .state_loader import load_latest_state
+from .state_loader import CheckpointState, load_latest_state
 
 
 console = Console()
@@ -50,12 +50,18 @@ def _fmt_ts(ts: Optional[str]) -> str:
         return ts
 
 
-def view_dashboard(state: Dict[str, Any]) -> None:
+def _count(state: Mapping, key: str) -> int:
+    # Checkpoint-backed states answer from the summary header without loading the body
+    if isinstance(state, CheckpointState):
+        return state.count(key)
+    return len(state.get(key, []) or [])
+
+
+def view_dashboard(state: Mapping) -> None:
     counters = state.get("counters", {}) or {}
     status = state.get("current_stage", "-")
     paused = state.get("paused", False)
     goal = state.get("goal", "-")
-    reports = state.get("reports", {}) or {}
 
     top = Table.grid(expand=True)
     top.add_column(justify="left")
@@ -73,11 +79,11 @@ def view_dashboard(state: Dict[str, Any]) -> None:
     metrics.add_column("To Send", justify="right")
     metrics.add_column("Errors", justify="right")
 
-    repos = len(state.get("repos", []) or [])
-    candidates = len(state.get("candidates", []) or [])
-    leads = len(state.get("leads", []) or [])
-    to_send = len(state.get("to_send", []) or [])
-    errors = len(state.get("errors", []) or [])
+    repos = _count(state, "repos")
+    candidates = _count(state, "candidates")
+    leads = _count(state, "leads")
+    to_send = _count(state, "to_send")
+    errors = _count(state, "errors")
     metrics.add_row(str(repos), str(candidates), str(leads), str(to_send), str(errors))
     console.print(metrics)
 
@@ -95,7 +101,7 @@ def view_dashboard(state: Dict[str, Any]) -> None:
     console.print(info)
 
 
-def view_triage(state: Dict[str, Any]) -> None:
+def view_triage(state: Mapping) -> None:
     # 3 columns: discovery, enrichment, hygiene (show counts and some items)
     discovery = state.get("repos", []) or []
     candidates = state.get("candidates", []) or []
@@ -115,7 +121,7 @@ def view_triage(state: Dict[str, Any]) -> None:
     console.print(t)
 
 
-def view_personalization(state: Dict[str, Any]) -> None:
+def view_personalization(state: Mapping) -> None:
     to_send = state.get("to_send", []) or []
     t = Table(title="Personalization Review", expand=True)
     t.add_column("Lead")
@@ -130,9 +136,12 @@ def view_personalization(state: Dict[str, Any]) -> None:
     console.print(t)
 
 
-def view_queue(state: Dict[str, Any]) -> None:
-    reports = state.get("reports", {}) or {}
-    sends = reports.get("instantly", {}).get("sends", []) if isinstance(reports, dict) else []
+def view_queue(state: Mapping) -> None:
+    if isinstance(state, CheckpointState):
+        sends = state.queue_sends(50)
+    else:
+        reports = state.get("reports", {}) or {}
+        sends = reports.get("instantly", {}).get("sends", []) if isinstance(reports, dict) else []
     t = Table(title="Queue & Sending", expand=True)
     t.add_column("Email")
     t.add_column("Status")
@@ -144,7 +153,7 @@ def view_queue(state: Dict[str, Any]) -> None:
     console.print(t)
 
 
-def view_sync(state: Dict[str, Any]) -> None:
+def view_sync(state: Mapping) -> None:
     reports = state.get("reports", {}) or {}
     sync = reports.get("crm", []) if isinstance(reports, dict) else []
     t = Table(title="CRM Sync Log", expand=True)
@@ -162,7 +171,7 @@ def view_sync(state: Dict[str, Any]) -> None:
     console.print(t)
 
 
-def view_issues(state: Dict[str, Any]) -> None:
+def view_issues(state: Mapping) -> None:
     errors = state.get("errors", []) or []
     t = Table(title="Issues (Errors & Follow-ups)", expand=True)
     t.add_column("When")
@@ -179,7 +188,7 @@ def view_issues(state: Dict[str, Any]) -> None:
     console.print(t)
 
 
-def render_view(name: str, state: Dict[str, Any]) -> None:
+def render_view(name: str, state: Mapping) -> None:
     name = name.lower()
     if name in ("dash", "dashboard"):
         view_dashboard(state)
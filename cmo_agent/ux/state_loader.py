@@ -4,14 +4,30 @@ State loader utilities for reading CMO Agent RunState checkpoints.
 This module provides helpers to locate and parse the latest checkpoint
 JSON file from one or more directories. It is intentionally light-weight
 and has no runtime dependencies outside the standard library.
+
+Checkpoints written by `write_checkpoint` start with a fixed-size summary
+header (job id, stage, counters, collection sizes, recent sends) and are
+recorded in an append-only `catalog.jsonl` next to them, so the dashboard
+can find and summarise the latest run without parsing the full state.
+The file as a whole is still plain JSON; full sections are only loaded
+when a view asks for them. Appends and compaction take an exclusive lock
+on `catalog.lock` so a compaction cannot drop a concurrently appended entry.
 """
 from __future__ import annotations
 
 import json
 import os
-from dataclasses import dataclass
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: catalog updates go unlocked
+    fcntl = None
 
 
 DEFAULT_CHECKPOINT_DIRS: Tuple[Path, ...] = (
@@ -19,11 +35,195 @@ DEFAULT_CHECKPOINT_DIRS: Tuple[Path, ...] = (
     Path("./cmo_agent/checkpoints"),
 )
 
+CATALOG_FILENAME = "catalog.jsonl"
+# Separate from the catalog, which compaction replaces with a new file
+CATALOG_LOCK_FILENAME = "catalog.lock"
+HEADER_SIZE = 8192
+HEADER_VERSION = 1
+# Bytes read from the end of a catalog when looking for the latest entry
+CATALOG_TAIL_BYTES = 64 * 1024
+
+# RunState keys answered straight from the summary header
+SUMMARY_KEYS = ("job_id", "goal", "current_stage", "paused", "created_at", "completed_at", "end_reason", "counters")
+SIZED_KEYS = ("repos", "candidates", "leads", "to_send", "errors")
+MAX_SUMMARY_SENDS = 50
+
 
 @dataclass
 class LoadedState:
     path: Path
-    state: Dict[str, Any]
+    state: Mapping
+    summary: Dict[str, Any] = field(default_factory=dict)
+
+
+def _instantly_sends(state: Mapping) -> List[Dict[str, Any]]:
+    reports = state.get("reports", {}) or {}
+    if not isinstance(reports, dict):
+        return []
+    return (reports.get("instantly", {}) or {}).get("sends", []) or []
+
+
+def build_summary(state: Mapping, job_id: str, checkpoint_type: str, timestamp: str) -> Dict[str, Any]:
+    """Header summary for a RunState, sized from the unsanitized collections"""
+    summary: Dict[str, Any] = {
+        "job_id": job_id,
+        "checkpoint_type": checkpoint_type,
+        "timestamp": timestamp,
+    }
+    for key in SUMMARY_KEYS:
+        if key != "job_id" and key in state:
+            summary[key] = state.get(key)
+    sizes = {key: len(state.get(key, []) or []) for key in SIZED_KEYS}
+    sends = _instantly_sends(state)
+    sizes["sends"] = len(sends)
+    summary["sizes"] = sizes
+    summary["sends"] = [
+        {"email": s.get("email"), "status": s.get("status"), "timestamp": s.get("timestamp")}
+        for s in sends[:MAX_SUMMARY_SENDS]
+        if isinstance(s, dict)
+    ]
+    return summary
+
+
+def _encode_header(summary: Dict[str, Any]) -> Optional[bytes]:
+    """First line of a checkpoint, padded to HEADER_SIZE; trims sends (then drops them) to fit"""
+    summary = dict(summary)
+    while True:
+        line = '{"checkpoint_header": %d, "summary": %s,' % (
+            HEADER_VERSION, json.dumps(summary, default=str, ensure_ascii=False, separators=(",", ":")))
+        encoded = line.encode("utf-8")
+        if len(encoded) < HEADER_SIZE:
+            return encoded + b" " * (HEADER_SIZE - 1 - len(encoded)) + b"\n"
+        sends = summary.get("sends")
+        if sends:
+            summary["sends"] = sends[: len(sends) // 2]
+        elif "sends" in summary:
+            del summary["sends"]
+        elif "counters" in summary:
+            del summary["counters"]
+        else:
+            return None
+
+
+@contextmanager
+def _catalog_lock(directory: Path) -> Iterator[None]:
+    """Exclusive lock over a directory catalog, held across processes and threads"""
+    if fcntl is None:
+        yield
+        return
+    with (directory / CATALOG_LOCK_FILENAME).open("a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def write_checkpoint(path: str | os.PathLike, payload: Dict[str, Any], summary: Dict[str, Any]) -> Path:
+    """Write a checkpoint with a summary header and record it in the directory catalog
+
+    The file is written to a temporary name and renamed into place, then one
+    line is appended to `catalog.jsonl`, so readers never see a partial file.
+    """
+    p = Path(path)
+    body = json.dumps(payload, indent=2, default=str, ensure_ascii=False)
+    header = _encode_header(summary) if payload else None
+    tmp = p.with_name(p.name + ".tmp")
+    with tmp.open("wb") as f:
+        if header is not None:
+            # The header line opens the object; the body continues it after its own "{"
+            f.write(header)
+            f.write(body[1:].encode("utf-8"))
+        else:
+            f.write(body.encode("utf-8"))
+    os.replace(tmp, p)
+
+    entry = {
+        "path": p.name,
+        "job_id": summary.get("job_id"),
+        "checkpoint_type": summary.get("checkpoint_type"),
+        "timestamp": summary.get("timestamp"),
+        "written_at": time.time(),
+    }
+    with _catalog_lock(p.parent), (p.parent / CATALOG_FILENAME).open("a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, default=str, ensure_ascii=False) + "\n")
+    return p
+
+
+def read_checkpoint_summary(path: str | os.PathLike) -> Optional[Dict[str, Any]]:
+    """Summary header of a checkpoint, reading at most HEADER_SIZE bytes; None for legacy files"""
+    try:
+        with Path(path).open("rb") as f:
+            head = f.read(HEADER_SIZE)
+    except OSError:
+        return None
+    if not head.startswith(b'{"checkpoint_header"'):
+        return None
+    line = head.split(b"\n", 1)[0].decode("utf-8", errors="replace").rstrip()
+    try:
+        header = json.loads(line.rstrip(",") + "}")
+    except ValueError:
+        return None
+    if header.get("checkpoint_header") != HEADER_VERSION:
+        return None
+    return header.get("summary") or None
+
+
+def _catalog_lines_reversed(catalog: Path) -> Iterator[str]:
+    """Catalog lines newest first, reading the tail before falling back to the whole file"""
+    with catalog.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        start = max(0, size - CATALOG_TAIL_BYTES)
+        f.seek(start)
+        tail = f.read()
+        if start:
+            # Start at the first complete line; the cut one is re-read with the head
+            cut = tail.find(b"\n") + 1
+            start, tail = start + cut, tail[cut:]
+        yield from reversed(tail.decode("utf-8", errors="replace").splitlines())
+        if start:
+            f.seek(0)
+            yield from reversed(f.read(start).decode("utf-8", errors="replace").splitlines())
+
+
+def iter_catalog(directory: str | os.PathLike) -> Iterator[Tuple[Path, Dict[str, Any]]]:
+    """(checkpoint path, catalog entry) pairs for a directory, newest first, existing files only"""
+    d = Path(directory)
+    catalog = d / CATALOG_FILENAME
+    if not catalog.exists():
+        return
+    seen = set()
+    for line in _catalog_lines_reversed(catalog):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        name = entry.get("path")
+        if not name or name in seen:
+            continue
+        seen.add(name)
+        p = d / name
+        if p.exists():
+            yield p, entry
+
+
+def compact_catalog(directory: str | os.PathLike) -> int:
+    """Rewrite a directory catalog without entries for deleted checkpoints; returns entries kept"""
+    d = Path(directory)
+    catalog = d / CATALOG_FILENAME
+    if not catalog.exists():
+        return 0
+    # Appends wait until the rewritten catalog is in place, so none land in the replaced file
+    with _catalog_lock(d):
+        entries = [entry for _, entry in iter_catalog(d)]
+        entries.reverse()
+        tmp = catalog.with_name(CATALOG_FILENAME + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, default=str, ensure_ascii=False) + "\n")
+        os.replace(tmp, catalog)
+    return len(entries)
 
 
 def _iter_checkpoint_files(dirs: Iterable[Path]) -> List[Path]:
@@ -49,20 +249,92 @@ def find_latest_checkpoint(
     else:
         dirs = tuple(Path(p) for p in search_dirs)
 
-    files = _iter_checkpoint_files(dirs)
-    if not files:
+    # Directories with a catalog answer from its newest live entry; the
+    # rest fall back to scanning for the newest file by modified time
+    candidates: List[Tuple[float, Path]] = []
+    uncatalogued: List[Path] = []
+    for d in dirs:
+        try:
+            if not (d / CATALOG_FILENAME).exists():
+                uncatalogued.append(d)
+                continue
+            for p, entry in iter_catalog(d):
+                candidates.append((float(entry.get("written_at") or p.stat().st_mtime), p))
+                break
+        except Exception:
+            continue
+
+    for p in _iter_checkpoint_files(uncatalogued):
+        try:
+            candidates.append((p.stat().st_mtime, p))
+        except OSError:
+            continue
+
+    if not candidates:
         return None
+    candidates.sort(key=lambda item: item[0], reverse=True)
+    return candidates[0][1]
+
+
+class CheckpointState(Mapping):
+    """Read-only RunState view over a checkpoint file
+
+    Keys in the summary header are served without opening the body; any
+    other key parses the full checkpoint once and caches it. `count()` and
+    `queue_sends()` cover the dashboard/queue views from the header alone.
+    """
+
+    def __init__(self, path: Path, summary: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.summary = summary or {}
+        self._full: Optional[Dict[str, Any]] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._full is not None
+
+    def load(self) -> Dict[str, Any]:
+        if self._full is None:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            data.pop("checkpoint_header", None)
+            data.pop("summary", None)
+            # Agent checkpoints nest the RunState under "state"; bare dumps are the state itself
+            nested = data.get("state")
+            self._full = nested if isinstance(nested, dict) else data
+        return self._full
+
+    def __getitem__(self, key: str) -> Any:
+        if key in SUMMARY_KEYS and key in self.summary:
+            return self.summary[key]
+        return self.load()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.load())
+
+    def __len__(self) -> int:
+        return len(self.load())
+
+    def count(self, key: str) -> int:
+        sizes = self.summary.get("sizes") or {}
+        if key in sizes:
+            return int(sizes[key])
+        if key == "sends":
+            return len(_instantly_sends(self))
+        return len(self.get(key, []) or [])
 
-    # Newest by modified time
-    files.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-    return files[0]
+    def queue_sends(self, limit: int) -> List[Dict[str, Any]]:
+        sends = self.summary.get("sends")
+        total = (self.summary.get("sizes") or {}).get("sends")
+        if sends is not None and total is not None and len(sends) >= min(limit, total):
+            return sends[:limit]
+        return _instantly_sends(self)[:limit]
 
 
 def load_state_from_file(path: str | os.PathLike) -> LoadedState:
     p = Path(path)
-    with p.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-    return LoadedState(path=p, state=data)
+    summary = read_checkpoint_summary(p) or {}
+    return LoadedState(path=p, state=CheckpointState(p, summary), summary=summary)
 
 
 def load_latest_state(
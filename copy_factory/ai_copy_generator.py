@@ -15,6 +15,7 @@ import hashlib
 
 from .core.models import ICPProfile, ProspectData, CopyTemplate
 from .core.storage import CopyFactoryStorage
+from .core.copy_cache import TieredCopyCache
 
 logger = logging.getLogger(__name__)
 
@@ -22,33 +23,32 @@ logger = logging.getLogger(__name__)
 class AICopyGenerator:
     """AI-powered copy generation using LLMs"""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
+    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini",
+                 cache_path: str = "copy_factory/data/ai_cache.sqlite3",
+                 cache_ttl_seconds: float = 86400, memory_cache_size: int = 4096):
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         self.model = model
         self.logger = logger
 
-        # Cache for generated copy to avoid redundant API calls
+        # Cache for generated copy to avoid redundant API calls: memory LRU over a
+        # single SQLite file; the old per-key JSON directory is read as a fallback
         self.cache_dir = "copy_factory/data/ai_cache"
-        os.makedirs(self.cache_dir, exist_ok=True)
+        self.cache = TieredCopyCache(cache_path, ttl_seconds=cache_ttl_seconds,
+                                     memory_size=memory_cache_size, legacy_dir=self.cache_dir)
 
     def generate_personalized_copy(self, prospect: ProspectData, icp: ICPProfile,
                                  tone: str = "professional", length: str = "medium",
                                  context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Generate AI-powered personalized copy for a prospect"""
 
-        # Create cache key
+        # Create cache key; concurrent misses on the same key share one generation
         cache_key = self._create_cache_key(prospect, icp, tone, length, context)
-        cached_result = self._get_cached_result(cache_key)
-
-        if cached_result:
-            self.logger.info(f"Using cached AI copy for {prospect.login}")
-            return cached_result
-
-        # Generate fresh copy
-        result = self._generate_ai_copy(prospect, icp, tone, length, context)
+        result, cached = self.cache.get_or_compute(
+            cache_key, lambda: self._generate_ai_copy(prospect, icp, tone, length, context)
+        )
 
-        # Cache the result
-        self._cache_result(cache_key, result)
+        if cached:
+            self.logger.debug(f"Using cached AI copy for {prospect.login}")
 
         return result
 
@@ -390,33 +390,19 @@ Best regards,
 
     def _get_cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """Get cached result if available"""
-        cache_file = os.path.join(self.cache_dir, f"{cache_key}.json")
-
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r') as f:
-                    cached = json.load(f)
-
-                # Check if cache is still valid (24 hours)
-                cached_time = datetime.fromisoformat(cached['generated_at'])
-                if (datetime.now() - cached_time).total_seconds() < 86400:  # 24 hours
-                    return cached
-
-            except Exception as e:
-                self.logger.warning(f"Error reading cache: {e}")
-
-        return None
+        return self.cache.get(cache_key)
 
     def _cache_result(self, cache_key: str, result: Dict[str, Any]) -> None:
         """Cache the generation result"""
-        cache_file = os.path.join(self.cache_dir, f"{cache_key}.json")
-
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(result, f, indent=2)
+            self.cache.put(cache_key, result)
         except Exception as e:
             self.logger.warning(f"Error writing cache: {e}")
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss/generation counters for the copy cache"""
+        return self.cache.get_stats()
+
     def bulk_generate_copy(self, prospects: List[ProspectData], icp: ICPProfile,
                           tone: str = "professional", length: str = "medium",
                           max_workers: int = 4) -> List[Dict[str, Any]]:
@@ -438,7 +424,10 @@ Best regards,
                 if result:
                     results.append(result)
 
-        self.logger.info(f"Generated AI copy for {len(results)} prospects")
+        stats = self.cache.get_stats()
+        self.logger.info(f"Generated AI copy for {len(results)} prospects "
+                         f"(generations: {stats['generations']}, memory hits: {stats['memory_hits']}, "
+                         f"disk hits: {stats['disk_hits']}, coalesced: {stats['singleflight_waits']})")
         return results
 
     def optimize_copy_for_conversion(self, base_copy: Dict[str, Any],
@@ -12,12 +12,30 @@ from datetime import datetime
 import re
 from collections import defaultdict, Counter
 import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 from .core.models import ProspectData
 from .ai_copy_generator import AICopyGenerator
 
 logger = logging.getLogger(__name__)
 
+# Bump when sub-analysis logic changes so every cached part is recomputed
+ANALYSIS_VERSION = 1
+
+# Prospect fields each sub-analysis reads; a part is recomputed only when
+# the fingerprint of its own inputs changes
+ANALYSIS_PART_INPUTS = {
+    'bio': ('bio',),
+    'repository': ('repo_description', 'bio', 'language', 'stars', 'forks'),
+    'technical_expertise': ('language', 'contributions_last_year', 'public_repos', 'topics'),
+    'pain_points': ('contributions_last_year', 'followers', 'public_repos', 'topics', 'bio', 'repo_description'),
+    'interests': ('bio', 'topics'),
+    'communication_style': ('bio', 'repo_description'),
+    'engagement_patterns': ('contributions_last_year', 'forks', 'public_repos'),
+    'content_themes': ('topics', 'bio'),
+}
+
 
 class ContentAnalyzer:
     """AI-powered analysis of prospect content and profiles"""
@@ -27,60 +45,97 @@ class ContentAnalyzer:
         self.ai_generator = AICopyGenerator(api_key)
         self.logger = logger
 
-        # Analysis cache
+        # Analysis cache: one entry per prospect holding each sub-analysis and
+        # the fingerprint of the inputs it was computed from
         self.analysis_cache_dir = "copy_factory/data/content_analysis"
         os.makedirs(self.analysis_cache_dir, exist_ok=True)
 
+        self._stats_lock = threading.Lock()
+        self.analysis_stats = Counter()
+
     def analyze_prospect_content(self, prospect: ProspectData,
                                include_repo_analysis: bool = True) -> Dict[str, Any]:
         """Perform comprehensive AI analysis of prospect content"""
+        analysis, _, _ = self._analyze_incremental(prospect, include_repo_analysis)
+        return analysis
+
+    def _fingerprint_part(self, prospect: ProspectData, part: str, include_repo_analysis: bool) -> str:
+        """Hash of the prospect fields a sub-analysis reads"""
+        values = [getattr(prospect, name, None) for name in ANALYSIS_PART_INPUTS[part]]
+        if part == 'repository':
+            values.append(include_repo_analysis)
+        payload = json.dumps([ANALYSIS_VERSION, part, values], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+    def _compute_part(self, prospect: ProspectData, part: str, include_repo_analysis: bool) -> Any:
+        """Run one sub-analysis"""
+        if part == 'bio':
+            return self._analyze_bio(prospect.bio) if prospect.bio else {}
+        if part == 'repository':
+            if include_repo_analysis and prospect.repo_description:
+                return self._analyze_repository_content(prospect)
+            return {}
+
+        analyzers = {
+            'technical_expertise': self._extract_technical_expertise,
+            'pain_points': self._identify_pain_points,
+            'interests': self._analyze_interests,
+            'communication_style': self._determine_communication_style,
+            'engagement_patterns': self._analyze_engagement_patterns,
+            'content_themes': self._extract_content_themes,
+        }
+        return analyzers[part](prospect)
+
+    def _analyze_incremental(self, prospect: ProspectData, include_repo_analysis: bool = True,
+                             cached: Optional[Dict[str, Any]] = None
+                             ) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, str]]:
+        """Analyze a prospect, reusing cached parts whose input fingerprint is unchanged.
+
+        Returns (analysis, parts, fingerprints). A part that raised is left out of
+        fingerprints so it is retried on the next run.
+        """
+        cached_parts = (cached or {}).get('parts', {})
+        cached_fps = (cached or {}).get('fingerprints', {})
+        parts: Dict[str, Any] = {}
+        fingerprints: Dict[str, str] = {}
+        error = None
+        recomputed = reused = 0
+
+        for part in ANALYSIS_PART_INPUTS:
+            fp = self._fingerprint_part(prospect, part, include_repo_analysis)
+            if cached_fps.get(part) == fp and part in cached_parts:
+                parts[part] = cached_parts[part]
+                fingerprints[part] = fp
+                reused += 1
+                continue
+            try:
+                parts[part] = self._compute_part(prospect, part, include_repo_analysis)
+                fingerprints[part] = fp
+            except Exception as e:
+                self.logger.error(f"Error analyzing prospect {prospect.login} ({part}): {e}")
+                parts[part] = [] if part in ('pain_points', 'interests', 'content_themes') else {}
+                error = str(e)
+            recomputed += 1
+
+        with self._stats_lock:
+            self.analysis_stats['parts_recomputed'] += recomputed
+            self.analysis_stats['parts_reused'] += reused
 
         analysis = {
             'prospect_id': prospect.lead_id,
             'analysis_timestamp': datetime.now().isoformat(),
-            'insights': {},
-            'pain_points': [],
-            'interests': [],
-            'communication_style': {},
-            'technical_expertise': {},
-            'engagement_patterns': {},
-            'content_themes': []
+            'insights': {**parts['bio'], **parts['repository']},
+            'pain_points': parts['pain_points'],
+            'interests': parts['interests'],
+            'communication_style': parts['communication_style'],
+            'technical_expertise': parts['technical_expertise'],
+            'engagement_patterns': parts['engagement_patterns'],
+            'content_themes': parts['content_themes']
         }
+        if error:
+            analysis['error'] = error
 
-        try:
-            # Analyze bio and profile information
-            if prospect.bio:
-                bio_analysis = self._analyze_bio(prospect.bio)
-                analysis['insights'].update(bio_analysis)
-
-            # Analyze repository content
-            if include_repo_analysis and prospect.repo_description:
-                repo_analysis = self._analyze_repository_content(prospect)
-                analysis['insights'].update(repo_analysis)
-
-            # Extract technical expertise
-            analysis['technical_expertise'] = self._extract_technical_expertise(prospect)
-
-            # Identify pain points and challenges
-            analysis['pain_points'] = self._identify_pain_points(prospect)
-
-            # Analyze interests and motivations
-            analysis['interests'] = self._analyze_interests(prospect)
-
-            # Determine communication style preferences
-            analysis['communication_style'] = self._determine_communication_style(prospect)
-
-            # Analyze engagement patterns
-            analysis['engagement_patterns'] = self._analyze_engagement_patterns(prospect)
-
-            # Extract content themes
-            analysis['content_themes'] = self._extract_content_themes(prospect)
-
-        except Exception as e:
-            self.logger.error(f"Error analyzing prospect {prospect.login}: {e}")
-            analysis['error'] = str(e)
-
-        return analysis
+        return analysis, parts, fingerprints
 
     def _analyze_bio(self, bio: str) -> Dict[str, Any]:
         """Analyze prospect bio for insights"""
@@ -451,15 +506,18 @@ List specific pain points identified:
     def generate_personalized_insights(self, prospect: ProspectData) -> Dict[str, Any]:
         """Generate comprehensive personalized insights for copy generation"""
 
-        # Get cached analysis or perform new analysis
+        # Reuse the cached analysis if no sub-analysis inputs changed
         cache_key = f"insights_{prospect.lead_id}"
         cached = self._get_cached_analysis(cache_key)
 
-        if cached:
-            return cached
+        if cached and cached.get('fingerprints') == {
+                part: self._fingerprint_part(prospect, part, True) for part in ANALYSIS_PART_INPUTS}:
+            with self._stats_lock:
+                self.analysis_stats['full_hits'] += 1
+            return cached['insights']
 
-        # Perform full analysis
-        analysis = self.analyze_prospect_content(prospect)
+        # Recompute only the invalidated parts
+        analysis, parts, fingerprints = self._analyze_incremental(prospect, True, cached)
 
         # Generate actionable insights
         insights = {
@@ -476,7 +534,12 @@ List specific pain points identified:
         full_insights = {**analysis, **insights}
 
         # Cache the results
-        self._cache_analysis(cache_key, full_insights)
+        self._cache_analysis(cache_key, {
+            'version': ANALYSIS_VERSION,
+            'fingerprints': fingerprints,
+            'parts': parts,
+            'insights': full_insights
+        })
 
         return full_insights
 
@@ -596,7 +659,7 @@ List specific pain points identified:
         return timing
 
     def _get_cached_analysis(self, cache_key: str) -> Optional[Dict[str, Any]]:
-        """Get cached analysis if available"""
+        """Get the cached analysis entry (parts + fingerprints) if available"""
 
         cache_file = os.path.join(self.analysis_cache_dir, f"{cache_key}.json")
 
@@ -605,9 +668,8 @@ List specific pain points identified:
                 with open(cache_file, 'r') as f:
                     cached = json.load(f)
 
-                # Check if cache is still valid (7 days)
-                cached_time = datetime.fromisoformat(cached['analysis_timestamp'])
-                if (datetime.now() - cached_time).total_seconds() < 604800:  # 7 days
+                # Entries written before fingerprinting have no parts to reuse
+                if cached.get('version') == ANALYSIS_VERSION and 'fingerprints' in cached:
                     return cached
 
             except Exception as e:
@@ -615,24 +677,30 @@ List specific pain points identified:
 
         return None
 
-    def _cache_analysis(self, cache_key: str, analysis: Dict[str, Any]) -> None:
+    def _cache_analysis(self, cache_key: str, entry: Dict[str, Any]) -> None:
         """Cache analysis results"""
 
         cache_file = os.path.join(self.analysis_cache_dir, f"{cache_key}.json")
+        tmp_file = f"{cache_file}.{threading.get_ident()}.tmp"
 
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(analysis, f, indent=2)
+            with open(tmp_file, 'w') as f:
+                json.dump(entry, f, default=str)
+            os.replace(tmp_file, cache_file)
         except Exception as e:
             self.logger.warning(f"Error caching analysis: {e}")
 
-    def batch_analyze_prospects(self, prospects: List[ProspectData],
-                              max_workers: int = 4) -> Dict[str, Dict[str, Any]]:
-        """Analyze multiple prospects in batch"""
+    def get_analysis_stats(self) -> Dict[str, int]:
+        """Counters for full cache hits and reused/recomputed sub-analyses"""
+        with self._stats_lock:
+            return dict(self.analysis_stats)
 
-        from concurrent.futures import ThreadPoolExecutor
+    def iter_analyze_prospects(self, prospects: List[ProspectData], max_workers: int = 4):
+        """Yield (lead_id, insights) as each analysis completes.
 
-        results = {}
+        At most 2 * max_workers analyses are in flight, so downstream copy generation
+        can start on the first results while the rest of the batch is still running.
+        """
 
         def analyze_single(prospect):
             try:
@@ -641,11 +709,31 @@ List specific pain points identified:
                 self.logger.error(f"Error analyzing prospect {prospect.login}: {e}")
                 return prospect.lead_id, {'error': str(e)}
 
+        window = max(1, max_workers) * 2
+        pending = set()
+        prospect_iter = iter(prospects)
+
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = [executor.submit(analyze_single, prospect) for prospect in prospects]
-            for future in futures:
-                prospect_id, analysis = future.result()
-                results[prospect_id] = analysis
+            for prospect in prospect_iter:
+                pending.add(executor.submit(analyze_single, prospect))
+                if len(pending) >= window:
+                    break
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+                    next_prospect = next(prospect_iter, None)
+                    if next_prospect is not None:
+                        pending.add(executor.submit(analyze_single, next_prospect))
+
+    def batch_analyze_prospects(self, prospects: List[ProspectData],
+                              max_workers: int = 4) -> Dict[str, Dict[str, Any]]:
+        """Analyze multiple prospects in batch"""
+
+        results = {}
+        for prospect_id, analysis in self.iter_analyze_prospects(prospects, max_workers):
+            results[prospect_id] = analysis
 
         self.logger.info(f"Analyzed {len(results)} prospects")
         return results
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Tiered cache for AI-generated copy
+In-process LRU in front of a single-file SQLite store with TTL eviction,
+plus single-flight deduplication so concurrent misses on one key generate once
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TieredCopyCache:
+    """Memory LRU -> SQLite cache for generation results keyed by request hash"""
+
+    def __init__(self, db_path: str = "copy_factory/data/ai_cache.sqlite3",
+                 ttl_seconds: float = 86400, memory_size: int = 4096,
+                 legacy_dir: Optional[str] = None):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.memory_size = max(0, int(memory_size))
+        self.legacy_dir = Path(legacy_dir) if legacy_dir else None
+
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self.stats = {
+            'memory_hits': 0, 'disk_hits': 0, 'legacy_hits': 0, 'misses': 0,
+            'generations': 0, 'singleflight_waits': 0, 'expired_evictions': 0,
+        }
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS copy_cache ("
+            " key TEXT PRIMARY KEY, payload TEXT NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_copy_cache_created ON copy_cache(created_at)")
+        self.conn.commit()
+        self.evict_expired()
+
+    def _bump(self, counter: str):
+        with self._lock:
+            self.stats[counter] += 1
+
+    def _remember(self, key: str, created_at: float, value: Dict[str, Any]):
+        if not self.memory_size:
+            return
+        with self._lock:
+            self._memory[key] = (created_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str, count_miss: bool = True) -> Optional[Dict[str, Any]]:
+        """Look up a key in memory, then SQLite, then the legacy per-file JSON cache"""
+        now = time.time()
+        cutoff = now - self.ttl_seconds
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > cutoff:
+                    self._memory.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                    return entry[1]
+                del self._memory[key]
+
+        with self._db_lock:
+            row = self.conn.execute(
+                "SELECT payload, created_at FROM copy_cache WHERE key = ? AND created_at > ?", (key, cutoff)
+            ).fetchone()
+        if row:
+            try:
+                value = json.loads(row[0])
+            except ValueError:
+                value = None
+            if value is not None:
+                self._remember(key, row[1], value)
+                self._bump('disk_hits')
+                return value
+
+        value = self._get_legacy(key, now)
+        if value is not None:
+            self._bump('legacy_hits')
+            return value
+
+        if count_miss:
+            self._bump('misses')
+        return None
+
+    def _get_legacy(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        """Read a pre-SQLite `<key>.json` entry and promote it into the store"""
+        if not self.legacy_dir:
+            return None
+        legacy_file = self.legacy_dir / f"{key}.json"
+        if not legacy_file.exists():
+            return None
+        try:
+            with open(legacy_file, 'r') as f:
+                value = json.load(f)
+            created_at = datetime.fromisoformat(value['generated_at']).timestamp()
+        except Exception as e:
+            logger.warning(f"Error reading legacy cache entry {legacy_file}: {e}")
+            return None
+        if created_at + self.ttl_seconds <= now:
+            return None
+        self.put(key, value, created_at=created_at)
+        return value
+
+    def put(self, key: str, value: Dict[str, Any], created_at: Optional[float] = None):
+        """Store a result in both tiers"""
+        created_at = created_at if created_at is not None else time.time()
+        try:
+            payload = json.dumps(value, default=str)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Error serializing cache entry: {e}")
+            return
+        with self._db_lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO copy_cache (key, payload, created_at) VALUES (?, ?, ?)",
+                (key, payload, created_at),
+            )
+            self.conn.commit()
+        self._remember(key, created_at, value)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], bool]:
+        """Return (value, cached). Concurrent misses on the same key share one compute call."""
+        value = self.get(key)
+        if value is not None:
+            return value, True
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.stats['singleflight_waits'] += 1
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            # Another leader may have finished between our miss and taking the slot
+            value = self.get(key, count_miss=False)
+            cached = value is not None
+            if not cached:
+                self._bump('generations')
+                value = compute()
+                if value:
+                    self.put(key, value)
+            future.set_result(value)
+            return value, cached
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def evict_expired(self) -> int:
+        """Delete rows older than the TTL from the store (uses the created_at index)"""
+        with self._db_lock:
+            cur = self.conn.execute("DELETE FROM copy_cache WHERE created_at <= ?",
+                                    (time.time() - self.ttl_seconds,))
+            self.conn.commit()
+        removed = cur.rowcount or 0
+        with self._lock:
+            self.stats['expired_evictions'] += removed
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['memory_entries'] = len(self._memory)
+        with self._db_lock:
+            stats['disk_entries'] = self.conn.execute("SELECT COUNT(*) FROM copy_cache").fetchone()[0]
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            for counter in self.stats:
+                self.stats[counter] = 0
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Performance store for Copy Factory
+Append-only JSONL partitions per day and campaign, plus SQLite daily rollups
+that are updated as each record is appended
+"""
+
+import json
+import os
+import sqlite3
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterator
+from urllib.parse import quote, unquote
+
+logger = logging.getLogger(__name__)
+
+# Counters summed into the daily rollups
+ROLLUP_METRICS = ['emails_sent', 'opens', 'responses', 'conversions', 'bounces']
+
+
+class PerformanceStore:
+    """Day/campaign partitioned performance records with incremental daily rollups.
+
+    Layout: `<base_dir>/<YYYY-MM-DD>/<quoted campaign id>.jsonl`, one record per line.
+    Campaign ids are percent-quoted, so lookups match ids exactly instead of by
+    substring.
+    """
+
+    def __init__(self, base_dir: str = "copy_factory/data/performance"):
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.base_dir / "rollups.sqlite3"
+        is_new = not self.db_path.exists()
+
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        metric_columns = ", ".join(f"{m} INTEGER NOT NULL DEFAULT 0" for m in ROLLUP_METRICS)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS daily_rollups ("
+            " day TEXT NOT NULL, campaign_id TEXT NOT NULL, documents INTEGER NOT NULL DEFAULT 0,"
+            f" {metric_columns}, PRIMARY KEY (day, campaign_id))"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_rollups_campaign ON daily_rollups(campaign_id, day)")
+        self.conn.commit()
+
+        if is_new:
+            self._import_legacy_files()
+
+    def partition_path(self, day: str, campaign_id: str) -> Path:
+        return self.base_dir / day / f"{quote(campaign_id, safe='')}.jsonl"
+
+    def append(self, campaign_id: str, record: Dict[str, Any], tracked_at: Optional[datetime] = None) -> Path:
+        """Append one record to its partition and fold it into the day's rollup"""
+        tracked_at = tracked_at or datetime.now()
+        day = tracked_at.strftime('%Y-%m-%d')
+        path = self.partition_path(day, campaign_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, default=str) + '\n')
+        self._add_to_rollup(day, campaign_id, record)
+        self.conn.commit()
+        return path
+
+    def _add_to_rollup(self, day: str, campaign_id: str, record: Dict[str, Any]):
+        values = [self._as_int(record.get(m)) for m in ROLLUP_METRICS]
+        updates = ", ".join(f"{m} = {m} + excluded.{m}" for m in ROLLUP_METRICS)
+        self.conn.execute(
+            f"INSERT INTO daily_rollups (day, campaign_id, documents, {', '.join(ROLLUP_METRICS)})"
+            f" VALUES (?, ?, 1, {', '.join('?' * len(ROLLUP_METRICS))})"
+            f" ON CONFLICT(day, campaign_id) DO UPDATE SET documents = documents + 1, {updates}",
+            [day, campaign_id, *values],
+        )
+
+    @staticmethod
+    def _as_int(value: Any) -> int:
+        try:
+            return int(value or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    @staticmethod
+    def _cutoff_day(days_back: int) -> str:
+        return (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
+
+    def get_rollups(self, campaign_ids: Optional[List[str]] = None, days_back: int = 30) -> List[Dict[str, Any]]:
+        """Daily rollup rows in the window, oldest first"""
+        sql = "SELECT * FROM daily_rollups WHERE day >= ?"
+        params: List[Any] = [self._cutoff_day(days_back)]
+        if campaign_ids:
+            sql += f" AND campaign_id IN ({', '.join('?' * len(campaign_ids))})"
+            params.extend(campaign_ids)
+        sql += " ORDER BY day, campaign_id"
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def partition_paths(self, campaign_ids: Optional[List[str]] = None, days_back: int = 30) -> List[Path]:
+        """Partition files in the window; only day directories at or after the cutoff are listed"""
+        cutoff = self._cutoff_day(days_back)
+        wanted = {f"{quote(c, safe='')}.jsonl" for c in campaign_ids} if campaign_ids else None
+        paths = []
+        for day_dir in sorted(p for p in self.base_dir.iterdir() if p.is_dir() and p.name >= cutoff):
+            for path in sorted(day_dir.glob('*.jsonl')):
+                if wanted is None or path.name in wanted:
+                    paths.append(path)
+        return paths
+
+    def iter_records(self, campaign_ids: Optional[List[str]] = None, days_back: int = 30) -> Iterator[Dict[str, Any]]:
+        """Raw records in the window, for callers that need more than the rollups"""
+        for path in self.partition_paths(campaign_ids, days_back):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        logger.warning(f"Skipping torn performance record in {path}")
+
+    def rebuild_rollups(self):
+        """Recompute every rollup from the partitions (e.g. after a crash between append and commit)"""
+        with self.conn:
+            self.conn.execute("DELETE FROM daily_rollups")
+            for day_dir in sorted(p for p in self.base_dir.iterdir() if p.is_dir()):
+                for path in day_dir.glob('*.jsonl'):
+                    campaign_id = unquote(path.stem)
+                    with open(path, 'r', encoding='utf-8') as f:
+                        for line in f:
+                            try:
+                                self._add_to_rollup(day_dir.name, campaign_id, json.loads(line))
+                            except ValueError:
+                                continue
+
+    def _import_legacy_files(self):
+        """Move flat `performance_<campaign>_<timestamp>.json` files into the partitioned layout"""
+        legacy_files = sorted(self.base_dir.glob('performance_*.json'))
+        for path in legacy_files:
+            try:
+                with open(path, 'r') as f:
+                    record = json.load(f)
+                campaign_id = record['campaign_id']
+                tracked_at = datetime.fromisoformat(record.get('tracked_at') or
+                                                    datetime.fromtimestamp(path.stat().st_mtime).isoformat())
+                self.append(campaign_id, record, tracked_at)
+                os.replace(path, path.with_name(path.name + '.imported'))
+            except Exception as e:
+                logger.warning(f"Could not import legacy performance file {path}: {e}")
+        if legacy_files:
+            logger.info(f"Imported {len(legacy_files)} legacy performance files into the partitioned store")
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
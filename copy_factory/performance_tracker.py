@@ -8,7 +8,7 @@ import os
 import json
 import logging
 from typing import Dict, List, Optional, Any, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime
 from collections import defaultdict
 import statistics
 import numpy as np
@@ -17,6 +17,7 @@ from .ai_copy_generator import AICopyGenerator
 from .copy_optimizer import CopyOptimizer
 from .campaign_automator import CampaignAutomator
 from .core.storage import CopyFactoryStorage
+from .core.performance_store import PerformanceStore
 
 logger = logging.getLogger(__name__)
 
@@ -29,9 +30,9 @@ class PerformanceTracker:
         self.ai_generator = AICopyGenerator(api_key)
         self.storage = CopyFactoryStorage()
 
-        # Performance data storage
+        # Performance data storage: day/campaign partitions with daily rollups
         self.performance_dir = "copy_factory/data/performance"
-        os.makedirs(self.performance_dir, exist_ok=True)
+        self.performance_store = PerformanceStore(self.performance_dir)
 
         # Learning data storage
         self.learning_dir = "copy_factory/data/learning"
@@ -48,12 +49,9 @@ class PerformanceTracker:
         })
 
         # Save performance data
-        filename = f"performance_{campaign_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        filepath = os.path.join(self.performance_dir, filename)
-
         try:
-            with open(filepath, 'w') as f:
-                json.dump(performance_data, f, indent=2)
+            filepath = self.performance_store.append(campaign_id, performance_data)
+            filename = os.path.relpath(filepath, self.performance_dir)
         except Exception as e:
             logger.error(f"Failed to save performance data: {e}")
             return {'error': str(e)}
@@ -97,23 +95,14 @@ class PerformanceTracker:
                                   days_back: int = 30) -> Dict[str, Any]:
         """Analyze performance trends across campaigns"""
 
-        # Get performance data
-        performance_files = self._get_performance_files(campaign_ids, days_back)
-        performance_data = []
-
-        for file_path in performance_files:
-            try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    performance_data.append(data)
-            except Exception as e:
-                logger.warning(f"Error loading performance data from {file_path}: {e}")
+        # Get daily rollups (one row per day and campaign) instead of every record
+        rollups = self.performance_store.get_rollups(campaign_ids, days_back)
 
-        if not performance_data:
+        if not rollups:
             return {'error': 'No performance data found'}
 
         # Analyze trends
-        trends = self._calculate_performance_trends(performance_data)
+        trends = self._calculate_performance_trends(rollups)
 
         # Generate insights
         insights = self._generate_performance_insights(trends)
@@ -123,8 +112,9 @@ class PerformanceTracker:
 
         return {
             'analysis_period': f"{days_back} days",
-            'campaigns_analyzed': len(set(d['campaign_id'] for d in performance_data)),
-            'total_data_points': len(performance_data),
+            'campaigns_analyzed': len(set(r['campaign_id'] for r in rollups)),
+            'total_data_points': sum(r['documents'] for r in rollups),
+            'rollup_rows': len(rollups),
             'trends': trends,
             'insights': insights,
             'optimization_opportunities': opportunities,
@@ -132,45 +122,11 @@ class PerformanceTracker:
         }
 
     def _get_performance_files(self, campaign_ids: Optional[List[str]], days_back: int) -> List[str]:
-        """Get relevant performance files"""
-
-        import glob
-
-        pattern = os.path.join(self.performance_dir, "performance_*.json")
-        all_files = glob.glob(pattern)
-
-        # Filter by campaign if specified
-        if campaign_ids:
-            filtered_files = []
-            for file_path in all_files:
-                for campaign_id in campaign_ids:
-                    if campaign_id in file_path:
-                        filtered_files.append(file_path)
-                        break
-            all_files = filtered_files
-
-        # Filter by date
-        cutoff_date = datetime.now() - timedelta(days=days_back)
-        recent_files = []
-
-        for file_path in all_files:
-            try:
-                # Extract date from filename
-                parts = os.path.basename(file_path).split('_')
-                if len(parts) >= 3:
-                    date_str = parts[2].split('.')[0]  # Remove .json
-                    if len(date_str) >= 8:  # YYYYMMDD format
-                        file_date = datetime.strptime(date_str[:8], '%Y%m%d')
-                        if file_date >= cutoff_date:
-                            recent_files.append(file_path)
-            except:
-                # If date parsing fails, include the file
-                recent_files.append(file_path)
-
-        return recent_files
+        """Get relevant performance partition files (exact campaign id match)"""
+        return [str(p) for p in self.performance_store.partition_paths(campaign_ids, days_back)]
 
     def _calculate_performance_trends(self, performance_data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Calculate performance trends from data"""
+        """Calculate performance trends from data (records or daily rollups, oldest first)"""
 
         if not performance_data:
             return {}
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for fingerprinted incremental content analysis
+Checks that only invalidated sub-analyses recompute and that batches stream results
+"""
+
+import os
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+# Import as a package so relative imports resolve
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from copy_factory.content_analyzer import ContentAnalyzer, ANALYSIS_PART_INPUTS
+from copy_factory.core.models import ProspectData
+
+
+def test_content_analysis():
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # The analyzer keeps its caches under ./copy_factory/data
+        os.chdir(temp_dir)
+        try:
+            print("🧪 Testing incremental content analysis...")
+            analyzer = ContentAnalyzer()
+            prospect = ProspectData(lead_id="lead_1", login="octo", bio="Senior engineer, open source",
+                                    repo_description="Fast HTTP client", topics=["python", "docker"],
+                                    language="Python", contributions_last_year=120, public_repos=30)
+
+            print("\n1️⃣ Cold analysis...")
+            first = analyzer.generate_personalized_insights(prospect)
+            stats = analyzer.get_analysis_stats()
+            assert stats['parts_recomputed'] == len(ANALYSIS_PART_INPUTS)
+            assert first['technical_expertise']['expertise_level'] == 'expert'
+            print(f"✅ {stats['parts_recomputed']} sub-analyses computed")
+
+            print("\n2️⃣ Unchanged prospect...")
+            again = analyzer.generate_personalized_insights(prospect)
+            stats = analyzer.get_analysis_stats()
+            assert again == first and stats['full_hits'] == 1
+            assert stats['parts_recomputed'] == len(ANALYSIS_PART_INPUTS)
+            print("✅ Served from cache without recomputation")
+
+            print("\n3️⃣ Bio change only invalidates parts that read the bio...")
+            changed = replace(prospect, bio="Junior developer learning Rust")
+            updated = analyzer.generate_personalized_insights(changed)
+            stats = analyzer.get_analysis_stats()
+            bio_parts = sum(1 for fields in ANALYSIS_PART_INPUTS.values() if 'bio' in fields)
+            assert stats['parts_recomputed'] == len(ANALYSIS_PART_INPUTS) + bio_parts
+            assert stats['parts_reused'] == len(ANALYSIS_PART_INPUTS) - bio_parts
+            assert updated['technical_expertise'] == first['technical_expertise']
+            print(f"✅ {bio_parts} parts recomputed, {stats['parts_reused']} reused")
+
+            print("\n4️⃣ Streaming batch...")
+            prospects = [replace(prospect, lead_id=f"lead_{i}", login=f"user{i}") for i in range(20)]
+            slow_ids = {"lead_0"}
+            original = analyzer.generate_personalized_insights
+
+            def slow_first(p):
+                if p.lead_id in slow_ids:
+                    time.sleep(0.3)
+                return original(p)
+
+            analyzer.generate_personalized_insights = slow_first
+            order = [lead_id for lead_id, _ in analyzer.iter_analyze_prospects(prospects, max_workers=4)]
+            assert sorted(order) == sorted(p.lead_id for p in prospects)
+            assert order[0] != "lead_0", "results should stream in completion order"
+            results = analyzer.batch_analyze_prospects(prospects, max_workers=4)
+            assert len(results) == len(prospects)
+            print("✅ Results streamed as they completed")
+
+            print("\n🎉 Content analysis tests passed!")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_content_analysis()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for the tiered AI copy cache
+Checks single-flight deduplication in bulk runs and that a re-run costs zero generations
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Import as a package so the generator's relative imports resolve
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from copy_factory.ai_copy_generator import AICopyGenerator
+from copy_factory.core.models import ICPProfile, ProspectData
+
+
+class CountingGenerator(AICopyGenerator):
+    """Counts (slow) API calls so concurrent duplicate misses would show up"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.api_calls = 0
+        self._calls_lock = threading.Lock()
+
+    def _call_ai_api(self, prompt: str) -> str:
+        with self._calls_lock:
+            self.api_calls += 1
+        time.sleep(0.01)
+        return super()._call_ai_api(prompt)
+
+
+def test_copy_cache():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print("🧪 Testing tiered copy cache...")
+        cache_path = str(Path(temp_dir) / "ai_cache.sqlite3")
+        icp = ICPProfile(id="test_icp", name="Test ICP", description="Test",
+                         technographics={"language": ["Python"]}, firmographics={}, triggers=[])
+        # 200 prospects, each listed 5 times: duplicates are in flight together
+        unique = [ProspectData(lead_id=f"lead_{i}", login=f"user{i}", name=f"User {i}",
+                               email_profile=f"user{i}@example.com", language="Python")
+                  for i in range(200)]
+        prospects = [p for p in unique for _ in range(5)]
+
+        print("\n1️⃣ Cold bulk run with duplicate prospects...")
+        gen = CountingGenerator(cache_path=cache_path)
+        results = gen.bulk_generate_copy(prospects, icp, max_workers=8)
+        stats = gen.get_cache_stats()
+        assert len(results) == len(prospects)
+        assert gen.api_calls == len(unique), f"expected {len(unique)} API calls, got {gen.api_calls}"
+        assert stats['generations'] == len(unique)
+        print(f"✅ {gen.api_calls} API calls for {len(prospects)} requests "
+              f"({stats['singleflight_waits']} coalesced, {stats['memory_hits']} memory hits)")
+
+        print("\n2️⃣ Re-run in a fresh process-equivalent (disk tier only)...")
+        gen2 = CountingGenerator(cache_path=cache_path)
+        results2 = gen2.bulk_generate_copy(unique, icp, max_workers=8)
+        stats2 = gen2.get_cache_stats()
+        assert gen2.api_calls == 0 and stats2['generations'] == 0
+        assert stats2['disk_hits'] == len(unique) and stats2['misses'] == 0
+        assert {r['prospect_id'] for r in results2} == {p.lead_id for p in unique}
+        print(f"✅ Zero generation calls on re-run ({stats2['disk_hits']} disk hits)")
+
+        print("\n3️⃣ TTL expiry...")
+        gen3 = CountingGenerator(cache_path=cache_path, cache_ttl_seconds=0)
+        gen3.generate_personalized_copy(unique[0], icp)
+        assert gen3.api_calls == 1
+        assert gen3.get_cache_stats()['expired_evictions'] == len(unique)
+        print("✅ Expired entries evicted and regenerated")
+
+        print("\n🎉 Copy cache tests passed!")
+
+
+if __name__ == "__main__":
+    test_copy_cache()
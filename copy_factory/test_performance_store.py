@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for the partitioned performance store
+Checks exact campaign matching, incremental daily rollups, legacy import and rebuilds
+"""
+
+import json
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.performance_store import PerformanceStore
+
+
+def test_performance_store():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print("🧪 Testing performance store...")
+        base = Path(temp_dir) / "performance"
+        base.mkdir()
+
+        # A flat file from before partitioning
+        legacy = {'campaign_id': 'camp', 'emails_sent': 10, 'opens': 4, 'responses': 1,
+                  'tracked_at': (datetime.now() - timedelta(days=2)).isoformat()}
+        (base / "performance_camp_20240101_000000.json").write_text(json.dumps(legacy))
+
+        store = PerformanceStore(str(base))
+
+        print("\n1️⃣ Legacy import...")
+        assert not list(base.glob("performance_*.json"))
+        assert store.get_rollups(['camp'])[0]['opens'] == 4
+        print("✅ Legacy file moved into its day partition")
+
+        print("\n2️⃣ Incremental rollups over 90 days...")
+        now = datetime.now()
+        for day in range(90):
+            for _ in range(5):
+                store.append('camp', {'emails_sent': 100, 'opens': 20 + day % 7, 'responses': 2,
+                                      'conversions': 1}, now - timedelta(days=day))
+                store.append('camp_2', {'emails_sent': 50, 'opens': 10}, now - timedelta(days=day))
+        rollups = store.get_rollups(['camp'], days_back=90)
+        assert len(rollups) == 90, len(rollups)
+        assert [r['day'] for r in rollups] == sorted(r['day'] for r in rollups)
+        today = rollups[-1]
+        assert today['documents'] == 5 and today['emails_sent'] == 500
+        print(f"✅ {sum(r['documents'] for r in rollups)} records summarised in {len(rollups)} rollup rows")
+
+        print("\n3️⃣ Exact campaign matching...")
+        assert {r['campaign_id'] for r in store.get_rollups(['camp'], 90)} == {'camp'}
+        paths = store.partition_paths(['camp'], days_back=0)
+        assert [p.name for p in paths] == ['camp.jsonl']
+        assert len(list(store.iter_records(['camp'], days_back=0))) == 5
+        print("✅ 'camp' does not match 'camp_2'")
+
+        print("\n4️⃣ Rebuild from partitions...")
+        before = store.get_rollups(days_back=90)
+        store.rebuild_rollups()
+        assert store.get_rollups(days_back=90) == before
+        store.close()
+        print("✅ Rollups rebuilt identically")
+
+        print("\n🎉 Performance store tests passed!")
+
+
+if __name__ == "__main__":
+    test_performance_store()
@@ -12,7 +12,7 @@ import json
 import hashlib
 import re
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Set, Any
+from typing import Dict, List, Optional, Set, Any, Tuple
 import copy
 import requests
 from requests.adapters import HTTPAdapter
@@ -21,6 +21,7 @@ import yaml
 import argparse
 from dataclasses import dataclass, asdict
 from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 import sqlite3
 
@@ -29,7 +30,11 @@ from lead_intelligence.core.prospect_scorer import ProspectScorer
 from lead_intelligence.core.concurrent_processor import ConcurrentProcessor, ProcessingResult
 from lead_intelligence.core.job_metadata import JobTracker, JobStats
 from lead_intelligence.core.identity_deduper import IdentityDeduper
-from lead_intelligence.core.timezone_utils import days_ago
+from lead_intelligence.core.group_commit_writer import GroupCommitCSVWriter
+from lead_intelligence.core.timezone_utils import days_ago, to_utc_iso8601, utc_now
+from lead_intelligence.core.query_sharding import ShardPlanner, ShardPlanCache, SEARCH_RESULT_CAP
+from lead_intelligence.core.signal_cursor import SignalCursorStore, signal_record
+from lead_intelligence.core.icp_catalog import load_yaml
 
 
 @dataclass
@@ -181,11 +186,19 @@ class TimeoutSession(requests.Session):
 class GitHubScraper:
     """Scrapes GitHub for prospect data"""
 
-    def __init__(self, token: str, config: dict, output_path: str = None, output_dir: Optional[str] = None, icp_config_path: Optional[str] = None):
+    # Collaborator listing pages per repo before falling back to per-login lookups
+    COLLABORATOR_MAX_PAGES = 3
+    # Commit pages per repo when fetching back to the signal cursor
+    COMMIT_MAX_PAGES = 10
+
+    def __init__(self, token: str, config: dict, output_path: str = None, output_dir: Optional[str] = None, icp_config_path: Optional[str] = None, resume: bool = False):
         self.token = token
         self.config = config
         self.output_path = output_path
         self.output_dir = output_dir
+        # Resume an interrupted incremental CSV (see GroupCommitCSVWriter)
+        self.resume = resume
+        self.resumed_logins: Set[str] = set()
 
         # Initialize token rotation support
         self.tokens = [token] if token else []
@@ -204,8 +217,7 @@ class GitHubScraper:
         self.icp_config = {}
         if icp_config_path:
             try:
-                with open(icp_config_path, 'r') as f:
-                    self.icp_config = yaml.safe_load(f) or {}
+                self.icp_config = load_yaml(icp_config_path)
                 # Add ICP config to main config for backward compatibility
                 self.config['icp'] = self.icp_config
             except Exception as e:
@@ -242,6 +254,11 @@ class GitHubScraper:
         self.user_cache: Dict[str, Dict] = {}
         self.contrib_cache: Dict[str, Dict] = {}
         self.org_cache: Dict[str, Dict] = {}
+        # Maintainer-status memoization (per repo / per owner / per org member)
+        self.collaborator_cache: Dict[str, Dict[str, str]] = {}
+        self.codeowners_cache: Dict[str, Set[str]] = {}
+        self.owner_is_org_cache: Dict[str, bool] = {}
+        self.org_membership_cache: Dict[tuple, bool] = {}
         # Initialize ProspectScorer
         self.prospect_scorer = ProspectScorer(icp_config_path)
 
@@ -278,6 +295,27 @@ class GitHubScraper:
                 self.dedup_enabled = False
                 self._dedup_conn = None
 
+        # Shard plans for searches over GitHub's 1000-result cap
+        search_cfg = self.config.get('search') or {}
+        self.shard_workers = int(search_cfg.get('shard_concurrency') or concurrency_config.get('max_workers', 4))
+        self.shard_planner = ShardPlanner(
+            cache=ShardPlanCache(search_cfg.get('shard_cache') or 'data/shard_plans.json',
+                                 ttl_hours=float(search_cfg.get('shard_cache_ttl_hours', 24))),
+            probe_workers=self.shard_workers
+        )
+
+        # Per-repo commit cursors: later runs fetch only commits since the last one seen
+        signals_cfg = self.config.get('signals') or {}
+        self.signal_cursors: Optional[SignalCursorStore] = None
+        if signals_cfg.get('incremental', True):
+            try:
+                self.signal_cursors = SignalCursorStore(
+                    signals_cfg.get('cursor_db') or 'data/signal_cursors.sqlite3',
+                    window_days=int(signals_cfg.get('window_days', 90))
+                )
+            except Exception as e:
+                print(f"⚠️  Signal cursor DB init failed: {e}. Fetching full windows.")
+
     def _get_auth_header(self, token: str) -> str:
         """Get the appropriate authorization header based on token format"""
         if not token:
@@ -380,8 +418,10 @@ class GitHubScraper:
                     if self._try_rotate_token():
                         return True  # Successfully rotated, retry the request
 
-                    # No backup tokens available, wait
+                    # No backup tokens available, wait (buffered CSV rows are committed first)
                     print(f"⏱️  No backup tokens available. Waiting {wait_time/60:.1f} minutes...")
+                    if self.csv_writer:
+                        self.csv_writer.commit()
                     time.sleep(wait_time)
                     return True
         return False
@@ -639,7 +679,6 @@ class GitHubScraper:
     def _init_csv_file(self):
         """Initialize CSV file for incremental writing"""
         if self.output_path and not self.csv_initialized:
-            self.csv_file = open(self.output_path, 'w', newline='', encoding='utf-8')
             # Define all fieldnames from Prospect dataclass
             fieldnames = [
                 # Core identification
@@ -681,16 +720,34 @@ class GitHubScraper:
                 'two_factor_authentication', 'has_organization_projects',
                 'has_repository_projects'
             ]
-            self.csv_writer = csv.DictWriter(self.csv_file, fieldnames=fieldnames)
-            self.csv_writer.writeheader()
-            self.csv_file.flush()
+            writer_cfg = self.config.get('csv_writer') or {}
+            self.csv_writer = GroupCommitCSVWriter(
+                self.output_path,
+                fieldnames,
+                commit_rows=int(writer_cfg.get('commit_rows', 100)),
+                commit_interval_ms=int(writer_cfg.get('commit_interval_ms', 1000)),
+                fsync=bool(writer_cfg.get('fsync', False)),
+                resume=self.resume,
+            )
+            self.csv_file = self.csv_writer
+            if self.resume and self.csv_writer.committed_rows:
+                # Pre-seed in-run dedup from the committed part of the partial file
+                self.prospects.update(self.csv_writer.committed_lead_ids)
+                self.resumed_logins.update(self.csv_writer.committed_logins)
+                self.leads_with_email_count += self.csv_writer.committed_with_email
+                print(f"♻️  Resuming {self.output_path}: {self.csv_writer.committed_rows} rows already committed "
+                      f"({len(self.resumed_logins)} logins skipped)")
             self.csv_initialized = True
 
     def _write_prospect_to_csv(self, prospect: Prospect):
-        """Write a single prospect to CSV file immediately"""
+        """Write a single prospect to CSV; made durable by the writer's group commit"""
         if self.csv_writer:
-            self.csv_writer.writerow(prospect.to_dict())
-            self.csv_file.flush()  # Ensure data is written immediately
+            self.csv_writer.write_row(
+                prospect.to_dict(),
+                login=prospect.login,
+                lead_id=prospect.lead_id,
+                has_email=bool(prospect.email_profile or prospect.email_public_commit),
+            )
 
     def _close_csv_file(self):
         """Close CSV file"""
@@ -763,15 +820,74 @@ class GitHubScraper:
         return base_query
 
     def search_repos(self) -> List[Dict]:
-        """Search GitHub repos based on config criteria with ICP filtering"""
-        repos = []
+        """Search GitHub repos based on config criteria with ICP filtering
 
+        When more repos are wanted than one search can return (1000), the query
+        is split into date/star range shards that are searched concurrently and
+        merged without duplicates.
+        """
         # Build query with ICP filters
-        query = self._build_icp_query()
+        query = self._render_query(self._build_icp_query())
+        max_repos = self.config['limits']['max_repos']
+
+        if max_repos <= SEARCH_RESULT_CAP or not self.config['search'].get('shard', True):
+            return self._search_query(query, max_repos)
+
+        shards = self.shard_planner.plan(query, self._count_repos)
+        if len(shards) == 1:
+            return self._search_query(shards[0].query, max_repos)
+
+        total = sum(s.total_count or 0 for s in shards)
+        tqdm.write(f"🧩 {total} matching repos; searching {len(shards)} shards with {self.shard_workers} workers")
+        repos: List[Dict] = []
+        seen: Set[Any] = set()
+        with ThreadPoolExecutor(max_workers=self.shard_workers) as executor:
+            futures = [executor.submit(self._search_query, shard.query, max_repos) for shard in shards]
+            for future in as_completed(futures):
+                try:
+                    shard_repos = future.result()
+                except Exception as e:
+                    tqdm.write(f"⚠️  Shard search failed: {e}")
+                    continue
+                for repo in shard_repos:
+                    key = repo.get('id', repo.get('full_name'))
+                    if key not in seen:
+                        seen.add(key)
+                        repos.append(repo)
+                if len(repos) >= max_repos:
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+        # Shards finish in any order; restore the requested sort
+        sort = self.config['search'].get('sort', 'updated')
+        sort_field = {'updated': 'updated_at', 'stars': 'stargazers_count', 'forks': 'forks_count'}.get(sort)
+        if sort_field:
+            reverse = self.config['search'].get('order', 'desc') == 'desc'
+            missing = '' if sort == 'updated' else 0
+            repos.sort(key=lambda r: r.get(sort_field) or missing, reverse=reverse)
+        return repos[:max_repos]
+
+    def _count_repos(self, query: str) -> Optional[int]:
+        """total_count for a repository search, None if the probe fails"""
+        url = "https://api.github.com/search/repositories"
+        params = {'q': query, 'per_page': 1}
+        for _ in range(3):
+            response = self.session.get(url, headers=self.headers, params=params, timeout=self.timeout_secs)
+            if self._rate_limit_wait(response):
+                continue
+            if response.status_code != 200:
+                return None
+            return (response.json() or {}).get('total_count')
+        return None
+
+    def _search_query(self, query: str, max_repos: int) -> List[Dict]:
+        """Page through one search query (at most 1000 results)"""
+        repos = []
+
         sort = self.config['search'].get('sort', 'updated')
         order = self.config['search'].get('order', 'desc')
         per_page = min(self.config['search'].get('per_page', 30), 100)
-        max_repos = self.config['limits']['max_repos']
 
         page = 1
         est_pages = max(1, (max_repos + per_page - 1) // per_page)
@@ -1128,91 +1244,226 @@ class GitHubScraper:
 
     def check_maintainer_status(self, repo_full_name: str, username: str) -> Dict[str, bool]:
         """Check if user is a maintainer/collaborator with permissions on the repo"""
-        result = {
+        return self.resolve_maintainer_statuses(repo_full_name, [username]).get(username) or self._empty_maintainer_status()
+
+    @staticmethod
+    def _empty_maintainer_status() -> Dict[str, Any]:
+        return {
             'is_maintainer': False,
             'is_org_member': False,
             'permission_level': 'read',
             'is_codeowner': False
         }
 
-        if not (self.token and self.token.strip()):
-            return result
+    def resolve_maintainer_statuses(self, repo_full_name: str, usernames: List[str], owner_type: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Resolve maintainer status for a set of contributors of one repo.
+
+        Repo-level facts are fetched once and memoized: the collaborator permission map
+        (one paginated listing instead of one call per login), the parsed CODEOWNERS
+        owners (negative results included) and whether the owner is an org. Only org
+        membership remains per login, and it is cached per (org, login).
+        """
+        results = {u: self._empty_maintainer_status() for u in usernames if u}
+        if not results or not (self.token and self.token.strip()):
+            return results
 
         try:
-            # Check collaborator permissions
-            collab_url = f"https://api.github.com/repos/{repo_full_name}/collaborators/{username}/permission"
-            response = self.session.get(collab_url, headers=self.headers, timeout=10)
+            permissions = self._get_collaborator_permissions(repo_full_name, list(results))
+            codeowners = self._get_codeowners(repo_full_name)
+            owner = repo_full_name.split('/')[0]
+            owner_is_org = self._owner_is_org(owner, owner_type)
+
+            for username, result in results.items():
+                permission = permissions.get(username.lower())
+                if permission:
+                    result['permission_level'] = permission
+                    result['is_maintainer'] = permission in ['admin', 'maintain', 'write']
+                result['is_codeowner'] = username.lower() in codeowners
+                if owner_is_org:
+                    result['is_org_member'] = self._check_org_membership(owner, username)
+        except Exception:
+            # Silently handle permission errors (user might not have access)
+            pass
 
-            if response.status_code == 200:
-                data = response.json()
-                permission = data.get('permission', 'read')
-                result['permission_level'] = permission
-                result['is_maintainer'] = permission in ['admin', 'maintain', 'write']
+        return results
 
-            # Check CODEOWNERS file
-            result['is_codeowner'] = self._check_codeowners(repo_full_name, username)
+    def _get_collaborator_permissions(self, repo_full_name: str, usernames: List[str]) -> Dict[str, str]:
+        """Map of lowercased login -> permission for the repo, listed once and memoized.
 
-            # Check organization membership
-            owner_org = repo_full_name.split('/')[0]
-            result['is_org_member'] = self._check_org_membership(owner_org, username)
+        Listing collaborators requires push access. Without it the per-login permission
+        endpoint is denied as well, so a 403/404 is cached as "no permission data" and
+        no further calls are made for this repo. Only a complete listing or a 403/404
+        is cached: a 5xx, 401 or rate limit would otherwise report every later
+        contributor of the repo as having no permission for the rest of the run.
+        """
+        cached = self.collaborator_cache.get(repo_full_name)
+        if cached is not None:
+            return cached
+
+        permissions: Dict[str, str] = {}
+        url = f"https://api.github.com/repos/{repo_full_name}/collaborators"
+        params = {'affiliation': 'all', 'per_page': 100}
+        for _ in range(self.COLLABORATOR_MAX_PAGES):
+            response = self.session.get(url, headers=self.headers, params=params, timeout=10)
+            if self._rate_limit_wait(response):
+                response = self.session.get(url, headers=self.headers, params=params, timeout=10)
+            if response.status_code != 200:
+                if response.status_code in (403, 404) and not self._is_rate_limited(response):
+                    self.collaborator_cache[repo_full_name] = permissions
+                return permissions
+            for collab in response.json() or []:
+                login = (collab.get('login') or '').lower()
+                if login:
+                    permissions[login] = self._permission_from_collaborator(collab)
+            next_url = (response.links or {}).get('next', {}).get('url')
+            if not next_url:
+                self.collaborator_cache[repo_full_name] = permissions
+                return permissions
+            url, params = next_url, None
+
+        # Very large collaborator lists: fall back to per-login lookups for the rest. The
+        # map only covers these usernames, so it is not cached under the repo
+        for username in usernames:
+            if username.lower() not in permissions:
+                permission = self._get_collaborator_permission(repo_full_name, username)
+                if permission:
+                    permissions[username.lower()] = permission
+        return permissions
+
+    @staticmethod
+    def _is_rate_limited(response) -> bool:
+        """429, or a 403 caused by an exhausted rate limit rather than missing access"""
+        if response.status_code == 429:
+            return True
+        return response.status_code == 403 and (
+            response.headers.get('X-RateLimit-Remaining') == '0' or 'rate limit' in (response.text or '').lower()
+        )
 
-        except Exception as e:
-            # Silently handle permission errors (user might not have access)
-            pass
+    @staticmethod
+    def _permission_from_collaborator(collab: Dict) -> str:
+        role = collab.get('role_name')
+        if role in ('admin', 'maintain', 'write', 'triage', 'read'):
+            return role
+        perms = collab.get('permissions') or {}
+        for key, level in (('admin', 'admin'), ('maintain', 'maintain'), ('push', 'write'), ('triage', 'triage')):
+            if perms.get(key):
+                return level
+        return 'read'
+
+    def _get_collaborator_permission(self, repo_full_name: str, username: str) -> Optional[str]:
+        url = f"https://api.github.com/repos/{repo_full_name}/collaborators/{username}/permission"
+        response = self.session.get(url, headers=self.headers, timeout=10)
+        if response.status_code == 200:
+            return response.json().get('permission', 'read')
+        return None
 
-        return result
+    def _get_codeowners(self, repo_full_name: str) -> Set[str]:
+        """Lowercased individual owners from the repo's CODEOWNERS files, fetched once per repo"""
+        cached = self.codeowners_cache.get(repo_full_name)
+        if cached is not None:
+            return cached
 
-    def _check_codeowners(self, repo_full_name: str, username: str) -> bool:
-        """Check if user is listed in CODEOWNERS file"""
+        owners: Set[str] = set()
+        # Only definitive answers (200 or 404 for every location) are cached; a rate limit,
+        # 5xx or timeout would otherwise hide this repo's CODEOWNERS for the rest of the run
+        definitive = True
         try:
+            import base64
             # Try common CODEOWNERS file locations
-            codeowners_paths = ['CODEOWNERS', '.github/CODEOWNERS', 'docs/CODEOWNERS']
-
-            for path in codeowners_paths:
+            for path in ['CODEOWNERS', '.github/CODEOWNERS', 'docs/CODEOWNERS']:
                 url = f"https://api.github.com/repos/{repo_full_name}/contents/{path}"
                 response = self.session.get(url, headers=self.headers, timeout=10)
+                if self._rate_limit_wait(response):
+                    response = self.session.get(url, headers=self.headers, timeout=10)
+                if response.status_code != 200:
+                    definitive = definitive and response.status_code == 404
+                    continue
+                content = base64.b64decode(response.json()['content']).decode('utf-8')
 
-                if response.status_code == 200:
-                    import base64
-                    data = response.json()
-                    content = base64.b64decode(data['content']).decode('utf-8')
-
-                    # Parse CODEOWNERS format
-                    for line in content.split('\n'):
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            # Remove comments from line
-                            line = line.split('#')[0].strip()
-                            if line:
-                                parts = line.split()
-                                if parts:
-                                    pattern = parts[0]
-                                    owners = parts[1:]
-                                    if username in owners or f'@{username}' in owners:
-                                        return True
+                # Parse CODEOWNERS format: "<pattern> @owner1 @org/team email@x"
+                for line in content.split('\n'):
+                    line = line.split('#')[0].strip()
+                    if not line:
+                        continue
+                    for owner in line.split()[1:]:
+                        owners.add(owner.lstrip('@').lower())
         except Exception:
-            pass
+            definitive = False
 
-        return False
+        # Missing files are cached too, so repos without CODEOWNERS cost three calls once
+        if definitive:
+            self.codeowners_cache[repo_full_name] = owners
+        return owners
+
+    def _check_codeowners(self, repo_full_name: str, username: str) -> bool:
+        """Check if user is listed in CODEOWNERS file"""
+        return bool(username) and username.lower() in self._get_codeowners(repo_full_name)
+
+    def _owner_is_org(self, owner: str, owner_type: Optional[str] = None) -> bool:
+        """Whether a repo owner is an organization; learned once per owner"""
+        if owner in self.owner_is_org_cache:
+            return self.owner_is_org_cache[owner]
+        if owner_type:
+            is_org = owner_type == 'Organization'
+        elif self.org_cache.get(owner):
+            is_org = True
+        else:
+            # /orgs/{owner} is 404 for user accounts; any other failure is not cached
+            url = f"https://api.github.com/orgs/{owner}"
+            response = self.session.get(url, headers=self.headers, timeout=10)
+            if self._rate_limit_wait(response):
+                response = self.session.get(url, headers=self.headers, timeout=10)
+            if response.status_code == 200:
+                self.org_cache[owner] = response.json()
+                is_org = True
+            elif response.status_code == 404:
+                is_org = False
+            else:
+                return False
+        self.owner_is_org_cache[owner] = is_org
+        return is_org
 
     def _check_org_membership(self, org_name: str, username: str) -> bool:
         """Check if user is a member of the organization"""
+        key = (org_name, (username or '').lower())
+        if key in self.org_membership_cache:
+            return self.org_membership_cache[key]
         try:
             # Check if org_name looks like an organization (not a user)
-            org_url = f"https://api.github.com/orgs/{org_name}"
-            org_response = self.session.get(org_url, headers=self.headers, timeout=10)
-
-            if org_response.status_code != 200:
-                return False  # Not an org or doesn't exist
+            if not self._owner_is_org(org_name):
+                if org_name not in self.owner_is_org_cache:
+                    return False  # Org lookup failed; ask again next time
+                is_member = False  # Not an org or doesn't exist
+            else:
+                # Check membership
+                membership_url = f"https://api.github.com/orgs/{org_name}/members/{username}"
+                membership_response = self.session.get(membership_url, headers=self.headers, timeout=10)
+                if membership_response.status_code not in (204, 404):
+                    return False
+                is_member = membership_response.status_code == 204  # 204 means member, 404 means not
+        except Exception:
+            return False
 
-            # Check membership
-            membership_url = f"https://api.github.com/orgs/{org_name}/members/{username}"
-            membership_response = self.session.get(membership_url, headers=self.headers, timeout=10)
+        self.org_membership_cache[key] = is_member
+        return is_member
 
-            return membership_response.status_code == 204  # 204 means member, 404 means not
+    def _follow_next_pages(self, response, max_pages: int) -> Tuple[List[Dict], bool]:
+        """Items of `response` plus the `Link: next` pages after it
 
-        except Exception:
-            return False
+        The flag is False if a page failed or `max_pages` ran out first.
+        """
+        items = list(response.json() or [])
+        for _ in range(max_pages - 1):
+            next_url = (response.links or {}).get('next', {}).get('url')
+            if not next_url:
+                return items, True
+            response = self.session.get(next_url, headers=self.headers, timeout=10)
+            if self._rate_limit_wait(response):
+                response = self.session.get(next_url, headers=self.headers, timeout=10)
+            if response.status_code != 200:
+                return items, False
+            items.extend(response.json() or [])
+        return items, not (response.links or {}).get('next')
 
     def get_maintainer_contributors(self, repo: Dict, max_contributors: int = 10) -> List[Dict]:
         """Get maintainers and core contributors for a repo based on recent activity"""
@@ -1228,9 +1479,11 @@ class GitHubScraper:
         try:
             # Get recent contributors via commits API (more reliable than contributors endpoint)
             commits_url = f"https://api.github.com/repos/{repo_full_name}/commits"
+            since = self.signal_cursors.since(repo_full_name, 'commit') if self.signal_cursors else days_ago(90)
             params = {
-                'per_page': min(max_contributors * 3, 100),  # Get more to filter
-                'since': days_ago(90)
+                # Get more to filter; with cursors every commit since the last run is paged in
+                'per_page': 100 if self.signal_cursors else min(max_contributors * 3, 100),
+                'since': since
             }
 
             response = self.session.get(commits_url, headers=self.headers, params=params, timeout=10)
@@ -1242,18 +1495,33 @@ class GitHubScraper:
                 commits = response.json()
                 author_counts = {}
 
-                # Count commits by author
-                for commit in commits:
-                    if commit.get('author') and commit['author']['type'] == 'User':
-                        author_login = commit['author']['login']
-                        author_counts[author_login] = author_counts.get(author_login, 0) + 1
+                if self.signal_cursors:
+                    # Merge every new commit into the stored 90-day rollup and count from it;
+                    # the cursor only advances if the pages reached it
+                    commits, complete = self._follow_next_pages(response, self.COMMIT_MAX_PAGES)
+                    records = [r for r in (signal_record('commit', c) for c in commits) if r]
+                    self.signal_cursors.merge(repo_full_name, 'commit', records, advance_cursor=complete)
+                    author_counts = self.signal_cursors.author_counts(repo_full_name, 'commit')
+                else:
+                    # Count commits by author
+                    for commit in commits:
+                        if commit.get('author') and commit['author']['type'] == 'User':
+                            author_login = commit['author']['login']
+                            author_counts[author_login] = author_counts.get(author_login, 0) + 1
 
                 # Sort by commit count and get top contributors
                 sorted_authors = sorted(author_counts.items(), key=lambda x: x[1], reverse=True)
 
-                for login, commit_count in sorted_authors[:max_contributors]:
-                    # Get maintainer status for this user
-                    maintainer_info = self.check_maintainer_status(repo_full_name, login)
+                top_authors = sorted_authors[:max_contributors]
+                # Resolve maintainer status for the whole top-N set in one pass
+                maintainer_statuses = self.resolve_maintainer_statuses(
+                    repo_full_name,
+                    [login for login, _ in top_authors],
+                    owner_type=(repo.get('owner') or {}).get('type'),
+                )
+
+                for login, commit_count in top_authors:
+                    maintainer_info = maintainer_statuses.get(login) or self._empty_maintainer_status()
 
                     # Get user details
                     user_details = self.get_user_details(login)
@@ -1528,7 +1796,7 @@ class GitHubScraper:
 
         # Dedup: skip if we've seen this login before
         login_val = user.get('login')
-        if not login_val or self._dedup_seen(login_val):
+        if not login_val or login_val in self.resumed_logins or self._dedup_seen(login_val):
             return None
 
         # Generate stable lead_id
@@ -2222,6 +2490,10 @@ class GitHubScraper:
                 # Update main progress bar with current stats (leads = with email)
                 repo_pbar.set_postfix(prospects=len(self.all_prospects), leads=self.leads_with_email_count)
 
+                # Repos without new prospects write no rows; keep the commit interval a time bound
+                if self.csv_writer:
+                    self.csv_writer.commit_if_due()
+
                 # Check if we've hit our leads (people with email) limit
                 if self.leads_with_email_count >= self.config['limits']['max_people']:
                     repo_pbar.set_description(f"Reached max leads limit ({self.config['limits']['max_people']})")
@@ -2579,7 +2851,16 @@ def main():
     parser.add_argument('--dedup-db', default=os.environ.get('DEDUP_DB', 'data/dedup.db'), help='Path to SQLite DB for dedup (default: $DEDUP_DB or data/dedup.db)')
     parser.add_argument('--no-dedup', action='store_true', help='Disable deduplication (process all logins)')
     parser.add_argument('--timeout-secs', type=int, default=int(os.environ.get('HTTP_TIMEOUT_SECS', '15')), help='HTTP request timeout seconds (default: $HTTP_TIMEOUT_SECS or 15)')
+    parser.add_argument('--resume', action='store_true', help='Resume an interrupted run: keep committed rows in --out and skip their logins')
+    parser.add_argument('--commit-rows', type=int, default=100, help='Incremental CSV group commit: flush every N rows (default: 100)')
+    parser.add_argument('--commit-interval-ms', type=int, default=1000, help='Incremental CSV group commit: flush at least every T ms (default: 1000)')
+    parser.add_argument('--fsync', action='store_true', help='fsync the CSV and its commit sidecar on every group commit')
     args = parser.parse_args()
+    csv_writer_config = {
+        'commit_rows': args.commit_rows,
+        'commit_interval_ms': args.commit_interval_ms,
+        'fsync': args.fsync,
+    }
 
     # Check for GitHub token
     # Prefer token from config.github.token_env, then GITHUB_TOKEN, then GH_TOKEN
@@ -2621,6 +2902,7 @@ def main():
         }
         # HTTP timeout
         config['http'] = {'timeout_secs': args.timeout_secs}
+        config['csv_writer'] = csv_writer_config
         # Apply overrides in URL mode
         if args.max_repos or args.repos:
             config['limits']['max_repos'] = args.repos or args.max_repos
@@ -2639,7 +2921,7 @@ def main():
         if output_path:
             os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
 
-        scraper = GitHubScraper(token, config, output_path, None)
+        scraper = GitHubScraper(token, config, output_path, None, resume=args.resume)
 
         # Initialize CSV if needed
         if output_path:
@@ -2684,6 +2966,7 @@ def main():
         # Inject HTTP timeout
         config.setdefault('http', {})
         config['http']['timeout_secs'] = args.timeout_secs
+        config['csv_writer'] = csv_writer_config
     except FileNotFoundError:
         print(f"❌ Error: Config file '{args.config}' not found")
         print("Creating default config...")
@@ -2757,7 +3040,7 @@ def main():
         return
 
     # Single-query mode
-    scraper = GitHubScraper(token, config, args.out, args.out_dir)
+    scraper = GitHubScraper(token, config, args.out, args.out_dir, resume=args.resume)
     scraper.scrape()
 
     scraper._close_csv_file()
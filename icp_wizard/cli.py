@@ -14,7 +14,7 @@ from typing import Optional
 sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from icp_wizard.core.icp_wizard import ICPWizard
+from icp_wizard.core.icp_wizard import ICPWizard, StreamHandler
 from icp_wizard.core.memory_system import ConversationMemory
 from icp_wizard.utils.logging_utils import setup_logging, get_logger
 
@@ -41,13 +41,36 @@ def setup_environment():
         sys.exit(1)
 
 
+class ConsoleStreamHandler(StreamHandler):
+    """Prints assistant replies to the terminal as tokens arrive"""
+
+    def __init__(self, show_timings: bool = False):
+        self.show_timings = show_timings
+
+    def on_message_start(self, stage: str) -> None:
+        sys.stdout.write("\n🤖 ")
+        sys.stdout.flush()
+
+    def on_token(self, stage: str, token: str) -> None:
+        sys.stdout.write(token)
+        sys.stdout.flush()
+
+    def on_message_end(self, stage: str, timing: dict) -> None:
+        sys.stdout.write("\n")
+        if self.show_timings:
+            sys.stdout.write(f"   ⏱️  {stage}: first token {timing['ttft_ms']:.0f}ms, "
+                             f"total {timing['llm_ms']:.0f}ms (prep {timing['prepare_ms']:.0f}ms)\n")
+        sys.stdout.flush()
+
+
 def run_icp_wizard(
     api_key: Optional[str] = None,
     output_file: Optional[str] = None,
     user_identifier: Optional[str] = None,
     memory_dir: Optional[Path] = None,
     config_dir: Optional[Path] = None,
-    verbose: bool = False
+    verbose: bool = False,
+    stream: bool = True
 ) -> Optional[dict]:
     """Run the enhanced interactive ICP wizard with memory"""
     try:
@@ -65,7 +88,8 @@ def run_icp_wizard(
             api_key=api_key,
             user_identifier=user_identifier,
             memory_dir=memory_dir,
-            config_dir=config_dir
+            config_dir=config_dir,
+            stream_handler=ConsoleStreamHandler(show_timings=verbose) if stream else None
         )
 
         # Show memory insights for returning users
@@ -84,6 +108,11 @@ def run_icp_wizard(
 
         result = wizard.run_wizard()
 
+        if verbose:
+            for stage, timing in wizard.get_stage_timings().items():
+                logger.debug(f"{stage}: {timing['turns']} turns, avg first token {timing['ttft_ms']}ms, "
+                             f"avg total {timing['llm_ms']}ms")
+
         if result:
             config = result
 
@@ -437,6 +466,8 @@ Examples:
                        help='OpenAI API key (can also be set via OPENAI_API_KEY env var)')
     parser.add_argument('--user-id', '-u',
                        help='User identifier for memory system (auto-generated if not provided)')
+    parser.add_argument('--no-stream', action='store_true',
+                       help='Print assistant replies only once complete instead of streaming them')
 
     # Debugging options
     parser.add_argument('--verbose', '-v', action='store_true',
@@ -472,7 +503,8 @@ Examples:
             user_identifier=args.user_id,
             memory_dir=Path(args.memory_dir) if args.memory_dir else None,
             config_dir=Path(args.config_dir) if args.config_dir else None,
-            verbose=args.verbose or args.debug
+            verbose=args.verbose or args.debug,
+            stream=not args.no_stream
         )
 
         if config:
@@ -3,11 +3,12 @@
 ICP Wizard Core Components
 """
 
-from .icp_wizard import ICPWizard, ICPConfiguration
+from .icp_wizard import ICPWizard, ICPConfiguration, StreamHandler
 from .memory_system import ConversationMemory
 
 __all__ = [
     "ICPWizard",
     "ICPConfiguration",
+    "StreamHandler",
     "ConversationMemory"
 ]
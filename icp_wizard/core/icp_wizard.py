@@ -7,6 +7,7 @@ import os
 import json
 import asyncio
 import hashlib
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Any, TypedDict, Tuple
 from datetime import datetime, timedelta
@@ -17,11 +18,101 @@ from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 
+from lead_intelligence.core.icp_catalog import ICPCatalog, get_catalog
 from .memory_system import ConversationMemory, UserProfile
 from ..utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
 
+# Prompt templates are compiled into chains once per wizard; everything
+# user-provided goes through template variables, never string interpolation
+PROMPT_TEMPLATES = {
+    "greeting_returning": """
+    You are an expert sales intelligence consultant helping a user discover their Ideal Customer Profile (ICP).
+
+    This is a returning user with {conversation_count} previous conversations and a {success_rate}% success rate.
+    Their preferences include:
+    - Preferred ICP types: {preferred_icps}
+    - Common industries: {common_industries}
+    - Technical preferences: {technical_preferences}
+
+    Available ICPs:
+    {icp_list}
+
+    Welcome them back warmly, acknowledge their history, and ask what they're looking for this time.
+    Reference their past preferences to make them feel understood.
+    """,
+    "greeting_new": """
+    You are an expert sales intelligence consultant helping a user discover their Ideal Customer Profile (ICP).
+
+    This appears to be their first conversation with the ICP Wizard.
+
+    Available ICPs:
+    {icp_list}
+
+    Give a warm welcome, explain briefly what ICP discovery is about, and ask what type of customers they're looking for.
+    Be conversational and ask open-ended questions to understand their needs.
+    """,
+    "understand_needs": """
+    Analyze the user's input and suggest relevant ICPs from the available options.
+
+    User input: {user_input}
+    Known preferences: {preferences}
+
+    Available ICPs:
+    {icp_details}
+
+    Based on their response:
+    1. Identify which ICPs might be relevant
+    2. Ask clarifying questions if needed
+    3. Explain why certain ICPs match their needs
+    4. Ask for confirmation or more details
+
+    Be conversational and help them refine their understanding.
+    """,
+    "refine_icp": """
+    Help the user refine their ICP selection.
+
+    User input: {user_input}
+    Known preferences: {preferences}
+    Current ICP options: {icp_options}
+
+    Based on their feedback:
+    1. Narrow down ICP suggestions
+    2. Ask about specific criteria (company size, tech stack, location, etc.)
+    3. Explain the characteristics of the suggested ICPs
+    4. Help them understand what makes these profiles ideal
+
+    If they're ready to proceed, summarize the selected ICP and ask for confirmation.
+    """,
+    "confirm_icp": """
+    Help the user confirm their ICP selection.
+
+    User input: {user_input}
+
+    If they seem ready to proceed:
+    1. Summarize the selected ICP
+    2. Explain what data will be collected
+    3. Ask for final confirmation
+    4. If confirmed, prepare to generate the ICP configuration
+
+    If they need more clarification, continue the conversation.
+    """
+}
+
+
+class StreamHandler:
+    """Receives assistant replies token by token; subclass to render them"""
+
+    def on_message_start(self, stage: str) -> None:
+        pass
+
+    def on_token(self, stage: str, token: str) -> None:
+        pass
+
+    def on_message_end(self, stage: str, timing: Dict[str, Any]) -> None:
+        pass
+
 
 @dataclass
 class ICPConfiguration:
@@ -72,9 +163,14 @@ class ICPWizard:
         api_key: Optional[str] = None,
         user_identifier: Optional[str] = None,
         memory_dir: Optional[Path] = None,
-        config_dir: Optional[Path] = None
+        config_dir: Optional[Path] = None,
+        stream_handler: Optional[StreamHandler] = None
     ):
-        """Initialize the ICP Wizard with all components"""
+        """Initialize the ICP Wizard with all components
+
+        With a stream_handler, assistant replies are streamed to it token by
+        token as the LLM produces them instead of being printed once complete.
+        """
         self.api_key = api_key or os.environ.get('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError("OpenAI API key required. Set OPENAI_API_KEY environment variable.")
@@ -90,12 +186,21 @@ class ICPWizard:
         self.llm = ChatOpenAI(
             model="gpt-4o",
             temperature=0.7,
-            api_key=self.api_key
+            api_key=self.api_key,
+            streaming=True
         )
+        self.stream_handler = stream_handler
 
         # Load ICP options
         self.config_dir = config_dir or Path("configs/icp")
-        self.icp_options = self._load_icp_options()
+        self.icp_catalog = self._load_icp_catalog()
+        self.icp_options = self.icp_catalog.icps
+        self._icp_list_text = self._format_icp_list()
+        self._icp_details_text = self._format_icp_details()
+        self._chains = {
+            name: ChatPromptTemplate.from_template(template) | self.llm
+            for name, template in PROMPT_TEMPLATES.items()
+        }
 
         # Create conversation graph
         self.graph = self._create_conversation_graph()
@@ -106,7 +211,8 @@ class ICPWizard:
             "stage_transitions": [],
             "messages_sent": 0,
             "conversation_duration": 0,
-            "success": False
+            "success": False,
+            "stage_timings": []
         }
 
         logger.info(f"Initialized ICP Wizard for user {self.user_identifier}")
@@ -120,23 +226,20 @@ class ICPWizard:
         system_info = f"{socket.gethostname()}_{getpass.getuser()}_{datetime.now().strftime('%Y%m%d')}"
         return hashlib.md5(system_info.encode()).hexdigest()[:8]
 
-    def _load_icp_options(self) -> List[Dict[str, Any]]:
-        """Load available ICP options from configuration"""
+    def _load_icp_catalog(self) -> ICPCatalog:
+        """Load the compiled ICP catalog (shared and cached until options.yaml changes)"""
         try:
-            import yaml
             options_file = self.config_dir / "options.yaml"
 
             if not options_file.exists():
                 logger.warning(f"ICP options file not found: {options_file}")
-                return []
+                return ICPCatalog([])
 
-            with open(options_file, 'r') as f:
-                config = yaml.safe_load(f) or {}
-                return config.get('icp_options', [])
+            return get_catalog(options_file)
 
         except Exception as e:
             logger.error(f"Failed to load ICP options: {e}")
-            return []
+            return ICPCatalog([])
 
     def _create_initial_state(self) -> ICPWizardState:
         """Create enhanced initial state with memory and context"""
@@ -177,57 +280,38 @@ class ICPWizard:
     def _create_conversation_graph(self) -> StateGraph:
         """Create the LangGraph conversation flow"""
 
-        def greeting_node(state: ICPWizardState) -> ICPWizardState:
+        async def greeting_node(state: ICPWizardState) -> ICPWizardState:
             """Enhanced greeting with memory and context awareness"""
             messages = state.get('messages', [])
-            user_profile = state.get('user_profile', {})
-            context_awareness = state.get('context_awareness', {})
+            preferences, _, prepare_seconds = await self._prepare_turn()
 
             # Check if user has previous conversations
-            has_history = context_awareness.get('has_previous_conversations', False)
-            conversation_count = user_profile.get('conversation_count', 0)
+            conversation_count = preferences.get('conversation_count', 0)
 
-            if has_history and conversation_count > 0:
+            if conversation_count > 0:
                 # Personalized greeting for returning users
-                greeting_prompt = f"""
-                You are an expert sales intelligence consultant helping a user discover their Ideal Customer Profile (ICP).
-
-                This is a returning user with {conversation_count} previous conversations and a {user_profile.get('success_rate', 0)*100:.1f}% success rate.
-                Their preferences include:
-                - Preferred ICP types: {', '.join(user_profile.get('preferred_icps', [])) or 'Various'}
-                - Common industries: {', '.join(user_profile.get('common_industries', [])) or 'Various'}
-                - Technical preferences: {', '.join(user_profile.get('technical_preferences', [])) or 'Mixed'}
-
-                Available ICPs:
-                {self._format_icp_list()}
-
-                Welcome them back warmly, acknowledge their history, and ask what they're looking for this time.
-                Reference their past preferences to make them feel understood.
-                """
+                chain = self._chains["greeting_returning"]
+                inputs = {
+                    "conversation_count": conversation_count,
+                    "success_rate": f"{preferences.get('success_rate', 0)*100:.1f}",
+                    "preferred_icps": ', '.join(preferences.get('preferred_icps', [])) or 'Various',
+                    "common_industries": ', '.join(preferences.get('common_industries', [])) or 'Various',
+                    "technical_preferences": ', '.join(preferences.get('technical_preferences', [])) or 'Mixed',
+                    "icp_list": self._icp_list_text
+                }
             else:
                 # Standard greeting for new users
-                greeting_prompt = f"""
-                You are an expert sales intelligence consultant helping a user discover their Ideal Customer Profile (ICP).
-
-                This appears to be their first conversation with the ICP Wizard.
-
-                Available ICPs:
-                {self._format_icp_list()}
+                chain = self._chains["greeting_new"]
+                inputs = {"icp_list": self._icp_list_text}
 
-                Give a warm welcome, explain briefly what ICP discovery is about, and ask what type of customers they're looking for.
-                Be conversational and ask open-ended questions to understand their needs.
-                """
-
-            prompt = ChatPromptTemplate.from_template(greeting_prompt)
-            chain = prompt | self.llm
-
-            response = chain.invoke({})
+            content = await self._stream_reply("greeting", chain, inputs, prepare_seconds)
 
             new_message = {
                 "role": "assistant",
-                "content": response.content,
+                "content": content,
                 "timestamp": datetime.now().isoformat(),
-                "stage": "greeting"
+                "stage": "greeting",
+                "streamed": self.stream_handler is not None
             }
 
             # Update analytics
@@ -241,6 +325,7 @@ class ICPWizard:
             return {
                 **state,
                 "messages": messages + [new_message],
+                "user_preferences": preferences,
                 "conversation_stage": "understanding_needs",
                 "conversation_history": state.get('conversation_history', []) + [{
                     "stage": "greeting",
@@ -249,41 +334,24 @@ class ICPWizard:
                 }]
             }
 
-        def understand_needs_node(state: ICPWizardState) -> ICPWizardState:
+        async def understand_needs_node(state: ICPWizardState) -> ICPWizardState:
             """Understand user needs and suggest ICPs"""
             messages = state.get('messages', [])
             user_input = messages[-1]["content"] if messages else ""
+            preferences, _, prepare_seconds = await self._prepare_turn()
 
-            analysis_prompt = f"""
-            Analyze the user's input and suggest relevant ICPs from the available options.
-
-            User input: {user_input}
-
-            Available ICPs:
-            {self._format_icp_details()}
-
-            Based on their response:
-            1. Identify which ICPs might be relevant
-            2. Ask clarifying questions if needed
-            3. Explain why certain ICPs match their needs
-            4. Ask for confirmation or more details
-
-            Be conversational and help them refine their understanding.
-            """
-
-            prompt = ChatPromptTemplate.from_template(analysis_prompt)
-            chain = prompt | self.llm
-
-            response = chain.invoke({
+            content = await self._stream_reply("analyzing_needs", self._chains["understand_needs"], {
                 "user_input": user_input,
-                "icp_details": self._format_icp_details()
-            })
+                "icp_details": self._icp_details_text,
+                "preferences": self._format_preferences(preferences)
+            }, prepare_seconds)
 
             new_message = {
                 "role": "assistant",
-                "content": response.content,
+                "content": content,
                 "timestamp": datetime.now().isoformat(),
-                "stage": "analyzing_needs"
+                "stage": "analyzing_needs",
+                "streamed": self.stream_handler is not None
             }
 
             return {
@@ -292,41 +360,24 @@ class ICPWizard:
                 "conversation_stage": "refining_icp"
             }
 
-        def refine_icp_node(state: ICPWizardState) -> ICPWizardState:
+        async def refine_icp_node(state: ICPWizardState) -> ICPWizardState:
             """Refine ICP based on user feedback"""
             messages = state.get('messages', [])
             user_input = messages[-1]["content"] if messages else ""
+            preferences, current_icps, prepare_seconds = await self._prepare_turn(user_input, match_icps=True)
 
-            refinement_prompt = f"""
-            Help the user refine their ICP selection.
-
-            User input: {user_input}
-            Current ICP options: {self._format_icp_list()}
-
-            Based on their feedback:
-            1. Narrow down ICP suggestions
-            2. Ask about specific criteria (company size, tech stack, location, etc.)
-            3. Explain the characteristics of the suggested ICPs
-            4. Help them understand what makes these profiles ideal
-
-            If they're ready to proceed, summarize the selected ICP and ask for confirmation.
-            """
-
-            current_icps = self._find_matching_icps(user_input)
-
-            prompt = ChatPromptTemplate.from_template(refinement_prompt)
-            chain = prompt | self.llm
-
-            response = chain.invoke({
+            content = await self._stream_reply("refining_icp", self._chains["refine_icp"], {
                 "user_input": user_input,
-                "icp_options": self._format_icp_list(current_icps)
-            })
+                "icp_options": self._format_icp_list(current_icps),
+                "preferences": self._format_preferences(preferences)
+            }, prepare_seconds)
 
             new_message = {
                 "role": "assistant",
-                "content": response.content,
+                "content": content,
                 "timestamp": datetime.now().isoformat(),
-                "stage": "refining_icp"
+                "stage": "refining_icp",
+                "streamed": self.stream_handler is not None
             }
 
             return {
@@ -335,35 +386,21 @@ class ICPWizard:
                 "conversation_stage": "confirming_icp"
             }
 
-        def confirm_icp_node(state: ICPWizardState) -> ICPWizardState:
+        async def confirm_icp_node(state: ICPWizardState) -> ICPWizardState:
             """Confirm final ICP selection"""
             messages = state.get('messages', [])
             user_input = messages[-1]["content"] if messages else ""
 
-            confirmation_prompt = """
-            Help the user confirm their ICP selection.
-
-            User input: {user_input}
-
-            If they seem ready to proceed:
-            1. Summarize the selected ICP
-            2. Explain what data will be collected
-            3. Ask for final confirmation
-            4. If confirmed, prepare to generate the ICP configuration
-
-            If they need more clarification, continue the conversation.
-            """
-
-            prompt = ChatPromptTemplate.from_template(confirmation_prompt)
-            chain = prompt | self.llm
-
-            response = chain.invoke({"user_input": user_input})
+            content = await self._stream_reply("confirming_icp", self._chains["confirm_icp"], {
+                "user_input": user_input
+            })
 
             new_message = {
                 "role": "assistant",
-                "content": response.content,
+                "content": content,
                 "timestamp": datetime.now().isoformat(),
-                "stage": "confirming_icp"
+                "stage": "confirming_icp",
+                "streamed": self.stream_handler is not None
             }
 
             return {
@@ -452,7 +489,7 @@ class ICPWizard:
             {
                 "confirming_icp": "confirm_icp",
                 "finalizing": "finalize_icp",
-                "understanding_needs": "understanding_needs"
+                "understanding_needs": "understand_needs"
             }
         )
 
@@ -461,7 +498,7 @@ class ICPWizard:
             lambda state: self._determine_next_stage(state),
             {
                 "finalizing": "finalize_icp",
-                "understanding_needs": "understanding_needs"
+                "understanding_needs": "understand_needs"
             }
         )
 
@@ -469,6 +506,86 @@ class ICPWizard:
 
         return workflow.compile()
 
+    async def _prepare_turn(self, user_input: str = "", match_icps: bool = False) -> Tuple[Dict[str, Any], List[Dict[str, Any]], float]:
+        """Run the independent pre-LLM work of a turn concurrently
+
+        Memory lookup reads the user's memory file and ICP matching scans all
+        options; both run in worker threads so neither blocks the event loop.
+        Returns (preferences, matching_icps, elapsed_seconds).
+        """
+        started = time.perf_counter()
+        memory_lookup = asyncio.to_thread(self.memory_system.get_personalized_suggestions, self.user_identifier)
+        if match_icps:
+            preferences, matches = await asyncio.gather(
+                memory_lookup,
+                asyncio.to_thread(self._find_matching_icps, user_input)
+            )
+        else:
+            preferences, matches = await memory_lookup, []
+        return preferences, matches, time.perf_counter() - started
+
+    async def _stream_reply(self, stage: str, chain, inputs: Dict[str, Any], prepare_seconds: float = 0.0) -> str:
+        """Stream an LLM reply to the stream handler and return the full text
+
+        Records prepare time, time-to-first-token and total LLM time for the stage.
+        """
+        handler = self.stream_handler
+        if handler:
+            handler.on_message_start(stage)
+
+        started = time.perf_counter()
+        first_token = None
+        parts = []
+        async for chunk in chain.astream(inputs):
+            token = getattr(chunk, "content", chunk)
+            if not token:
+                continue
+            if first_token is None:
+                first_token = time.perf_counter() - started
+            parts.append(token)
+            if handler:
+                handler.on_token(stage, token)
+        total = time.perf_counter() - started
+
+        timing = {
+            "stage": stage,
+            "prepare_ms": round(prepare_seconds * 1000, 1),
+            "ttft_ms": round((first_token if first_token is not None else total) * 1000, 1),
+            "llm_ms": round(total * 1000, 1)
+        }
+        self.analytics["stage_timings"].append(timing)
+        logger.debug(f"Stage {stage}: prepare {timing['prepare_ms']}ms, "
+                     f"first token {timing['ttft_ms']}ms, total {timing['llm_ms']}ms")
+        if handler:
+            handler.on_message_end(stage, timing)
+        return "".join(parts)
+
+    def get_stage_timings(self) -> Dict[str, Dict[str, float]]:
+        """Average prepare time, time-to-first-token and LLM time per stage"""
+        summary: Dict[str, Dict[str, float]] = {}
+        for timing in self.analytics.get("stage_timings", []):
+            entry = summary.setdefault(timing["stage"], {"turns": 0, "prepare_ms": 0.0, "ttft_ms": 0.0, "llm_ms": 0.0})
+            entry["turns"] += 1
+            for key in ("prepare_ms", "ttft_ms", "llm_ms"):
+                entry[key] += timing[key]
+        for entry in summary.values():
+            for key in ("prepare_ms", "ttft_ms", "llm_ms"):
+                entry[key] = round(entry[key] / entry["turns"], 1)
+        return summary
+
+    def _format_preferences(self, preferences: Dict[str, Any]) -> str:
+        """Format remembered user preferences for prompts"""
+        if not preferences.get("conversation_count"):
+            return "None yet (first conversation)"
+        parts = []
+        if preferences.get("preferred_icps"):
+            parts.append(f"preferred ICPs: {', '.join(preferences['preferred_icps'])}")
+        if preferences.get("common_industries"):
+            parts.append(f"industries: {', '.join(preferences['common_industries'])}")
+        if preferences.get("technical_preferences"):
+            parts.append(f"technologies: {', '.join(preferences['technical_preferences'])}")
+        return "; ".join(parts) or "No strong preferences recorded"
+
     def _format_icp_list(self, icps: Optional[List[Dict[str, Any]]] = None) -> str:
         """Format ICP list for prompts"""
         icps = icps or self.icp_options
@@ -485,17 +602,8 @@ class ICPWizard:
         ])
 
     def _find_matching_icps(self, user_input: str) -> List[Dict[str, Any]]:
-        """Find ICPs that match user input"""
-        user_input_lower = user_input.lower()
-
-        matches = []
-        for icp in self.icp_options:
-            # Check name and description for matches
-            icp_text = f"{icp['name']} {icp.get('description', '')}".lower()
-            if any(keyword in icp_text for keyword in user_input_lower.split()):
-                matches.append(icp)
-
-        return matches[:5]  # Return top 5 matches
+        """Find ICPs that match user input, best match first"""
+        return self.icp_catalog.match(user_input, limit=5)
 
     def _determine_next_stage(self, state: ICPWizardState) -> str:
         """Determine the next conversation stage based on current state"""
@@ -520,13 +628,9 @@ class ICPWizard:
         """Extract ICP selection from conversation messages"""
         conversation_text = " ".join([msg.get('content', '') for msg in messages])
 
-        # Simple keyword matching for ICP selection
-        for icp in self.icp_options:
-            icp_keywords = icp['name'].lower().split()
-            if any(keyword in conversation_text.lower() for keyword in icp_keywords):
-                return icp
-
-        return None
+        # Best-ranked ICP for everything said so far
+        matches = self.icp_catalog.match(conversation_text, limit=1)
+        return matches[0] if matches else None
 
     def _generate_icp_config(self, icp: Dict[str, Any]) -> ICPConfiguration:
         """Generate ICP configuration for the intelligence system"""
@@ -567,17 +671,18 @@ class ICPWizard:
             # Get next response from the graph
             result = await self.graph.ainvoke(current_state)
 
-            # Display assistant message
+            # Display assistant message (streamed replies are already on screen)
             last_message = result['messages'][-1]
-            print(f"\n🤖 {last_message['content']}")
+            if not last_message.get('streamed'):
+                print(f"\n🤖 {last_message['content']}")
 
             # Check if conversation is complete
             if result.get('conversation_stage') == 'completed':
                 current_state = result
                 break
 
-            # Get user input
-            user_input = input("\n👤 You: ").strip()
+            # Get user input without blocking the event loop
+            user_input = (await asyncio.to_thread(input, "\n👤 You: ")).strip()
 
             if user_input.lower() in ['quit', 'exit', 'q']:
                 print("\n👋 Goodbye! Feel free to restart the conversation anytime.")
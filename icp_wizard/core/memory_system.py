@@ -7,11 +7,12 @@ Provides persistent user profiles, conversation history, and learning capabiliti
 import os
 import json
 import hashlib
+import sqlite3
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional, Any, TypedDict, Set
 from datetime import datetime, timedelta
 from collections import defaultdict
-import pickle
 
 from ..utils.logging_utils import get_logger
 
@@ -34,53 +35,165 @@ class UserProfile(TypedDict):
 
 
 class ConversationMemory:
-    """Advanced conversation memory system with learning capabilities"""
+    """Advanced conversation memory system with learning capabilities
+
+    Everything lives in one SQLite database (`memory.sqlite3` in the memory
+    directory): one row per user profile, global pattern counters that are
+    incremented in the same transaction as the profile update, and a
+    tag-indexed session table for "similar past sessions" lookups. Legacy
+    `*_memory.json` files found in the directory are imported once.
+    """
+
+    DB_FILENAME = "memory.sqlite3"
 
     def __init__(self, memory_dir: Optional[Path] = None):
         """Initialize memory system with configurable storage directory"""
         self.memory_dir = memory_dir or Path("lead_intelligence/data/conversation_memory")
         self.memory_dir.mkdir(parents=True, exist_ok=True)
-        self.user_memories: Dict[str, UserProfile] = {}
+        self.db_path = self.memory_dir / self.DB_FILENAME
         self.session_cache: Dict[str, Any] = {}
 
-        # Learning patterns across all users
-        self.global_patterns = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._init_schema()
+        self._import_legacy_files()
 
         logger.info(f"Initialized conversation memory system at {self.memory_dir}")
 
+    def _init_schema(self) -> None:
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS user_memories (
+                    user_hash TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    profile TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_user_memories_updated ON user_memories (updated_at);
+
+                CREATE TABLE IF NOT EXISTS global_patterns (
+                    category TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (category, key)
+                );
+
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_hash TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    icp_id TEXT,
+                    success INTEGER NOT NULL,
+                    duration REAL NOT NULL,
+                    message_count INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_sessions_user ON sessions (user_hash);
+
+                CREATE TABLE IF NOT EXISTS session_tags (
+                    tag TEXT NOT NULL,
+                    session_id INTEGER NOT NULL,
+                    PRIMARY KEY (tag, session_id)
+                ) WITHOUT ROWID;
+            """)
+
+    def _import_legacy_files(self) -> None:
+        """One-time import of per-user JSON files from the old storage format"""
+        legacy_files = list(self.memory_dir.glob("*_memory.json"))
+        if not legacy_files:
+            return
+        imported = 0
+        with self._lock, self._conn:
+            for memory_file in legacy_files:
+                try:
+                    with open(memory_file, 'r', encoding='utf-8') as f:
+                        memory = self._validate_and_upgrade_memory(json.load(f))
+                    user_hash = memory_file.name[:-len("_memory.json")]
+                    if self._write_profile(user_hash, memory, insert_only=True):
+                        self._seed_global_patterns(memory)
+                        imported += 1
+                    memory_file.rename(memory_file.with_suffix(".json.imported"))
+                except Exception as e:
+                    logger.warning(f"Could not import legacy memory file {memory_file}: {e}")
+        logger.info(f"Imported {imported} legacy memory files into {self.db_path}")
+
+    def _seed_global_patterns(self, memory: UserProfile) -> None:
+        """Count an imported profile's past conversations in the global counters"""
+        conversation_count = memory.get("conversation_count") or 0
+        if conversation_count:
+            self._increment_pattern("totals", "conversations", conversation_count)
+        for successful_icp in memory.get("successful_icps", []):
+            icp_id = successful_icp.get("icp_id") if isinstance(successful_icp, dict) else None
+            if icp_id:
+                self._increment_pattern("successful_icps", icp_id)
+
     def _get_user_hash(self, user_identifier: str) -> str:
         """Generate consistent hash for user identification"""
         return hashlib.md5(user_identifier.encode()).hexdigest()[:12]
 
-    def _get_memory_file(self, user_hash: str) -> Path:
-        """Get memory file path for user"""
-        return self.memory_dir / f"{user_hash}_memory.json"
+    def _read_profile(self, user_hash: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT profile FROM user_memories WHERE user_hash = ?", (user_hash,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _write_profile(self, user_hash: str, memory: UserProfile, insert_only: bool = False) -> bool:
+        """Upsert a profile row (caller holds the lock and transaction); True if the user is new"""
+        updated_at = memory.get("last_conversation") or memory.get("created_at") or datetime.now().isoformat()
+        is_new = self._conn.execute(
+            "SELECT 1 FROM user_memories WHERE user_hash = ?", (user_hash,)
+        ).fetchone() is None
+        if not is_new and insert_only:
+            return False
+        self._conn.execute(
+            """INSERT INTO user_memories (user_hash, user_id, updated_at, profile) VALUES (?, ?, ?, ?)
+               ON CONFLICT (user_hash) DO UPDATE
+               SET user_id = excluded.user_id, updated_at = excluded.updated_at, profile = excluded.profile""",
+            (user_hash, memory.get("user_id", "unknown"), updated_at, json.dumps(memory, ensure_ascii=False))
+        )
+        if is_new:
+            self._increment_pattern("totals", "users")
+        return is_new
+
+    def _increment_pattern(self, category: str, key: str, amount: int = 1) -> None:
+        self._conn.execute(
+            """INSERT INTO global_patterns (category, key, count) VALUES (?, ?, ?)
+               ON CONFLICT (category, key) DO UPDATE SET count = count + excluded.count""",
+            (category, key, amount)
+        )
+
+    @property
+    def global_patterns(self) -> Dict[str, Dict[str, int]]:
+        """Learning patterns across all users, as {category: {key: count}}"""
+        patterns: Dict[str, Dict[str, int]] = defaultdict(dict)
+        with self._lock:
+            for category, key, count in self._conn.execute("SELECT category, key, count FROM global_patterns"):
+                patterns[category][key] = count
+        return patterns
 
     def load_user_memory(self, user_identifier: str) -> UserProfile:
         """Load user's conversation memory and preferences"""
         user_hash = self._get_user_hash(user_identifier)
-        memory_file = self._get_memory_file(user_hash)
-
-        if memory_file.exists():
-            try:
-                with open(memory_file, 'r', encoding='utf-8') as f:
-                    memory_data = json.load(f)
-                    # Validate and upgrade memory structure if needed
-                    return self._validate_and_upgrade_memory(memory_data)
-            except Exception as e:
-                logger.warning(f"Could not load user memory for {user_identifier}: {e}")
-                return self._create_default_memory(user_identifier)
+        try:
+            memory_data = self._read_profile(user_hash)
+        except Exception as e:
+            logger.warning(f"Could not load user memory for {user_identifier}: {e}")
+            return self._create_default_memory(user_identifier)
 
-        return self._create_default_memory(user_identifier)
+        if memory_data is None:
+            return self._create_default_memory(user_identifier)
+        # Validate and upgrade memory structure if needed
+        return self._validate_and_upgrade_memory(memory_data)
 
     def save_user_memory(self, user_identifier: str, memory: UserProfile) -> None:
         """Save user's conversation memory and preferences"""
         user_hash = self._get_user_hash(user_identifier)
-        memory_file = self._get_memory_file(user_hash)
 
         try:
-            with open(memory_file, 'w', encoding='utf-8') as f:
-                json.dump(memory, f, indent=2, ensure_ascii=False)
+            with self._lock, self._conn:
+                self._write_profile(user_hash, memory)
             logger.debug(f"Saved memory for user {user_identifier}")
         except Exception as e:
             logger.error(f"Could not save user memory for {user_identifier}: {e}")
@@ -129,7 +242,19 @@ class ConversationMemory:
         return memory_data
 
     def update_memory_from_conversation(self, user_identifier: str, conversation_data: Dict[str, Any]) -> UserProfile:
-        """Update user's memory with new conversation insights"""
+        """Update user's memory with new conversation insights
+
+        The profile, global counters and session index are updated in one transaction.
+        """
+        with self._lock:
+            try:
+                with self._conn:
+                    return self._update_memory_locked(user_identifier, conversation_data)
+            except sqlite3.Error as e:
+                logger.error(f"Could not save user memory for {user_identifier}: {e}")
+                return self.load_user_memory(user_identifier)
+
+    def _update_memory_locked(self, user_identifier: str, conversation_data: Dict[str, Any]) -> UserProfile:
         memory = self.load_user_memory(user_identifier)
 
         # Update basic conversation metadata
@@ -152,18 +277,22 @@ class ConversationMemory:
             memory["successful_icps"] = memory["successful_icps"][-20:]
 
         # Learn from conversation patterns
-        self._learn_from_conversation(memory, conversation_data)
+        industries, tech_stack = self._learn_from_conversation(memory, conversation_data)
 
         # Update global learning patterns
         self._update_global_patterns(conversation_data)
 
+        # Index the session for similar-session lookups
+        self._record_session(user_identifier, conversation_data, industries, tech_stack)
+
         # Save updated memory
-        self.save_user_memory(user_identifier, memory)
+        self._write_profile(self._get_user_hash(user_identifier), memory)
+        logger.debug(f"Saved memory for user {user_identifier}")
 
         return memory
 
-    def _learn_from_conversation(self, memory: UserProfile, conversation_data: Dict[str, Any]) -> None:
-        """Learn patterns from successful conversations"""
+    def _learn_from_conversation(self, memory: UserProfile, conversation_data: Dict[str, Any]) -> tuple:
+        """Learn patterns from successful conversations; returns (industries, technologies) mentioned"""
         messages = conversation_data.get("messages", [])
 
         # Extract ICP preferences
@@ -209,6 +338,8 @@ class ConversationMemory:
         memory["conversation_patterns"].append(pattern)
         memory["conversation_patterns"] = memory["conversation_patterns"][-50:]
 
+        return industries, tech_stack
+
     def _extract_industries(self, text: str) -> List[str]:
         """Extract industry mentions from conversation text"""
         industries = []
@@ -331,17 +462,78 @@ class ConversationMemory:
         if conversation_data.get("final_icp_config"):
             icp_id = conversation_data["final_icp_config"].get("icp_id")
             if icp_id:
-                self.global_patterns["successful_icps"][icp_id] += 1
+                self._increment_pattern("successful_icps", icp_id)
+
+        self._increment_pattern("totals", "conversations")
 
         # Track conversation patterns
         duration = conversation_data.get("duration_seconds", 0)
         if duration > 0:
             if duration < 300:  # < 5 minutes
-                self.global_patterns["conversation_duration"]["quick"] += 1
+                self._increment_pattern("conversation_duration", "quick")
             elif duration < 900:  # < 15 minutes
-                self.global_patterns["conversation_duration"]["medium"] += 1
+                self._increment_pattern("conversation_duration", "medium")
             else:  # > 15 minutes
-                self.global_patterns["conversation_duration"]["long"] += 1
+                self._increment_pattern("conversation_duration", "long")
+
+    def _record_session(self, user_identifier: str, conversation_data: Dict[str, Any],
+                        industries: List[str], tech_stack: List[str]) -> None:
+        """Store a session row plus its industry/tech/ICP tags"""
+        icp_id = (conversation_data.get("final_icp_config") or {}).get("icp_id")
+        cursor = self._conn.execute(
+            """INSERT INTO sessions (user_hash, created_at, icp_id, success, duration, message_count)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (self._get_user_hash(user_identifier), datetime.now().isoformat(), icp_id,
+             int(bool(conversation_data.get("final_icp_config"))),
+             conversation_data.get("duration_seconds", 0) or 0,
+             len(conversation_data.get("messages", [])))
+        )
+        tags = [f"industry:{i}" for i in industries] + [f"tech:{t}" for t in tech_stack]
+        if icp_id:
+            tags.append(f"icp:{icp_id}")
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO session_tags (tag, session_id) VALUES (?, ?)",
+            [(tag, cursor.lastrowid) for tag in tags]
+        )
+
+    def find_similar_sessions(self, industries: Optional[List[str]] = None,
+                              technologies: Optional[List[str]] = None,
+                              icp_id: Optional[str] = None,
+                              exclude_user: Optional[str] = None,
+                              successful_only: bool = True,
+                              limit: int = 10) -> List[Dict[str, Any]]:
+        """Past sessions sharing the most industry/technology/ICP tags, best match first"""
+        tags = [f"industry:{i}" for i in industries or []] + [f"tech:{t}" for t in technologies or []]
+        if icp_id:
+            tags.append(f"icp:{icp_id}")
+        if not tags:
+            return []
+
+        query = f"""
+            SELECT s.session_id, s.created_at, s.icp_id, s.success, s.duration, m.overlap
+            FROM (SELECT session_id, COUNT(*) AS overlap FROM session_tags
+                  WHERE tag IN ({",".join("?" * len(tags))}) GROUP BY session_id) AS m
+            JOIN sessions s ON s.session_id = m.session_id
+            WHERE (? IS NULL OR s.user_hash != ?) AND (? = 0 OR s.success = 1)
+            ORDER BY m.overlap DESC, s.session_id DESC
+            LIMIT ?
+        """
+        exclude_hash = self._get_user_hash(exclude_user) if exclude_user else None
+        with self._lock:
+            rows = self._conn.execute(
+                query, (*tags, exclude_hash, exclude_hash, int(successful_only), limit)
+            ).fetchall()
+        return [
+            {
+                "session_id": session_id,
+                "created_at": created_at,
+                "icp_id": session_icp,
+                "success": bool(success),
+                "duration": duration,
+                "matching_tags": overlap
+            }
+            for session_id, created_at, session_icp, success, duration, overlap in rows
+        ]
 
     def get_personalized_suggestions(self, user_identifier: str) -> Dict[str, Any]:
         """Get personalized suggestions based on user's history"""
@@ -356,11 +548,26 @@ class ConversationMemory:
             "avg_conversation_duration": self._calculate_avg_duration(memory),
             "last_conversation": memory.get("last_conversation"),
             "is_returning_user": memory.get("conversation_count", 0) > 1,
-            "learning_insights": self._generate_learning_insights(memory)
+            "learning_insights": self._generate_learning_insights(memory),
+            "similar_session_icps": self._similar_session_icps(user_identifier, memory)
         }
 
         return suggestions
 
+    def _similar_session_icps(self, user_identifier: str, memory: UserProfile, limit: int = 3) -> List[str]:
+        """ICPs other users settled on in sessions about the same industries and tech"""
+        sessions = self.find_similar_sessions(
+            industries=memory.get("common_industries", []),
+            technologies=memory.get("technical_preferences", []),
+            exclude_user=user_identifier,
+            limit=20
+        )
+        counts: Dict[str, int] = defaultdict(int)
+        for session in sessions:
+            if session["icp_id"]:
+                counts[session["icp_id"]] += session["matching_tags"]
+        return sorted(counts, key=counts.get, reverse=True)[:limit]
+
     def _calculate_success_rate(self, memory: UserProfile) -> float:
         """Calculate user's success rate"""
         conversation_count = memory.get("conversation_count", 0)
@@ -418,37 +625,43 @@ class ConversationMemory:
 
     def get_memory_stats(self) -> Dict[str, Any]:
         """Get overall memory system statistics"""
-        # Count total users
-        user_count = len(list(self.memory_dir.glob("*_memory.json")))
-
-        # Aggregate global patterns
-        total_conversations = sum(self.global_patterns["successful_icps"].values())
+        patterns = self.global_patterns
+        totals = patterns.get("totals", {})
 
         return {
-            "total_users": user_count,
-            "total_conversations": total_conversations,
-            "popular_icps": dict(self.global_patterns["successful_icps"]),
-            "conversation_duration_distribution": dict(self.global_patterns["conversation_duration"]),
+            "total_users": totals.get("users", 0),
+            "total_conversations": totals.get("conversations", 0),
+            "popular_icps": dict(patterns.get("successful_icps", {})),
+            "conversation_duration_distribution": dict(patterns.get("conversation_duration", {})),
             "memory_dir": str(self.memory_dir),
             "last_updated": datetime.now().isoformat()
         }
 
     def cleanup_old_memories(self, days_to_keep: int = 365) -> int:
-        """Clean up old memory files beyond retention period"""
-        cutoff_date = datetime.now() - timedelta(days=days_to_keep)
-        deleted_count = 0
+        """Delete user memories (and their sessions) not updated within the retention period"""
+        cutoff_date = (datetime.now() - timedelta(days=days_to_keep)).isoformat()
 
-        for memory_file in self.memory_dir.glob("*_memory.json"):
-            try:
-                # Check file modification time
-                if memory_file.stat().st_mtime < cutoff_date.timestamp():
-                    memory_file.unlink()
-                    deleted_count += 1
-                    logger.info(f"Cleaned up old memory file: {memory_file}")
-            except Exception as e:
-                logger.warning(f"Could not cleanup memory file {memory_file}: {e}")
-
-        return deleted_count
+        try:
+            with self._lock, self._conn:
+                stale = [row[0] for row in self._conn.execute(
+                    "SELECT user_hash FROM user_memories WHERE updated_at < ?", (cutoff_date,)
+                )]
+                for user_hash in stale:
+                    self._conn.execute(
+                        "DELETE FROM session_tags WHERE session_id IN "
+                        "(SELECT session_id FROM sessions WHERE user_hash = ?)", (user_hash,)
+                    )
+                    self._conn.execute("DELETE FROM sessions WHERE user_hash = ?", (user_hash,))
+                    self._conn.execute("DELETE FROM user_memories WHERE user_hash = ?", (user_hash,))
+                if stale:
+                    self._increment_pattern("totals", "users", -len(stale))
+        except sqlite3.Error as e:
+            logger.warning(f"Could not cleanup old memories: {e}")
+            return 0
+
+        if stale:
+            logger.info(f"Cleaned up {len(stale)} old user memories")
+        return len(stale)
 
     def export_memory_data(self, export_path: Path) -> bool:
         """Export all memory data for analysis"""
@@ -460,14 +673,10 @@ class ConversationMemory:
             }
 
             # Export individual user memories
-            for memory_file in self.memory_dir.glob("*_memory.json"):
-                try:
-                    with open(memory_file, 'r', encoding='utf-8') as f:
-                        user_data = json.load(f)
-                        user_id = user_data.get("user_id", "unknown")
-                        export_data["users"][user_id] = user_data
-                except Exception as e:
-                    logger.warning(f"Could not export user memory {memory_file}: {e}")
+            with self._lock:
+                rows = self._conn.execute("SELECT user_id, profile FROM user_memories").fetchall()
+            for user_id, profile in rows:
+                export_data["users"][user_id] = json.loads(profile)
 
             with open(export_path, 'w', encoding='utf-8') as f:
                 json.dump(export_data, f, indent=2, ensure_ascii=False)
@@ -478,3 +687,8 @@ class ConversationMemory:
         except Exception as e:
             logger.error(f"Could not export memory data: {e}")
             return False
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -14,7 +14,6 @@ from typing import Optional
 sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent / "lead_intelligence"))
 
-from icp_wizard import ICPWizard
 from lead_intelligence.core.beautiful_logger import beautiful_logger, log_header, log_separator
 
 
@@ -42,7 +41,8 @@ def run_icp_wizard(api_key: Optional[str] = None, output_file: Optional[str] = N
         # Setup environment
         setup_environment()
 
-        # Create and run wizard
+        # Create and run wizard (imported here so --list/--details skip LangChain/OpenAI)
+        from icp_wizard import ICPWizard
         wizard = ICPWizard(api_key=api_key)
         result = wizard.run_wizard()
 
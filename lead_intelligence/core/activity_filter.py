@@ -6,11 +6,10 @@ Filters prospects based on recent activity and engagement levels
 
 import re
 from typing import Dict, List, Any, Tuple, Optional
-from datetime import datetime, timedelta
 from dataclasses import dataclass
 import logging
 
-from .timezone_utils import parse_utc_datetime
+from .timezone_utils import days_since as _days_since
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +26,18 @@ class ActivityFilterResult:
 class ActivityThresholdFilter:
     """Filters prospects based on activity thresholds and engagement levels"""
 
+    # Signal type hierarchy (PRs > Issues > Commits)
+    SIGNAL_SCORES = {
+        'pr': 1.0,      # Pull requests (highest quality)
+        'issue': 0.7,   # Issues (good quality)
+        'commit': 0.5   # Commits (moderate quality)
+    }
+    MAINTAINER_KEYWORDS = (
+        'maintainer', 'maintain', 'owner', 'creator', 'founder',
+        'lead developer', 'core contributor', 'project lead'
+    )
+    PROFILE_FIELDS = ('login', 'name', 'github_user_url')
+
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.logger = logging.getLogger(__name__)
@@ -127,36 +138,33 @@ class ActivityThresholdFilter:
         if not signal_at:
             return 0.0, ["No activity timestamp available"], None
 
-        try:
-            signal_date = parse_utc_datetime(signal_at)
-            days_since = (datetime.now() - signal_date).days
-
-            # Very recent (0-30 days)
-            if days_since <= 30:
-                score = 1.0
-                reasons.append(f"Very recent activity ({days_since} days ago)")
-            # Recent (31-60 days)
-            elif days_since <= 60:
-                score = 0.8
-                reasons.append(f"Recent activity ({days_since} days ago)")
-            # Moderately recent (61-90 days)
-            elif days_since <= 90:
-                score = 0.6
-                reasons.append(f"Moderately recent activity ({days_since} days ago)")
-            # Older (91-180 days)
-            elif days_since <= 180:
-                score = 0.3
-                reasons.append(f"Some activity ({days_since} days ago)")
-            # Very old (180+ days)
-            else:
-                score = 0.1
-                reasons.append(f"Old activity ({days_since} days ago)")
+        days_since = _days_since(signal_at)
+        if days_since is None:
+            self.logger.warning(f"Could not parse signal date '{signal_at}'")
+            return 0.0, ["Could not determine activity recency"], None
 
-            return score, reasons, days_since
+        # Very recent (0-30 days)
+        if days_since <= 30:
+            score = 1.0
+            reasons.append(f"Very recent activity ({days_since} days ago)")
+        # Recent (31-60 days)
+        elif days_since <= 60:
+            score = 0.8
+            reasons.append(f"Recent activity ({days_since} days ago)")
+        # Moderately recent (61-90 days)
+        elif days_since <= 90:
+            score = 0.6
+            reasons.append(f"Moderately recent activity ({days_since} days ago)")
+        # Older (91-180 days)
+        elif days_since <= 180:
+            score = 0.3
+            reasons.append(f"Some activity ({days_since} days ago)")
+        # Very old (180+ days)
+        else:
+            score = 0.1
+            reasons.append(f"Old activity ({days_since} days ago)")
 
-        except Exception as e:
-            self.logger.warning(f"Could not parse signal date '{signal_at}': {e}")
-            return 0.0, ["Could not determine activity recency"], None
+        return score, reasons, days_since
 
     def _check_signal_quality(self, prospect: Dict[str, Any]) -> Tuple[float, List[str], Optional[str]]:
         """Check the quality/type of activity signal"""
@@ -167,14 +175,7 @@ class ActivityThresholdFilter:
         if not signal_type:
             return 0.0, ["No signal type available"], None
 
-        # Signal type hierarchy (PRs > Issues > Commits)
-        signal_scores = {
-            'pr': 1.0,      # Pull requests (highest quality)
-            'issue': 0.7,   # Issues (good quality)
-            'commit': 0.5   # Commits (moderate quality)
-        }
-
-        base_score = signal_scores.get(signal_type.lower(), 0.2)
+        base_score = self.SIGNAL_SCORES.get(signal_type.lower(), 0.2)
 
         if signal_type.lower() == 'pr':
             reasons.append("Pull request activity (highest quality signal)")
@@ -282,12 +283,7 @@ class ActivityThresholdFilter:
         # Bio-based maintainer detection
         bio = prospect.get('bio', '').strip().lower()
         if bio:
-            maintainer_keywords = [
-                'maintainer', 'maintain', 'owner', 'creator', 'founder',
-                'lead developer', 'core contributor', 'project lead'
-            ]
-
-            for keyword in maintainer_keywords:
+            for keyword in self.MAINTAINER_KEYWORDS:
                 if keyword in bio:
                     score += 0.3
                     reasons.append(f"Bio indicates maintainer status ('{keyword}')")
@@ -328,10 +324,9 @@ class ActivityThresholdFilter:
             reasons.append("Has activity signal (basic consistency)")
 
         # Check if profile appears complete
-        required_fields = ['login', 'name', 'github_user_url']
-        present_fields = sum(1 for field in required_fields if prospect.get(field))
+        present_fields = sum(1 for field in self.PROFILE_FIELDS if prospect.get(field))
 
-        if present_fields == len(required_fields):
+        if present_fields == len(self.PROFILE_FIELDS):
             score += 0.3
             reasons.append("Complete profile information")
         elif present_fields >= 2:
@@ -352,16 +347,8 @@ class ActivityThresholdFilter:
 
     def is_recently_active(self, prospect: Dict[str, Any]) -> bool:
         """Quick check if prospect is recently active (within threshold)"""
-        signal_at = prospect.get('signal_at')
-        if not signal_at:
-            return False
-
-        try:
-            signal_date = parse_utc_datetime(signal_at)
-            days_since = (datetime.now() - signal_date).days
-            return days_since <= self.defaults['activity_days_threshold']
-        except Exception:
-            return False
+        days_since = _days_since(prospect.get('signal_at'))
+        return days_since is not None and days_since <= self.defaults['activity_days_threshold']
 
     def filter_prospects(self, prospects: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
@@ -434,12 +421,4 @@ class ActivityThresholdFilter:
 
     def _get_days_since_activity(self, prospect: Dict[str, Any]) -> Optional[int]:
         """Get days since last activity for a prospect"""
-        signal_at = prospect.get('signal_at')
-        if not signal_at:
-            return None
-
-        try:
-            signal_date = parse_utc_datetime(signal_at)
-            return (datetime.now() - signal_date).days
-        except Exception:
-            return None
+        return _days_since(prospect.get('signal_at'))
@@ -15,6 +15,8 @@ from pathlib import Path
 import time
 from urllib.parse import urljoin
 
+from .attio_record_mirror import AttioRecordMirror, DEFAULT_MIRROR_DB_PATH
+
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +24,16 @@ logger = logging.getLogger(__name__)
 class AttioIntegrator:
     """Attio API integration for automatic data import"""
 
+    # Attio object slug -> natural key attribute used for create-vs-update decisions
+    OBJECT_KEYS = {
+        'people': 'login',
+        'repos': 'repo_full_name',
+        'repo_membership': 'membership_id',
+        'signals': 'signal_id',
+    }
+
     def __init__(self, config: Optional[Dict[str, Any]] = None):
-        self.config = config or self._default_config()
+        self.config = {**self._default_config(), **(config or {})}
         self.session = requests.Session()
         self.session.headers.update({
             'Authorization': f'Bearer {self.config["api_token"]}',
@@ -31,6 +41,12 @@ class AttioIntegrator:
         })
         self.logger = logger
         self.rate_limiter = self._setup_rate_limiter()
+        self.mirror: Optional[AttioRecordMirror] = None
+        if self.config.get('use_record_mirror'):
+            try:
+                self.mirror = AttioRecordMirror(self.config['mirror_db_path'])
+            except Exception as e:
+                self.logger.warning(f"Attio record mirror unavailable ({e}); falling back to per-record lookups")
 
     def _default_config(self) -> Dict[str, Any]:
         """Default Attio integration configuration"""
@@ -44,7 +60,12 @@ class AttioIntegrator:
             'timeout': 30,
             'auto_create_lists': True,
             'validate_before_import': True,
-            'backup_before_import': True
+            'backup_before_import': True,
+            # Local record-ID mirror (see AttioRecordMirror)
+            'use_record_mirror': True,
+            'mirror_db_path': DEFAULT_MIRROR_DB_PATH,
+            'mirror_max_age_hours': 24,
+            'mirror_page_size': 500
         }
 
     def _setup_rate_limiter(self):
@@ -96,6 +117,109 @@ class AttioIntegrator:
 
         raise Exception(f"Failed to make request after {self.config['max_retries']} attempts")
 
+    @staticmethod
+    def _extract_record_id(record: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Record ID from an Attio record ({"id": {"record_id": ...}} or {"id": {"value": ...}})"""
+        if not isinstance(record, dict):
+            return None
+        if isinstance(record.get('data'), dict) and 'id' in record['data']:
+            record = record['data']
+        rid = record.get('id')
+        if isinstance(rid, dict):
+            return rid.get('record_id') or rid.get('value')
+        return rid if isinstance(rid, str) else None
+
+    @staticmethod
+    def _extract_attribute(record: Dict[str, Any], attribute: str) -> Optional[str]:
+        """First value of an attribute from a listed record (values[attr][0].value or flat)"""
+        values = record.get('values') or record.get('data') or {}
+        raw = values.get(attribute) if isinstance(values, dict) else None
+        if isinstance(raw, list):
+            raw = raw[0] if raw else None
+        if isinstance(raw, dict):
+            raw = raw.get('value')
+        return str(raw) if raw not in (None, '') else None
+
+    def refresh_mirror(self, objects: Optional[List[str]] = None) -> Dict[str, int]:
+        """Rebuild the local record-ID mirror from one paginated bulk listing per object"""
+        if not self.mirror:
+            return {}
+        page_size = int(self.config.get('mirror_page_size', 500))
+        counts = {}
+        for object_slug in objects or list(self.OBJECT_KEYS):
+            attribute = self.OBJECT_KEYS[object_slug]
+            pairs = []
+            offset = 0
+            while True:
+                response = self._make_request(
+                    'POST',
+                    f'objects/{object_slug}/records/query',
+                    {'limit': page_size, 'offset': offset}
+                )
+                records = response.get('data', []) or []
+                for record in records:
+                    key = self._extract_attribute(record, attribute)
+                    record_id = self._extract_record_id(record)
+                    if key and record_id:
+                        pairs.append((key, record_id))
+                if len(records) < page_size:
+                    break
+                offset += page_size
+            self.mirror.replace_object(object_slug, pairs)
+            counts[object_slug] = len(pairs)
+            self.logger.info(f"Attio mirror refreshed: {object_slug} ({len(pairs)} records)")
+        return counts
+
+    def ensure_mirror_fresh(self, objects: Optional[List[str]] = None):
+        """Refresh stale mirror objects; on failure imports fall back to per-record lookups"""
+        if not self.mirror:
+            return
+        max_age = float(self.config.get('mirror_max_age_hours', 24))
+        stale = [o for o in (objects or list(self.OBJECT_KEYS)) if not self.mirror.is_fresh(o, max_age)]
+        if not stale:
+            return
+        try:
+            self.refresh_mirror(stale)
+        except Exception as e:
+            self.logger.warning(f"Attio mirror refresh failed ({e}); using per-record lookups")
+
+    def _mirror_is_authoritative(self, object_slug: str) -> bool:
+        return bool(self.mirror) and self.mirror.is_fresh(object_slug, float(self.config.get('mirror_max_age_hours', 24)))
+
+    def _existing_record_id(self, object_slug: str, key: str, find_remote) -> Optional[str]:
+        """Record ID for a natural key: from the mirror when fresh, otherwise via API lookup"""
+        if self._mirror_is_authoritative(object_slug):
+            return self.mirror.get(object_slug, key)
+        record_id = self._extract_record_id(find_remote(key))
+        if record_id and self.mirror:
+            self.mirror.put(object_slug, key, record_id)
+        return record_id
+
+    def _remember_record(self, object_slug: str, key: str, response: Optional[Dict[str, Any]]):
+        if self.mirror:
+            record_id = self._extract_record_id(response)
+            if record_id:
+                self.mirror.put(object_slug, key, record_id)
+
+    def plan_import(self, intelligence_data: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
+        """Offline create/update plan from the mirror alone (no API calls)"""
+        if not self.mirror:
+            raise ValueError("plan_import requires the record mirror (use_record_mirror)")
+        sections = {'people': 'people', 'repos': 'repos', 'memberships': 'repo_membership', 'signals': 'signals'}
+        plan = {}
+        for section, object_slug in sections.items():
+            rows = intelligence_data.get(section) or []
+            attribute = self.OBJECT_KEYS[object_slug]
+            keys = [r.get(attribute) for r in rows if r.get(attribute)]
+            existing = self.mirror.get_many(object_slug, keys)
+            plan[section] = {
+                'total': len(rows),
+                'update': sum(1 for k in keys if k in existing),
+                'create': sum(1 for k in keys if k not in existing),
+                'missing_key': len(rows) - len(keys),
+            }
+        return plan
+
     def validate_connection(self) -> bool:
         """Validate Attio API connection"""
         try:
@@ -152,11 +276,10 @@ class AttioIntegrator:
             attio_data = self._transform_person_for_attio(person)
 
             # Check if person already exists
-            existing = self._find_existing_person(person['login'])
+            record_id = self._existing_record_id('people', person['login'], self._find_existing_person)
 
-            if existing:
+            if record_id:
                 # Update existing record
-                record_id = existing['id']['value']
                 response = self._make_request(
                     'PUT',
                     f'objects/people/records/{record_id}',
@@ -170,6 +293,7 @@ class AttioIntegrator:
                     'objects/people/records',
                     attio_data
                 )
+                self._remember_record('people', person['login'], response)
                 return {'success': True, 'created': True, 'updated': False}
 
         except Exception as e:
@@ -283,10 +407,9 @@ class AttioIntegrator:
             attio_data = self._transform_repo_for_attio(repo)
 
             # Check if repo already exists
-            existing = self._find_existing_repo(repo['repo_full_name'])
+            record_id = self._existing_record_id('repos', repo['repo_full_name'], self._find_existing_repo)
 
-            if existing:
-                record_id = existing['id']['value']
+            if record_id:
                 response = self._make_request(
                     'PUT',
                     f'objects/repos/records/{record_id}',
@@ -299,6 +422,7 @@ class AttioIntegrator:
                     'objects/repos/records',
                     attio_data
                 )
+                self._remember_record('repos', repo['repo_full_name'], response)
                 return {'success': True, 'created': True, 'updated': False}
 
         except Exception as e:
@@ -399,10 +523,9 @@ class AttioIntegrator:
             attio_data = self._transform_membership_for_attio(membership)
 
             # Check if membership already exists
-            existing = self._find_existing_membership(membership['membership_id'])
+            record_id = self._existing_record_id('repo_membership', membership['membership_id'], self._find_existing_membership)
 
-            if existing:
-                record_id = existing['id']['value']
+            if record_id:
                 response = self._make_request(
                     'PUT',
                     f'objects/repo_membership/records/{record_id}',
@@ -414,6 +537,7 @@ class AttioIntegrator:
                     'objects/repo_membership/records',
                     attio_data
                 )
+                self._remember_record('repo_membership', membership['membership_id'], response)
 
             return {'success': True}
 
@@ -495,10 +619,9 @@ class AttioIntegrator:
             attio_data = self._transform_signal_for_attio(signal)
 
             # Check if signal already exists
-            existing = self._find_existing_signal(signal['signal_id'])
+            record_id = self._existing_record_id('signals', signal['signal_id'], self._find_existing_signal)
 
-            if existing:
-                record_id = existing['id']['value']
+            if record_id:
                 response = self._make_request(
                     'PUT',
                     f'objects/signals/records/{record_id}',
@@ -510,6 +633,7 @@ class AttioIntegrator:
                     'objects/signals/records',
                     attio_data
                 )
+                self._remember_record('signals', signal['signal_id'], response)
 
             return {'success': True}
 
@@ -561,6 +685,9 @@ class AttioIntegrator:
         if not self.validate_connection():
             raise Exception("Attio API connection validation failed")
 
+        # One bulk listing per stale object replaces a lookup per record
+        self.ensure_mirror_fresh()
+
         results = {
             'timestamp': datetime.now().isoformat(),
             'people': {},
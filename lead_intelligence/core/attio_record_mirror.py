@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Attio Record Mirror
+Persistent SQLite mapping of natural keys (login, repo full name, membership id,
+signal id) to Attio record IDs, so imports can decide create-vs-update locally
+"""
+
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Iterable, Tuple
+
+# Inside the package's data directory, independent of the working directory
+DEFAULT_MIRROR_DB_PATH = str(Path(__file__).resolve().parent.parent / "data" / "attio_mirror.sqlite3")
+
+
+class AttioRecordMirror:
+    """Local key -> Attio record ID mirror, refreshed from bulk listings"""
+
+    def __init__(self, db_path: str = DEFAULT_MIRROR_DB_PATH):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            " object TEXT NOT NULL, key TEXT NOT NULL, record_id TEXT NOT NULL, synced_at TEXT NOT NULL,"
+            " PRIMARY KEY (object, key))"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS refreshes (object TEXT PRIMARY KEY, refreshed_at TEXT NOT NULL, record_count INTEGER)"
+        )
+        self.conn.commit()
+
+    def get(self, object_slug: str, key: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT record_id FROM records WHERE object = ? AND key = ?", (object_slug, key)
+        ).fetchone()
+        return row[0] if row else None
+
+    def get_many(self, object_slug: str, keys: Iterable[str]) -> Dict[str, str]:
+        """Bulk lookup; chunked to stay under SQLite's bound-parameter limit"""
+        keys = [k for k in keys if k]
+        found: Dict[str, str] = {}
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for key, record_id in self.conn.execute(
+                f"SELECT key, record_id FROM records WHERE object = ? AND key IN ({placeholders})",
+                [object_slug, *chunk],
+            ):
+                found[key] = record_id
+        return found
+
+    def put(self, object_slug: str, key: str, record_id: str, commit: bool = True):
+        if not key or not record_id:
+            return
+        self.conn.execute(
+            "INSERT OR REPLACE INTO records (object, key, record_id, synced_at) VALUES (?, ?, ?, ?)",
+            (object_slug, key, record_id, datetime.now().isoformat()),
+        )
+        if commit:
+            self.conn.commit()
+
+    def replace_object(self, object_slug: str, pairs: List[Tuple[str, str]]):
+        """Replace all mappings for an object with a fresh bulk listing in one transaction"""
+        now = datetime.now().isoformat()
+        with self.conn:
+            self.conn.execute("DELETE FROM records WHERE object = ?", (object_slug,))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO records (object, key, record_id, synced_at) VALUES (?, ?, ?, ?)",
+                [(object_slug, key, record_id, now) for key, record_id in pairs if key and record_id],
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO refreshes (object, refreshed_at, record_count) VALUES (?, ?, ?)",
+                (object_slug, now, len(pairs)),
+            )
+
+    def last_refreshed(self, object_slug: str) -> Optional[datetime]:
+        row = self.conn.execute("SELECT refreshed_at FROM refreshes WHERE object = ?", (object_slug,)).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def is_fresh(self, object_slug: str, max_age_hours: float) -> bool:
+        refreshed = self.last_refreshed(object_slug)
+        return refreshed is not None and datetime.now() - refreshed <= timedelta(hours=max_age_hours)
+
+    def count(self, object_slug: str) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM records WHERE object = ?", (object_slug,)).fetchone()[0]
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
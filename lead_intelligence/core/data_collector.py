@@ -8,16 +8,22 @@ import os
 import json
 import time
 import hashlib
+import math
 import sqlite3
 import logging
 import pathlib
+import queue
+import threading
 from dataclasses import dataclass, field
-from typing import List, Literal, Dict, Any, Optional, Iterator
+from typing import List, Literal, Dict, Any, Optional, Iterator, Tuple, Callable
 from datetime import datetime, timedelta
 import requests
 from urllib.parse import urlparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import yaml
+
+from .query_sharding import ShardPlanner, ShardPlanCache, Shard, SEARCH_RESULT_CAP
+from .signal_cursor import SignalCursorStore, normalize_timestamp, signal_record
+from .icp_catalog import ICPCatalog, get_catalog, load_yaml
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -39,6 +45,12 @@ class GithubCfg:
     retries: int = 3
     backoff_base_secs: float = 2.0
     jitter: bool = True
+    shard_queries: bool = True          # split queries over the 1000-result search cap
+    shard_concurrency: int = 4          # shards searched (and probed) in parallel
+    shard_cache_ttl_hours: float = 24
+    incremental_signals: bool = True    # fetch repo signals only since the last run's cursor
+    signal_window_days: int = 90
+    signal_max_pages: int = 10          # pages per repo and signal type when fetching back to the cursor
 
 
 @dataclass
@@ -57,6 +69,7 @@ class AppConfig:
     """Main application configuration"""
     defaults: Defaults
     icps: Dict[str, Any]
+    path: Optional[str] = None      # YAML file the config was loaded from
 
 
 @dataclass
@@ -122,11 +135,56 @@ class JsonFormatter(logging.Formatter):
         return json.dumps(base, ensure_ascii=False)
 
 
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys (double hashing on one blake2b digest)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(64, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        num_bits = self.num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> None:
+        bits = self.bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
 class Deduper:
-    """SQLite-based deduplication system"""
+    """SQLite-based deduplication system
 
-    def __init__(self, db_path: str):
+    By default one connection is held open in WAL mode, "never seen" lookups
+    are answered from an in-memory Bloom filter built from the table at
+    startup, and mark_seen inserts are committed in batches of `batch_size`.
+    Call flush() (or close()) at the end of a run to commit the last batch.
+    `persistent=False` keeps the original connection-per-call behavior.
+    """
+
+    def __init__(self, db_path: str, persistent: bool = True, batch_size: int = 500,
+                 bloom_error_rate: float = 0.01):
         self.db_path = db_path
+        self.persistent = persistent
+        self.batch_size = max(1, batch_size)
+        self.bloom_error_rate = bloom_error_rate
+        self._conn: Optional[sqlite3.Connection] = None
+        self._bloom: Optional[BloomFilter] = None
+        self._pending: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self.stats = {'lookups': 0, 'bloom_negatives': 0, 'db_lookups': 0, 'inserts': 0, 'commits': 0}
         self._init_db()
 
     def _init_db(self):
@@ -144,28 +202,101 @@ class Deduper:
                 )
             ''')
 
+        if self.persistent:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._rebuild_bloom()
+
+    def _rebuild_bloom(self, min_capacity: int = 100_000):
+        """Load every seen lead_id into a Bloom filter sized for twice the current table"""
+        existing = self._conn.execute('SELECT COUNT(*) FROM seen_leads').fetchone()[0]
+        bloom = BloomFilter(max(min_capacity, 2 * (existing + len(self._pending))), self.bloom_error_rate)
+        for (lead_id,) in self._conn.execute('SELECT lead_id FROM seen_leads'):
+            bloom.add(lead_id)
+        for lead_id in self._pending:
+            bloom.add(lead_id)
+        self._bloom = bloom
+        logger.debug(f"Dedupe Bloom filter built from {existing} leads ({len(bloom.bits) // 1024} KiB)")
+
     def already_seen(self, lead_id: str) -> bool:
         """Check if lead_id has been seen before"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                'SELECT 1 FROM seen_leads WHERE lead_id = ?',
-                (lead_id,)
-            )
+        if not self.persistent:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.execute(
+                    'SELECT 1 FROM seen_leads WHERE lead_id = ?',
+                    (lead_id,)
+                )
+                return cursor.fetchone() is not None
+
+        with self._lock:
+            self.stats['lookups'] += 1
+            if lead_id in self._pending:
+                return True
+            if lead_id not in self._bloom:
+                self.stats['bloom_negatives'] += 1
+                return False
+            # Possible hit (or a false positive): confirm in the database
+            self.stats['db_lookups'] += 1
+            cursor = self._conn.execute('SELECT 1 FROM seen_leads WHERE lead_id = ?', (lead_id,))
             return cursor.fetchone() is not None
 
     def mark_seen(self, prospect: Prospect):
         """Mark a prospect as seen"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                'INSERT OR IGNORE INTO seen_leads VALUES (?, ?, ?, ?, ?)',
-                (
-                    prospect.lead_id,
-                    prospect.collected_at,
-                    prospect.icp,
-                    prospect.repo_full_name,
-                    prospect.login
-                )
-            )
+        row = (
+            prospect.lead_id,
+            prospect.collected_at,
+            prospect.icp,
+            prospect.repo_full_name,
+            prospect.login
+        )
+        if not self.persistent:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('INSERT OR IGNORE INTO seen_leads VALUES (?, ?, ?, ?, ?)', row)
+            return
+
+        with self._lock:
+            if prospect.lead_id in self._pending:
+                return
+            self._pending[prospect.lead_id] = row
+            self._bloom.add(prospect.lead_id)
+            if self._bloom.count > self._bloom.capacity:
+                # Keep the false-positive rate near its target as the table grows
+                self._flush_locked()
+                self._rebuild_bloom(min_capacity=self._bloom.capacity * 2)
+            elif len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self):
+        """Commit buffered mark_seen inserts"""
+        if not self.persistent:
+            return
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        rows = list(self._pending.values())
+        with self._conn:
+            self._conn.executemany('INSERT OR IGNORE INTO seen_leads VALUES (?, ?, ?, ?, ?)', rows)
+        self._pending.clear()
+        self.stats['inserts'] += len(rows)
+        self.stats['commits'] += 1
+
+    def close(self):
+        """Flush pending inserts and close the connection"""
+        if self._conn is None:
+            return
+        self.flush()
+        self._conn.close()
+        self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
 
 class RawWriter:
@@ -184,15 +315,24 @@ class RawWriter:
 class QueryPlanner:
     """Plans and generates GitHub search queries for ICPs"""
 
-    def __init__(self, config: AppConfig):
+    def __init__(self, config: AppConfig, shard_cache_path: Optional[str] = None):
         self.config = config
+        github = config.defaults.github
+        cache_path = shard_cache_path or str(pathlib.Path(config.defaults.dedupe_db).with_name('shard_plans.json'))
+        self.shard_planner = ShardPlanner(
+            cache=ShardPlanCache(cache_path, ttl_hours=github.shard_cache_ttl_hours),
+            probe_workers=github.shard_concurrency
+        )
+        # Share the compiled catalog for the config file; configs built in code compile their own
+        self.catalog = get_catalog(config.path, kind='mapping') if config.path \
+            else ICPCatalog.from_mapping(config.icps)
 
     def queries_for(self, icp_key: str) -> List[str]:
         """Generate search queries for a specific ICP"""
-        if icp_key not in self.config.icps:
+        icp_config = self.catalog.get(icp_key)
+        if icp_config is None:
             raise ValueError(f"Unknown ICP: {icp_key}")
 
-        icp_config = self.config.icps[icp_key]
         if not icp_config.get('enabled', True):
             return []
 
@@ -217,13 +357,24 @@ class QueryPlanner:
 
         return re.sub(r'\{date:(\d+)\}', replace_date, query)
 
+    def shard_query(self, query: str, count_fn, limit: Optional[int] = None) -> List[Shard]:
+        """Split a query into shards that each return fewer than 1000 results
+
+        `count_fn(query)` returns the search total_count. When at most `limit`
+        repos are wanted, one query already returns enough and no probing is done.
+        """
+        if not self.config.defaults.github.shard_queries or (limit is not None and limit <= SEARCH_RESULT_CAP):
+            return [Shard(query, None)]
+        return self.shard_planner.plan(query, count_fn)
+
 
 class GitHubSearchClient:
     """Enhanced GitHub API client with rate limiting and retries"""
 
-    def __init__(self, token: str, config: GithubCfg):
+    def __init__(self, token: str, config: GithubCfg, signal_cursors: Optional[SignalCursorStore] = None):
         self.token = token
         self.config = config
+        self.signal_cursors = signal_cursors
         self.session = requests.Session()
         self.session.headers.update({
             'Authorization': f'token {token}',
@@ -264,78 +415,190 @@ class GitHubSearchClient:
 
             page += 1
 
+    def count_repos(self, query: str) -> Optional[int]:
+        """total_count for a repository search (one single-item request)"""
+        response = self._make_request('GET', '/search/repositories', params={'q': query, 'per_page': 1})
+        if not response:
+            return None
+        return response.json().get('total_count')
+
+    def search_shards(self, queries: List[str], max_workers: int = 4,
+                      seen: Optional[set] = None) -> Iterator[Dict]:
+        """Search several shard queries concurrently, yielding each repo once
+
+        Repos are yielded as pages arrive. Closing the generator early (e.g. on
+        a repo cap) stops the workers after their current page.
+        """
+        seen = seen if seen is not None else set()
+        if len(queries) <= 1 or max_workers <= 1:
+            for query in queries:
+                for repo in self.search_repos(query):
+                    key = repo.get('id', repo.get('full_name'))
+                    if key not in seen:
+                        seen.add(key)
+                        yield repo
+            return
+
+        results: queue.Queue = queue.Queue(maxsize=max_workers * self.config.per_page)
+        stop = threading.Event()
+        done = object()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def worker(query: str):
+            try:
+                for repo in self.search_repos(query):
+                    if not put(repo):
+                        return
+            except Exception as e:
+                logger.warning(f"Shard search failed for {query[:80]}: {e}")
+            finally:
+                put(done)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search-shard")
+        for query in queries:
+            executor.submit(worker, query)
+        remaining = len(queries)
+        try:
+            while remaining:
+                item = results.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                key = item.get('id', item.get('full_name'))
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield item
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def fetch_signals(self, repo: Dict, per_repo_cap: int) -> Iterator[Dict]:
-        """Fetch recent signals (PRs, commits, issues) for a repository"""
+        """Fetch recent signals (PRs, commits, issues) for a repository
+
+        With signal cursors, every page of activity since the previous run is
+        fetched into the rollup and up to `per_repo_cap` new signals per type
+        are yielded. A signal type is merged (and its cursor advanced) once the
+        caller has consumed its signals, so stopping early (e.g. on a lead cap)
+        means they are fetched again next run rather than skipped.
+        """
         owner = repo['owner']['login']
         repo_name = repo['name']
+        repo_full_name = repo.get('full_name') or f'{owner}/{repo_name}'
+        fetchers = (
+            ('pr', self._fetch_recent_prs),
+            ('commit', self._fetch_recent_commits),
+            ('issue', self._fetch_recent_issues),
+        )
 
-        # Fetch recent PRs
-        prs = self._fetch_recent_prs(owner, repo_name, per_repo_cap)
-        for pr in prs[:per_repo_cap]:
-            yield {
-                'type': 'pr',
-                'data': pr,
-                'repo': repo
-            }
-
-        # Fetch recent commits
-        commits = self._fetch_recent_commits(owner, repo_name, per_repo_cap)
-        for commit in commits[:per_repo_cap]:
-            yield {
-                'type': 'commit',
-                'data': commit,
-                'repo': repo
-            }
-
-        # Fetch recent issues
-        issues = self._fetch_recent_issues(owner, repo_name, per_repo_cap)
-        for issue in issues[:per_repo_cap]:
-            yield {
-                'type': 'issue',
-                'data': issue,
-                'repo': repo
-            }
+        for signal_type, fetch in fetchers:
+            if not self.signal_cursors:
+                items, _ = fetch(owner, repo_name, per_repo_cap)
+                for item in items[:per_repo_cap]:
+                    yield {
+                        'type': signal_type,
+                        'data': item,
+                        'repo': repo
+                    }
+                continue
 
-    def _fetch_recent_prs(self, owner: str, repo: str, limit: int) -> List[Dict]:
+            since = self.signal_cursors.since(repo_full_name, signal_type)
+            items, complete = fetch(owner, repo_name, per_repo_cap, since=since)
+            records = {}
+            for item in items:
+                record = signal_record(signal_type, item)
+                if record:
+                    records[record.item_id] = (record, item)
+            new = self.signal_cursors.new_signals(repo_full_name, signal_type, [r for r, _ in records.values()])
+
+            consumed = 0
+            for record in new[:per_repo_cap]:
+                yield {
+                    'type': signal_type,
+                    'data': records[record.item_id][1],
+                    'repo': repo
+                }
+                consumed += 1
+            # Everything fetched goes into the rollup so the window counts stay complete
+            self.signal_cursors.merge(repo_full_name, signal_type, [r for r, _ in records.values()],
+                                      advance_cursor=complete)
+            if not complete:
+                logger.warning(f"{repo_full_name} {signal_type}: stopped before reaching {since}; "
+                               f"cursor kept for the next run")
+            logger.debug(f"{repo_full_name} {signal_type}: {consumed} new since {since}")
+
+    def _fetch_pages(self, endpoint: str, params: Dict[str, Any], since: Optional[str] = None,
+                     is_recent: Optional[Callable[[Dict], bool]] = None) -> Tuple[List[Dict], bool]:
+        """Fetch one page, or with `since` every page back to it following `Link: next`
+
+        For newest-first listings without a server-side `since`, `is_recent`
+        drops older items and paging stops at the first page that has any.
+        Returns (items, complete); complete is False when a page failed or
+        `signal_max_pages` ran out before the listing reached `since`.
+        """
+        items: List[Dict] = []
+        for _ in range(self.config.signal_max_pages if since else 1):
+            response = self._make_request('GET', endpoint, params=params)
+            if not response:
+                return items, False
+            page = response.json() or []
+            recent = [item for item in page if is_recent(item)] if is_recent else page
+            items.extend(recent)
+            next_url = (response.links or {}).get('next', {}).get('url')
+            if not since or not next_url or len(recent) < len(page):
+                return items, True
+            endpoint, params = next_url[len('https://api.github.com'):], None
+        return items, False
+
+    def _fetch_recent_prs(self, owner: str, repo: str, limit: int,
+                          since: Optional[str] = None) -> Tuple[List[Dict], bool]:
         """Fetch recent pull requests"""
         params = {
             'state': 'all',
             'sort': 'updated',
             'direction': 'desc',
-            'per_page': min(limit, 100)
+            'per_page': 100 if since else min(limit, 100)
         }
+        # The pulls endpoint has no `since`; results are sorted by updated_at desc
+        return self._fetch_pages(
+            f'/repos/{owner}/{repo}/pulls', params, since,
+            is_recent=(lambda pr: (normalize_timestamp(pr.get('updated_at')) or '') >= since) if since else None
+        )
 
-        response = self._make_request('GET', f'/repos/{owner}/{repo}/pulls', params=params)
-        if response:
-            return response.json()
-        return []
-
-    def _fetch_recent_commits(self, owner: str, repo: str, limit: int) -> List[Dict]:
+    def _fetch_recent_commits(self, owner: str, repo: str, limit: int,
+                              since: Optional[str] = None) -> Tuple[List[Dict], bool]:
         """Fetch recent commits"""
         params = {
-            'per_page': min(limit, 100)
+            'per_page': 100 if since else min(limit, 100)
         }
+        if since:
+            params['since'] = since
 
-        response = self._make_request('GET', f'/repos/{owner}/{repo}/commits', params=params)
-        if response:
-            return response.json()
-        return []
+        return self._fetch_pages(f'/repos/{owner}/{repo}/commits', params, since)
 
-    def _fetch_recent_issues(self, owner: str, repo: str, limit: int) -> List[Dict]:
+    def _fetch_recent_issues(self, owner: str, repo: str, limit: int,
+                             since: Optional[str] = None) -> Tuple[List[Dict], bool]:
         """Fetch recent issues"""
         params = {
             'state': 'all',
             'sort': 'updated',
             'direction': 'desc',
-            'per_page': min(limit, 100)
+            'per_page': 100 if since else min(limit, 100)
         }
+        if since:
+            params['since'] = since
 
-        response = self._make_request('GET', f'/repos/{owner}/{repo}/issues', params=params)
-        if response:
-            # Filter out pull requests (they're included in issues)
-            issues = [issue for issue in response.json() if 'pull_request' not in issue]
-            return issues
-        return []
+        issues, complete = self._fetch_pages(f'/repos/{owner}/{repo}/issues', params, since)
+        # Filter out pull requests (they're included in issues)
+        return [issue for issue in issues if 'pull_request' not in issue], complete
 
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Optional[requests.Response]:
         """Make a request with rate limiting and retries"""
@@ -386,8 +649,7 @@ class GitHubSearchClient:
 
 def load_config(path: str) -> AppConfig:
     """Load and validate configuration"""
-    with open(path) as f:
-        raw = yaml.safe_load(f)
+    raw = load_yaml(path)
 
     # Validate required fields
     if 'defaults' not in raw:
@@ -417,7 +679,7 @@ def load_config(path: str) -> AppConfig:
         github=github_cfg
     )
 
-    return AppConfig(defaults=defaults, icps=icps_data)
+    return AppConfig(defaults=defaults, icps=icps_data, path=path)
 
 
 def setup_logging(log_dir: str, run_id: str):
@@ -481,7 +743,8 @@ def assemble_prospect(signal_data: Dict, icp_key: str, run_id: str) -> Prospect:
         signal_at = data.get('updated_at', data.get('created_at', datetime.now().isoformat()))
     elif signal_type == 'commit':
         commit_msg = data.get('commit', {}).get('message', 'No message')
-        signal = f"Commit: {commit_msg.split('\n')[0][:80]}"
+        first_line = commit_msg.split('\n')[0]
+        signal = f"Commit: {first_line[:80]}"
         signal_at = data.get('commit', {}).get('committer', {}).get('date', datetime.now().isoformat())
     elif signal_type == 'issue':
         signal = f"Issue #{data.get('number', 'N/A')}: {data.get('title', 'No title')[:80]}"
@@ -515,7 +778,14 @@ class DataCollector:
     def __init__(self, config_path: str, github_token: str):
         self.config = load_config(config_path)
         self.github_token = github_token
-        self.github_client = GitHubSearchClient(github_token, self.config.defaults.github)
+        github = self.config.defaults.github
+        signal_cursors = None
+        if github.incremental_signals:
+            signal_cursors = SignalCursorStore(
+                str(pathlib.Path(self.config.defaults.dedupe_db).with_name('signal_cursors.sqlite3')),
+                window_days=github.signal_window_days
+            )
+        self.github_client = GitHubSearchClient(github_token, github, signal_cursors)
         self.query_planner = QueryPlanner(self.config)
 
     def collect_for_icps(self, icp_keys: List[str], limits: Limits, run_id: str) -> Dict[str, Any]:
@@ -560,18 +830,23 @@ class DataCollector:
         })
 
         # Collect for each ICP
-        for icp_key in icp_keys:
-            logger.info(f"🎯 Collecting for ICP: {icp_key}")
-
-            try:
-                self._collect_for_icp(
-                    icp_key, self.query_planner, self.github_client,
-                    limits, counters, writer, deduper, run_ctx
-                )
-            except Exception as e:
-                logger.error(f"Failed to collect for ICP {icp_key}: {e}", extra={
-                    "ctx": {"icp": icp_key, "error": str(e)}
-                })
+        try:
+            for icp_key in icp_keys:
+                logger.info(f"🎯 Collecting for ICP: {icp_key}")
+
+                try:
+                    self._collect_for_icp(
+                        icp_key, self.query_planner, self.github_client,
+                        limits, counters, writer, deduper, run_ctx
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to collect for ICP {icp_key}: {e}", extra={
+                        "ctx": {"icp": icp_key, "error": str(e)}
+                    })
+        finally:
+            # Commit the last batch of seen leads even if the run is interrupted
+            deduper.close()
+        logger.debug(f"Dedupe stats: {deduper.stats}")
 
         # Generate summary
         summary = {
@@ -610,10 +885,23 @@ class DataCollector:
             logger.warning(f"No queries generated for ICP: {icp_key}")
             return
 
+        # Repos already scanned for this ICP (shards and segments overlap)
+        seen_repos = set()
+
         for query in queries:
             logger.info(f"🔍 Searching with query: {query[:100]}...")
 
-            for repo in gh.search_repos(query):
+            shards = planner.shard_query(query, gh.count_repos, limit=limits.max_repos)
+            if len(shards) > 1:
+                logger.info(f"🧩 Query split into {len(shards)} shards", extra={
+                    "ctx": {
+                        "icp": icp_key,
+                        "shards": len(shards),
+                        "total_count": sum(s.total_count or 0 for s in shards)
+                    }
+                })
+
+            for repo in gh.search_shards([s.query for s in shards], gh.config.shard_concurrency, seen_repos):
                 # Check repo limit
                 if counters["repos_scanned"] >= limits.max_repos:
                     logger.info("Repo cap reached", extra={
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Gate Plan
+Compiles the ICP, activity and quality gate configs into one ordered predicate plan
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Tuple, Optional, Callable, Iterable
+
+from .icp_filter import ICPRelevanceFilter
+from .activity_filter import ActivityThresholdFilter
+from .quality_gate import QualityGate
+
+logger = logging.getLogger(__name__)
+
+# A check returns (passed, reasons) and may add prospect annotations
+GateCheck = Callable[[Dict[str, Any], Dict[str, Any]], Tuple[bool, List[str]]]
+
+
+@dataclass
+class Gate:
+    """One compiled predicate in a GatePlan"""
+    name: str
+    check: GateCheck
+    cost: float                      # static cost estimate, used until stats exist
+    blocking: bool = True            # blocking failures reject and stop evaluation
+    requires: Tuple[str, ...] = ()   # gates whose annotations this one reads
+
+
+@dataclass
+class GateStats:
+    """Per-gate counters collected while the plan runs"""
+    evaluated: int = 0
+    rejected: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rejection_rate(self) -> float:
+        return self.rejected / self.evaluated if self.evaluated else 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.seconds / self.evaluated if self.evaluated else 0.0
+
+
+@dataclass
+class GatePlanResult:
+    """Outcome of running a prospect through the plan"""
+    passes: bool
+    failed_gate: Optional[str]
+    reasons: List[str]
+    warnings: List[str] = field(default_factory=list)
+    gates_evaluated: int = 0
+    annotations: Dict[str, Any] = field(default_factory=dict)
+
+
+class GatePlan:
+    """Ordered gate predicates: cheap and selective gates first, short-circuit on blocking failures
+
+    Build one with `GatePlan.compile(...)` from existing filter instances or
+    `GatePlan.from_configs(...)` from the Phase 2 config dicts. `validate_batch`
+    runs column-wise (one gate over all surviving prospects at a time), which
+    keeps timing overhead per gate rather than per prospect. After a
+    representative run, `optimize_order()` reorders gates from the observed
+    cost and rejection rate.
+    """
+
+    def __init__(self, gates: Iterable[Gate]):
+        self.gates: List[Gate] = self._resolve_order(sorted(gates, key=lambda g: g.cost))
+        self.stats: Dict[str, GateStats] = {g.name: GateStats() for g in self.gates}
+
+    @classmethod
+    def from_configs(cls, icp_config: Optional[Dict[str, Any]] = None,
+                     activity_config: Optional[Dict[str, Any]] = None,
+                     quality_config: Optional[Dict[str, Any]] = None,
+                     non_blocking: Iterable[str] = ()) -> 'GatePlan':
+        return cls.compile(
+            icp_filter=ICPRelevanceFilter(icp_config) if icp_config is not None else None,
+            activity_filter=ActivityThresholdFilter(activity_config) if activity_config is not None else None,
+            quality_gate=QualityGate(quality_config) if quality_config is not None else None,
+            non_blocking=non_blocking,
+        )
+
+    @classmethod
+    def compile(cls, icp_filter: Optional[ICPRelevanceFilter] = None,
+                activity_filter: Optional[ActivityThresholdFilter] = None,
+                quality_gate: Optional[QualityGate] = None,
+                non_blocking: Iterable[str] = ()) -> 'GatePlan':
+        """Compile filter instances into a plan; gates named in `non_blocking` only add warnings"""
+        gates: List[Gate] = []
+        if quality_gate is not None:
+            gates.extend(_quality_gates(quality_gate, has_icp_gate=icp_filter is not None))
+        if activity_filter is not None:
+            gates.append(Gate('activity', _activity_check(activity_filter), cost=50.0))
+        if icp_filter is not None:
+            gates.append(Gate('icp', _icp_check(icp_filter), cost=80.0))
+
+        non_blocking = set(non_blocking)
+        unknown = non_blocking - {g.name for g in gates}
+        if unknown:
+            raise ValueError(f"Unknown gates in non_blocking: {sorted(unknown)}")
+        for gate in gates:
+            gate.blocking = gate.name not in non_blocking
+        return cls(gates)
+
+    @staticmethod
+    def _resolve_order(gates: List[Gate]) -> List[Gate]:
+        """Keep the given order but move each gate after the gates it requires"""
+        ordered: List[Gate] = []
+        placed = set()
+        pending = list(gates)
+        while pending:
+            for i, gate in enumerate(pending):
+                if all(req in placed for req in gate.requires):
+                    ordered.append(pending.pop(i))
+                    placed.add(gate.name)
+                    break
+            else:
+                # Requirement not in the plan; the gate falls back to prospect fields
+                ordered.append(pending.pop(0))
+                placed.add(ordered[-1].name)
+        return ordered
+
+    @property
+    def order(self) -> List[str]:
+        return [g.name for g in self.gates]
+
+    def evaluate(self, prospect: Dict[str, Any]) -> GatePlanResult:
+        """Run one prospect through the plan, stopping at the first blocking failure"""
+        annotations: Dict[str, Any] = {}
+        warnings: List[str] = []
+        evaluated = 0
+        for gate in self.gates:
+            stats = self.stats[gate.name]
+            started = time.perf_counter()
+            passed, reasons = self._run_gate(gate, prospect, annotations, stats)
+            stats.seconds += time.perf_counter() - started
+            stats.evaluated += 1
+            evaluated += 1
+            if passed:
+                continue
+            if not gate.blocking:
+                warnings.extend(reasons)
+                continue
+            stats.rejected += 1
+            return GatePlanResult(False, gate.name, reasons, warnings, evaluated, annotations)
+        return GatePlanResult(True, None, [], warnings, evaluated, annotations)
+
+    def validate_batch(self, prospects: List[Dict[str, Any]]) -> List[GatePlanResult]:
+        """Column-wise evaluation: each gate runs over all prospects still alive
+
+        Returns results aligned with `prospects`.
+        """
+        n = len(prospects)
+        annotations: List[Dict[str, Any]] = [{} for _ in range(n)]
+        warnings: List[List[str]] = [[] for _ in range(n)]
+        evaluated = [0] * n
+        results: List[Optional[GatePlanResult]] = [None] * n
+        alive = list(range(n))
+
+        for gate in self.gates:
+            if not alive:
+                break
+            stats = self.stats[gate.name]
+            survivors = []
+            run_gate = self._run_gate
+            started = time.perf_counter()
+            for i in alive:
+                passed, reasons = run_gate(gate, prospects[i], annotations[i], stats)
+                evaluated[i] += 1
+                if passed:
+                    survivors.append(i)
+                elif not gate.blocking:
+                    warnings[i].extend(reasons)
+                    survivors.append(i)
+                else:
+                    results[i] = GatePlanResult(False, gate.name, reasons, warnings[i], evaluated[i], annotations[i])
+            stats.seconds += time.perf_counter() - started
+            stats.evaluated += len(alive)
+            stats.rejected += len(alive) - len(survivors)
+            alive = survivors
+
+        for i in alive:
+            results[i] = GatePlanResult(True, None, [], warnings[i], evaluated[i], annotations[i])
+        return results
+
+    def filter_prospects(self, prospects: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Filter prospects through the plan
+        Returns: (passing_prospects, rejected_prospects); passing prospects carry gate annotations
+        """
+        passing = []
+        rejected = []
+        for prospect, result in zip(prospects, self.validate_batch(prospects)):
+            if result.passes:
+                annotated = prospect.copy()
+                annotated.update(result.annotations)
+                if result.warnings:
+                    annotated['gate_warnings'] = result.warnings
+                passing.append(annotated)
+            else:
+                rejected.append({
+                    'prospect': prospect,
+                    'rejection_reason': f"Gate failed: {result.failed_gate}",
+                    'failed_gate': result.failed_gate,
+                    'reasons': result.reasons
+                })
+
+        logger.info(f"Gate plan: {len(passing)} passing, {len(rejected)} rejected "
+                    f"(order: {' > '.join(self.order)})")
+        return passing, rejected
+
+    @staticmethod
+    def _run_gate(gate: Gate, prospect: Dict[str, Any], annotations: Dict[str, Any],
+                  stats: GateStats) -> Tuple[bool, List[str]]:
+        try:
+            return gate.check(prospect, annotations)
+        except Exception as e:
+            stats.errors += 1
+            return False, [f"Validation error in {gate.name}: {e}"]
+
+    def optimize_order(self, min_samples: int = 50) -> List[str]:
+        """Reorder gates by observed cost per rejection (ascending)
+
+        For independent filters this minimizes expected work: a gate that is
+        cheap and rejects often should run first. Gates with fewer than
+        `min_samples` evaluations keep their static cost estimate's position.
+        Returns the new order.
+        """
+        positions = {g.name: i for i, g in enumerate(self.gates)}
+
+        def rank(gate: Gate) -> Tuple[int, float, int]:
+            stats = self.stats[gate.name]
+            if stats.evaluated < min_samples:
+                return (1, 0.0, positions[gate.name])
+            if not gate.blocking:
+                # Never rejects, so it can only add work in front of other gates
+                return (2, stats.mean_seconds, positions[gate.name])
+            return (0, stats.mean_seconds / max(stats.rejection_rate, 1e-6), positions[gate.name])
+
+        self.gates = self._resolve_order(sorted(self.gates, key=rank))
+        return self.order
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-gate timing and rejection counts, in current plan order"""
+        gates = []
+        for gate in self.gates:
+            stats = self.stats[gate.name]
+            gates.append({
+                'gate': gate.name,
+                'blocking': gate.blocking,
+                'evaluated': stats.evaluated,
+                'rejected': stats.rejected,
+                'errors': stats.errors,
+                'rejection_rate': stats.rejection_rate,
+                'total_ms': stats.seconds * 1000,
+                'mean_us': stats.mean_seconds * 1e6
+            })
+        return {
+            'order': self.order,
+            'gates': gates,
+            'total_ms': sum(g['total_ms'] for g in gates)
+        }
+
+    def reset_stats(self) -> None:
+        self.stats = {g.name: GateStats() for g in self.gates}
+
+
+def _quality_gates(quality_gate: QualityGate, has_icp_gate: bool) -> List[Gate]:
+    """QualityGate's eight gates as separate predicates, cheapest first"""
+    def drop_score(method):
+        def check(prospect, annotations):
+            passed, _score, reasons = method(prospect)
+            return passed, reasons
+        return check
+
+    threshold = quality_gate.gates['icp_relevance']
+
+    def icp_relevance(prospect, annotations):
+        # Reads the score computed by the `icp` gate when it is part of the plan
+        icp_score = annotations.get('icp_relevance_score', prospect.get('icp_relevance_score'))
+        if icp_score is None:
+            return False, ["ICP relevance not calculated"]
+        if icp_score >= threshold:
+            return True, []
+        return False, [f"ICP relevance {icp_score:.2f} below threshold {threshold:.2f}"]
+
+    return [
+        Gate('quality.email', lambda p, a: quality_gate._validate_email_gate(p), cost=2.0),
+        Gate('quality.personalization', lambda p, a: quality_gate._validate_personalization_gate(p), cost=1.0),
+        Gate('quality.compliance', lambda p, a: quality_gate._validate_compliance_gate(p), cost=1.5),
+        Gate('quality.completeness', drop_score(quality_gate._validate_completeness_gate), cost=2.5),
+        Gate('quality.icp_relevance', icp_relevance, cost=0.5,
+             requires=('icp',) if has_icp_gate else ()),
+        Gate('quality.activity', lambda p, a: quality_gate._validate_activity_gate(p), cost=3.0),
+        Gate('quality.consistency', drop_score(quality_gate._validate_consistency_gate), cost=3.5),
+        Gate('quality.accuracy', drop_score(quality_gate._validate_accuracy_gate), cost=5.0),
+    ]
+
+
+def _activity_check(activity_filter: ActivityThresholdFilter) -> GateCheck:
+    def check(prospect, annotations):
+        result = activity_filter.meets_activity_requirements(prospect)
+        annotations['activity_score'] = result.activity_score
+        annotations['activity_reasons'] = result.activity_reasons
+        annotations['activity_details'] = result.activity_details
+        return result.passes_filter, ([] if result.passes_filter else result.activity_reasons)
+    return check
+
+
+def _icp_check(icp_filter: ICPRelevanceFilter) -> GateCheck:
+    def check(prospect, annotations):
+        result = icp_filter.is_relevant(prospect)
+        annotations['icp_relevance_score'] = result.relevance_score
+        annotations['icp_match_reasons'] = result.match_reasons
+        annotations['icp_match_details'] = result.match_details
+        return result.is_relevant, ([] if result.is_relevant else result.match_reasons)
+    return check
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Group-commit CSV Writer
+Incremental CSV output that flushes every N rows or T milliseconds instead of per row,
+with a sidecar commit log so an interrupted scrape can resume from the last complete row.
+"""
+
+import csv
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set
+
+
+class GroupCommitCSVWriter:
+    """CSV writer with group commit and a crash-safe resume sidecar.
+
+    Rows are buffered by the file object and made durable in groups. Each commit
+    flushes (and optionally fsyncs) the CSV, then appends one JSON line to the
+    sidecar `<path>.commits` recording the committed byte offset plus the logins
+    and lead_ids in that group. Anything past the last recorded offset is a torn
+    or uncommitted tail and is truncated on resume.
+
+    The row threshold and `commit_interval_ms` are checked on every `write_row`.
+    While no rows arrive, the caller's loop calls `commit_if_due()` so buffered
+    rows are not left uncommitted past the interval.
+    """
+
+    def __init__(self, path: str, fieldnames: List[str], commit_rows: int = 100,
+                 commit_interval_ms: int = 1000, fsync: bool = False, resume: bool = False):
+        self.path = Path(path)
+        self.sidecar_path = Path(f"{path}.commits")
+        self.fieldnames = fieldnames
+        self.commit_rows = max(1, int(commit_rows))
+        self.commit_interval = max(0, int(commit_interval_ms)) / 1000.0
+        self.fsync = fsync
+
+        # Recovered state (populated on resume)
+        self.committed_logins: Set[str] = set()
+        self.committed_lead_ids: Set[str] = set()
+        self.committed_rows = 0
+        self.committed_with_email = 0
+
+        self._pending_logins: List[str] = []
+        self._pending_lead_ids: List[str] = []
+        self._pending_with_email = 0
+        self._last_commit = time.monotonic()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and self.path.exists():
+            offset = self._recover()
+            self._write_compacted_sidecar(offset)
+            self._file = open(self.path, 'r+', newline='', encoding='utf-8')
+            self._file.truncate(offset)
+            self._file.seek(offset)
+            self._writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+            if offset == 0:
+                self._writer.writeheader()
+                self.commit(force=True)
+        else:
+            self._file = open(self.path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.DictWriter(self._file, fieldnames=fieldnames)
+            self._writer.writeheader()
+            if self.sidecar_path.exists():
+                self.sidecar_path.unlink()
+            self.commit(force=True)
+        self._sidecar = open(self.sidecar_path, 'a', encoding='utf-8')
+
+    def _recover(self) -> int:
+        """Read the sidecar and return the last committed offset (0 if nothing usable)"""
+        offset = 0
+        if self.sidecar_path.exists():
+            with open(self.sidecar_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # torn last line
+                    offset = int(entry.get('offset', offset))
+                    self.committed_rows = int(entry.get('rows', self.committed_rows))
+                    self.committed_logins.update(entry.get('logins') or [])
+                    self.committed_lead_ids.update(entry.get('lead_ids') or [])
+                    self.committed_with_email += int(entry.get('with_email') or 0)
+            return min(offset, self.path.stat().st_size)
+        return self._recover_from_csv()
+
+    def _recover_from_csv(self) -> int:
+        """No sidecar (e.g. a file written before group commit): keep complete rows only"""
+        with open(self.path, 'r', newline='', encoding='utf-8') as f:
+            data = f.read()
+        if not data:
+            return 0
+        # A file not ending in a newline has a torn last record
+        complete = data if data.endswith('\n') else data[:data.rfind('\n') + 1]
+        rows = list(csv.DictReader(complete.splitlines(keepends=True)))
+        for row in rows:
+            if row.get('login'):
+                self.committed_logins.add(row['login'])
+            if row.get('lead_id'):
+                self.committed_lead_ids.add(row['lead_id'])
+            if row.get('email_profile') or row.get('email_public_commit'):
+                self.committed_with_email += 1
+        self.committed_rows = len(rows)
+        return len(complete.encode('utf-8'))
+
+    def _write_compacted_sidecar(self, offset: int):
+        """Replace the sidecar with one entry holding the recovered state (drops torn lines)"""
+        tmp = self.sidecar_path.with_name(self.sidecar_path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as sc:
+            sc.write(json.dumps({
+                'offset': offset, 'rows': self.committed_rows,
+                'logins': sorted(self.committed_logins), 'lead_ids': sorted(self.committed_lead_ids),
+                'with_email': self.committed_with_email,
+            }) + '\n')
+        os.replace(tmp, self.sidecar_path)
+
+    def write_row(self, row: Dict[str, Any], login: Optional[str] = None,
+                  lead_id: Optional[str] = None, has_email: bool = False):
+        """Buffer one row; commits when the row count or time threshold is reached"""
+        self._writer.writerow(row)
+        if login:
+            self._pending_logins.append(login)
+        self._pending_lead_ids.append(lead_id or '')
+        if has_email:
+            self._pending_with_email += 1
+        if (len(self._pending_lead_ids) >= self.commit_rows
+                or time.monotonic() - self._last_commit >= self.commit_interval):
+            self.commit()
+
+    def commit_if_due(self) -> bool:
+        """Commit buffered rows if `commit_interval_ms` has passed since the last commit"""
+        if self._pending_lead_ids and time.monotonic() - self._last_commit >= self.commit_interval:
+            self.commit()
+            return True
+        return False
+
+    def commit(self, force: bool = False):
+        """Flush buffered rows and record the committed offset in the sidecar"""
+        if not self._pending_lead_ids and not force:
+            return
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.committed_rows += len(self._pending_lead_ids)
+        self.committed_logins.update(self._pending_logins)
+        self.committed_lead_ids.update(l for l in self._pending_lead_ids if l)
+        self.committed_with_email += self._pending_with_email
+
+        sidecar = getattr(self, '_sidecar', None)
+        if sidecar is not None:
+            sidecar.write(json.dumps({
+                'offset': self._file.tell(),
+                'rows': self.committed_rows,
+                'logins': self._pending_logins,
+                'lead_ids': [l for l in self._pending_lead_ids if l],
+                'with_email': self._pending_with_email,
+            }) + '\n')
+            sidecar.flush()
+            if self.fsync:
+                os.fsync(sidecar.fileno())
+        elif force:
+            # Initial header commit happens before the sidecar is opened
+            with open(self.sidecar_path, 'a', encoding='utf-8') as sc:
+                sc.write(json.dumps({'offset': self._file.tell(), 'rows': self.committed_rows}) + '\n')
+
+        self._pending_logins = []
+        self._pending_lead_ids = []
+        self._pending_with_email = 0
+        self._last_commit = time.monotonic()
+
+    def close(self):
+        """Commit any buffered rows and close both files"""
+        if self._file:
+            self.commit()
+            self._file.close()
+            self._file = None
+        if getattr(self, '_sidecar', None):
+            self._sidecar.close()
+            self._sidecar = None
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+ICP Catalog
+Compiles ICP YAML files once into a cached, mtime-validated index with BM25 ranked lookup
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# Bump when the compiled layout changes so stale on-disk caches are ignored
+CATALOG_FORMAT_VERSION = 2
+DEFAULT_CACHE_DIR = Path(".cache/icp_catalog")
+
+# Term weight per field: a hit in the name or technographics counts more than one in prose
+FIELD_WEIGHTS = {
+    'name': 3.0,
+    'language': 2.5,
+    'topic': 2.5,
+    'keyword': 2.0,
+    'description': 1.0,
+    'trigger': 0.5,
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+_QUALIFIER_RE = re.compile(r'(?<!\S)-?([a-z]+):(\S+)')
+STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'i', 'in', 'is', 'it', 'my',
+    'of', 'on', 'or', 'our', 'that', 'the', 'this', 'to', 'we', 'with', 'want', 'looking', 'need',
+})
+
+PathLike = Union[str, Path]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords dropped and a trailing plural 's' stripped"""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _as_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return [str(v) for v in value]
+    return [str(value)]
+
+
+def _query_terms(queries: List[str]) -> Dict[str, List[str]]:
+    """Languages, topics and free keywords from GitHub search queries"""
+    terms: Dict[str, List[str]] = {'language': [], 'topic': [], 'keyword': []}
+    for query in queries:
+        query = query.lower()
+        for match in _QUALIFIER_RE.finditer(query):
+            if match.group(0).startswith('-'):
+                continue
+            if match.group(1) in ('language', 'topic'):
+                terms[match.group(1)].append(match.group(2))
+        free_text = _QUALIFIER_RE.sub(' ', query).replace('(', ' ').replace(')', ' ')
+        terms['keyword'].extend(w for w in free_text.split() if w not in ('or', 'and', 'not') and not w.startswith('-'))
+    return terms
+
+
+class _FileCache:
+    """In-process cache of parsed files keyed by path, validated against (mtime_ns, size)"""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def stamp(path: Path) -> Tuple[int, int]:
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, key: str, stamp: Tuple[int, int]) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[1] if entry and entry[0] == stamp else None
+
+    def put(self, key: str, stamp: Tuple[int, int], value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (stamp, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_yaml_cache = _FileCache()
+_catalog_cache = _FileCache()
+
+
+def load_yaml(path: PathLike) -> Dict[str, Any]:
+    """Parse a YAML file once per modification; returns a copy callers may mutate"""
+    path = Path(path).resolve()
+    stamp = _FileCache.stamp(path)
+    data = _yaml_cache.get(str(path), stamp)
+    if data is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f) or {}
+        _yaml_cache.put(str(path), stamp, data)
+    return copy.deepcopy(data)
+
+
+class ICPCatalog:
+    """ICP definitions plus an inverted index over names, keywords, languages and topics
+
+    `search()` ranks ICPs with BM25 (per-field term weights, document length
+    normalization), touching only the posting lists of the query's terms.
+    Build catalogs with `get_catalog()` so the compiled index is shared and
+    reused across processes through the on-disk cache.
+    """
+
+    def __init__(self, icps: List[Dict[str, Any]], compiled: Optional[Dict[str, Any]] = None):
+        self.icps = icps
+        self._by_id = {icp['id']: icp for icp in icps if 'id' in icp}
+        # term -> [(doc index, weighted term frequency)]
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        self.doc_lengths: List[float] = []
+        self.avg_doc_length = 0.0
+        self.length_norms: List[float] = []     # BM25 k1 * (1 - b + b * len / avg_len), per ICP
+        if compiled is None:
+            self._compile()
+        else:
+            self._load_compiled(compiled)
+
+    @classmethod
+    def from_options(cls, options: Dict[str, Any]) -> 'ICPCatalog':
+        """Catalog from a wizard options file (`icp_options: [...]`)"""
+        return cls(list(options.get('icp_options') or []))
+
+    @classmethod
+    def from_mapping(cls, icps: Dict[str, Dict[str, Any]]) -> 'ICPCatalog':
+        """Catalog from a collector config `icps:` mapping keyed by ICP id"""
+        return cls([dict(icp, id=key, name=icp.get('name') or icp.get('label') or key)
+                    for key, icp in (icps or {}).items()])
+
+    def _document_fields(self, icp: Dict[str, Any]) -> Dict[str, List[str]]:
+        technographics = icp.get('technographics') or {}
+        queries = _as_list((icp.get('github') or {}).get('repo_queries')) + \
+            _as_list((icp.get('search') or {}).get('segments'))
+        from_queries = _query_terms(queries)
+        return {
+            'name': [icp.get('name', ''), icp.get('id', '').replace('_', ' ')],
+            'language': _as_list(technographics.get('language')) + from_queries['language'],
+            'topic': _as_list(technographics.get('frameworks')) + from_queries['topic'],
+            'keyword': _as_list(icp.get('keywords')) + from_queries['keyword'],
+            'description': [icp.get('description', '')],
+            'trigger': _as_list(icp.get('triggers')),
+        }
+
+    def _compile(self) -> None:
+        postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        for doc, icp in enumerate(self.icps):
+            length = 0.0
+            for field, values in self._document_fields(icp).items():
+                weight = FIELD_WEIGHTS[field]
+                for token in tokenize(' '.join(values)):
+                    postings[token][doc] = postings[token].get(doc, 0.0) + weight
+                    length += weight
+            self.doc_lengths.append(length)
+        self.postings = {term: sorted(docs.items()) for term, docs in postings.items()}
+        self._set_length_norms()
+
+    def _set_length_norms(self) -> None:
+        self.avg_doc_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if self.doc_lengths else 0.0
+        self.length_norms = [BM25_K1 * (1 - BM25_B + BM25_B * length / (self.avg_doc_length or 1.0))
+                             for length in self.doc_lengths]
+
+    def _load_compiled(self, compiled: Dict[str, Any]) -> None:
+        doc_lengths = [float(length) for length in compiled['doc_lengths']]
+        if len(doc_lengths) != len(self.icps):
+            raise ValueError(f"{len(doc_lengths)} document lengths for {len(self.icps)} ICPs")
+        postings = {}
+        for term, docs in compiled['postings'].items():
+            posting = [(int(doc), float(tf)) for doc, tf in docs]
+            if any(not 0 <= doc < len(self.icps) for doc, _ in posting):
+                raise ValueError(f"Posting for {term!r} points outside the catalog")
+            postings[term] = posting
+        self.postings = postings
+        self.doc_lengths = doc_lengths
+        self._set_length_norms()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """ICPs and the compiled index as plain JSON-serializable data"""
+        return {
+            'icps': self.icps,
+            'postings': {term: [[doc, tf] for doc, tf in docs] for term, docs in self.postings.items()},
+            'doc_lengths': self.doc_lengths,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ICPCatalog':
+        """Catalog from `to_dict()` output, without recompiling the index"""
+        return cls(list(data['icps']), compiled=data)
+
+    def get(self, icp_id: str) -> Optional[Dict[str, Any]]:
+        return self._by_id.get(icp_id)
+
+    def __len__(self) -> int:
+        return len(self.icps)
+
+    def __iter__(self):
+        return iter(self.icps)
+
+    def search(self, text: str, limit: int = 5, min_score: float = 0.0) -> List[Tuple[Dict[str, Any], float]]:
+        """ICPs ranked by BM25 relevance to `text`, best first"""
+        n = len(self.icps)
+        if not n:
+            return []
+        scores: Dict[int, float] = defaultdict(float)
+        norms = self.length_norms
+        for term in set(tokenize(text)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc, tf in posting:
+                scores[doc] += idf * tf * (BM25_K1 + 1) / (tf + norms[doc])
+        ranked = sorted(((score, doc) for doc, score in scores.items() if score > min_score),
+                        key=lambda item: (-item[0], item[1]))
+        return [(self.icps[doc], score) for score, doc in ranked[:limit]]
+
+    def match(self, text: str, limit: int = 5) -> List[Dict[str, Any]]:
+        return [icp for icp, _ in self.search(text, limit)]
+
+
+def _disk_cache_path(cache_dir: Path, path: Path, kind: str) -> Path:
+    digest = hashlib.sha1(f"{kind}|{path}".encode('utf-8')).hexdigest()[:16]
+    return cache_dir / f"{path.stem}_{kind}_{digest}.json"
+
+
+def get_catalog(path: PathLike, kind: str = 'options',
+                cache_dir: Optional[PathLike] = DEFAULT_CACHE_DIR) -> ICPCatalog:
+    """Compiled catalog for an ICP YAML file, rebuilt only when the file changes
+
+    `kind` is 'options' for wizard option files (`icp_options:` list) or
+    'mapping' for collector configs (`icps:` mapping). The compiled catalog is
+    memoized in-process and written as JSON under `cache_dir` (None disables
+    the disk cache); both are keyed on the file's mtime and size. The disk
+    cache holds only data, so a tampered file is at worst rejected and rebuilt.
+    """
+    path = Path(path).resolve()
+    stamp = _FileCache.stamp(path)
+    key = f"{kind}|{path}"
+    catalog = _catalog_cache.get(key, stamp)
+    if catalog is not None:
+        return catalog
+
+    disk_path = _disk_cache_path(Path(cache_dir), path, kind) if cache_dir else None
+    if disk_path and disk_path.exists():
+        try:
+            with open(disk_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('version') == CATALOG_FORMAT_VERSION and tuple(cached.get('stamp', ())) == stamp:
+                catalog = ICPCatalog.from_dict(cached['catalog'])
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable ICP catalog cache {disk_path}: {e}")
+
+    if catalog is None:
+        data = load_yaml(path)
+        catalog = ICPCatalog.from_mapping(data.get('icps') or {}) if kind == 'mapping' \
+            else ICPCatalog.from_options(data)
+        if disk_path:
+            try:
+                disk_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = disk_path.with_suffix('.tmp')
+                payload = json.dumps({'version': CATALOG_FORMAT_VERSION, 'stamp': list(stamp),
+                                      'catalog': catalog.to_dict()}, ensure_ascii=False)
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(tmp, disk_path)
+            except (OSError, TypeError, ValueError) as e:
+                # TypeError: YAML values JSON cannot hold (e.g. unquoted dates); skip the disk cache
+                logger.debug(f"Could not write ICP catalog cache {disk_path}: {e}")
+        logger.debug(f"Compiled ICP catalog from {path}: {len(catalog)} ICPs, {len(catalog.postings)} terms")
+
+    _catalog_cache.put(key, stamp, catalog)
+    return catalog
+
+
+def clear_caches() -> None:
+    """Drop the in-process YAML and catalog caches (the disk cache is validated by mtime)"""
+    _yaml_cache.clear()
+    _catalog_cache.clear()
@@ -6,14 +6,17 @@ Filters prospects based on Ideal Customer Profile matching
 
 import re
 from typing import Dict, List, Any, Tuple, Optional
-from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass
 import logging
 
-from .timezone_utils import parse_utc_datetime
+from .timezone_utils import days_since as _days_since
 
 logger = logging.getLogger(__name__)
 
+TECH_HUBS = ('san francisco', 'palo alto', 'mountain view', 'seattle', 'austin', 'boston')
+US_CITIES = TECH_HUBS + ('new york', 'san jose')
+ENGLISH_SPEAKING_COUNTRIES = ('united states', 'canada', 'united kingdom', 'australia', 'new zealand')
+
 
 @dataclass
 class ICPMatchResult:
@@ -189,8 +192,7 @@ class ICPRelevanceFilter:
                         category_reasons.append(f"Bio indicates {size_category} stage")
 
             # Location-based size hints (tech hubs suggest growth stage)
-            tech_hubs = ['san francisco', 'palo alto', 'mountain view', 'seattle', 'austin', 'boston']
-            if any(hub in location for hub in tech_hubs):
+            if any(hub in location for hub in TECH_HUBS):
                 if size_category in ['series_a', 'series_b_plus']:
                     score += 0.3
                     category_reasons.append("Location suggests growth-stage company")
@@ -294,33 +296,24 @@ class ICPRelevanceFilter:
 
         # Check recency of activity
         if signal_at:
-            try:
-                signal_date = parse_utc_datetime(signal_at)
-                # Use UTC-aware now for consistent comparison
-                now_utc = datetime.now(timezone.utc)
-                # If parsed date is naive, treat as UTC
-                if signal_date.tzinfo is None:
-                    signal_date = signal_date.replace(tzinfo=timezone.utc)
-                days_since = (now_utc - signal_date).days
-
-                # Very recent activity (last 30 days)
-                if days_since <= 30:
-                    score += 0.5
-                    reasons.append(f"Very recent activity ({days_since} days ago)")
-                # Recent activity (last 90 days)
-                elif days_since <= 90:
-                    score += 0.3
-                    reasons.append(f"Recent activity ({days_since} days ago)")
-                # Older activity
-                elif days_since <= 180:
-                    score += 0.1
-                    reasons.append(f"Some recent activity ({days_since} days ago)")
-                else:
-                    reasons.append(f"Older activity ({days_since} days ago)")
-
-            except Exception as e:
-                self.logger.warning(f"Could not parse signal date: {e}")
+            days_since = _days_since(signal_at)
+            if days_since is None:
+                self.logger.warning(f"Could not parse signal date: {signal_at!r}")
                 reasons.append("Could not determine activity recency")
+            # Very recent activity (last 30 days)
+            elif days_since <= 30:
+                score += 0.5
+                reasons.append(f"Very recent activity ({days_since} days ago)")
+            # Recent activity (last 90 days)
+            elif days_since <= 90:
+                score += 0.3
+                reasons.append(f"Recent activity ({days_since} days ago)")
+            # Older activity
+            elif days_since <= 180:
+                score += 0.1
+                reasons.append(f"Some recent activity ({days_since} days ago)")
+            else:
+                reasons.append(f"Older activity ({days_since} days ago)")
         else:
             reasons.append("No activity timestamp available")
 
@@ -399,15 +392,13 @@ class ICPRelevanceFilter:
                 break
 
         # US-based preferences
-        us_cities = ['san francisco', 'palo alto', 'mountain view', 'seattle', 'austin', 'boston', 'new york', 'san jose']
-        if any(city in location for city in us_cities):
+        if any(city in location for city in US_CITIES):
             if 'us' in preferred_locations or 'united states' in preferred_locations:
                 score += 0.6
                 reasons.append("US tech hub location")
 
         # English-speaking countries
-        english_countries = ['united states', 'canada', 'united kingdom', 'australia', 'new zealand']
-        if any(country in location for country in english_countries):
+        if any(country in location for country in ENGLISH_SPEAKING_COUNTRIES):
             score += 0.3
             reasons.append("English-speaking country")
 
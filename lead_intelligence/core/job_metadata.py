@@ -6,6 +6,7 @@ Tracks processing runs with metadata, statistics, and reproducible parameters
 
 import json
 import hashlib
+import sqlite3
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
@@ -66,14 +67,129 @@ class JobMetadata:
             self.output_files = {}
 
 
+def _job_from_dict(job_dict: Dict[str, Any]) -> JobMetadata:
+    """Reconstruct JobMetadata (with nested JobStats) from its asdict() form"""
+    job_dict = dict(job_dict)
+    stats_dict = job_dict.pop('stats', None) or {}
+    job = JobMetadata(**job_dict)
+    job.stats = JobStats(**stats_dict)
+    return job
+
+
+class JobHistoryIndex:
+    """SQLite index of saved jobs with incrementally maintained aggregates.
+
+    Each save stores the job's serialized metadata plus the counters used for
+    history stats, so recent-job listings and stats never read the per-job JSON
+    files. Re-saving a job replaces its row (moving it to most recent), and the
+    all-time totals are adjusted by the difference.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " job_id TEXT UNIQUE NOT NULL,"
+            " started_at TEXT, ended_at TEXT,"
+            " success INTEGER NOT NULL DEFAULT 0,"
+            " prospects INTEGER NOT NULL DEFAULT 0,"
+            " contactable INTEGER NOT NULL DEFAULT 0,"
+            " payload TEXT NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS totals ("
+            " id INTEGER PRIMARY KEY CHECK (id = 1),"
+            " jobs INTEGER NOT NULL, successful INTEGER NOT NULL,"
+            " prospects INTEGER NOT NULL, contactable INTEGER NOT NULL)"
+        )
+        self.conn.execute("INSERT OR IGNORE INTO totals VALUES (1, 0, 0, 0, 0)")
+        self.conn.commit()
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM jobs LIMIT 1").fetchone() is None
+
+    def record(self, job_dict: Dict[str, Any]):
+        """Insert or replace one job and update the running totals in the same transaction"""
+        stats = job_dict.get('stats') or {}
+        row = (
+            int(bool(job_dict.get('success'))),
+            int(stats.get('prospects_after_dedupe') or 0),
+            int(stats.get('contactable_prospects') or 0),
+        )
+        with self.conn:
+            previous = self.conn.execute(
+                "SELECT success, prospects, contactable FROM jobs WHERE job_id = ?", (job_dict['job_id'],)
+            ).fetchone()
+            if previous:
+                self.conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_dict['job_id'],))
+                self.conn.execute(
+                    "UPDATE totals SET jobs = jobs - 1, successful = successful - ?,"
+                    " prospects = prospects - ?, contactable = contactable - ? WHERE id = 1",
+                    previous,
+                )
+            self.conn.execute(
+                "INSERT INTO jobs (job_id, started_at, ended_at, success, prospects, contactable, payload)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_dict['job_id'], job_dict.get('started_at'), job_dict.get('ended_at'), *row,
+                 json.dumps(job_dict, default=str)),
+            )
+            self.conn.execute(
+                "UPDATE totals SET jobs = jobs + 1, successful = successful + ?,"
+                " prospects = prospects + ?, contactable = contactable + ? WHERE id = 1",
+                row,
+            )
+
+    def recent(self, limit: int) -> List[Dict[str, Any]]:
+        rows = self.conn.execute("SELECT payload FROM jobs ORDER BY seq DESC LIMIT ?", (limit,)).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def window_aggregates(self, limit: int) -> Dict[str, int]:
+        """Counters over the most recent `limit` jobs (reads `limit` index rows)"""
+        jobs, successful, prospects, contactable = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(success), 0), COALESCE(SUM(prospects), 0), COALESCE(SUM(contactable), 0)"
+            " FROM (SELECT success, prospects, contactable FROM jobs ORDER BY seq DESC LIMIT ?)",
+            (limit,),
+        ).fetchone()
+        return {'jobs': jobs, 'successful': successful, 'prospects': prospects, 'contactable': contactable}
+
+    def totals(self) -> Dict[str, int]:
+        jobs, successful, prospects, contactable = self.conn.execute(
+            "SELECT jobs, successful, prospects, contactable FROM totals WHERE id = 1"
+        ).fetchone()
+        return {'jobs': jobs, 'successful': successful, 'prospects': prospects, 'contactable': contactable}
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+
 class JobTracker:
     """Tracks processing jobs and manages metadata"""
 
+    # Number of recent jobs covered by get_job_history_stats
+    HISTORY_WINDOW = 100
+
     def __init__(self, base_dir: str):
         self.base_dir = Path(base_dir)
         self.jobs_dir = self.base_dir / "jobs"
-        self.jobs_dir.mkdir(exist_ok=True)
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
         self.current_job: Optional[JobMetadata] = None
+        self.index = JobHistoryIndex(self.jobs_dir / "job_index.sqlite3")
+        if self.index.is_empty():
+            self._backfill_index()
+
+    def _backfill_index(self):
+        """One-time import of pre-index *_metadata.json files, oldest first"""
+        job_files = sorted(self.jobs_dir.glob("*_metadata.json"), key=lambda x: x.stat().st_mtime)
+        for job_file in job_files:
+            try:
+                with open(job_file, 'r') as f:
+                    self.index.record(json.load(f))
+            except Exception:
+                continue
 
     def start_job(
         self,
@@ -218,6 +334,9 @@ Concurrency: {'Enabled' if job.concurrency_enabled else 'Disabled'} ({job.worker
             job_dict = asdict(job)
             json.dump(job_dict, f, indent=2, default=str)
 
+        # Keep the history index (listings and aggregates) in step with the files
+        self.index.record(json.loads(json.dumps(job_dict, default=str)))
+
     def load_job(self, job_id: str) -> Optional[JobMetadata]:
         """Load job metadata from file"""
         job_file = self.jobs_dir / f"{job_id}_metadata.json"
@@ -230,48 +349,42 @@ Concurrency: {'Enabled' if job.concurrency_enabled else 'Disabled'} ({job.worker
                 job_dict = json.load(f)
 
             # Reconstruct JobMetadata object
-            stats_dict = job_dict.pop('stats', {})
-            stats = JobStats(**stats_dict)
-            job = JobMetadata(**job_dict)
-            job.stats = stats
-
-            return job
+            return _job_from_dict(job_dict)
         except Exception:
             return None
 
     def list_recent_jobs(self, limit: int = 10) -> List[JobMetadata]:
-        """List recent jobs"""
-        job_files = sorted(
-            self.jobs_dir.glob("*_metadata.json"),
-            key=lambda x: x.stat().st_mtime,
-            reverse=True
-        )
-
+        """List recent jobs (served from the history index)"""
         jobs = []
-        for job_file in job_files[:limit]:
-            job_id = job_file.stem.replace('_metadata', '')
-            job = self.load_job(job_id)
-            if job:
-                jobs.append(job)
-
+        for job_dict in self.index.recent(limit):
+            try:
+                jobs.append(_job_from_dict(job_dict))
+            except Exception:
+                continue
         return jobs
 
     def get_job_history_stats(self) -> Dict[str, Any]:
-        """Get statistics across all jobs"""
-        jobs = self.list_recent_jobs(100)  # Last 100 jobs
+        """Get statistics across recent jobs (last HISTORY_WINDOW) plus all-time totals"""
+        window = self.index.window_aggregates(self.HISTORY_WINDOW)
+        total_jobs = window['jobs']
 
-        if not jobs:
+        if not total_jobs:
             return {}
 
-        total_jobs = len(jobs)
-        successful_jobs = len([j for j in jobs if j.success])
-        total_prospects = sum(j.stats.prospects_after_dedupe for j in jobs)
-        total_contactable = sum(j.stats.contactable_prospects for j in jobs)
+        total_prospects = window['prospects']
+        totals = self.index.totals()
+        recent = self.list_recent_jobs(1)
 
         return {
             'total_jobs': total_jobs,
-            'success_rate': successful_jobs / total_jobs if total_jobs > 0 else 0,
+            'success_rate': window['successful'] / total_jobs if total_jobs > 0 else 0,
             'avg_prospects_per_job': total_prospects / total_jobs if total_jobs > 0 else 0,
-            'avg_contactable_rate': total_contactable / total_prospects if total_prospects > 0 else 0,
-            'most_recent_job': jobs[0] if jobs else None
+            'avg_contactable_rate': window['contactable'] / total_prospects if total_prospects > 0 else 0,
+            'most_recent_job': recent[0] if recent else None,
+            'all_time': {
+                'total_jobs': totals['jobs'],
+                'success_rate': totals['successful'] / totals['jobs'] if totals['jobs'] > 0 else 0,
+                'avg_prospects_per_job': totals['prospects'] / totals['jobs'] if totals['jobs'] > 0 else 0,
+                'avg_contactable_rate': totals['contactable'] / totals['prospects'] if totals['prospects'] > 0 else 0,
+            },
         }
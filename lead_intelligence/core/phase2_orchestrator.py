@@ -22,6 +22,7 @@ from .icp_filter import ICPRelevanceFilter
 from .activity_filter import ActivityThresholdFilter
 from .data_normalizer import DataNormalizer, NormalizationResult
 from .quality_gate import QualityGate, QualityGateResult
+from .gate_plan import GatePlan
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +58,10 @@ class Phase2Config:
     quality_gates_enabled: bool = True
     quality_config: Dict[str, Any] = field(default_factory=dict)
 
+    # Run the ICP, activity and quality gates as one compiled, short-circuiting
+    # GatePlan after normalization instead of three separate passes
+    use_gate_plan: bool = True
+
     # Processing settings
     max_workers: int = 4
     batch_size: int = 100
@@ -130,6 +135,17 @@ class Phase2Orchestrator:
         # Quality gates
         self.quality_gate = QualityGate(self.config.quality_config)
 
+        # Compiled gate plan over the enabled filters (built once, stats accumulate across runs)
+        self.gate_plan: Optional[GatePlan] = None
+        if self.config.use_gate_plan and (self.config.icp_filtering_enabled or
+                                          self.config.activity_filtering_enabled or
+                                          self.config.quality_gates_enabled):
+            self.gate_plan = GatePlan.compile(
+                self.icp_filter if self.config.icp_filtering_enabled else None,
+                self.activity_filter if self.config.activity_filtering_enabled else None,
+                self.quality_gate if self.config.quality_gates_enabled else None,
+            )
+
     async def process_phase2_async(self, raw_prospects: List[Dict[str, Any]]) -> Phase2Result:
         """Process prospects through Phase 2 pipeline asynchronously"""
         start_time = time.time()
@@ -162,15 +178,18 @@ class Phase2Orchestrator:
                 current_prospects = step_result.data
                 all_errors.extend(step_result.errors)
 
+            # Steps 4, 5 and 7 run as one gate plan after normalization when enabled
+            use_gate_plan = self.gate_plan is not None
+
             # Step 4: ICP relevance filtering
-            if self.config.icp_filtering_enabled:
+            if self.config.icp_filtering_enabled and not use_gate_plan:
                 step_result = await self._run_icp_filtering_step(current_prospects)
                 pipeline_steps.append(step_result)
                 current_prospects = step_result.data
                 all_errors.extend(step_result.errors)
 
             # Step 5: Activity threshold filtering
-            if self.config.activity_filtering_enabled:
+            if self.config.activity_filtering_enabled and not use_gate_plan:
                 step_result = await self._run_activity_filtering_step(current_prospects)
                 pipeline_steps.append(step_result)
                 current_prospects = step_result.data
@@ -184,7 +203,12 @@ class Phase2Orchestrator:
                 all_errors.extend(step_result.errors)
 
             # Step 7: Quality gate validation
-            if self.config.quality_gates_enabled:
+            if use_gate_plan:
+                step_result, rejected_prospects = self._run_gate_plan_step(current_prospects)
+                pipeline_steps.append(step_result)
+                qualified_prospects = step_result.data
+                all_errors.extend(step_result.errors)
+            elif self.config.quality_gates_enabled:
                 step_result = await self._run_quality_gate_step(current_prospects)
                 pipeline_steps.append(step_result)
                 qualified_prospects = step_result.data
@@ -294,15 +318,18 @@ class Phase2Orchestrator:
                 current_prospects = step_result.data
                 all_errors.extend(step_result.errors)
 
+            # Steps 4, 5 and 7 run as one gate plan after normalization when enabled
+            use_gate_plan = self.gate_plan is not None
+
             # Step 4: ICP relevance filtering
-            if self.config.icp_filtering_enabled:
+            if self.config.icp_filtering_enabled and not use_gate_plan:
                 step_result = self._run_icp_filtering_step_sync(current_prospects)
                 pipeline_steps.append(step_result)
                 current_prospects = step_result.data
                 all_errors.extend(step_result.errors)
 
             # Step 5: Activity threshold filtering
-            if self.config.activity_filtering_enabled:
+            if self.config.activity_filtering_enabled and not use_gate_plan:
                 step_result = self._run_activity_filtering_step_sync(current_prospects)
                 pipeline_steps.append(step_result)
                 current_prospects = step_result.data
@@ -316,7 +343,12 @@ class Phase2Orchestrator:
                 all_errors.extend(step_result.errors)
 
             # Step 7: Quality gate validation
-            if self.config.quality_gates_enabled:
+            if use_gate_plan:
+                step_result, rejected_prospects = self._run_gate_plan_step(current_prospects)
+                pipeline_steps.append(step_result)
+                qualified_prospects = step_result.data
+                all_errors.extend(step_result.errors)
+            elif self.config.quality_gates_enabled:
                 step_result = self._run_quality_gate_step_sync(current_prospects)
                 pipeline_steps.append(step_result)
                 qualified_prospects = step_result.data
@@ -931,6 +963,44 @@ class Phase2Orchestrator:
                 data=[]
             )
 
+    def _run_gate_plan_step(self, prospects: List[Dict[str, Any]]) -> Tuple[PipelineStepResult, List[Dict[str, Any]]]:
+        """Run the compiled gate plan; returns the step result and the rejected prospects"""
+        start_time = time.time()
+
+        try:
+            passing, rejected = self.gate_plan.filter_prospects(prospects)
+            rejected_prospects = [{
+                'prospect': r['prospect'],
+                'rejection_reasons': r['reasons'],
+                'failed_gate': r['failed_gate']
+            } for r in rejected]
+
+            processing_time = time.time() - start_time
+
+            return PipelineStepResult(
+                step_name="gate_plan",
+                success=True,
+                input_count=len(prospects),
+                output_count=len(passing),
+                rejected_count=len(rejected_prospects),
+                processing_time=processing_time,
+                errors=[],
+                data=passing
+            ), rejected_prospects
+
+        except Exception as e:
+            processing_time = time.time() - start_time
+            return PipelineStepResult(
+                step_name="gate_plan",
+                success=False,
+                input_count=len(prospects),
+                output_count=0,
+                rejected_count=len(prospects),
+                processing_time=processing_time,
+                errors=[str(e)],
+                data=[]
+            ), []
+
     def _calculate_final_stats(self, raw_prospects: List[Dict[str, Any]],
                              qualified_prospects: List[Dict[str, Any]],
                              rejected_prospects: List[Dict[str, Any]],
@@ -963,6 +1033,10 @@ class Phase2Orchestrator:
         stats['total_processing_time'] = total_processing_time
         stats['avg_processing_time_per_prospect'] = total_processing_time / len(raw_prospects) if raw_prospects else 0
 
+        # Per-gate timing and rejection counts from the compiled plan
+        if self.gate_plan is not None:
+            stats['gate_plan'] = self.gate_plan.get_stats()
+
         return stats
 
     def _config_to_dict(self) -> Dict[str, Any]:
@@ -975,6 +1049,7 @@ class Phase2Orchestrator:
             'activity_filtering_enabled': self.config.activity_filtering_enabled,
             'normalization_enabled': self.config.normalization_enabled,
             'quality_gates_enabled': self.config.quality_gates_enabled,
+            'use_gate_plan': self.config.use_gate_plan,
             'max_workers': self.config.max_workers,
             'batch_size': self.config.batch_size,
             'enable_parallel': self.config.enable_parallel
@@ -7,10 +7,10 @@ Implements scoring and tiering logic for lead qualification
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-import yaml
 import os
 
 from .compliance_checker import ComplianceChecker, ComplianceResult
+from .icp_catalog import load_yaml
 
 
 @dataclass
@@ -65,8 +65,7 @@ class ProspectScorer:
         """Load ICP configuration"""
         if config_path and os.path.exists(config_path):
             try:
-                with open(config_path, 'r') as f:
-                    return yaml.safe_load(f) or {}
+                return load_yaml(config_path)
             except Exception as e:
                 print(f"⚠️  Failed to load ICP config: {e}")
 
@@ -8,6 +8,9 @@ from typing import Dict, List, Any, Tuple, Optional
 from dataclasses import dataclass
 import logging
 import re
+from urllib.parse import urlparse
+
+from .timezone_utils import days_since as _days_since
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +28,24 @@ class QualityGateResult:
 class QualityGate:
     """Implements quality gates for prospect validation"""
 
+    EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+    DISPOSABLE_DOMAINS = frozenset({
+        '10minutemail.com', 'guerrillamail.com', 'mailinator.com',
+        'temp-mail.org', 'throwaway.email', 'yopmail.com'
+    })
+    # Simplified check - in production you'd use MX record validation
+    UNDELIVERABLE_DOMAINS = frozenset({
+        'example.com', 'test.com', 'invalid.com',
+        'localhost', '127.0.0.1'
+    })
+    COMPLETENESS_REQUIRED_FIELDS = ('login', 'name', 'github_user_url')
+    COMPLETENESS_OPTIONAL_FIELDS = ('company', 'location', 'bio', 'followers', 'public_repos')
+    PERSONALIZATION_FIELDS = ('name', 'repo_full_name')
+
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.logger = logging.getLogger(__name__)
+        self.blocked_domains = frozenset(d.lower() for d in config.get('blocked_email_domains', []))
 
         # Quality gate thresholds
         self.gates = {
@@ -157,8 +175,8 @@ class QualityGate:
         reasons = []
 
         # Required fields for basic completeness
-        required_fields = ['login', 'name', 'github_user_url']
-        optional_fields = ['company', 'location', 'bio', 'followers', 'public_repos']
+        required_fields = self.COMPLETENESS_REQUIRED_FIELDS
+        optional_fields = self.COMPLETENESS_OPTIONAL_FIELDS
 
         present_required = sum(1 for field in required_fields if prospect.get(field))
         present_optional = sum(1 for field in optional_fields if prospect.get(field))
@@ -273,18 +291,12 @@ class QualityGate:
             return False, ["No activity timestamp"]
 
         # Calculate days since activity
-        try:
-            from datetime import datetime
-            from .timezone_utils import parse_utc_datetime
-
-            signal_date = parse_utc_datetime(signal_at)
-            days_since = (datetime.now() - signal_date).days
+        days_since = _days_since(signal_at)
+        if days_since is None:
+            return False, [f"Could not parse activity date: {signal_at!r}"]
 
-            if days_since > self.gates['activity_recent']:
-                return False, [f"Activity too old ({days_since} days)"]
-
-        except Exception as e:
-            return False, [f"Could not parse activity date: {e}"]
+        if days_since > self.gates['activity_recent']:
+            return False, [f"Activity too old ({days_since} days)"]
 
         return True, []
 
@@ -308,8 +320,7 @@ class QualityGate:
         email = prospect.get('email_profile') or prospect.get('email_public_commit')
         if email and '@' in email:
             domain = email.split('@')[1].lower()
-            blocked_domains = self.config.get('blocked_email_domains', [])
-            if domain in [d.lower() for d in blocked_domains]:
+            if domain in self.blocked_domains:
                 reasons.append(f"Blocked email domain: {domain}")
 
         passes = len(reasons) == 0
@@ -323,7 +334,7 @@ class QualityGate:
             return True, []
 
         # Must have basic personalization data
-        required_for_personalization = ['name', 'repo_full_name']
+        required_for_personalization = self.PERSONALIZATION_FIELDS
 
         missing = [field for field in required_for_personalization if not prospect.get(field)]
         if missing:
@@ -345,30 +356,16 @@ class QualityGate:
         if not email or '@' not in email:
             return False
 
-        # Simple regex check
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        return bool(self.EMAIL_PATTERN.match(email))
 
     def _is_disposable_email(self, email: str) -> bool:
         """Check if email is from disposable provider"""
         domain = email.split('@')[1].lower()
-
-        disposable_domains = {
-            '10minutemail.com', 'guerrillamail.com', 'mailinator.com',
-            'temp-mail.org', 'throwaway.email', 'yopmail.com'
-        }
-
-        return domain in disposable_domains
+        return domain in self.DISPOSABLE_DOMAINS
 
     def _is_deliverable_domain(self, domain: str) -> bool:
         """Check if domain is likely deliverable"""
-        # This is a simplified check - in production you'd use MX record validation
-        undeliverable_patterns = [
-            'example.com', 'test.com', 'invalid.com',
-            'localhost', '127.0.0.1'
-        ]
-
-        return domain not in undeliverable_patterns and '.' in domain
+        return domain not in self.UNDELIVERABLE_DOMAINS and '.' in domain
 
     def _has_email_issues(self, email: str) -> bool:
         """Check for common email accuracy issues"""
@@ -388,7 +385,6 @@ class QualityGate:
             return False
 
         try:
-            from urllib.parse import urlparse
             parsed = urlparse(url)
             return bool(parsed.scheme and parsed.netloc)
         except:
@@ -406,17 +402,9 @@ class QualityGate:
         # Warning for old activity
         signal_at = prospect.get('signal_at')
         if signal_at:
-            try:
-                from datetime import datetime
-                from .timezone_utils import parse_utc_datetime
-
-                signal_date = parse_utc_datetime(signal_at)
-                days_since = (datetime.now() - signal_date).days
-
-                if days_since > 60 and days_since <= self.gates['activity_recent']:
-                    warnings.append(f"Activity is {days_since} days old (approaching threshold)")
-            except:
-                pass
+            days_since = _days_since(signal_at)
+            if days_since is not None and 60 < days_since <= self.gates['activity_recent']:
+                warnings.append(f"Activity is {days_since} days old (approaching threshold)")
 
         return warnings
 
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Search Query Sharding
+Splits GitHub search queries into shards that each stay under the 1000-result search cap
+"""
+
+import os
+import re
+import json
+import math
+import time
+import hashlib
+import logging
+import pathlib
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# GitHub search never returns more than this many results for one query
+SEARCH_RESULT_CAP = 1000
+
+# Bisection order: activity window first, then creation date, then stars
+SHARD_FIELDS = ('pushed', 'created', 'stars')
+DATE_FIELDS = ('pushed', 'created')
+GITHUB_EPOCH = date(2008, 1, 1)
+MAX_STARS = 1_000_000
+
+_QUALIFIER_RE = re.compile(r'(?<!\S)(pushed|created|stars):(\S+)')
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+Bound = Union[date, int]
+Ranges = Dict[str, Tuple[Bound, Bound]]
+
+
+@dataclass
+class Shard:
+    """One query of a shard plan; total_count is None when the probe failed"""
+    query: str
+    total_count: Optional[int]
+    truncated: bool = False
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _parse_bound(field: str, value: str) -> Optional[Bound]:
+    if field in DATE_FIELDS:
+        if not _DATE_RE.match(value):
+            return None
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return None
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _full_range(field: str) -> Tuple[Bound, Bound]:
+    if field in DATE_FIELDS:
+        return GITHUB_EPOCH, _today()
+    return 0, MAX_STARS
+
+
+def _step(field: str, value: Bound, delta: int) -> Bound:
+    return value + timedelta(days=delta) if field in DATE_FIELDS else value + delta
+
+
+def _parse_qualifier(field: str, raw: str) -> Optional[Tuple[Bound, Bound]]:
+    """Inclusive (lo, hi) for a range qualifier value, None if it isn't a plain range"""
+    lo, hi = _full_range(field)
+    if '..' in raw:
+        left, right = raw.split('..', 1)
+        if left != '*':
+            lo = _parse_bound(field, left)
+        if right != '*':
+            hi = _parse_bound(field, right)
+    elif raw.startswith('>='):
+        lo = _parse_bound(field, raw[2:])
+    elif raw.startswith('<='):
+        hi = _parse_bound(field, raw[2:])
+    elif raw.startswith('>'):
+        lo = _parse_bound(field, raw[1:])
+        lo = _step(field, lo, 1) if lo is not None else None
+    elif raw.startswith('<'):
+        hi = _parse_bound(field, raw[1:])
+        hi = _step(field, hi, -1) if hi is not None else None
+    else:
+        lo = hi = _parse_bound(field, raw)
+    if lo is None or hi is None:
+        return None
+    return lo, hi
+
+
+def parse_query(query: str) -> Tuple[str, Ranges]:
+    """Split a search query into (base query, bisectable ranges)
+
+    Repeated qualifiers for one field are intersected. Qualifiers this module
+    can't represent (e.g. times, or negations) are left in the base query.
+    """
+    ranges: Ranges = {}
+    kept: List[str] = []
+    last = 0
+    for match in _QUALIFIER_RE.finditer(query):
+        field, raw = match.group(1), match.group(2)
+        parsed = _parse_qualifier(field, raw)
+        if parsed is None:
+            continue
+        kept.append(query[last:match.start()])
+        last = match.end()
+        if field in ranges:
+            lo, hi = ranges[field]
+            parsed = (max(lo, parsed[0]), min(hi, parsed[1]))
+        ranges[field] = parsed
+    kept.append(query[last:])
+    base = ' '.join(''.join(kept).split())
+    return base, ranges
+
+
+def render_query(base: str, ranges: Ranges) -> str:
+    parts = [base] if base else []
+    for field in SHARD_FIELDS:
+        if field in ranges:
+            lo, hi = ranges[field]
+            parts.append(f"{field}:{lo}" if lo == hi else f"{field}:{lo}..{hi}")
+    return ' '.join(parts)
+
+
+def split_ranges(ranges: Ranges) -> Optional[Tuple[Ranges, Ranges]]:
+    """Bisect the first splittable field; None when every dimension is a single value
+
+    Dates split at the midpoint; stars split geometrically since star counts
+    are heavy-tailed. A query without a date range gets created: added so it
+    always has a dimension to bisect; stars: is added once dates run out.
+    """
+    candidates = dict(ranges)
+    if not any(f in candidates for f in DATE_FIELDS):
+        candidates['created'] = _full_range('created')
+
+    for field in SHARD_FIELDS:
+        if field not in candidates:
+            if field == 'stars':
+                candidates['stars'] = _full_range('stars')
+            else:
+                continue
+        lo, hi = candidates[field]
+        if lo >= hi:
+            continue
+        if field in DATE_FIELDS:
+            mid = lo + timedelta(days=(hi - lo).days // 2)
+        else:
+            mid = max(lo, min(hi - 1, int(math.sqrt((lo + 1) * (hi + 1))) - 1))
+        left, right = dict(candidates), dict(candidates)
+        left[field] = (lo, mid)
+        right[field] = (_step(field, mid, 1), hi)
+        return left, right
+    return None
+
+
+class ShardPlanCache:
+    """JSON file of shard plans keyed by query, reused until they expire"""
+
+    def __init__(self, path: str, ttl_hours: float = 24):
+        self.path = pathlib.Path(path)
+        self.ttl_seconds = ttl_hours * 3600
+        self._lock = threading.Lock()
+        self._plans: Optional[Dict[str, Dict]] = None
+
+    @staticmethod
+    def key(query: str, cap: int) -> str:
+        return hashlib.sha1(f"{cap}|{query}".encode('utf-8')).hexdigest()
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._plans is None:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self._plans = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._plans = {}
+        return self._plans
+
+    def get(self, query: str, cap: int) -> Optional[List[Shard]]:
+        with self._lock:
+            entry = self._load().get(self.key(query, cap))
+        if not entry or time.time() - entry.get('created_at', 0) > self.ttl_seconds:
+            return None
+        return [Shard(s['query'], s.get('total_count'), s.get('truncated', False)) for s in entry['shards']]
+
+    def put(self, query: str, cap: int, shards: List[Shard]) -> None:
+        with self._lock:
+            plans = self._load()
+            now = time.time()
+            # Drop expired plans so the file doesn't grow with every daily {date:N} expansion
+            for key in [k for k, v in plans.items() if now - v.get('created_at', 0) > self.ttl_seconds]:
+                del plans[key]
+            plans[self.key(query, cap)] = {
+                'query': query,
+                'created_at': now,
+                'shards': [{'query': s.query, 'total_count': s.total_count, 'truncated': s.truncated} for s in shards]
+            }
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(plans, f, indent=2)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                logger.warning(f"Could not save shard plan cache {self.path}: {e}")
+
+
+class ShardPlanner:
+    """Probes total_count and bisects range qualifiers until every shard is under the cap"""
+
+    def __init__(self, cache: Optional[ShardPlanCache] = None, cap: int = SEARCH_RESULT_CAP,
+                 probe_workers: int = 4, max_shards: int = 256):
+        self.cache = cache
+        self.cap = cap
+        self.probe_workers = max(1, probe_workers)
+        self.max_shards = max_shards
+
+    def plan(self, query: str, count_fn: Callable[[str], Optional[int]]) -> List[Shard]:
+        """Shards covering `query`; `count_fn` returns a query's total_count (None on failure)"""
+        if self.cache:
+            cached = self.cache.get(query, self.cap)
+            if cached is not None:
+                logger.debug(f"Using cached shard plan ({len(cached)} shards) for: {query[:80]}")
+                return cached
+
+        total = count_fn(query)
+        if total is None or total <= self.cap:
+            shards = [Shard(query, total)]
+        else:
+            shards = self._bisect(query, total, count_fn)
+            logger.info(f"Sharded query ({total} results) into {len(shards)} shards: {query[:80]}")
+
+        if self.cache and all(s.total_count is not None for s in shards):
+            self.cache.put(query, self.cap, shards)
+        return shards
+
+    def _bisect(self, query: str, total: int, count_fn: Callable[[str], Optional[int]]) -> List[Shard]:
+        base, ranges = parse_query(query)
+        shards: List[Shard] = []
+        frontier: List[Tuple[Ranges, str, int]] = [(ranges, query, total)]
+
+        with ThreadPoolExecutor(max_workers=self.probe_workers) as executor:
+            while frontier:
+                children: List[Tuple[Ranges, str]] = []
+                for node_ranges, node_query, count in frontier:
+                    split = split_ranges(node_ranges) if len(shards) + len(frontier) < self.max_shards else None
+                    if split is None:
+                        logger.warning(f"Shard still has {count} results and can't be split further: {node_query[:80]}")
+                        shards.append(Shard(node_query, count, truncated=True))
+                        continue
+                    children.extend((r, render_query(base, r)) for r in split)
+
+                counts = list(executor.map(count_fn, [q for _, q in children]))
+                frontier = []
+                for (child_ranges, child_query), count in zip(children, counts):
+                    if count == 0:
+                        continue
+                    if count is None or count <= self.cap:
+                        shards.append(Shard(child_query, count))
+                    else:
+                        frontier.append((child_ranges, child_query, count))
+        return shards
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Signal Cursors
+Per-repo, per-signal-type "since" cursors and a rolling window of seen signals, so daily
+runs only fetch activity newer than the last run
+"""
+
+import logging
+import pathlib
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# GitHub timestamps are UTC with a Z suffix; normalized values compare correctly as strings
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+@dataclass
+class SignalCursor:
+    """Newest signal seen for a repo and signal type"""
+    last_seen_at: str
+    last_seen_id: str
+
+
+@dataclass
+class SignalRecord:
+    """The parts of a PR, issue or commit the rollup keeps"""
+    item_id: str
+    occurred_at: str
+    author: Optional[str]
+
+
+def normalize_timestamp(value: Any) -> Optional[str]:
+    """UTC timestamp in GitHub's `YYYY-MM-DDTHH:MM:SSZ` form, None if unparseable"""
+    if isinstance(value, datetime):
+        dt = value
+    elif isinstance(value, str) and value:
+        try:
+            dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    else:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+def signal_record(signal_type: str, data: Dict[str, Any]) -> Optional[SignalRecord]:
+    """Build a SignalRecord from a GitHub API item ('pr', 'issue' or 'commit')"""
+    if not data:
+        return None
+    if signal_type == 'commit':
+        commit = data.get('commit') or {}
+        occurred_at = normalize_timestamp((commit.get('committer') or {}).get('date')
+                                          or (commit.get('author') or {}).get('date'))
+        author = data.get('author') or {}
+        login = author.get('login') if author.get('type') == 'User' else None
+        item_id = data.get('sha')
+    else:
+        occurred_at = normalize_timestamp(data.get('updated_at') or data.get('created_at'))
+        login = (data.get('user') or {}).get('login')
+        item_id = data.get('number', data.get('id'))
+    if item_id is None or occurred_at is None:
+        return None
+    return SignalRecord(str(item_id), occurred_at, login)
+
+
+class SignalCursorStore:
+    """SQLite store of signal cursors and a per-repo rollup of signals in the window
+
+    `since()` gives the timestamp to pass as the API's `since` (the cursor,
+    or the start of the window for repos not seen before). Callers fetch
+    every page back to it, then `merge()` records the signals, advances the
+    cursor and prunes rollup rows that have aged out, so `author_counts()`
+    stays a correct "last N days" count without refetching the whole window.
+    """
+
+    def __init__(self, db_path: str, window_days: int = 90):
+        self.db_path = db_path
+        self.window_days = window_days
+        self._lock = threading.Lock()
+        pathlib.Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        with self._conn:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS signal_cursors (
+                    repo_full_name TEXT NOT NULL,
+                    signal_type TEXT NOT NULL,
+                    last_seen_at TEXT NOT NULL,
+                    last_seen_id TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (repo_full_name, signal_type)
+                )
+            ''')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS signal_rollup (
+                    repo_full_name TEXT NOT NULL,
+                    signal_type TEXT NOT NULL,
+                    item_id TEXT NOT NULL,
+                    occurred_at TEXT NOT NULL,
+                    author TEXT,
+                    PRIMARY KEY (repo_full_name, signal_type, item_id)
+                )
+            ''')
+
+    def _window_start(self, window_days: Optional[int] = None) -> str:
+        days = self.window_days if window_days is None else window_days
+        return (datetime.now(timezone.utc) - timedelta(days=days)).strftime(TIMESTAMP_FORMAT)
+
+    def cursor(self, repo_full_name: str, signal_type: str) -> Optional[SignalCursor]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT last_seen_at, last_seen_id FROM signal_cursors WHERE repo_full_name = ? AND signal_type = ?',
+                (repo_full_name, signal_type)
+            ).fetchone()
+        return SignalCursor(*row) if row else None
+
+    def since(self, repo_full_name: str, signal_type: str) -> str:
+        """Fetch activity from this timestamp on (inclusive, as GitHub's `since` is)"""
+        window_start = self._window_start()
+        cursor = self.cursor(repo_full_name, signal_type)
+        if cursor is None or cursor.last_seen_at < window_start:
+            return window_start
+        return cursor.last_seen_at
+
+    def new_signals(self, repo_full_name: str, signal_type: str,
+                    records: Iterable[SignalRecord]) -> List[SignalRecord]:
+        """Records not seen before: newer than the cursor, or updated since they were merged"""
+        since = self.since(repo_full_name, signal_type)
+        cursor = self.cursor(repo_full_name, signal_type)
+        candidates = [r for r in records if r.occurred_at >= since and not
+                      (cursor and r.occurred_at == cursor.last_seen_at and r.item_id == cursor.last_seen_id)]
+        if not candidates:
+            return []
+        with self._lock:
+            known = dict(self._conn.execute(
+                f'''SELECT item_id, occurred_at FROM signal_rollup
+                    WHERE repo_full_name = ? AND signal_type = ?
+                    AND item_id IN ({",".join("?" * len(candidates))})''',
+                (repo_full_name, signal_type, *[r.item_id for r in candidates])
+            ).fetchall())
+        return [r for r in candidates if known.get(r.item_id, '') < r.occurred_at]
+
+    def merge(self, repo_full_name: str, signal_type: str, records: Iterable[SignalRecord],
+              advance_cursor: bool = True) -> int:
+        """Add records to the rollup, advance the cursor and prune aged-out rows
+
+        Pass `advance_cursor=False` when the fetch stopped before reaching
+        `since()` (a page limit or a failed page): the records still count,
+        but the cursor stays put so the unfetched gap is fetched next run.
+        Returns the number of records that were new or newer than the stored copy.
+        """
+        records = list(records)
+        window_start = self._window_start()
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany('''
+                INSERT INTO signal_rollup (repo_full_name, signal_type, item_id, occurred_at, author)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (repo_full_name, signal_type, item_id) DO UPDATE
+                SET occurred_at = excluded.occurred_at, author = excluded.author
+                WHERE excluded.occurred_at > signal_rollup.occurred_at
+            ''', [(repo_full_name, signal_type, r.item_id, r.occurred_at, r.author) for r in records])
+            merged = self._conn.total_changes - before
+
+            if records and advance_cursor:
+                newest = max(records, key=lambda r: (r.occurred_at, r.item_id))
+                self._conn.execute('''
+                    INSERT INTO signal_cursors (repo_full_name, signal_type, last_seen_at, last_seen_id, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (repo_full_name, signal_type) DO UPDATE
+                    SET last_seen_at = excluded.last_seen_at, last_seen_id = excluded.last_seen_id,
+                        updated_at = excluded.updated_at
+                    WHERE excluded.last_seen_at >= signal_cursors.last_seen_at
+                ''', (repo_full_name, signal_type, newest.occurred_at, newest.item_id,
+                      normalize_timestamp(datetime.now(timezone.utc))))
+
+            self._conn.execute(
+                'DELETE FROM signal_rollup WHERE repo_full_name = ? AND signal_type = ? AND occurred_at < ?',
+                (repo_full_name, signal_type, window_start)
+            )
+        return merged
+
+    def author_counts(self, repo_full_name: str, signal_type: str,
+                      window_days: Optional[int] = None) -> Dict[str, int]:
+        """Signals per author within the window, from the stored rollup"""
+        with self._lock:
+            rows = self._conn.execute('''
+                SELECT author, COUNT(*) FROM signal_rollup
+                WHERE repo_full_name = ? AND signal_type = ? AND occurred_at >= ? AND author IS NOT NULL
+                GROUP BY author
+            ''', (repo_full_name, signal_type, self._window_start(window_days))).fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -5,6 +5,7 @@ Ensures all datetime operations use timezone-aware UTC to prevent Phase 2 crashe
 """
 
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from typing import Optional, Union
 import dateutil.parser
 
@@ -57,6 +58,31 @@ def parse_utc_datetime(dt_str: str) -> datetime:
         return utc_now()
 
 
+@lru_cache(maxsize=8192)
+def _parse_utc_cached(dt_str: str) -> Optional[datetime]:
+    try:
+        dt = dateutil.parser.isoparse(dt_str)
+    except Exception:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def days_since(dt_str: str, now: Optional[datetime] = None) -> Optional[int]:
+    """Whole days between a datetime string and now (UTC), None if it can't be parsed
+
+    Parses are memoized, so callers checking the same signal_at from several
+    filters only pay for dateutil once.
+    """
+    if not dt_str or not isinstance(dt_str, str):
+        return None
+    dt = _parse_utc_cached(dt_str)
+    if dt is None:
+        return None
+    return ((now or utc_now()) - dt).days
+
+
 def days_ago(days: int) -> str:
     """Get ISO string for N days ago"""
     past_date = utc_now() - timedelta(days=days)
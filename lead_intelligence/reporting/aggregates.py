@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Dashboard Aggregates
+Single streaming pass over a processed lead run, cached next to the run file
+"""
+
+import heapq
+import json
+import logging
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Bump when the aggregate layout changes so stale caches are recomputed
+AGGREGATES_VERSION = 1
+# Suffix appended to the run file name; deliberately not *.json so run globs skip it
+CACHE_SUFFIX = '.aggregates'
+# Leads kept in the top-N heap, and entries kept per counter in the cache
+TOP_N_CAPACITY = 100
+COUNTER_CAPACITY = 100
+READ_CHUNK_SIZE = 1 << 20
+
+QUALITY_METRICS = ('Has Email', 'Has Company', 'Has Location', 'Has Bio', 'High Followers', 'Active Contributor')
+
+PathLike = Union[str, Path]
+
+
+def iter_json_array(path: PathLike, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array one at a time, reading the file in chunks"""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buf, pos, eof = '', 0, False
+
+        def fill():
+            nonlocal buf, pos, eof
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+
+        def skip(chars: str) -> bool:
+            """Advance past `chars`; False once the file is exhausted"""
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in chars:
+                    pos += 1
+                if pos < len(buf):
+                    return True
+                if eof:
+                    return False
+                fill()
+
+        if not skip(' \t\r\n'):
+            return
+        if buf[pos] != '[':
+            raise ValueError(f"{path} does not contain a JSON array")
+        pos += 1
+        while skip(' \t\r\n,'):
+            if buf[pos] == ']':
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            after = end
+            while after < len(buf) and buf[after] in ' \t\r\n':
+                after += 1
+            if not eof and (after == len(buf) or buf[after] not in ',]'):
+                # A number cut by the chunk boundary (`-7` of `-7.5e3`); decode it again with more data
+                fill()
+                continue
+            pos = end
+            yield item
+        raise ValueError(f"{path} ends before the JSON array is closed")
+
+
+def _present(value: Any) -> bool:
+    """pandas notna() semantics: anything but None/NaN counts, including empty strings"""
+    return value is not None and value == value
+
+
+def _number(value: Any) -> float:
+    return value if isinstance(value, (int, float)) and value == value else 0
+
+
+def _signals(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [s.strip() for s in value.split(',') if s.strip()]
+    if isinstance(value, (list, tuple)):
+        return [str(s).strip() for s in value if str(s).strip()]
+    return []
+
+
+class DashboardAggregates:
+    """Every dashboard metric for one run, built by `add()` in a single pass
+
+    Counters feed the distribution charts, `score_counts` the score
+    histogram, and a bounded min-heap keeps the top-scoring leads (earlier
+    leads win ties, matching `DataFrame.nlargest`). Serialized aggregates
+    keep the `COUNTER_CAPACITY` largest entries of each counter.
+    """
+
+    def __init__(self, top_capacity: int = TOP_N_CAPACITY):
+        self.top_capacity = top_capacity
+        self.total = 0
+        self.high_potential = 0
+        self.with_email = 0
+        self.score_total = 0.0
+        self.score_counts: Counter = Counter()
+        self.engagement: Counter = Counter()
+        self.companies: Counter = Counter()
+        self.languages: Counter = Counter()
+        self.quality_signals: Counter = Counter()
+        self.quality: Counter = Counter()
+        self._top: List[Tuple[float, int, Dict[str, Any]]] = []
+        self.source: Dict[str, Any] = {}
+
+    def add(self, lead: Dict[str, Any]) -> None:
+        index = self.total
+        self.total += 1
+        get = lead.get
+        quality = self.quality
+
+        email_profile, email_commit = get('email_profile'), get('email_public_commit')
+        if email_profile or email_commit:
+            self.with_email += 1
+        if _present(email_profile) or _present(email_commit):
+            quality['Has Email'] += 1
+
+        engagement = get('engagement_potential')
+        if engagement == 'high':
+            self.high_potential += 1
+        if _present(engagement):
+            self.engagement[engagement] += 1
+
+        company = get('company')
+        if _present(company):
+            self.companies[company] += 1
+            quality['Has Company'] += 1
+        language = get('language')
+        if _present(language):
+            self.languages[language] += 1
+        if _present(get('location')):
+            quality['Has Location'] += 1
+        if _present(get('bio')):
+            quality['Has Bio'] += 1
+        if _number(get('followers')) > 50:
+            quality['High Followers'] += 1
+        if _number(get('public_repos')) > 10:
+            quality['Active Contributor'] += 1
+
+        signals = get('quality_signals')
+        if signals:
+            self.quality_signals.update(_signals(signals))
+
+        score = get('intelligence_score')
+        if isinstance(score, (int, float)) and score == score:
+            self.score_total += score
+            self.score_counts[round(score, 2)] += 1
+            key = (score, -index)
+            top = self._top
+            if len(top) < self.top_capacity:
+                heapq.heappush(top, (key, index, self._top_row(lead)))
+            elif key > top[0][0]:
+                heapq.heapreplace(top, (key, index, self._top_row(lead)))
+
+    @staticmethod
+    def _top_row(lead: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'Login': lead.get('login'),
+            'Score': lead.get('intelligence_score'),
+            'Email': lead.get('email_profile') or lead.get('email_public_commit') or 'N/A',
+            'Company': lead.get('company') or 'N/A',
+            'Location': lead.get('location') or 'N/A',
+            'Followers': lead.get('followers') or 0,
+            'Stars': lead.get('stars') or 0,
+            'Repository': lead.get('repo_full_name') or 'N/A',
+        }
+
+    @classmethod
+    def from_leads(cls, leads, top_capacity: int = TOP_N_CAPACITY) -> 'DashboardAggregates':
+        aggregates = cls(top_capacity)
+        for lead in leads:
+            aggregates.add(lead)
+        return aggregates
+
+    @property
+    def avg_score(self) -> float:
+        return round(self.score_total / self.total, 1) if self.total else 0
+
+    def quality_percentages(self) -> Dict[str, float]:
+        return {metric: round(self.quality[metric] / self.total * 100, 1) if self.total else 0.0
+                for metric in QUALITY_METRICS}
+
+    def top_leads(self, n: int = 20) -> List[Dict[str, Any]]:
+        """Highest-scoring leads, best first"""
+        return [row for _, _, row in sorted(self._top, reverse=True)[:n]]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'total': self.total,
+            'high_potential': self.high_potential,
+            'with_email': self.with_email,
+            'avg_score': self.avg_score,
+            **{f"pct_{metric.lower().replace(' ', '_')}": pct for metric, pct in self.quality_percentages().items()},
+        }
+
+    def compare(self, other: 'DashboardAggregates') -> Dict[str, Dict[str, float]]:
+        """Summary metrics of this run against `other` (e.g. the previous run)"""
+        mine, theirs = self.summary(), other.summary()
+        return {key: {'current': mine[key], 'previous': theirs[key], 'delta': round(mine[key] - theirs[key], 1)}
+                for key in mine}
+
+    def to_dict(self) -> Dict[str, Any]:
+        def top_items(counter: Counter) -> List[List[Any]]:
+            return [[key, count] for key, count in counter.most_common(COUNTER_CAPACITY)]
+
+        return {
+            'version': AGGREGATES_VERSION,
+            'source': self.source,
+            'top_capacity': self.top_capacity,
+            'total': self.total,
+            'high_potential': self.high_potential,
+            'with_email': self.with_email,
+            'score_total': self.score_total,
+            'score_counts': sorted([score, count] for score, count in self.score_counts.items()),
+            'engagement': top_items(self.engagement),
+            'companies': top_items(self.companies),
+            'languages': top_items(self.languages),
+            'quality_signals': top_items(self.quality_signals),
+            'quality': dict(self.quality),
+            'top': [[list(key), index, row] for key, index, row in self._top],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DashboardAggregates':
+        aggregates = cls(data['top_capacity'])
+        aggregates.source = data.get('source', {})
+        for field in ('total', 'high_potential', 'with_email', 'score_total'):
+            setattr(aggregates, field, data[field])
+        for field in ('score_counts', 'engagement', 'companies', 'languages', 'quality_signals'):
+            setattr(aggregates, field, Counter({key: count for key, count in data[field]}))
+        aggregates.quality = Counter(data['quality'])
+        aggregates._top = [(tuple(key), index, row) for key, index, row in data['top']]
+        heapq.heapify(aggregates._top)
+        return aggregates
+
+
+def aggregates_cache_path(run_path: PathLike) -> Path:
+    run_path = Path(run_path)
+    return run_path.with_name(run_path.name + CACHE_SUFFIX)
+
+
+def _source_stamp(run_path: Path) -> Dict[str, Any]:
+    stat = run_path.stat()
+    return {'path': run_path.name, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def load_run_aggregates(run_path: PathLike, top_capacity: int = TOP_N_CAPACITY,
+                        use_cache: bool = True) -> DashboardAggregates:
+    """Aggregates for a run file, read from its cache unless the run changed since
+
+    A miss streams the run once (memory stays bounded by one lead plus the
+    counters and heap) and rewrites `<run>.aggregates` atomically.
+    """
+    run_path = Path(run_path)
+    stamp = _source_stamp(run_path)
+    cache_path = aggregates_cache_path(run_path)
+
+    if use_cache and cache_path.exists():
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if (cached.get('version') == AGGREGATES_VERSION and cached.get('source') == stamp
+                    and cached.get('top_capacity', 0) >= top_capacity):
+                return DashboardAggregates.from_dict(cached)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable dashboard aggregates {cache_path}: {e}")
+
+    aggregates = DashboardAggregates(top_capacity)
+    for lead in iter_json_array(run_path):
+        if isinstance(lead, dict):
+            aggregates.add(lead)
+    aggregates.source = stamp
+
+    try:
+        tmp = cache_path.with_name(cache_path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(aggregates.to_dict(), f, default=str)
+        os.replace(tmp, cache_path)
+    except OSError as e:
+        logger.debug(f"Could not write dashboard aggregates {cache_path}: {e}")
+    return aggregates
+
+
+def find_run_files(processed_dir: PathLike, pattern: str = 'intelligent_leads*.json') -> List[Path]:
+    """Processed run files, newest first"""
+    return sorted(Path(processed_dir).glob(pattern), key=lambda p: p.stat().st_mtime, reverse=True)
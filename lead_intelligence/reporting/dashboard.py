@@ -6,15 +6,33 @@ Generates interactive HTML dashboards for lead intelligence data
 
 import os
 import json
-import pandas as pd
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import plotly.offline as offline
 
+try:
+    from .aggregates import DashboardAggregates, find_run_files, load_run_aggregates
+except ImportError:  # run as a script (make intelligence-dashboard)
+    from aggregates import DashboardAggregates, find_run_files, load_run_aggregates
+
+LeadData = Union[List[Dict[str, Any]], DashboardAggregates]
+
+
+def _aggregates(data: LeadData) -> DashboardAggregates:
+    """Views accept raw leads or precomputed aggregates; raw leads are aggregated in one pass"""
+    if isinstance(data, DashboardAggregates):
+        return data
+    return DashboardAggregates.from_leads(data)
+
+
+def _bar_axes(counter, n: int = 10):
+    top = counter.most_common(n)
+    return [name for name, _ in top], [count for _, count in top]
+
 
 class IntelligenceDashboard:
     """Generates interactive dashboards for lead intelligence"""
@@ -24,26 +42,30 @@ class IntelligenceDashboard:
         self.reports_dir = self.data_dir.parent / "reporting" / "dashboards"
         self.reports_dir.mkdir(parents=True, exist_ok=True)
 
-    def load_latest_data(self) -> Dict[str, Any]:
-        """Load the most recent intelligence data"""
+    def latest_run_file(self) -> Path:
+        """Path of the most recent processed intelligence run"""
         processed_dir = self.data_dir / "processed"
 
         if not processed_dir.exists():
             raise FileNotFoundError(f"No processed data found in {processed_dir}")
 
-        # Find latest processed file
-        json_files = list(processed_dir.glob("intelligent_leads*.json"))
-        if not json_files:
+        run_files = find_run_files(processed_dir)
+        if not run_files:
             raise FileNotFoundError("No intelligent leads data found")
+        return run_files[0]
 
-        latest_file = max(json_files, key=lambda x: x.stat().st_mtime)
-
-        with open(latest_file, 'r') as f:
+    def load_latest_data(self) -> List[Dict[str, Any]]:
+        """Load the most recent intelligence data"""
+        with open(self.latest_run_file(), 'r') as f:
             return json.load(f)
 
-    def generate_overview_dashboard(self, data: List[Dict[str, Any]]) -> str:
+    def load_latest_aggregates(self, use_cache: bool = True) -> DashboardAggregates:
+        """Dashboard aggregates of the most recent run, streamed once and cached next to it"""
+        return load_run_aggregates(self.latest_run_file(), use_cache=use_cache)
+
+    def generate_overview_dashboard(self, data: LeadData) -> str:
         """Generate main overview dashboard"""
-        df = pd.DataFrame(data)
+        agg = _aggregates(data)
 
         # Create subplots
         fig = make_subplots(
@@ -54,38 +76,32 @@ class IntelligenceDashboard:
                    [{'type': 'bar'}, {'type': 'bar'}]]
         )
 
-        # Intelligence Score Distribution
+        # Intelligence Score Distribution (pre-counted scores, summed per bin)
+        scores = sorted(agg.score_counts.items())
         fig.add_trace(
-            go.Histogram(x=df['intelligence_score'], nbinsx=20, name="Scores"),
+            go.Histogram(x=[score for score, _ in scores], y=[count for _, count in scores],
+                         histfunc='sum', nbinsx=20, name="Scores"),
             row=1, col=1
         )
 
         # Engagement Potential Pie Chart
-        potential_counts = df['engagement_potential'].value_counts()
+        potential_labels, potential_values = _bar_axes(agg.engagement, None)
         fig.add_trace(
-            go.Pie(labels=potential_counts.index, values=potential_counts.values,
+            go.Pie(labels=potential_labels, values=potential_values,
                   name="Engagement Potential"),
             row=1, col=2
         )
 
         # Top Companies
-        company_counts = df['company'].dropna().value_counts().head(10)
+        company_names, company_values = _bar_axes(agg.companies)
         fig.add_trace(
-            go.Bar(x=company_counts.index, y=company_counts.values,
+            go.Bar(x=company_names, y=company_values,
                   name="Company Distribution"),
             row=2, col=1
         )
 
         # Quality Signals (simplified)
-        signal_counts = {}
-        for signals_str in df['quality_signals'].dropna():
-            for signal in signals_str.split(','):
-                signal = signal.strip()
-                if signal:
-                    signal_counts[signal] = signal_counts.get(signal, 0) + 1
-
-        top_signals = sorted(signal_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-        signal_names, signal_values = zip(*top_signals)
+        signal_names, signal_values = _bar_axes(agg.quality_signals)
 
         fig.add_trace(
             go.Bar(x=signal_names, y=signal_values, name="Quality Signals"),
@@ -101,30 +117,17 @@ class IntelligenceDashboard:
 
         return offline.plot(fig, include_plotlyjs=True, output_type='div')
 
-    def generate_quality_dashboard(self, data: List[Dict[str, Any]]) -> str:
+    def generate_quality_dashboard(self, data: LeadData) -> str:
         """Generate quality analysis dashboard"""
-        df = pd.DataFrame(data)
-
-        # Calculate quality metrics
-        quality_metrics = {
-            'Has Email': df['email_profile'].notna() | df['email_public_commit'].notna(),
-            'Has Company': df['company'].notna(),
-            'Has Location': df['location'].notna(),
-            'Has Bio': df['bio'].notna(),
-            'High Followers': df['followers'] > 50,
-            'Active Contributor': df['public_repos'] > 10
-        }
-
-        quality_df = pd.DataFrame({k: v.sum() for k, v in quality_metrics.items()},
-                                index=['Count']).T
-        quality_df['Percentage'] = (quality_df['Count'] / len(df) * 100).round(1)
+        # Share of leads meeting each quality metric
+        percentages = _aggregates(data).quality_percentages()
 
         # Create quality chart
         fig = go.Figure(data=[
             go.Bar(
-                x=quality_df.index,
-                y=quality_df['Percentage'],
-                text=quality_df['Percentage'].astype(str) + '%',
+                x=list(percentages),
+                y=list(percentages.values()),
+                text=[f"{pct}%" for pct in percentages.values()],
                 textposition='auto',
             )
         ])
@@ -138,15 +141,15 @@ class IntelligenceDashboard:
 
         return offline.plot(fig, include_plotlyjs=True, output_type='div')
 
-    def generate_opportunity_dashboard(self, data: List[Dict[str, Any]]) -> str:
+    def generate_opportunity_dashboard(self, data: LeadData) -> str:
         """Generate opportunity analysis dashboard"""
-        df = pd.DataFrame(data)
+        agg = _aggregates(data)
 
         # Technology distribution
-        tech_counts = df['language'].dropna().value_counts().head(10)
+        tech_names, tech_values = _bar_axes(agg.languages)
 
         # Company concentration
-        company_counts = df['company'].dropna().value_counts().head(10)
+        company_names, company_values = _bar_axes(agg.companies)
 
         # Create subplot
         fig = make_subplots(
@@ -156,13 +159,13 @@ class IntelligenceDashboard:
 
         # Technology bar chart
         fig.add_trace(
-            go.Bar(x=tech_counts.index, y=tech_counts.values, name="Technologies"),
+            go.Bar(x=tech_names, y=tech_values, name="Technologies"),
             row=1, col=1
         )
 
         # Company bar chart
         fig.add_trace(
-            go.Bar(x=company_counts.index, y=company_counts.values, name="Companies"),
+            go.Bar(x=company_names, y=company_values, name="Companies"),
             row=1, col=2
         )
 
@@ -174,32 +177,17 @@ class IntelligenceDashboard:
 
         return offline.plot(fig, include_plotlyjs=True, output_type='div')
 
-    def generate_lead_detail_view(self, data: List[Dict[str, Any]], top_n: int = 20) -> str:
+    def generate_lead_detail_view(self, data: LeadData, top_n: int = 20) -> str:
         """Generate detailed lead view for top performers"""
-        df = pd.DataFrame(data)
-        top_leads = df.nlargest(top_n, 'intelligence_score')
-
-        # Create detailed table
-        table_data = []
-        for _, lead in top_leads.iterrows():
-            table_data.append({
-                'Login': lead['login'],
-                'Score': lead['intelligence_score'],
-                'Email': lead.get('email_profile') or lead.get('email_public_commit') or 'N/A',
-                'Company': lead.get('company') or 'N/A',
-                'Location': lead.get('location') or 'N/A',
-                'Followers': lead.get('followers') or 0,
-                'Stars': lead.get('stars') or 0,
-                'Repository': lead.get('repo_full_name') or 'N/A'
-            })
-
-        table_df = pd.DataFrame(table_data)
+        # Rows come from the bounded top-N heap, best first
+        table_data = _aggregates(data).top_leads(top_n)
+        columns = list(table_data[0]) if table_data else []
 
         fig = go.Figure(data=[go.Table(
-            header=dict(values=list(table_df.columns),
+            header=dict(values=columns,
                        fill_color='paleturquoise',
                        align='left'),
-            cells=dict(values=[table_df[col] for col in table_df.columns],
+            cells=dict(values=[[row[col] for row in table_data] for col in columns],
                       fill_color='lavender',
                       align='left'))
         ])
@@ -211,15 +199,16 @@ class IntelligenceDashboard:
 
         return offline.plot(fig, include_plotlyjs=True, output_type='div')
 
-    def generate_html_dashboard(self, data: List[Dict[str, Any]]) -> str:
+    def generate_html_dashboard(self, data: LeadData) -> str:
         """Generate complete HTML dashboard"""
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-        # Generate all dashboard components
-        overview_chart = self.generate_overview_dashboard(data)
-        quality_chart = self.generate_quality_dashboard(data)
-        opportunity_chart = self.generate_opportunity_dashboard(data)
-        detail_view = self.generate_lead_detail_view(data)
+        # Aggregate once and share it across every component
+        agg = _aggregates(data)
+        overview_chart = self.generate_overview_dashboard(agg)
+        quality_chart = self.generate_quality_dashboard(agg)
+        opportunity_chart = self.generate_opportunity_dashboard(agg)
+        detail_view = self.generate_lead_detail_view(agg)
 
         # Create HTML template
         html_template = f"""
@@ -292,19 +281,19 @@ class IntelligenceDashboard:
                     <p>Generated on {timestamp}</p>
                     <div class="stats">
                         <div class="stat-card">
-                            <div class="stat-number">{len(data)}</div>
+                            <div class="stat-number">{agg.total}</div>
                             <div class="stat-label">Total Leads</div>
                         </div>
                         <div class="stat-card">
-                            <div class="stat-number">{len([d for d in data if d.get('engagement_potential') == 'high'])}</div>
+                            <div class="stat-number">{agg.high_potential}</div>
                             <div class="stat-label">High Potential</div>
                         </div>
                         <div class="stat-card">
-                            <div class="stat-number">{len([d for d in data if d.get('email_profile') or d.get('email_public_commit')])}</div>
+                            <div class="stat-number">{agg.with_email}</div>
                             <div class="stat-label">With Email</div>
                         </div>
                         <div class="stat-card">
-                            <div class="stat-number">{round(sum(d.get('intelligence_score', 0) for d in data) / len(data), 1) if data else 0}</div>
+                            <div class="stat-number">{agg.avg_score}</div>
                             <div class="stat-label">Avg Score</div>
                         </div>
                     </div>
@@ -361,7 +350,7 @@ class IntelligenceDashboard:
 
         return html_template
 
-    def save_dashboard(self, data: List[Dict[str, Any]], filename: str = None) -> str:
+    def save_dashboard(self, data: LeadData, filename: str = None) -> str:
         """Save dashboard to HTML file"""
         if filename is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -384,26 +373,33 @@ def main():
     parser.add_argument('--data-dir', default='lead_intelligence/data',
                        help='Directory containing intelligence data')
     parser.add_argument('--output', help='Output filename (optional)')
+    parser.add_argument('--compare', metavar='RUN_FILE',
+                       help='Compare the latest run against another intelligent_leads*.json run')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Recompute aggregates instead of reading <run>.json.aggregates')
 
     args = parser.parse_args()
 
     try:
         dashboard = IntelligenceDashboard(args.data_dir)
-        data = dashboard.load_latest_data()
+        agg = dashboard.load_latest_aggregates(use_cache=not args.no_cache)
 
-        output_path = dashboard.save_dashboard(data, args.output)
+        output_path = dashboard.save_dashboard(agg, args.output)
 
         print(f"✅ Dashboard generated: {output_path}")
-        print(f"📊 Total leads analyzed: {len(data)}")
+        print(f"📊 Total leads analyzed: {agg.total}")
 
         # Print summary stats
-        high_potential = len([d for d in data if d.get('engagement_potential') == 'high'])
-        with_email = len([d for d in data if d.get('email_profile') or d.get('email_public_commit')])
-
         print("📈 Summary:")
-        print(f"   • High potential leads: {high_potential}")
-        print(f"   • Leads with email: {with_email}")
-        print(f"   • Average intelligence score: {round(sum(d.get('intelligence_score', 0) for d in data) / len(data), 1) if data else 0}")
+        print(f"   • High potential leads: {agg.high_potential}")
+        print(f"   • Leads with email: {agg.with_email}")
+        print(f"   • Average intelligence score: {agg.avg_score}")
+
+        if args.compare:
+            previous = load_run_aggregates(args.compare, use_cache=not args.no_cache)
+            print(f"🔁 Compared with {Path(args.compare).name}:")
+            for metric, values in agg.compare(previous).items():
+                print(f"   • {metric}: {values['current']} ({values['delta']:+} vs {values['previous']})")
 
     except Exception as e:
         print(f"❌ Error generating dashboard: {e}")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: dashboard metrics from a whole-file load plus one DataFrame pass per view, vs a single
+streaming aggregation pass, vs the cached aggregates. Writes a synthetic run file and reports wall
+time and peak Python heap (tracemalloc) for each mode.
+"""
+
+import sys
+import json
+import time
+import random
+import tempfile
+import argparse
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from lead_intelligence.reporting.aggregates import aggregates_cache_path, load_run_aggregates
+
+
+def make_lead(i: int, rng: random.Random) -> dict:
+    return {
+        'login': f'user_{i:08d}', 'intelligence_score': round(rng.random() * 100, 2),
+        'engagement_potential': rng.choice(['high', 'medium', 'low']),
+        'email_profile': f'user_{i}@example.com' if rng.random() < 0.4 else None,
+        'email_public_commit': None, 'company': rng.choice([None, 'Acme', 'Globex', 'Initech', f'co_{i % 500}']),
+        'location': rng.choice([None, 'Berlin', 'NYC']), 'bio': 'x' * rng.randint(0, 200) or None,
+        'followers': rng.randint(0, 500), 'public_repos': rng.randint(0, 50),
+        'language': rng.choice(['Python', 'Rust', 'Go', None]), 'quality_signals': 'has_email, active',
+        'stars': rng.randint(0, 5000), 'repo_full_name': f'org/repo_{i % 1000}',
+    }
+
+
+def dataframe_passes(run_path: Path) -> int:
+    """What the dashboard did before: load the whole file, then one DataFrame per view"""
+    import pandas as pd
+
+    with open(run_path, 'r') as f:
+        data = json.load(f)
+    for _ in range(4):  # overview, quality, opportunity, lead detail
+        df = pd.DataFrame(data)
+        df['company'].dropna().value_counts().head(10)
+        df['language'].dropna().value_counts().head(10)
+        (df['email_profile'].notna() | df['email_public_commit'].notna()).sum()
+        df.nlargest(20, 'intelligence_score')
+    return len(data)
+
+
+def measure(fn) -> tuple:
+    """Wall time of an untraced run, then peak heap of a second, traced run (tracemalloc slows Python code)"""
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dashboard aggregation')
+    parser.add_argument('--leads', type=int, default=100000, help='Leads in the synthetic run file')
+    parser.add_argument('--skip-pandas', action='store_true', help='Skip the DataFrame baseline')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory(prefix='dashboard_bench_') as work_dir:
+        run_path = Path(work_dir) / 'intelligent_leads_bench.json'
+        print(f"🌱 Writing {args.leads:,} leads...")
+        with open(run_path, 'w') as f:
+            json.dump([make_lead(i, rng) for i in range(args.leads)], f)
+        print(f"   {run_path.stat().st_size / 1e6:,.1f} MB")
+
+        modes = [
+            ('streaming pass', lambda: load_run_aggregates(run_path, use_cache=False).total),
+            ('cached aggregates', lambda: load_run_aggregates(run_path).total),
+        ]
+        if not args.skip_pandas:
+            modes.insert(0, ('load + DataFrame passes', lambda: dataframe_passes(run_path)))
+
+        load_run_aggregates(run_path)  # warm the cache for the cached mode
+        assert aggregates_cache_path(run_path).exists()
+
+        results = {}
+        for mode, fn in modes:
+            total, elapsed, peak = measure(fn)
+            results[mode] = elapsed
+            print(f"\n⏱️  {mode}")
+            print(f"   {elapsed * 1000:,.1f} ms, peak {peak / 1e6:,.1f} MB traced, {total:,} leads")
+
+        if 'load + DataFrame passes' in results:
+            print(f"\n🚀 Streaming speedup: {results['load + DataFrame passes'] / results['streaming pass']:.1f}x, "
+                  f"cached: {results['load + DataFrame passes'] / results['cached aggregates']:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: connection-per-call Deduper vs long-lived WAL connection with Bloom filter front.
+Seeds a throwaway seen_leads table, then replays a lookup/mark_seen workload against both modes.
+"""
+
+import sys
+import time
+import random
+import tempfile
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from lead_intelligence.core.data_collector import Deduper, Prospect
+
+
+def make_prospect(lead_id: str) -> Prospect:
+    return Prospect(
+        lead_id=lead_id, login=f'user_{lead_id[:8]}', name=None, repo_full_name=f'org/{lead_id[:8]}',
+        signal_type='pr', signal='bench', signal_at='2026-01-01T00:00:00+00:00', stars=0, topics=[],
+        language='python', github_user_url='', github_repo_url='', icp='bench',
+        collected_at='2026-01-01T00:00:00+00:00', run_id='bench'
+    )
+
+
+def seed(db_path: str, count: int) -> list:
+    lead_ids = [f'seen_{i:08d}' for i in range(count)]
+    with Deduper(db_path, batch_size=5000) as deduper:
+        for lead_id in lead_ids:
+            deduper.mark_seen(make_prospect(lead_id))
+    return lead_ids
+
+
+def run_workload(deduper: Deduper, lookups: list) -> float:
+    """Collector pattern: check every candidate, mark the unseen ones. Returns lookups/sec"""
+    started = time.perf_counter()
+    for lead_id in lookups:
+        if not deduper.already_seen(lead_id):
+            deduper.mark_seen(make_prospect(lead_id))
+    deduper.flush()
+    elapsed = time.perf_counter() - started
+    return len(lookups) / elapsed if elapsed else float('inf')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Deduper lookup throughput')
+    parser.add_argument('--seeded', type=int, default=50000, help='Leads already in seen_leads')
+    parser.add_argument('--lookups', type=int, default=20000, help='Lookups per mode')
+    parser.add_argument('--hit-rate', type=float, default=0.1, help='Fraction of lookups for already-seen leads')
+    parser.add_argument('--batch-size', type=int, default=500, help='mark_seen batch size for long-lived mode')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory(prefix='dedupe_bench_') as work_dir:
+        print(f"🌱 Seeding {args.seeded} seen leads...")
+
+        results = {}
+        for mode, persistent in (('connection-per-call', False), ('long-lived + bloom', True)):
+            db_path = str(Path(work_dir) / f'{mode.split()[0]}.sqlite3')
+            seen = seed(db_path, args.seeded)
+            lookups = [rng.choice(seen) if rng.random() < args.hit_rate else f'new_{mode[0]}_{i:08d}'
+                       for i in range(args.lookups)]
+
+            print(f"\n⏱️  {mode}")
+            deduper = Deduper(db_path, persistent=persistent, batch_size=args.batch_size)
+            try:
+                results[mode] = run_workload(deduper, lookups)
+            finally:
+                deduper.close()
+            print(f"   {results[mode]:,.0f} lookups/sec")
+            if persistent:
+                stats = deduper.stats
+                print(f"   bloom negatives: {stats['bloom_negatives']}/{stats['lookups']}, "
+                      f"db lookups: {stats['db_lookups']}, commits: {stats['commits']}")
+
+        baseline, optimized = results['connection-per-call'], results['long-lived + bloom']
+        print(f"\n🚀 Speedup: {optimized / baseline:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
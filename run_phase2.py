@@ -116,6 +116,7 @@ def create_phase2_config(args) -> Phase2Config:
         activity_filtering_enabled=not getattr(args, 'skip_activity_filtering', False),
         normalization_enabled=not getattr(args, 'skip_normalization', False),
         quality_gates_enabled=not getattr(args, 'skip_quality_gates', False),
+        use_gate_plan=not getattr(args, 'no_gate_plan', False),
 
         icp_config=icp_config,
         activity_config=activity_config,
@@ -260,6 +261,18 @@ def generate_report(results: Dict[str, Any]) -> str:
             report_lines.append(f"- Errors: {step_stats['error_count']}")
         report_lines.append("")
 
+    # Gate plan
+    if stats.get('gate_plan'):
+        report_lines.append("## Gate Plan")
+        report_lines.append(f"Order: {' > '.join(stats['gate_plan']['order'])}")
+        report_lines.append("")
+        report_lines.append("| Gate | Evaluated | Rejected | Rejection Rate | Mean (µs) |")
+        report_lines.append("|------|-----------|----------|----------------|-----------|")
+        for gate in stats['gate_plan']['gates']:
+            report_lines.append(f"| {gate['gate']} | {gate['evaluated']} | {gate['rejected']} | "
+                                f"{gate['rejection_rate']:.1%} | {gate['mean_us']:.1f} |")
+        report_lines.append("")
+
     # Errors and warnings
     if results['errors']:
         report_lines.append("## Errors")
@@ -488,6 +501,8 @@ Examples:
                        help='Skip data normalization step')
     parser.add_argument('--skip-quality-gates', action='store_true',
                        help='Skip quality gate validation step')
+    parser.add_argument('--no-gate-plan', action='store_true',
+                       help='Run ICP, activity and quality gates as separate steps instead of one compiled plan')
 
     # ICP filtering options
     parser.add_argument('--icp-relevance-threshold', type=float, default=0.6,
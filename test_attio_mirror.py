@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Attio record mirror tests
+Covers bulk refresh pagination, create-vs-update decisions from a fresh or stale mirror, and plan_import
+"""
+
+import sqlite3
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lead_intelligence.core.attio_integrator import AttioIntegrator
+from lead_intelligence.core.attio_record_mirror import AttioRecordMirror, DEFAULT_MIRROR_DB_PATH
+
+
+class FakeAttio:
+    """Stands in for AttioIntegrator._make_request with in-memory records per object"""
+
+    def __init__(self, records=None):
+        # object slug -> {natural key: record_id}
+        self.records = {slug: dict(keys) for slug, keys in (records or {}).items()}
+        self.calls = []
+        self._next_id = 0
+
+    def __call__(self, method, endpoint, data=None, params=None):
+        self.calls.append((method, endpoint))
+        parts = endpoint.split('/')
+        slug = parts[1]
+        attribute = AttioIntegrator.OBJECT_KEYS[slug]
+        records = self.records.setdefault(slug, {})
+        if endpoint.endswith('/records/query'):
+            listed = list(records.items())[data['offset']:data['offset'] + data['limit']]
+            return {'data': [{'id': {'record_id': rid}, 'values': {attribute: [{'value': key}]}}
+                             for key, rid in listed]}
+        if method == 'GET':
+            key = next(v for k, v in params.items() if k.startswith('filter['))
+            rid = records.get(key)
+            return {'data': [{'id': {'record_id': rid}}] if rid else []}
+        if method == 'POST':
+            self._next_id += 1
+            rid = f'new-{self._next_id}'
+            records[data['data'][attribute]['value']] = rid
+            return {'data': {'id': {'record_id': rid}}}
+        return {'data': {'id': {'record_id': parts[-1]}}}
+
+    def count(self, method, suffix=''):
+        return sum(1 for m, e in self.calls if m == method and e.endswith(suffix))
+
+
+class TestAttioRecordMirror(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self.tmp.name) / 'mirror.sqlite3')
+
+    def tearDown(self):
+        if getattr(self, 'integrator', None) and self.integrator.mirror:
+            self.integrator.mirror.close()
+        self.tmp.cleanup()
+
+    def _integrator(self, fake, **config):
+        self.integrator = AttioIntegrator({'api_token': 'token', 'rate_limit_delay': 0,
+                                           'mirror_db_path': self.db_path, **config})
+        self.integrator._make_request = fake
+        return self.integrator
+
+    def test_default_path_independent_of_cwd(self):
+        self.assertTrue(Path(DEFAULT_MIRROR_DB_PATH).is_absolute())
+        self.assertEqual(Path(DEFAULT_MIRROR_DB_PATH).parent,
+                         Path(__file__).resolve().parent / 'lead_intelligence' / 'data')
+        self.assertEqual(AttioIntegrator({'api_token': 'token', 'use_record_mirror': False}).config['mirror_db_path'],
+                         DEFAULT_MIRROR_DB_PATH)
+
+    def test_refresh_paginates_bulk_listing(self):
+        fake = FakeAttio({'people': {f'user{i}': f'p{i}' for i in range(7)}, 'repos': {'org/a': 'r1'}})
+        integrator = self._integrator(fake, mirror_page_size=3)
+        counts = integrator.refresh_mirror()
+        self.assertEqual(counts, {'people': 7, 'repos': 1, 'repo_membership': 0, 'signals': 0})
+        # 7 people in pages of 3: 3 + 3 + 1
+        self.assertEqual(fake.count('POST', 'people/records/query'), 3)
+        self.assertEqual(integrator.mirror.get('people', 'user6'), 'p6')
+        self.assertEqual(integrator.mirror.count('people'), 7)
+        self.assertTrue(integrator.mirror.is_fresh('people', 1))
+
+        # A refresh replaces the object: records deleted upstream disappear locally
+        del fake.records['people']['user0']
+        integrator.refresh_mirror(['people'])
+        self.assertIsNone(integrator.mirror.get('people', 'user0'))
+        self.assertEqual(integrator.mirror.count('people'), 6)
+
+    def test_fresh_mirror_decides_without_lookups(self):
+        fake = FakeAttio({'people': {'known': 'p1'}})
+        integrator = self._integrator(fake)
+        integrator.ensure_mirror_fresh(['people'])
+        fake.calls.clear()
+
+        results = integrator.import_people([{'login': 'known'}, {'login': 'newbie'}])
+        self.assertEqual((results['created'], results['updated'], results['failed']), (1, 1, 0))
+        self.assertEqual(fake.count('GET'), 0)
+        self.assertIn(('PUT', 'objects/people/records/p1'), fake.calls)
+        # The create is remembered, so a re-import updates instead of duplicating
+        self.assertEqual(integrator.mirror.get('people', 'newbie'), 'new-1')
+        again = integrator.import_people([{'login': 'newbie'}])
+        self.assertEqual((again['created'], again['updated']), (0, 1))
+        self.assertEqual(fake.count('POST', 'people/records'), 1)
+
+    def test_stale_mirror_falls_back_to_lookups(self):
+        fake = FakeAttio({'people': {'known': 'p1'}})
+        integrator = self._integrator(fake, mirror_max_age_hours=1)
+        # Mirror has an outdated mapping and a refresh older than the max age
+        integrator.mirror.replace_object('people', [('known', 'stale-id')])
+        old = (datetime.now() - timedelta(hours=2)).isoformat()
+        integrator.mirror.conn.execute("UPDATE refreshes SET refreshed_at = ?", (old,))
+        integrator.mirror.conn.commit()
+
+        results = integrator.import_people([{'login': 'known'}, {'login': 'newbie'}])
+        self.assertEqual((results['created'], results['updated']), (1, 1))
+        self.assertEqual(fake.count('GET'), 2)
+        self.assertIn(('PUT', 'objects/people/records/p1'), fake.calls)
+        # Remote answers are written back to the mirror
+        self.assertEqual(integrator.mirror.get('people', 'known'), 'p1')
+
+    def test_plan_import_counts(self):
+        fake = FakeAttio({'people': {'a': 'p1', 'b': 'p2'}, 'repos': {'org/x': 'r1'}})
+        integrator = self._integrator(fake)
+        integrator.refresh_mirror()
+        fake.calls.clear()
+        plan = integrator.plan_import({
+            'people': [{'login': 'a'}, {'login': 'b'}, {'login': 'c'}, {'name': 'no login'}],
+            'repos': [{'repo_full_name': 'org/x'}, {'repo_full_name': 'org/y'}],
+        })
+        self.assertEqual(plan['people'], {'total': 4, 'update': 2, 'create': 1, 'missing_key': 1})
+        self.assertEqual(plan['repos'], {'total': 2, 'update': 1, 'create': 1, 'missing_key': 0})
+        self.assertEqual(plan['signals'], {'total': 0, 'update': 0, 'create': 0, 'missing_key': 0})
+        self.assertEqual(fake.calls, [])
+
+    def test_plan_import_requires_mirror(self):
+        integrator = self._integrator(FakeAttio(), use_record_mirror=False)
+        self.assertIsNone(integrator.mirror)
+        with self.assertRaises(ValueError):
+            integrator.plan_import({'people': []})
+
+    def test_mirror_get_many_chunks(self):
+        mirror = AttioRecordMirror(self.db_path)
+        try:
+            mirror.replace_object('people', [(f'u{i}', f'id{i}') for i in range(1200)])
+            found = mirror.get_many('people', [f'u{i}' for i in range(0, 1300, 2)])
+            self.assertEqual(len(found), 600)
+            tables = {r[0] for r in sqlite3.connect(self.db_path).execute("SELECT name FROM sqlite_master")}
+            self.assertTrue({'records', 'refreshes'} <= tables)
+        finally:
+            mirror.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Conversation memory tests
+Covers the SQLite schema, the one-time import of legacy JSON profiles, global counters across
+restarts, similar-session lookups, retention cleanup and export
+"""
+
+import hashlib
+import json
+import sqlite3
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from icp_wizard.core.memory_system import ConversationMemory
+
+PYPI_CONVERSATION = {
+    'messages': [{'role': 'user', 'content': 'We sell devtools to python teams in fintech'}],
+    'final_icp_config': {'icp_id': 'icp01_pypi', 'icp_name': 'PyPI Maintainers'},
+    'duration_seconds': 120,
+}
+ML_CONVERSATION = {
+    'messages': [{'role': 'user', 'content': 'Our customers run pytorch for healthcare imaging'}],
+    'final_icp_config': {'icp_id': 'icp02_ml', 'icp_name': 'ML Engineers'},
+    'duration_seconds': 1200,
+}
+UNFINISHED_CONVERSATION = {
+    'messages': [{'role': 'user', 'content': 'python fintech, not sure yet'}],
+    'duration_seconds': 400,
+}
+
+
+class TestConversationMemory(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.memory_dir = Path(self.tmp.name)
+        self.memories = []
+
+    def tearDown(self):
+        for memory in self.memories:
+            memory.close()
+        self.tmp.cleanup()
+
+    def _memory(self):
+        memory = ConversationMemory(self.memory_dir)
+        self.memories.append(memory)
+        return memory
+
+    def _write_legacy(self, user_id, **fields):
+        # Old files hold a partial profile named after the user hash; missing fields get defaults on import
+        user_hash = hashlib.md5(user_id.encode()).hexdigest()[:12]
+        path = self.memory_dir / f'{user_hash}_memory.json'
+        path.write_text(json.dumps({'user_id': user_id, **fields}), encoding='utf-8')
+        return path
+
+    def test_schema(self):
+        memory = self._memory()
+        self.assertEqual(memory.db_path, self.memory_dir / ConversationMemory.DB_FILENAME)
+        conn = sqlite3.connect(memory.db_path)
+        try:
+            names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        finally:
+            conn.close()
+        self.assertTrue({'user_memories', 'global_patterns', 'sessions', 'session_tags',
+                         'idx_user_memories_updated', 'idx_sessions_user'} <= names)
+        self.assertEqual(journal_mode, 'wal')
+        self.assertEqual(memory.get_memory_stats()['total_users'], 0)
+
+    def test_legacy_files_imported_once_and_counted(self):
+        alice_file = self._write_legacy('alice', conversation_count=3, successful_icps=[
+            {'icp_id': 'icp01_pypi'}, {'icp_id': 'icp01_pypi'}, {'icp_id': 'icp02_ml'}])
+        bob_file = self._write_legacy('bob', conversation_count=1)
+        (self.memory_dir / 'broken_memory.json').write_text('{not json', encoding='utf-8')
+
+        memory = self._memory()
+        self.assertFalse(alice_file.exists())
+        self.assertTrue(alice_file.with_suffix('.json.imported').exists())
+        self.assertTrue(bob_file.with_suffix('.json.imported').exists())
+        # Unreadable files are left in place for inspection
+        self.assertTrue((self.memory_dir / 'broken_memory.json').exists())
+
+        alice = memory.load_user_memory('alice')
+        self.assertEqual(alice['conversation_count'], 3)
+        self.assertEqual(len(alice['successful_icps']), 3)
+
+        stats = memory.get_memory_stats()
+        self.assertEqual(stats['total_users'], 2)
+        self.assertEqual(stats['total_conversations'], 4)
+        self.assertEqual(stats['popular_icps'], {'icp01_pypi': 2, 'icp02_ml': 1})
+
+        # A second start finds nothing new to import and does not double count
+        memory.close()
+        self.memories.remove(memory)
+        stats = self._memory().get_memory_stats()
+        self.assertEqual((stats['total_users'], stats['total_conversations']), (2, 4))
+
+    def test_legacy_file_does_not_overwrite_existing_profile(self):
+        memory = self._memory()
+        memory.update_memory_from_conversation('alice', PYPI_CONVERSATION)
+        memory.close()
+        self.memories.remove(memory)
+
+        self._write_legacy('alice', conversation_count=7)
+        memory = self._memory()
+        self.assertEqual(memory.load_user_memory('alice')['conversation_count'], 1)
+        stats = memory.get_memory_stats()
+        self.assertEqual((stats['total_users'], stats['total_conversations']), (1, 1))
+
+    def test_global_counters_survive_restart(self):
+        memory = self._memory()
+        memory.update_memory_from_conversation('alice', PYPI_CONVERSATION)
+        memory.update_memory_from_conversation('alice', UNFINISHED_CONVERSATION)
+        memory.update_memory_from_conversation('bob', ML_CONVERSATION)
+        before = memory.get_memory_stats()
+        memory.close()
+        self.memories.remove(memory)
+
+        after = self._memory().get_memory_stats()
+        for key in ('total_users', 'total_conversations', 'popular_icps', 'conversation_duration_distribution'):
+            self.assertEqual(after[key], before[key])
+        self.assertEqual((after['total_users'], after['total_conversations']), (2, 3))
+        self.assertEqual(after['popular_icps'], {'icp01_pypi': 1, 'icp02_ml': 1})
+        self.assertEqual(after['conversation_duration_distribution'], {'quick': 1, 'medium': 1, 'long': 1})
+
+    def test_find_similar_sessions(self):
+        memory = self._memory()
+        memory.update_memory_from_conversation('alice', PYPI_CONVERSATION)
+        memory.update_memory_from_conversation('bob', ML_CONVERSATION)
+        memory.update_memory_from_conversation('carol', UNFINISHED_CONVERSATION)
+
+        sessions = memory.find_similar_sessions(industries=['fintech'], technologies=['python'])
+        self.assertEqual([s['icp_id'] for s in sessions], ['icp01_pypi'])
+        self.assertEqual(sessions[0]['matching_tags'], 2)
+        self.assertTrue(sessions[0]['success'])
+
+        # Unsuccessful sessions are included on request, best overlap first
+        sessions = memory.find_similar_sessions(industries=['fintech'], technologies=['python'],
+                                                icp_id='icp01_pypi', successful_only=False)
+        self.assertEqual([(s['icp_id'], s['matching_tags']) for s in sessions], [('icp01_pypi', 3), (None, 2)])
+
+        self.assertEqual(memory.find_similar_sessions(icp_id='icp01_pypi', exclude_user='alice'), [])
+        self.assertEqual(memory.find_similar_sessions(), [])
+        self.assertEqual(memory.get_personalized_suggestions('dave')['similar_session_icps'], [])
+
+    def test_cleanup_old_memories(self):
+        memory = self._memory()
+        memory.update_memory_from_conversation('alice', PYPI_CONVERSATION)
+        memory.update_memory_from_conversation('bob', ML_CONVERSATION)
+        old = memory.load_user_memory('alice')
+        old['last_conversation'] = (datetime.now() - timedelta(days=400)).isoformat()
+        memory.save_user_memory('alice', old)
+
+        self.assertEqual(memory.cleanup_old_memories(days_to_keep=365), 1)
+        self.assertEqual(memory.load_user_memory('alice')['conversation_count'], 0)
+        self.assertEqual(memory.load_user_memory('bob')['conversation_count'], 1)
+        self.assertEqual(memory.get_memory_stats()['total_users'], 1)
+        # The removed user's sessions and tags are gone too
+        self.assertEqual(memory.find_similar_sessions(icp_id='icp01_pypi'), [])
+        self.assertEqual(len(memory.find_similar_sessions(icp_id='icp02_ml')), 1)
+        orphans = memory._conn.execute(
+            "SELECT COUNT(*) FROM session_tags WHERE session_id NOT IN (SELECT session_id FROM sessions)"
+        ).fetchone()[0]
+        self.assertEqual(orphans, 0)
+        self.assertEqual(memory.cleanup_old_memories(days_to_keep=365), 0)
+
+    def test_export_memory_data(self):
+        memory = self._memory()
+        memory.update_memory_from_conversation('alice', PYPI_CONVERSATION)
+        memory.update_memory_from_conversation('bob', ML_CONVERSATION)
+        export_path = self.memory_dir / 'export.json'
+
+        self.assertTrue(memory.export_memory_data(export_path))
+        exported = json.loads(export_path.read_text(encoding='utf-8'))
+        self.assertEqual(set(exported['users']), {'alice', 'bob'})
+        self.assertEqual(exported['users']['alice']['successful_icps'][0]['icp_id'], 'icp01_pypi')
+        self.assertEqual(exported['global_patterns']['totals'], {'users': 2, 'conversations': 2})
+        self.assertFalse(memory.export_memory_data(self.memory_dir / 'missing' / 'export.json'))
+
+
+if __name__ == '__main__':
+    unittest.main()
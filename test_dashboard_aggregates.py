@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Dashboard aggregates tests
+Covers the streaming run parser, single-pass metrics, the bounded top-N heap, and the per-run cache
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lead_intelligence.reporting.aggregates import (
+    DashboardAggregates, aggregates_cache_path, find_run_files, iter_json_array, load_run_aggregates
+)
+
+
+def _lead(i, **overrides):
+    lead = {
+        'login': f"dev{i}",
+        'intelligence_score': round((i * 37) % 100 / 10, 1),
+        'engagement_potential': ('high', 'medium', 'low')[i % 3],
+        'email_profile': f"dev{i}@example.com" if i % 2 else None,
+        'email_public_commit': None,
+        'company': ('Acme', 'Globex', None)[i % 3],
+        'location': 'Berlin' if i % 4 else None,
+        'bio': '' if i % 5 == 0 else 'Builds things',
+        'followers': i * 7,
+        'public_repos': i % 20,
+        'language': ('Python', 'Rust', 'Go', None)[i % 4],
+        'quality_signals': 'has_email, active' if i % 2 else None,
+        'stars': i,
+        'repo_full_name': f"org/repo{i}",
+    }
+    lead.update(overrides)
+    return lead
+
+
+class TestDashboardAggregates(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.processed = Path(self.tmp.name)
+        self.leads = [_lead(i) for i in range(60)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_run(self, leads, name='intelligent_leads_20260101.json'):
+        path = self.processed / name
+        path.write_text(json.dumps(leads, indent=2, ensure_ascii=False), encoding='utf-8')
+        return path
+
+    def test_streaming_parser_matches_json_load(self):
+        leads = self.leads + [_lead(99, bio='naïve é "quoted" ] , {', intelligence_score=12345.678)]
+        path = self._write_run(leads)
+        for chunk_size in (1, 7, 64, 1 << 20):
+            self.assertEqual(list(iter_json_array(path, chunk_size)), leads)
+
+        (self.processed / 'scalars.json').write_text('[1, 23456, -7.5e3, "x", true, null]')
+        self.assertEqual(list(iter_json_array(self.processed / 'scalars.json', 2)), [1, 23456, -7.5e3, 'x', True, None])
+        (self.processed / 'empty.json').write_text(' [ ] ')
+        self.assertEqual(list(iter_json_array(self.processed / 'empty.json', 1)), [])
+        (self.processed / 'truncated.json').write_text('[{"a": 1}, {"b"')
+        with self.assertRaises(ValueError):
+            list(iter_json_array(self.processed / 'truncated.json', 4))
+
+    def test_metrics_in_one_pass(self):
+        agg = DashboardAggregates.from_leads(self.leads)
+        self.assertEqual(agg.total, 60)
+        self.assertEqual(agg.high_potential, 20)
+        self.assertEqual(agg.with_email, 30)
+        self.assertEqual(agg.avg_score, round(sum(l['intelligence_score'] for l in self.leads) / 60, 1))
+        self.assertEqual(agg.companies, {'Acme': 20, 'Globex': 20})
+        self.assertEqual(agg.languages['Python'], 15)
+        self.assertEqual(agg.quality_signals, {'has_email': 30, 'active': 30})
+        self.assertEqual(sum(agg.score_counts.values()), 60)
+
+        quality = agg.quality_percentages()
+        self.assertEqual(quality['Has Email'], 50.0)
+        self.assertEqual(quality['Has Location'], 75.0)
+        # Empty bios count as present, as pandas notna() did
+        self.assertEqual(quality['Has Bio'], 100.0)
+        self.assertEqual(quality['High Followers'], round(sum(l['followers'] > 50 for l in self.leads) / 60 * 100, 1))
+
+    def test_top_leads_bounded_and_stable(self):
+        leads = [_lead(i, intelligence_score=5.0) for i in range(10)] + [_lead(10, intelligence_score=9.0)]
+        agg = DashboardAggregates.from_leads(leads, top_capacity=4)
+        self.assertEqual(len(agg._top), 4)
+        # Highest score first, then earlier leads win ties (DataFrame.nlargest order)
+        self.assertEqual([row['Login'] for row in agg.top_leads(3)], ['dev10', 'dev0', 'dev1'])
+        row = agg.top_leads(1)[0]
+        self.assertEqual(row['Email'], 'dev10@example.com' if 10 % 2 else 'N/A')
+        self.assertEqual(row['Repository'], 'org/repo10')
+
+    def test_cache_hit_and_invalidation(self):
+        run = self._write_run(self.leads)
+        first = load_run_aggregates(run)
+        cache = aggregates_cache_path(run)
+        self.assertTrue(cache.exists())
+
+        cached = json.loads(cache.read_text())
+        cached['total'] = -1
+        cache.write_text(json.dumps(cached))
+        self.assertEqual(load_run_aggregates(run).total, -1)
+        self.assertEqual(load_run_aggregates(run, use_cache=False).total, first.total)
+
+        self._write_run(self.leads[:10])
+        stat = run.stat()
+        os.utime(run, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        reloaded = load_run_aggregates(run)
+        self.assertEqual(reloaded.total, 10)
+        self.assertEqual(reloaded.top_leads(), DashboardAggregates.from_leads(self.leads[:10]).top_leads())
+
+        cache.write_text('{not json')
+        self.assertEqual(load_run_aggregates(run).total, 10)
+
+    def test_cache_round_trip_and_run_glob(self):
+        run = self._write_run(self.leads)
+        computed = load_run_aggregates(run)
+        cached = load_run_aggregates(run)
+        self.assertEqual(cached.summary(), computed.summary())
+        self.assertEqual(cached.top_leads(100), computed.top_leads(100))
+        self.assertEqual(cached.score_counts, computed.score_counts)
+        self.assertEqual(cached.companies, computed.companies)
+
+        newer = self._write_run(self.leads[:5], 'intelligent_leads_20260102.json')
+        os.utime(newer, (run.stat().st_mtime + 5,) * 2)
+        self.assertEqual(find_run_files(self.processed), [newer, run])
+
+    def test_compare_runs(self):
+        current = DashboardAggregates.from_leads(self.leads)
+        previous = DashboardAggregates.from_leads(self.leads[:30])
+        diff = current.compare(previous)
+        self.assertEqual(diff['total'], {'current': 60, 'previous': 30, 'delta': 30})
+        self.assertEqual(diff['high_potential']['delta'], 10)
+        self.assertIn('pct_has_email', diff)
+
+
+if __name__ == '__main__':
+    unittest.main()
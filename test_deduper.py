@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Deduper tests
+Covers the Bloom filter, batched inserts with explicit flush, and agreement with connection-per-call mode
+"""
+
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lead_intelligence.core.data_collector import BloomFilter, Deduper, Prospect
+
+
+def _prospect(lead_id):
+    return Prospect(
+        lead_id=lead_id, login='dev', name=None, repo_full_name='dev/repo', signal_type='pr',
+        signal='Fix', signal_at='2026-01-01T00:00:00+00:00', stars=10, topics=[], language='python',
+        github_user_url='https://github.com/dev', github_repo_url='https://github.com/dev/repo',
+        icp='icp01', collected_at='2026-01-01T00:00:00+00:00', run_id='test'
+    )
+
+
+def _row_count(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute('SELECT COUNT(*) FROM seen_leads').fetchone()[0]
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_no_false_negatives_and_low_false_positives(self):
+        bloom = BloomFilter(5000, error_rate=0.01)
+        for i in range(5000):
+            bloom.add(f'lead_{i}')
+        self.assertTrue(all(f'lead_{i}' in bloom for i in range(5000)))
+        false_positives = sum(f'other_{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class TestDeduper(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self.tmp.name) / 'dedup.sqlite3')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_batches_inserts_until_flush(self):
+        deduper = Deduper(self.db_path, batch_size=3)
+        deduper.mark_seen(_prospect('a'))
+        deduper.mark_seen(_prospect('b'))
+        self.assertTrue(deduper.already_seen('a'))
+        self.assertEqual(_row_count(self.db_path), 0)
+
+        deduper.mark_seen(_prospect('c'))
+        self.assertEqual(_row_count(self.db_path), 3)
+        deduper.mark_seen(_prospect('d'))
+        deduper.flush()
+        self.assertEqual(_row_count(self.db_path), 4)
+        self.assertEqual(deduper.stats['commits'], 2)
+        deduper.close()
+
+    def test_bloom_rebuilt_from_existing_rows(self):
+        with Deduper(self.db_path) as deduper:
+            for i in range(50):
+                deduper.mark_seen(_prospect(f'lead_{i}'))
+        self.assertEqual(_row_count(self.db_path), 50)
+
+        deduper = Deduper(self.db_path)
+        self.assertTrue(all(deduper.already_seen(f'lead_{i}') for i in range(50)))
+        self.assertFalse(any(deduper.already_seen(f'new_{i}') for i in range(200)))
+        # Unseen leads are answered by the Bloom filter, not the database
+        self.assertGreater(deduper.stats['bloom_negatives'], 190)
+        self.assertLess(deduper.stats['db_lookups'], 60)
+        deduper.close()
+
+    def test_growth_past_capacity_rebuilds_bloom(self):
+        with Deduper(self.db_path, batch_size=50) as deduper:
+            deduper._rebuild_bloom(min_capacity=10)
+            for i in range(100):
+                deduper.mark_seen(_prospect(f'lead_{i}'))
+            self.assertGreaterEqual(deduper._bloom.capacity, 100)
+            self.assertTrue(all(deduper.already_seen(f'lead_{i}') for i in range(100)))
+        self.assertEqual(_row_count(self.db_path), 100)
+
+    def test_matches_connection_per_call_mode(self):
+        legacy = Deduper(self.db_path, persistent=False)
+        legacy.mark_seen(_prospect('old'))
+        self.assertTrue(legacy.already_seen('old'))
+        self.assertFalse(legacy.already_seen('new'))
+
+        with Deduper(self.db_path) as deduper:
+            self.assertTrue(deduper.already_seen('old'))
+            self.assertFalse(deduper.already_seen('new'))
+            deduper.mark_seen(_prospect('new'))
+            deduper.mark_seen(_prospect('new'))
+        self.assertTrue(legacy.already_seen('new'))
+        self.assertEqual(_row_count(self.db_path), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Gate plan tests
+Covers ordering, short-circuiting, agreement with the individual filters, and stats-driven reordering
+"""
+
+import sys
+import unittest
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lead_intelligence.core.gate_plan import GatePlan, Gate
+from lead_intelligence.core.icp_filter import ICPRelevanceFilter
+from lead_intelligence.core.activity_filter import ActivityThresholdFilter
+from lead_intelligence.core.quality_gate import QualityGate
+from lead_intelligence.core.phase2_orchestrator import Phase2Orchestrator, Phase2Config
+from lead_intelligence.core.timezone_utils import utc_now, days_since
+
+ICP_CONFIG = {'relevance_threshold': 0.3, 'tech_stacks': ['python_ml', 'devops'], 'preferred_locations': ['us']}
+ACTIVITY_CONFIG = {'min_activity_score': 0.4}
+QUALITY_CONFIG = {'data_completeness_threshold': 0.5, 'data_consistency_threshold': 0.5,
+                  'blocked_email_domains': ['Blocked.IO']}
+
+
+def _prospect(i, **overrides):
+    prospect = {
+        'login': f'dev{i}', 'name': f'Dev Person{i}', 'github_user_url': f'https://github.com/dev{i}',
+        'email_profile': f'dev{i}@acme.dev', 'company': 'Acme seed startup', 'location': 'Seattle, WA',
+        'bio': 'Maintainer of ML tooling, pytorch and kubernetes', 'followers': 120, 'following': 30,
+        'public_repos': 25, 'language': 'python', 'topics': ['machine-learning'],
+        'repo_full_name': f'dev{i}/ml-infra', 'github_repo_url': f'https://github.com/dev{i}/ml-infra',
+        'signal': 'Add distributed training support', 'signal_type': 'pr',
+        'signal_at': (utc_now() - timedelta(days=5)).isoformat(),
+    }
+    prospect.update(overrides)
+    return prospect
+
+
+def _mixed_batch():
+    batch = []
+    for i in range(60):
+        if i % 3 == 0:
+            batch.append(_prospect(i, email_profile=None))
+        elif i % 5 == 0:
+            batch.append(_prospect(i, bio='', topics=[], language='', repo_full_name='', company='',
+                                   signal_type='', followers=0, public_repos=0))
+        elif i % 7 == 0:
+            batch.append(_prospect(i, email_profile=f'dev{i}@blocked.io'))
+        else:
+            batch.append(_prospect(i))
+    return batch
+
+
+class TestGatePlan(unittest.TestCase):
+
+    def test_orders_cheap_gates_first_and_respects_requirements(self):
+        plan = GatePlan.from_configs(ICP_CONFIG, ACTIVITY_CONFIG, QUALITY_CONFIG)
+        order = plan.order
+        self.assertEqual(order[-2:], ['icp', 'quality.icp_relevance'])
+        self.assertLess(order.index('quality.email'), order.index('activity'))
+        # quality.icp_relevance reads the score the icp gate computes
+        self.assertGreater(order.index('quality.icp_relevance'), order.index('icp'))
+
+    def test_short_circuits_on_blocking_failure(self):
+        plan = GatePlan.from_configs(ICP_CONFIG, ACTIVITY_CONFIG, QUALITY_CONFIG)
+        result = plan.evaluate(_prospect(1, email_profile=None))
+        self.assertFalse(result.passes)
+        self.assertEqual(result.failed_gate, 'quality.email')
+        self.assertEqual(result.gates_evaluated, plan.order.index('quality.email') + 1)
+        self.assertEqual(plan.stats['icp'].evaluated, 0)
+
+        result = plan.evaluate(_prospect(2))
+        self.assertTrue(result.passes, result)
+        self.assertEqual(result.gates_evaluated, len(plan.gates))
+        self.assertIn('icp_relevance_score', result.annotations)
+
+    def test_batch_matches_per_prospect_evaluation(self):
+        batch = _mixed_batch()
+        plan = GatePlan.from_configs(ICP_CONFIG, ACTIVITY_CONFIG, QUALITY_CONFIG)
+        batch_results = plan.validate_batch(batch)
+        single = [plan.evaluate(p) for p in batch]
+        self.assertEqual([(r.passes, r.failed_gate) for r in batch_results],
+                         [(r.passes, r.failed_gate) for r in single])
+        self.assertEqual(batch_results[7].failed_gate, 'quality.compliance')
+
+        stats = {g['gate']: g for g in plan.get_stats()['gates']}
+        self.assertEqual(stats['quality.email']['rejected'], 2 * 20)
+        self.assertLess(stats['icp']['evaluated'], stats['quality.email']['evaluated'])
+
+    def test_agrees_with_individual_filters(self):
+        batch = _mixed_batch()
+        icp_filter = ICPRelevanceFilter(ICP_CONFIG)
+        activity_filter = ActivityThresholdFilter(ACTIVITY_CONFIG)
+        plan = GatePlan.compile(icp_filter=icp_filter, activity_filter=activity_filter)
+        expected = [icp_filter.is_relevant(p).is_relevant and
+                    activity_filter.meets_activity_requirements(p).passes_filter for p in batch]
+        self.assertEqual([r.passes for r in plan.validate_batch(batch)], expected)
+
+        quality_gate = QualityGate(QUALITY_CONFIG)
+        quality_plan = GatePlan.compile(quality_gate=quality_gate)
+        scored = [dict(p, icp_relevance_score=0.9) for p in batch]
+        self.assertEqual([r.passes for r in quality_plan.validate_batch(scored)],
+                         [quality_gate.validate_prospect(p).passes_all_gates for p in scored])
+
+        passing, rejected = plan.filter_prospects(batch)
+        self.assertEqual(len(passing), sum(expected))
+        self.assertTrue(all('activity_score' in p and 'icp_relevance_score' in p for p in passing))
+        self.assertTrue(all(r['failed_gate'] in ('activity', 'icp') for r in rejected))
+
+    def test_non_blocking_gates_only_warn(self):
+        plan = GatePlan.from_configs(quality_config=QUALITY_CONFIG, non_blocking=['quality.email'])
+        result = plan.evaluate(_prospect(1, email_profile=None, icp_relevance_score=0.9))
+        self.assertTrue(result.passes)
+        self.assertEqual(result.warnings, ["No email address found"])
+        with self.assertRaises(ValueError):
+            GatePlan.from_configs(quality_config=QUALITY_CONFIG, non_blocking=['nope'])
+
+    def test_gate_errors_reject_instead_of_raising(self):
+        def broken(prospect, annotations):
+            raise KeyError('boom')
+        plan = GatePlan([Gate('broken', broken, cost=1.0)])
+        results = plan.validate_batch([{}, {}])
+        self.assertFalse(any(r.passes for r in results))
+        self.assertEqual(plan.stats['broken'].errors, 2)
+
+    def test_optimize_order_uses_observed_rejections(self):
+        calls = []
+
+        def cheap_rarely_rejects(prospect, annotations):
+            calls.append('a')
+            return prospect['i'] % 50 != 0, ['a']
+
+        def often_rejects(prospect, annotations):
+            calls.append('b')
+            return prospect['i'] % 2 == 0, ['b']
+
+        plan = GatePlan([Gate('a', cheap_rarely_rejects, cost=1.0), Gate('b', often_rejects, cost=2.0)])
+        batch = [{'i': i} for i in range(200)]
+        plan.validate_batch(batch)
+        self.assertEqual(plan.optimize_order(min_samples=50), ['b', 'a'])
+
+        calls.clear()
+        plan.reset_stats()
+        plan.validate_batch(batch)
+        self.assertEqual(calls.count('b'), 200)
+        self.assertEqual(calls.count('a'), 100)
+
+    def test_recency_uses_aware_now(self):
+        recent = _prospect(1)
+        self.assertEqual(days_since(recent['signal_at']), 5)
+        self.assertIsNone(days_since('not a date'))
+        result = ActivityThresholdFilter(ACTIVITY_CONFIG).meets_activity_requirements(recent)
+        self.assertEqual(result.activity_details['recency_score'], 1.0)
+        self.assertEqual(QualityGate(QUALITY_CONFIG)._validate_activity_gate(recent), (True, []))
+
+
+class TestPhase2GatePlan(unittest.TestCase):
+
+    def _config(self, **overrides):
+        return Phase2Config(validation_enabled=False, compliance_enabled=False, icp_config=ICP_CONFIG,
+                            activity_config=ACTIVITY_CONFIG, quality_config=QUALITY_CONFIG, **overrides)
+
+    def test_orchestrator_runs_compiled_plan(self):
+        orchestrator = Phase2Orchestrator(self._config())
+        self.assertEqual(set(orchestrator.gate_plan.order),
+                         set(GatePlan.from_configs(ICP_CONFIG, ACTIVITY_CONFIG, QUALITY_CONFIG).order))
+
+        result = orchestrator.process_phase2_sync(_mixed_batch())
+        self.assertTrue(result.success, result.errors)
+        self.assertEqual(list(result.stats['step_stats']), ['deduplication', 'normalization', 'gate_plan'])
+        step = result.stats['step_stats']['gate_plan']
+        self.assertEqual((step['output_count'], step['rejected_count']),
+                         (len(result.qualified_prospects), len(result.rejected_prospects)))
+        self.assertTrue(result.qualified_prospects)
+        self.assertTrue(all('icp_relevance_score' in p for p in result.qualified_prospects))
+        self.assertEqual({r['failed_gate'] for r in result.rejected_prospects} & {'quality.email', 'quality.compliance'},
+                         {'quality.email', 'quality.compliance'})
+
+        gate_stats = {g['gate']: g for g in result.stats['gate_plan']['gates']}
+        self.assertEqual(gate_stats['quality.email']['rejected'], 20)
+        # Short-circuiting: the ICP gate never sees prospects rejected by cheaper gates
+        self.assertLess(gate_stats['icp']['evaluated'], len(_mixed_batch()))
+
+    def test_plan_only_covers_enabled_filters_and_can_be_disabled(self):
+        orchestrator = Phase2Orchestrator(self._config(activity_filtering_enabled=False))
+        self.assertNotIn('activity', orchestrator.gate_plan.order)
+        self.assertIn('icp', orchestrator.gate_plan.order)
+
+        legacy = Phase2Orchestrator(self._config(use_gate_plan=False))
+        self.assertIsNone(legacy.gate_plan)
+        result = legacy.process_phase2_sync(_mixed_batch())
+        self.assertIn('icp_filtering', result.stats['step_stats'])
+        self.assertNotIn('gate_plan', result.stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
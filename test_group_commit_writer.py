@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Group-commit CSV writer tests
+Covers commit thresholds, torn-tail truncation on resume, and legacy files without a sidecar
+"""
+
+import csv
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lead_intelligence.core.group_commit_writer import GroupCommitCSVWriter
+
+FIELDS = ['lead_id', 'login', 'email_profile', 'bio']
+
+
+def _row(i, email=True):
+    return {'lead_id': f'id{i}', 'login': f'user{i}', 'email_profile': f'u{i}@x.io' if email else '', 'bio': 'line1\nline2'}
+
+
+def _read(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+class TestGroupCommitCSVWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / 'prospects.csv')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_commits_every_n_rows(self):
+        w = GroupCommitCSVWriter(self.path, FIELDS, commit_rows=10, commit_interval_ms=60_000)
+        for i in range(25):
+            w.write_row(_row(i), login=f'user{i}', lead_id=f'id{i}', has_email=True)
+        self.assertEqual(w.committed_rows, 20)
+        w.close()
+        self.assertEqual(w.committed_rows, 25)
+        self.assertEqual(len(_read(self.path)), 25)
+
+    def test_commit_if_due_bounds_idle_time(self):
+        w = GroupCommitCSVWriter(self.path, FIELDS, commit_rows=100, commit_interval_ms=60_000)
+        w.write_row(_row(0), login='user0', lead_id='id0', has_email=True)
+        self.assertFalse(w.commit_if_due())
+        self.assertEqual(w.committed_rows, 0)
+        # No further rows arrive; once the interval has passed the loop's check commits
+        w._last_commit -= 61
+        self.assertTrue(w.commit_if_due())
+        self.assertEqual(w.committed_rows, 1)
+        self.assertFalse(w.commit_if_due())
+        w.close()
+
+    def test_resume_truncates_uncommitted_tail(self):
+        w = GroupCommitCSVWriter(self.path, FIELDS, commit_rows=5, commit_interval_ms=60_000)
+        for i in range(12):
+            w.write_row(_row(i, email=i % 2 == 0), login=f'user{i}', lead_id=f'id{i}', has_email=i % 2 == 0)
+        # Simulate a crash: rows 10-11 reach the file but are never committed, plus a torn write
+        w._file.flush()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('id99,user99,"half a ro')
+        with open(w.sidecar_path, 'a', encoding='utf-8') as f:
+            f.write('{"offset": 12')
+
+        resumed = GroupCommitCSVWriter(self.path, FIELDS, commit_rows=5, resume=True)
+        self.assertEqual(resumed.committed_rows, 10)
+        self.assertEqual(resumed.committed_logins, {f'user{i}' for i in range(10)})
+        self.assertEqual(resumed.committed_with_email, 5)
+        resumed.write_row(_row(10), login='user10', lead_id='id10', has_email=True)
+        resumed.close()
+
+        rows = _read(self.path)
+        self.assertEqual([r['login'] for r in rows], [f'user{i}' for i in range(11)])
+        self.assertEqual(rows[3]['bio'], 'line1\nline2')
+
+        # The compacted sidecar supports another resume
+        again = GroupCommitCSVWriter(self.path, FIELDS, resume=True)
+        self.assertEqual(again.committed_rows, 11)
+        again.close()
+
+    def test_resume_without_sidecar(self):
+        with open(self.path, 'w', newline='', encoding='utf-8') as f:
+            w = csv.DictWriter(f, fieldnames=FIELDS)
+            w.writeheader()
+            w.writerow({'lead_id': 'id0', 'login': 'user0', 'email_profile': 'a@b.c', 'bio': ''})
+            f.write('id1,user1,torn')
+        resumed = GroupCommitCSVWriter(self.path, FIELDS, resume=True)
+        self.assertEqual(resumed.committed_lead_ids, {'id0'})
+        self.assertEqual(resumed.committed_with_email, 1)
+        resumed.close()
+        self.assertEqual([r['login'] for r in _read(self.path)], ['user0'])
+
+
+if __name__ == '__main__':
+    unittest.main()
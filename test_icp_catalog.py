@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+ICP catalog tests
+Covers BM25 ranking, collector-config mappings, mtime-validated in-process and on-disk caching, and the
+shared catalog in the collector's query planner
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lead_intelligence.core import icp_catalog
+from lead_intelligence.core.icp_catalog import ICPCatalog, get_catalog, load_yaml, clear_caches, tokenize
+from lead_intelligence.core.data_collector import QueryPlanner, load_config
+
+OPTIONS_YAML = """
+icp_options:
+  - id: icp01_pypi_maintainers
+    name: "PyPI Maintainers - Fast-Moving Python Libraries"
+    technographics:
+      language: ["Python"]
+      frameworks: ["pytest", "tox"]
+    github:
+      repo_queries:
+        - "language:Python stars:50..2000 in:readme pytest -archived:true"
+  - id: icp02_ml_ds_maintainers
+    name: "ML/DS Ecosystem Maintainers"
+    description: "Maintainers of machine learning and data science libraries"
+    github:
+      repo_queries:
+        - "language:Python (pytorch OR tensorflow) topic:machine-learning"
+  - id: icp03_rust_cli
+    name: "Rust CLI Authors"
+    technographics:
+      language: ["Rust"]
+"""
+
+COLLECTOR_YAML = """
+defaults:
+  dedupe_db: {db}
+  global_limits: {{max_repos: 10, max_leads: 10, per_repo_events: 5}}
+icps:
+  icp01_python:
+    label: "Python maintainers"
+    search:
+      segments: ["language:Python pytest"]
+  icp02_go:
+    label: "Go services"
+    search:
+      segments: ["language:Go grpc"]
+"""
+
+
+class TestICPCatalog(unittest.TestCase):
+
+    def setUp(self):
+        clear_caches()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.options = Path(self.tmp.name) / 'options.yaml'
+        self.options.write_text(OPTIONS_YAML)
+        self.cache_dir = Path(self.tmp.name) / 'cache'
+
+    def tearDown(self):
+        clear_caches()
+        self.tmp.cleanup()
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("We build C++ and Rust CLIs for the maintainers"),
+                         ['build', 'c++', 'rust', 'cli', 'maintainer'])
+
+    def test_ranked_search(self):
+        catalog = get_catalog(self.options, cache_dir=self.cache_dir)
+        ids = [icp['id'] for icp in catalog.match("python library maintainers who use pytest")]
+        self.assertEqual(ids[0], 'icp01_pypi_maintainers')
+        self.assertNotIn('icp03_rust_cli', ids)
+        self.assertEqual(catalog.match("pytorch and tensorflow teams")[0]['id'], 'icp02_ml_ds_maintainers')
+        self.assertEqual(catalog.match("rust")[0]['id'], 'icp03_rust_cli')
+        self.assertEqual(catalog.search("kubernetes"), [])
+        scores = [score for _, score in catalog.search("maintainers")]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_collector_mapping(self):
+        catalog = ICPCatalog.from_mapping({
+            'icp01': {'label': 'Python maintainers', 'search': {'segments': ['language:Python pytest']}},
+            'icp02': {'label': 'Go services', 'search': {'segments': ['language:Go grpc']}},
+        })
+        self.assertEqual(catalog.get('icp02')['name'], 'Go services')
+        self.assertEqual(catalog.match('grpc')[0]['id'], 'icp02')
+
+    def test_catalog_reused_until_file_changes(self):
+        first = get_catalog(self.options, cache_dir=self.cache_dir)
+        self.assertIs(get_catalog(self.options, cache_dir=self.cache_dir), first)
+
+        self.options.write_text(OPTIONS_YAML.replace('Rust CLI Authors', 'Rust CLI and WASM Authors'))
+        later = time.time() + 5
+        os.utime(self.options, (later, later))
+        updated = get_catalog(self.options, cache_dir=self.cache_dir)
+        self.assertIsNot(updated, first)
+        self.assertEqual(updated.match('wasm')[0]['id'], 'icp03_rust_cli')
+
+    def test_disk_cache_skips_yaml_parse(self):
+        compiled = get_catalog(self.options, cache_dir=self.cache_dir)
+        cache_files = list(self.cache_dir.glob('*.json'))
+        self.assertEqual(len(cache_files), 1)
+        self.assertEqual(json.loads(cache_files[0].read_text())['catalog']['icps'][2]['id'], 'icp03_rust_cli')
+        clear_caches()
+        with mock.patch.object(icp_catalog, 'load_yaml', side_effect=AssertionError('reparsed')):
+            catalog = get_catalog(self.options, cache_dir=self.cache_dir)
+        self.assertEqual(len(catalog), 3)
+        self.assertEqual(catalog.postings, compiled.postings)
+        self.assertEqual(catalog.length_norms, compiled.length_norms)
+        self.assertEqual(catalog.search('pytest maintainers'), compiled.search('pytest maintainers'))
+
+    def test_corrupt_disk_cache_is_rebuilt(self):
+        get_catalog(self.options, cache_dir=self.cache_dir)
+        cache_file = next(self.cache_dir.glob('*.json'))
+        cached = json.loads(cache_file.read_text())
+        cached['catalog']['postings']['rust'] = [[99, 1.0]]
+        cache_file.write_text(json.dumps(cached))
+        clear_caches()
+        catalog = get_catalog(self.options, cache_dir=self.cache_dir)
+        self.assertEqual(catalog.match('rust')[0]['id'], 'icp03_rust_cli')
+
+    def test_query_planner_shares_config_catalog(self):
+        config_path = Path(self.tmp.name) / 'collector.yaml'
+        config_path.write_text(COLLECTOR_YAML.format(db=Path(self.tmp.name) / 'dedup.sqlite3'))
+        config = load_config(str(config_path))
+        planner = QueryPlanner(config, shard_cache_path=str(Path(self.tmp.name) / 'shards.json'))
+        self.assertIs(planner.catalog, get_catalog(config_path, kind='mapping'))
+        self.assertEqual(planner.queries_for('icp02_go'), ['language:Go grpc'])
+
+    def test_load_yaml_returns_private_copies(self):
+        data = load_yaml(self.options)
+        data['icp_options'].clear()
+        self.assertEqual(len(load_yaml(self.options)['icp_options']), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+ICP wizard streaming tests
+Replies stream token by token to the StreamHandler, per-stage timings are recorded,
+and streamed replies are not printed a second time
+"""
+
+import asyncio
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from icp_wizard.core.icp_wizard import ICPWizard, StreamHandler
+from lead_intelligence.core.icp_catalog import ICPCatalog
+
+GREETING = ["Hi", "", " there,", " what customers", " are you after?"]
+NEEDS = ["PyPI maintainers", " look like a fit.", " Ready", " to proceed?"]
+
+
+class FakeChunk:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeChain:
+    """Prompt | LLM stand-in exposing astream(); tokens arrive with a small delay"""
+
+    def __init__(self, tokens, delay=0.01):
+        self.tokens = tokens
+        self.delay = delay
+        self.inputs = []
+
+    async def astream(self, inputs):
+        self.inputs.append(inputs)
+        for token in self.tokens:
+            await asyncio.sleep(self.delay)
+            yield FakeChunk(token)
+
+
+class RecordingHandler(StreamHandler):
+    def __init__(self):
+        self.events = []
+        self.tokens = {}
+
+    def on_message_start(self, stage):
+        self.events.append(('start', stage))
+
+    def on_token(self, stage, token):
+        self.tokens.setdefault(stage, []).append(token)
+
+    def on_message_end(self, stage, timing):
+        self.events.append(('end', stage, timing))
+
+
+class FakeGraph:
+    def __init__(self, states):
+        self.states = list(states)
+
+    async def ainvoke(self, state):
+        return self.states.pop(0)
+
+
+class TestICPWizardStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.handler = RecordingHandler()
+        self.wizard = self._wizard(self.handler)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _wizard(self, handler):
+        wizard = ICPWizard(api_key='test-key', user_identifier='tester',
+                           memory_dir=Path(self.tmp.name) / 'memory',
+                           config_dir=Path(self.tmp.name) / 'icp', stream_handler=handler)
+        wizard.icp_catalog = ICPCatalog([{'id': 'icp01_pypi', 'name': 'PyPI Maintainers',
+                                          'description': 'Maintainers of Python packages'}])
+        wizard._chains = {name: FakeChain(NEEDS if name == 'understand_needs' else GREETING)
+                          for name in wizard._chains}
+        return wizard
+
+    def _run_conversation(self, wizard):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), mock.patch('builtins.input', side_effect=AssertionError('no input')):
+            state = asyncio.run(wizard.start_conversation())
+        return state, out.getvalue()
+
+    def test_stream_reply_forwards_tokens_and_records_timing(self):
+        content = asyncio.run(self.wizard._stream_reply('greeting', FakeChain(GREETING), {'icp_list': ''}, 0.0042))
+        self.assertEqual(content, 'Hi there, what customers are you after?')
+        # Empty chunks are skipped, everything else reaches the handler in order
+        self.assertEqual(self.handler.tokens['greeting'], [t for t in GREETING if t])
+        self.assertEqual([e[:2] for e in self.handler.events], [('start', 'greeting'), ('end', 'greeting')])
+
+        timing = self.handler.events[-1][2]
+        self.assertEqual(timing, self.wizard.analytics['stage_timings'][-1])
+        self.assertEqual(timing['prepare_ms'], 4.2)
+        self.assertGreaterEqual(timing['ttft_ms'], 10)
+        self.assertGreaterEqual(timing['llm_ms'], timing['ttft_ms'] + 30)
+
+    def test_conversation_streams_each_stage_once(self):
+        state, printed = self._run_conversation(self.wizard)
+
+        self.assertEqual(state['conversation_stage'], 'completed')
+        assistant = [m for m in state['messages'] if m['role'] == 'assistant']
+        self.assertEqual([m['stage'] for m in assistant], ['greeting', 'analyzing_needs', 'finalized'])
+        self.assertEqual(assistant[0]['content'], ''.join(GREETING))
+        self.assertEqual(assistant[1]['content'], ''.join(NEEDS))
+        self.assertTrue(assistant[0]['streamed'] and assistant[1]['streamed'])
+        self.assertEqual(''.join(self.handler.tokens['analyzing_needs']), ''.join(NEEDS))
+
+        timings = self.wizard.get_stage_timings()
+        self.assertEqual(set(timings), {'greeting', 'analyzing_needs'})
+        for entry in timings.values():
+            self.assertEqual(entry['turns'], 1)
+            self.assertGreater(entry['ttft_ms'], 0)
+            self.assertGreaterEqual(entry['llm_ms'], entry['ttft_ms'])
+        # Streamed replies were rendered by the handler only; the final message is printed
+        self.assertNotIn(''.join(NEEDS), printed)
+        self.assertIn('PyPI Maintainers', printed)
+
+    def test_streamed_flag_controls_printing(self):
+        streamed = {'role': 'assistant', 'content': 'streamed reply', 'streamed': True}
+        plain = {'role': 'assistant', 'content': 'plain reply', 'streamed': False}
+        self.wizard.graph = FakeGraph([
+            {'messages': [streamed], 'conversation_stage': 'understanding_needs'},
+            {'messages': [streamed, {'role': 'user', 'content': 'hi'}, plain], 'conversation_stage': 'completed'},
+        ])
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out), mock.patch('builtins.input', return_value='hi'):
+            asyncio.run(self.wizard.start_conversation())
+        printed = out.getvalue()
+        self.assertNotIn('streamed reply', printed)
+        self.assertEqual(printed.count('plain reply'), 1)
+
+    def test_without_handler_reply_is_not_marked_streamed(self):
+        wizard = self._wizard(None)
+        state, printed = self._run_conversation(wizard)
+        assistant = [m for m in state['messages'] if m['role'] == 'assistant']
+        self.assertFalse(any(m.get('streamed') for m in assistant))
+        self.assertEqual(assistant[1]['content'], ''.join(NEEDS))
+        self.assertEqual(len(wizard.analytics['stage_timings']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
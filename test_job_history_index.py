@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Job history index tests
+Listings and history stats come from the SQLite index, not the per-job JSON files
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lead_intelligence.core.job_metadata import JobTracker, JobStats
+
+
+def _run_job(tracker, query, prospects, contactable, success=True):
+    tracker.start_job(query, {'limits': {'max_repos': 5}})
+    tracker.current_job.job_id = f"job_{query}"
+    tracker.update_stats(JobStats(prospects_after_dedupe=prospects, contactable_prospects=contactable))
+    return tracker.end_job(success=success)
+
+
+class TestJobHistoryIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_listing_and_stats_without_json_files(self):
+        tracker = JobTracker(self.tmp.name)
+        _run_job(tracker, 'a', 10, 5)
+        _run_job(tracker, 'b', 30, 15, success=False)
+        _run_job(tracker, 'c', 20, 10)
+
+        # Remove the per-job files: history must still be served from the index
+        for f in tracker.jobs_dir.glob('*_metadata.json'):
+            f.unlink()
+
+        recent = tracker.list_recent_jobs(2)
+        self.assertEqual([j.job_id for j in recent], ['job_c', 'job_b'])
+        self.assertEqual(recent[1].stats.prospects_after_dedupe, 30)
+
+        stats = tracker.get_job_history_stats()
+        self.assertEqual(stats['total_jobs'], 3)
+        self.assertAlmostEqual(stats['success_rate'], 2 / 3)
+        self.assertAlmostEqual(stats['avg_prospects_per_job'], 20)
+        self.assertAlmostEqual(stats['avg_contactable_rate'], 0.5)
+        self.assertEqual(stats['most_recent_job'].job_id, 'job_c')
+
+    def test_resave_replaces_and_adjusts_totals(self):
+        tracker = JobTracker(self.tmp.name)
+        _run_job(tracker, 'a', 10, 5)
+        _run_job(tracker, 'a', 40, 10)
+        stats = tracker.get_job_history_stats()
+        self.assertEqual(stats['total_jobs'], 1)
+        self.assertEqual(stats['all_time']['total_jobs'], 1)
+        self.assertAlmostEqual(stats['all_time']['avg_prospects_per_job'], 40)
+
+    def test_backfills_existing_metadata_files(self):
+        jobs_dir = Path(self.tmp.name) / 'jobs'
+        jobs_dir.mkdir()
+        legacy = {'job_id': 'job_old', 'started_at': '2025-01-01T00:00:00+00:00', 'query_hash': 'q',
+                  'config_hash': 'c', 'success': True,
+                  'stats': {'prospects_after_dedupe': 7, 'contactable_prospects': 7}}
+        (jobs_dir / 'job_old_metadata.json').write_text(json.dumps(legacy))
+        tracker = JobTracker(self.tmp.name)
+        self.assertEqual([j.job_id for j in tracker.list_recent_jobs()], ['job_old'])
+        self.assertEqual(tracker.get_job_history_stats()['avg_contactable_rate'], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
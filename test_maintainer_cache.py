@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Maintainer-status cache tests
+Collaborator, CODEOWNERS and org lookups are cached only for definitive answers, never after a
+transient failure
+"""
+
+import base64
+import sys
+import unittest
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from github_prospect_scraper import GitHubScraper
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, next_url=None, remaining='5000'):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.headers = {'X-RateLimit-Remaining': remaining}
+        self.links = {'next': {'url': next_url}} if next_url else {}
+        self.text = ''
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    """Returns queued responses (or raises queued exceptions) per URL suffix, recording every call"""
+
+    def __init__(self, routes):
+        self.routes = {suffix: list(responses) for suffix, responses in routes.items()}
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        for suffix, responses in self.routes.items():
+            if url.endswith(suffix):
+                result = responses.pop(0) if len(responses) > 1 else responses[0]
+                if isinstance(result, Exception):
+                    raise result
+                return result
+        return FakeResponse(404)
+
+
+PAGE_BASE = 'https://api.github.com/repositories/1/collaborators?page='
+PAGE_2 = f'{PAGE_BASE}2'
+
+
+def _codeowners(text):
+    return FakeResponse(200, {'content': base64.b64encode(text.encode()).decode()})
+
+
+def _scraper(routes):
+    scraper = GitHubScraper.__new__(GitHubScraper)
+    scraper.token = 'token'
+    scraper.headers = {}
+    scraper.session = FakeSession(routes)
+    scraper.org_cache = {}
+    scraper.codeowners_cache = {}
+    scraper.owner_is_org_cache = {}
+    scraper.org_membership_cache = {}
+    scraper.collaborator_cache = {}
+    scraper.csv_writer = None
+    return scraper
+
+
+def _collaborators(*entries, next_url=None):
+    return FakeResponse(200, [{'login': login, 'role_name': role} for login, role in entries], next_url=next_url)
+
+
+class TestCollaboratorCache(unittest.TestCase):
+
+    def test_complete_listing_cached(self):
+        scraper = _scraper({'org/repo/collaborators': [_collaborators(('Alice', 'admin'), next_url=PAGE_2)],
+                            'page=2': [_collaborators(('bob', 'write'))]})
+        expected = {'alice': 'admin', 'bob': 'write'}
+        self.assertEqual(scraper._get_collaborator_permissions('org/repo', ['alice']), expected)
+        self.assertEqual(scraper._get_collaborator_permissions('org/repo', ['carol']), expected)
+        self.assertEqual(len(scraper.session.calls), 2)
+        self.assertEqual(scraper.collaborator_cache['org/repo'], expected)
+
+    def test_denied_listing_cached_as_empty(self):
+        for status in (403, 404):
+            scraper = _scraper({'org/repo/collaborators': [FakeResponse(status)]})
+            self.assertEqual(scraper._get_collaborator_permissions('org/repo', ['alice']), {})
+            self.assertEqual(scraper.collaborator_cache['org/repo'], {})
+
+    def test_transient_failure_not_cached(self):
+        failures = [FakeResponse(500), FakeResponse(502), FakeResponse(401), FakeResponse(429),
+                    FakeResponse(403, remaining='0')]
+        for failure in failures:
+            scraper = _scraper({'org/repo/collaborators': [failure, _collaborators(('alice', 'maintain'))]})
+            self.assertEqual(scraper._get_collaborator_permissions('org/repo', ['alice']), {})
+            self.assertNotIn('org/repo', scraper.collaborator_cache)
+            status = scraper.resolve_maintainer_statuses('org/repo', ['alice'], owner_type='User')
+            self.assertTrue(status['alice']['is_maintainer'])
+            self.assertEqual(scraper.collaborator_cache['org/repo'], {'alice': 'maintain'})
+
+    def test_failure_on_later_page_not_cached(self):
+        scraper = _scraper({'org/repo/collaborators': [_collaborators(('alice', 'admin'), next_url=PAGE_2)],
+                            'page=2': [FakeResponse(503)]})
+        self.assertEqual(scraper._get_collaborator_permissions('org/repo', ['bob']), {'alice': 'admin'})
+        self.assertNotIn('org/repo', scraper.collaborator_cache)
+
+    def test_per_login_fallback_not_cached(self):
+        pages = {f'page={i}': [_collaborators((f'user{i}', 'read'), next_url=f'{PAGE_BASE}{i + 1}')]
+                 for i in range(2, GitHubScraper.COLLABORATOR_MAX_PAGES + 1)}
+        scraper = _scraper({'org/repo/collaborators': [_collaborators(('user1', 'read'), next_url=PAGE_2)],
+                            '/collaborators/alice/permission': [FakeResponse(200, {'permission': 'write'})],
+                            '/collaborators/carol/permission': [FakeResponse(200, {'permission': 'admin'})],
+                            **pages})
+        first = scraper._get_collaborator_permissions('org/repo', ['alice'])
+        self.assertEqual(first['alice'], 'write')
+        self.assertNotIn('org/repo', scraper.collaborator_cache)
+        # A later call with other logins looks those logins up instead of reusing alice's map
+        second = scraper._get_collaborator_permissions('org/repo', ['carol'])
+        self.assertEqual(second['carol'], 'admin')
+        self.assertNotIn('alice', second)
+
+
+class TestCodeownersCache(unittest.TestCase):
+
+    def test_owners_parsed_and_cached(self):
+        scraper = _scraper({'contents/.github/CODEOWNERS': [_codeowners('* @Alice @org/team  # leads\ndocs/ bob@x.io\n')]})
+        self.assertEqual(scraper._get_codeowners('org/repo'), {'alice', 'org/team', 'bob@x.io'})
+        self.assertTrue(scraper._check_codeowners('org/repo', 'ALICE'))
+        self.assertEqual(len(scraper.session.calls), 3)
+        self.assertIn('org/repo', scraper.codeowners_cache)
+
+    def test_all_404_cached_as_missing(self):
+        scraper = _scraper({})
+        self.assertEqual(scraper._get_codeowners('org/repo'), set())
+        self.assertEqual(scraper._get_codeowners('org/repo'), set())
+        self.assertEqual(len(scraper.session.calls), 3)
+
+    def test_transient_status_not_cached(self):
+        for status in (403, 500, 502):
+            scraper = _scraper({'contents/CODEOWNERS': [FakeResponse(status), FakeResponse(404)],
+                                'contents/.github/CODEOWNERS': [FakeResponse(404), _codeowners('* @alice')]})
+            self.assertEqual(scraper._get_codeowners('org/repo'), set())
+            self.assertNotIn('org/repo', scraper.codeowners_cache)
+            # The next contributor of the same repo retries and finds the owners
+            self.assertTrue(scraper._check_codeowners('org/repo', 'alice'))
+            self.assertEqual(scraper.codeowners_cache['org/repo'], {'alice'})
+
+    def test_exception_not_cached(self):
+        scraper = _scraper({'contents/CODEOWNERS': [requests.Timeout('slow'), FakeResponse(404)]})
+        self.assertEqual(scraper._get_codeowners('org/repo'), set())
+        self.assertNotIn('org/repo', scraper.codeowners_cache)
+        scraper._get_codeowners('org/repo')
+        self.assertIn('org/repo', scraper.codeowners_cache)
+
+
+class TestOwnerIsOrgCache(unittest.TestCase):
+
+    def test_owner_type_hint_needs_no_request(self):
+        scraper = _scraper({})
+        self.assertTrue(scraper._owner_is_org('acme', 'Organization'))
+        self.assertFalse(scraper._owner_is_org('alice', 'User'))
+        self.assertEqual(scraper.session.calls, [])
+
+    def test_org_and_user_lookups_cached(self):
+        scraper = _scraper({'/orgs/acme': [FakeResponse(200, {'login': 'acme'})]})
+        self.assertTrue(scraper._owner_is_org('acme'))
+        self.assertFalse(scraper._owner_is_org('alice'))
+        self.assertTrue(scraper._owner_is_org('acme'))
+        self.assertFalse(scraper._owner_is_org('alice'))
+        self.assertEqual(len(scraper.session.calls), 2)
+        self.assertEqual(scraper.org_cache['acme'], {'login': 'acme'})
+
+    def test_failed_lookup_not_cached(self):
+        scraper = _scraper({'/orgs/acme': [FakeResponse(502), FakeResponse(200, {'login': 'acme'})],
+                            '/orgs/acme/members/bob': [FakeResponse(204)]})
+        self.assertFalse(scraper._owner_is_org('acme'))
+        self.assertNotIn('acme', scraper.owner_is_org_cache)
+        self.assertTrue(scraper._owner_is_org('acme'))
+        self.assertTrue(scraper.owner_is_org_cache['acme'])
+
+    def test_membership_not_cached_after_failed_org_lookup(self):
+        scraper = _scraper({'/orgs/acme': [requests.ConnectionError('reset'), FakeResponse(500),
+                                           FakeResponse(200, {'login': 'acme'})],
+                            '/orgs/acme/members/bob': [FakeResponse(204)]})
+        self.assertFalse(scraper._check_org_membership('acme', 'bob'))
+        self.assertFalse(scraper._check_org_membership('acme', 'bob'))
+        self.assertEqual(scraper.org_membership_cache, {})
+        self.assertTrue(scraper._check_org_membership('acme', 'bob'))
+        self.assertTrue(scraper.org_membership_cache[('acme', 'bob')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Search query sharding tests
+Covers qualifier parsing, bisection until every shard is under the cap, full coverage, and plan caching
+"""
+
+import random
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lead_intelligence.core.query_sharding import (
+    ShardPlanner, ShardPlanCache, parse_query, render_query, split_ranges
+)
+
+TODAY = date(2026, 3, 1)
+
+
+def _corpus(n=12000, seed=7):
+    rng = random.Random(seed)
+    repos = []
+    for i in range(n):
+        repos.append({
+            'id': i,
+            'pushed': TODAY - timedelta(days=rng.randint(0, 59)),
+            'created': date(2015, 1, 1) + timedelta(days=rng.randint(0, 3000)),
+            # Heavy-tailed star counts, many repos on the same few values
+            'stars': min(2000, 50 + int(rng.paretovariate(1.2) * 10)),
+        })
+    return repos
+
+
+class FakeSearch:
+    """Evaluates the range qualifiers of a query against an in-memory corpus"""
+
+    def __init__(self, repos):
+        self.repos = repos
+        self.probes = 0
+
+    def matches(self, query):
+        _, ranges = parse_query(query)
+        out = []
+        for repo in self.repos:
+            if all(lo <= repo[field] <= hi for field, (lo, hi) in ranges.items()):
+                out.append(repo['id'])
+        return out
+
+    def count(self, query):
+        self.probes += 1
+        return len(self.matches(query))
+
+
+class TestQueryParsing(unittest.TestCase):
+
+    def test_parses_and_intersects_range_qualifiers(self):
+        base, ranges = parse_query('language:python stars:50..2000 is:public pushed:>2026-01-01 stars:>=100')
+        self.assertEqual(base, 'language:python is:public')
+        self.assertEqual(ranges['stars'], (100, 2000))
+        self.assertEqual(ranges['pushed'][0], date(2026, 1, 2))
+        self.assertIn('pushed:2026-01-02..', render_query(base, ranges))
+
+    def test_unparseable_qualifiers_stay_in_base(self):
+        base, ranges = parse_query('topic:ml pushed:>{date:60} created:<2020-01-01')
+        self.assertIn('pushed:>{date:60}', base)
+        self.assertEqual(ranges['created'][1], date(2019, 12, 31))
+
+    def test_split_adds_dimensions_when_needed(self):
+        left, right = split_ranges({})
+        self.assertIn('created', left)
+        self.assertEqual(right['created'][0], left['created'][1] + timedelta(days=1))
+
+        one_day = {'pushed': (TODAY, TODAY)}
+        left, right = split_ranges(one_day)
+        self.assertEqual(left['pushed'], (TODAY, TODAY))
+        self.assertEqual((left['stars'][1] + 1), right['stars'][0])
+        self.assertIsNone(split_ranges({'pushed': (TODAY, TODAY), 'stars': (7, 7)}))
+
+
+class TestShardPlanner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.search = FakeSearch(_corpus())
+        self.query = f'language:python stars:50..2000 pushed:>{TODAY - timedelta(days=60)}'
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_every_shard_under_cap_and_union_is_complete(self):
+        shards = ShardPlanner(cap=1000).plan(self.query, self.search.count)
+        self.assertGreater(len(shards), 12)
+        covered = []
+        for shard in shards:
+            ids = self.search.matches(shard.query)
+            if not shard.truncated:
+                self.assertLessEqual(len(ids), 1000)
+            self.assertEqual(len(ids), shard.total_count)
+            covered.extend(ids)
+        self.assertEqual(len(covered), len(set(covered)), "shards must not overlap")
+        self.assertEqual(set(covered), set(self.search.matches(self.query)))
+
+    def test_small_query_is_not_split(self):
+        query = self.query + ' stars:1500..2000'
+        shards = ShardPlanner(cap=1000).plan(query, self.search.count)
+        self.assertEqual([s.query for s in shards], [query])
+        self.assertEqual(self.search.probes, 1)
+
+    def test_cached_plan_skips_probing(self):
+        cache_path = str(Path(self.tmp.name) / 'shard_plans.json')
+        first = ShardPlanner(cache=ShardPlanCache(cache_path)).plan(self.query, self.search.count)
+        probes = self.search.probes
+
+        second = ShardPlanner(cache=ShardPlanCache(cache_path)).plan(self.query, self.search.count)
+        self.assertEqual(self.search.probes, probes)
+        self.assertEqual([s.query for s in second], [s.query for s in first])
+
+        expired = ShardPlanner(cache=ShardPlanCache(cache_path, ttl_hours=0)).plan(self.query, self.search.count)
+        self.assertGreater(self.search.probes, probes)
+        self.assertEqual(len(expired), len(first))
+
+    def test_failed_probe_keeps_shard_unsplit_and_uncached(self):
+        cache_path = Path(self.tmp.name) / 'shard_plans.json'
+        shards = ShardPlanner(cache=ShardPlanCache(str(cache_path))).plan(self.query, lambda q: None)
+        self.assertEqual(len(shards), 1)
+        self.assertIsNone(shards[0].total_count)
+        self.assertFalse(cache_path.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
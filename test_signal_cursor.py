@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Signal cursor tests
+Covers since-cursor advancement, the rolling author rollup, incremental fetch_signals, and paging
+back to the cursor when more than a page of activity arrived between runs
+"""
+
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from lead_intelligence.core.signal_cursor import SignalCursorStore, SignalRecord, normalize_timestamp, signal_record
+from lead_intelligence.core.data_collector import GitHubSearchClient, GithubCfg
+from github_prospect_scraper import GitHubScraper
+
+
+def _ts(days_ago, hours=0):
+    return (datetime.now(timezone.utc) - timedelta(days=days_ago, hours=hours)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _commit(sha, login, days_ago):
+    return {'sha': sha, 'author': {'login': login, 'type': 'User'},
+            'commit': {'message': f'change {sha}', 'committer': {'date': _ts(days_ago)}}}
+
+
+def _issue(number, days_ago, login='dev'):
+    return {'number': number, 'title': f'Issue {number}', 'updated_at': _ts(days_ago), 'user': {'login': login}}
+
+
+class TestSignalCursorStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SignalCursorStore(str(Path(self.tmp.name) / 'cursors.sqlite3'), window_days=90)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_records_from_api_items(self):
+        record = signal_record('commit', _commit('abc', 'alice', 3))
+        self.assertEqual((record.item_id, record.author), ('abc', 'alice'))
+        bot = dict(_commit('def', 'ci', 1), author={'login': 'ci[bot]', 'type': 'Bot'})
+        self.assertIsNone(signal_record('commit', bot).author)
+        self.assertEqual(signal_record('issue', _issue(7, 1)).item_id, '7')
+        self.assertIsNone(signal_record('issue', {'number': 8}))
+        self.assertEqual(normalize_timestamp('2026-01-02T03:04:05+02:00'), '2026-01-02T01:04:05Z')
+
+    def test_since_starts_at_window_then_follows_cursor(self):
+        self.assertEqual(self.store.since('o/r', 'commit')[:10], _ts(90)[:10])
+        newest = signal_record('commit', _commit('b', 'bob', 2))
+        self.store.merge('o/r', 'commit', [signal_record('commit', _commit('a', 'alice', 5)), newest])
+        self.assertEqual(self.store.since('o/r', 'commit'), newest.occurred_at)
+        self.assertEqual(self.store.cursor('o/r', 'commit').last_seen_id, 'b')
+        # Other repos and signal types have their own cursors
+        self.assertEqual(self.store.since('o/r', 'issue')[:10], _ts(90)[:10])
+
+    def test_rollup_keeps_window_counts_without_refetching(self):
+        day_one = [_commit('a', 'alice', 80), _commit('b', 'alice', 40), _commit('c', 'bob', 10)]
+        self.store.merge('o/r', 'commit', [signal_record('commit', c) for c in day_one])
+        # Next run: the inclusive `since` returns the boundary commit again plus one new commit
+        day_two = [_commit('c', 'bob', 10), _commit('d', 'bob', 0)]
+        merged = self.store.merge('o/r', 'commit', [signal_record('commit', c) for c in day_two])
+        self.assertEqual(merged, 1)
+        self.assertEqual(self.store.author_counts('o/r', 'commit'), {'alice': 2, 'bob': 2})
+        self.assertEqual(self.store.author_counts('o/r', 'commit', window_days=30), {'bob': 2})
+
+        # Rows that age out of the window are pruned on the next merge
+        self.store.merge('o/r', 'commit', [SignalRecord('old', _ts(120), 'carol')])
+        self.assertNotIn('carol', self.store.author_counts('o/r', 'commit', window_days=365))
+
+    def test_new_signals_skips_seen_and_keeps_updated(self):
+        self.store.merge('o/r', 'issue', [signal_record('issue', _issue(1, 5)), signal_record('issue', _issue(2, 3))])
+        fetched = [signal_record('issue', i) for i in (_issue(2, 3), _issue(1, 1), _issue(3, 0), _issue(4, 20))]
+        self.assertEqual([r.item_id for r in self.store.new_signals('o/r', 'issue', fetched)], ['1', '3'])
+
+
+class FakeClient(GitHubSearchClient):
+    """Serves PRs/commits/issues from lists, honouring `since` like the API does"""
+
+    def __init__(self, store, items):
+        super().__init__('token', GithubCfg(), store)
+        self.items = items
+        self.since_seen = []
+
+    def _fetch(self, signal_type, since):
+        self.since_seen.append((signal_type, since))
+        return [i for i in self.items[signal_type]
+                if since is None or signal_record(signal_type, i).occurred_at >= since], True
+
+    def _fetch_recent_prs(self, owner, repo, limit, since=None):
+        return self._fetch('pr', since)
+
+    def _fetch_recent_commits(self, owner, repo, limit, since=None):
+        return self._fetch('commit', since)
+
+    def _fetch_recent_issues(self, owner, repo, limit, since=None):
+        return self._fetch('issue', since)
+
+
+class TestIncrementalFetchSignals(unittest.TestCase):
+
+    REPO = {'owner': {'login': 'o'}, 'name': 'r', 'full_name': 'o/r'}
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SignalCursorStore(str(Path(self.tmp.name) / 'cursors.sqlite3'))
+        self.items = {'pr': [_issue(11, 2)], 'commit': [_commit('a', 'alice', 3)], 'issue': [_issue(5, 4)]}
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_second_run_only_yields_new_activity(self):
+        first = list(FakeClient(self.store, self.items).fetch_signals(self.REPO, 25))
+        self.assertEqual([s['type'] for s in first], ['pr', 'commit', 'issue'])
+
+        self.items['commit'].insert(0, _commit('b', 'bob', 0))
+        client = FakeClient(self.store, self.items)
+        second = list(client.fetch_signals(self.REPO, 25))
+        self.assertEqual([(s['type'], s['data'].get('sha')) for s in second], [('commit', 'b')])
+        self.assertEqual(dict(client.since_seen)['commit'][:10], _ts(3)[:10])
+
+    def test_unconsumed_signals_are_not_skipped(self):
+        signals = FakeClient(self.store, self.items).fetch_signals(self.REPO, 25)
+        self.assertEqual(next(signals)['type'], 'pr')
+        signals.close()
+        self.assertIsNone(self.store.cursor('o/r', 'pr'))
+        again = list(FakeClient(self.store, self.items).fetch_signals(self.REPO, 25))
+        self.assertEqual(len(again), 3)
+
+    def test_disabled_cursors_fetch_full_window(self):
+        client = FakeClient(None, self.items)
+        self.assertEqual(len(list(client.fetch_signals(self.REPO, 25))), 3)
+        self.assertEqual(len(list(client.fetch_signals(self.REPO, 25))), 3)
+        self.assertTrue(all(since is None for _, since in client.since_seen))
+
+
+class FakeResponse:
+    def __init__(self, items, next_url=None, status_code=200):
+        self.status_code = status_code
+        self._items = items
+        self.links = {'next': {'url': next_url}} if next_url else {}
+        self.headers = {'X-RateLimit-Remaining': '5000'}
+        self.text = ''
+
+    def json(self):
+        return self._items
+
+    def __bool__(self):
+        return self.status_code == 200
+
+
+class PagedCommits:
+    """Serves a newest-first commit list in pages, honouring `since` and `Link: next`"""
+
+    BASE = 'https://api.github.com/repos/o/r/commits'
+
+    def __init__(self, commits, page_size=100):
+        self.commits = commits
+        self.page_size = page_size
+        self.requests = []
+        self.fail_pages = set()
+
+    def page(self, url, params):
+        self.requests.append(url if params is None else params.get('since'))
+        if params is not None:
+            self.since, number = params.get('since'), 1
+        else:
+            number = int(url.rsplit('page=', 1)[1])
+        if number in self.fail_pages:
+            return FakeResponse([], status_code=502)
+        matching = [c for c in self.commits if signal_record('commit', c).occurred_at >= (self.since or '')]
+        start = (number - 1) * self.page_size
+        more = start + self.page_size < len(matching)
+        return FakeResponse(matching[start:start + self.page_size],
+                            next_url=f'{self.BASE}?page={number + 1}' if more else None)
+
+
+def _busy_commits(count, days_from, days_to, prefix):
+    """`count` commits spread between two ages, newest first, alternating alice/bob"""
+    step = (days_from - days_to) * 24 / count
+    return [{'sha': f'{prefix}{i}', 'author': {'login': 'alice' if i % 2 else 'bob', 'type': 'User'},
+             'commit': {'committer': {'date': _ts(0, hours=days_to * 24 + i * step)}}} for i in range(count)]
+
+
+class TestPagingBackToCursor(unittest.TestCase):
+
+    REPO = {'owner': {'login': 'o'}, 'name': 'r', 'full_name': 'o/r'}
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SignalCursorStore(str(Path(self.tmp.name) / 'cursors.sqlite3'))
+        self.api = PagedCommits(_busy_commits(50, 60, 30, 'old'))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def _client(self):
+        client = GitHubSearchClient('token', GithubCfg(), self.store)
+
+        def make_request(method, endpoint, params=None):
+            if endpoint.endswith('/commits') or '/commits?' in endpoint:
+                return self.api.page(endpoint, params)
+            return FakeResponse([])
+        client._make_request = make_request
+        return client
+
+    def test_collector_counts_every_page_between_runs(self):
+        list(self._client().fetch_signals(self.REPO, 25))
+        self.assertEqual(sum(self.store.author_counts('o/r', 'commit').values()), 50)
+
+        # 250 commits land before the next run: three pages of 100
+        self.api.commits = _busy_commits(250, 20, 1, 'new') + self.api.commits
+        self.api.requests.clear()
+        signals = list(self._client().fetch_signals(self.REPO, 25))
+        self.assertEqual(len(self.api.requests), 3)
+        self.assertEqual(len(signals), 25)
+        self.assertEqual(self.store.author_counts('o/r', 'commit'), {'alice': 150, 'bob': 150})
+        self.assertEqual(self.store.cursor('o/r', 'commit').last_seen_id, 'new0')
+
+    def test_failed_page_keeps_cursor(self):
+        list(self._client().fetch_signals(self.REPO, 25))
+        cursor = self.store.cursor('o/r', 'commit')
+        self.api.commits = _busy_commits(250, 20, 1, 'new') + self.api.commits
+        self.api.fail_pages = {2}
+        list(self._client().fetch_signals(self.REPO, 25))
+        # The first page still counts, but the gap behind it is fetched again next run
+        self.assertEqual(sum(self.store.author_counts('o/r', 'commit').values()), 150)
+        self.assertEqual(self.store.cursor('o/r', 'commit'), cursor)
+
+        self.api.fail_pages = set()
+        list(self._client().fetch_signals(self.REPO, 25))
+        self.assertEqual(sum(self.store.author_counts('o/r', 'commit').values()), 300)
+        self.assertEqual(self.store.cursor('o/r', 'commit').last_seen_id, 'new0')
+
+    def test_page_limit_keeps_cursor(self):
+        list(self._client().fetch_signals(self.REPO, 25))
+        cursor = self.store.cursor('o/r', 'commit')
+        self.api.commits = _busy_commits(250, 20, 1, 'new') + self.api.commits
+        client = self._client()
+        client.config.signal_max_pages = 2
+        list(client.fetch_signals(self.REPO, 25))
+        self.assertEqual(self.store.cursor('o/r', 'commit'), cursor)
+
+    def test_scraper_rollup_counts_every_page(self):
+        scraper = GitHubScraper.__new__(GitHubScraper)
+        scraper.token = ''
+        scraper.headers = {}
+        scraper.signal_cursors = self.store
+        scraper.csv_writer = None
+        scraper.get_user_details = lambda login: {'id': 1}
+
+        class Session:
+            def get(session, url, params=None, **kwargs):
+                return self.api.page(url, params)
+        scraper.session = Session()
+
+        scraper.get_maintainer_contributors(self.REPO)
+        self.api.commits = _busy_commits(250, 20, 1, 'new') + self.api.commits
+        contributors = scraper.get_maintainer_contributors(self.REPO)
+        self.assertEqual({c['user']['login']: c['commit_count_90d'] for c in contributors},
+                         {'alice': 150, 'bob': 150})
+        self.assertEqual(self.store.cursor('o/r', 'commit').last_seen_id, 'new0')
+
+
+if __name__ == '__main__':
+    unittest.main()
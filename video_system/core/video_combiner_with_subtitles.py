@@ -6,10 +6,25 @@ Combines intro videos with base video while preserving subtitles in the first 36
 
 import os
 import sys
+import time
+import shutil
+import tempfile
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import moviepy
 import argparse
 
+VIDEO_EXTENSIONS = ['.mp4', '.mov', '.avi', '.mkv', '.webm']
+
+# Encoding settings shared by the head and tail segments in batch render mode.
+# Both segments must agree on codec, pixel format, frame rate and audio rate so
+# they can be joined with a stream-copy concat instead of a re-encode.
+SEGMENT_CODEC = 'libx264'
+SEGMENT_AUDIO_CODEC = 'aac'
+SEGMENT_AUDIO_FPS = 44100
+SEGMENT_FFMPEG_PARAMS = ['-pix_fmt', 'yuv420p']
+
 def get_video_info(video_path):
     """Get basic information about a video file."""
     try:
@@ -25,6 +40,56 @@ def get_video_info(video_path):
         print(f"Error analyzing video {video_path}: {e}")
         return None
 
+def _build_head_composite(intro_clip, base_clip, background_clip, overlay_duration):
+    """
+    Build the personalized head: background + intro visuals + base subtitles/audio.
+
+    Covers the first overlay_duration seconds only; the caller decides what
+    follows it.
+    """
+    # Get video dimensions
+    width, height = base_clip.size
+
+    # Take first overlay_duration seconds from each video
+    intro_visuals = intro_clip.subclipped(0, min(overlay_duration, intro_clip.duration))
+    base_audio_part = base_clip.subclipped(0, min(overlay_duration, base_clip.duration))
+    background_part = background_clip.subclipped(0, min(overlay_duration, background_clip.duration))
+
+    # Resize all clips to match base video dimensions
+    if intro_visuals.size != base_clip.size:
+        intro_visuals = intro_visuals.resized(base_clip.size)
+    if background_part.size != base_clip.size:
+        background_part = background_part.resized(base_clip.size)
+
+    # Crop subtitle area from base video (bottom 20% of screen)
+    subtitle_height = int(height * 0.2)
+    subtitle_y_start = height - subtitle_height
+
+    subtitle_area = base_audio_part.cropped(
+        x1=0,
+        y1=subtitle_y_start,
+        x2=width,
+        y2=height
+    )
+
+    # Position subtitle area at bottom
+    subtitle_positioned = subtitle_area.with_position(('center', 'bottom'))
+
+    # Create composite for first 36 seconds:
+    # 1. Background video as base layer
+    # 2. Intro video as main content (positioned in center/top area)
+    # 3. Subtitle area from base video at bottom
+    # 4. Audio from base video
+
+    # Position intro video in the main content area (not covering subtitles)
+    intro_positioned = intro_visuals.with_position('center')
+
+    return moviepy.CompositeVideoClip([
+        background_part,      # Clean background
+        intro_positioned,     # Intro video content
+        subtitle_positioned   # Subtitles from base video
+    ]).with_audio(base_audio_part.audio)
+
 def combine_with_subtitle_preservation(intro_path, base_video_path, background_video_path, output_path, overlay_duration=36):
     """
     Combine intro video with base video while preserving subtitles.
@@ -42,48 +107,7 @@ def combine_with_subtitle_preservation(intro_path, base_video_path, background_v
         base_clip = moviepy.VideoFileClip(base_video_path)
         background_clip = moviepy.VideoFileClip(background_video_path)
 
-        # Get video dimensions
-        width, height = base_clip.size
-
-        # Take first overlay_duration seconds from each video
-        intro_visuals = intro_clip.subclipped(0, min(overlay_duration, intro_clip.duration))
-        base_audio_part = base_clip.subclipped(0, min(overlay_duration, base_clip.duration))
-        background_part = background_clip.subclipped(0, min(overlay_duration, background_clip.duration))
-
-        # Resize all clips to match base video dimensions
-        if intro_visuals.size != base_clip.size:
-            intro_visuals = intro_visuals.resized(base_clip.size)
-        if background_part.size != base_clip.size:
-            background_part = background_part.resized(base_clip.size)
-
-        # Crop subtitle area from base video (bottom 20% of screen)
-        subtitle_height = int(height * 0.2)
-        subtitle_y_start = height - subtitle_height
-
-        subtitle_area = base_audio_part.cropped(
-            x1=0,
-            y1=subtitle_y_start,
-            x2=width,
-            y2=height
-        )
-
-        # Position subtitle area at bottom
-        subtitle_positioned = subtitle_area.with_position(('center', 'bottom'))
-
-        # Create composite for first 36 seconds:
-        # 1. Background video as base layer
-        # 2. Intro video as main content (positioned in center/top area)
-        # 3. Subtitle area from base video at bottom
-        # 4. Audio from base video
-
-        # Position intro video in the main content area (not covering subtitles)
-        intro_positioned = intro_visuals.with_position('center')
-
-        composite_clip = moviepy.CompositeVideoClip([
-            background_part,      # Clean background
-            intro_positioned,     # Intro video content
-            subtitle_positioned   # Subtitles from base video
-        ]).with_audio(base_audio_part.audio)
+        composite_clip = _build_head_composite(intro_clip, base_clip, background_clip, overlay_duration)
 
         # Get remaining part of base video (after overlay duration)
         if base_clip.duration > overlay_duration:
@@ -114,6 +138,17 @@ def combine_with_subtitle_preservation(intro_path, base_video_path, background_v
         print(f"❌ Error combining videos: {e}")
         return False
 
+def list_intro_files(intros_dir):
+    """Return the sorted intro video file names found in intros_dir."""
+    intro_files = []
+
+    for file in os.listdir(intros_dir):
+        if any(file.lower().endswith(ext) for ext in VIDEO_EXTENSIONS):
+            intro_files.append(file)
+
+    intro_files.sort()  # Sort for consistent ordering
+    return intro_files
+
 def batch_combine_with_subtitles(intros_dir, base_video_path, background_video_path, output_dir, overlay_duration=36):
     """
     Batch process all intro videos with subtitle preservation.
@@ -121,15 +156,7 @@ def batch_combine_with_subtitles(intros_dir, base_video_path, background_video_p
     # Create output directory
     Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-    # Get all video files from intros directory
-    video_extensions = ['.mp4', '.mov', '.avi', '.mkv', '.webm']
-    intro_files = []
-
-    for file in os.listdir(intros_dir):
-        if any(file.lower().endswith(ext) for ext in video_extensions):
-            intro_files.append(file)
-
-    intro_files.sort()  # Sort for consistent ordering
+    intro_files = list_intro_files(intros_dir)
 
     print(f"Found {len(intro_files)} intro videos")
     print(f"Overlay duration: {overlay_duration} seconds (with subtitle preservation)")
@@ -150,6 +177,161 @@ def batch_combine_with_subtitles(intros_dir, base_video_path, background_video_p
 
     print(f"\n🎉 Completed! Successfully created {success_count}/{len(intro_files)} personalized demo videos")
 
+def get_ffmpeg_binary():
+    """Locate the ffmpeg binary (the one bundled with moviepy if available)."""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return shutil.which('ffmpeg') or 'ffmpeg'
+
+def _write_segment(clip, output_path, fps):
+    """Write a head or tail segment with the shared segment encoding settings."""
+    clip.write_videofile(
+        output_path,
+        fps=fps,
+        codec=SEGMENT_CODEC,
+        audio_codec=SEGMENT_AUDIO_CODEC,
+        audio_fps=SEGMENT_AUDIO_FPS,
+        ffmpeg_params=SEGMENT_FFMPEG_PARAMS,
+        temp_audiofile=output_path + '_temp_audio.m4a',
+        remove_temp=True,
+        logger=None
+    )
+
+def render_shared_tail(base_video_path, tail_path, overlay_duration=36):
+    """
+    Encode the part of the base video after overlay_duration exactly once.
+
+    Returns the tail path, or None when the base video is not longer than the
+    overlay (every output is then just its personalized head).
+    """
+    base_clip = moviepy.VideoFileClip(base_video_path)
+    try:
+        if base_clip.duration <= overlay_duration:
+            return None
+        tail_clip = base_clip.subclipped(overlay_duration, base_clip.duration)
+        _write_segment(tail_clip, tail_path, base_clip.fps)
+        return tail_path
+    finally:
+        base_clip.close()
+
+def render_personalized_head(intro_path, base_video_path, background_video_path, head_path, overlay_duration=36):
+    """Render only the first overlay_duration seconds for one intro."""
+    intro_clip = moviepy.VideoFileClip(intro_path)
+    base_clip = moviepy.VideoFileClip(base_video_path)
+    background_clip = moviepy.VideoFileClip(background_video_path)
+    try:
+        head_clip = _build_head_composite(intro_clip, base_clip, background_clip, overlay_duration)
+        _write_segment(head_clip, head_path, base_clip.fps)
+        head_clip.close()
+        return head_path
+    finally:
+        intro_clip.close()
+        base_clip.close()
+        background_clip.close()
+
+def concat_segments(segment_paths, output_path, ffmpeg_binary=None):
+    """Join already-encoded segments with ffmpeg's concat demuxer (no re-encode)."""
+    list_fd, list_path = tempfile.mkstemp(suffix='.txt', prefix='concat_')
+    try:
+        with os.fdopen(list_fd, 'w') as f:
+            for segment in segment_paths:
+                escaped = os.path.abspath(segment).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+
+        cmd = [
+            ffmpeg_binary or get_ffmpeg_binary(),
+            '-y', '-loglevel', 'error',
+            '-f', 'concat', '-safe', '0',
+            '-i', list_path,
+            '-c', 'copy',
+            '-movflags', '+faststart',
+            output_path
+        ]
+        subprocess.run(cmd, check=True, capture_output=True)
+    finally:
+        os.remove(list_path)
+
+def _render_one_with_shared_tail(intro_path, base_video_path, background_video_path, output_path,
+                                 tail_path, work_dir, overlay_duration):
+    """Process pool worker: render one head and stitch it onto the shared tail."""
+    started = time.perf_counter()
+    try:
+        if tail_path is None:
+            # Nothing to share - the head is the whole output
+            render_personalized_head(intro_path, base_video_path, background_video_path,
+                                     output_path, overlay_duration)
+        else:
+            head_path = os.path.join(work_dir, Path(output_path).stem + '_head.mp4')
+            render_personalized_head(intro_path, base_video_path, background_video_path,
+                                     head_path, overlay_duration)
+            concat_segments([head_path, tail_path], output_path)
+            os.remove(head_path)
+        return output_path, True, time.perf_counter() - started, None
+    except Exception as e:
+        return output_path, False, time.perf_counter() - started, str(e)
+
+def batch_render_with_shared_tail(intros_dir, base_video_path, background_video_path, output_dir,
+                                  overlay_duration=36, workers=None):
+    """
+    Batch render mode: encode the shared tail once, render only the personalized
+    head per intro in a process pool, then join head + tail with a stream-copy concat.
+
+    Produces the same personalized_demo_XX.mp4 outputs as batch_combine_with_subtitles,
+    but per-video cost is a head-only encode instead of a full-length encode.
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    intro_files = list_intro_files(intros_dir)
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+
+    print(f"Found {len(intro_files)} intro videos")
+    print(f"Overlay duration: {overlay_duration} seconds (shared-tail batch render, {workers} workers)")
+    print(f"Using base video: {base_video_path}")
+    print(f"Using background video: {background_video_path}")
+
+    if not intro_files:
+        return 0
+
+    work_dir = tempfile.mkdtemp(prefix='shared_tail_', dir=output_dir)
+    try:
+        started = time.perf_counter()
+        tail_path = render_shared_tail(base_video_path, os.path.join(work_dir, 'shared_tail.mp4'), overlay_duration)
+        if tail_path:
+            print(f"🎞️  Encoded shared tail once in {time.perf_counter() - started:.1f}s")
+
+        success_count = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {}
+            for i, intro_file in enumerate(intro_files, 1):
+                output_path = os.path.join(output_dir, f"personalized_demo_{i:02d}.mp4")
+                future = pool.submit(
+                    _render_one_with_shared_tail,
+                    os.path.join(intros_dir, intro_file),
+                    base_video_path,
+                    background_video_path,
+                    output_path,
+                    tail_path,
+                    work_dir,
+                    overlay_duration
+                )
+                futures[future] = intro_file
+
+            for done, future in enumerate(as_completed(futures), 1):
+                output_path, ok, elapsed, error = future.result()
+                if ok:
+                    success_count += 1
+                    print(f"✅ [{done}/{len(intro_files)}] {futures[future]} -> {output_path} ({elapsed:.1f}s)")
+                else:
+                    print(f"❌ [{done}/{len(intro_files)}] {futures[future]}: {error}")
+
+        total = time.perf_counter() - started
+        print(f"\n🎉 Completed! Successfully created {success_count}/{len(intro_files)} personalized demo videos "
+              f"in {total:.1f}s ({total / len(intro_files):.1f}s per video)")
+        return success_count
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
 def main():
     parser = argparse.ArgumentParser(description='Combine intro videos with base video preserving subtitles')
     parser.add_argument('--intros-dir', required=True, help='Directory containing intro videos')
@@ -157,6 +339,10 @@ def main():
     parser.add_argument('--background-video', required=True, help='Path to background video file')
     parser.add_argument('--output-dir', required=True, help='Directory to save combined videos')
     parser.add_argument('--overlay-duration', type=int, default=36, help='Duration in seconds for overlay (default 36)')
+    parser.add_argument('--batch-mode', choices=['sequential', 'shared-tail'], default='sequential',
+                        help='sequential: full re-encode per intro; shared-tail: encode the tail once, '
+                             'render heads in parallel and stream-copy concat')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes for shared-tail mode (default: CPUs - 1)')
 
     args = parser.parse_args()
 
@@ -187,6 +373,17 @@ def main():
         print(f"Background video size: {background_info['size']}")
 
     # Start batch processing
+    if args.batch_mode == 'shared-tail':
+        batch_render_with_shared_tail(
+            args.intros_dir,
+            args.base_video,
+            args.background_video,
+            args.output_dir,
+            args.overlay_duration,
+            args.workers
+        )
+        return
+
     batch_combine_with_subtitles(
         args.intros_dir,
         args.base_video,
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sequential full re-encode vs shared-tail batch render.
+Generates small synthetic clips with ffmpeg's lavfi sources so it runs anywhere.
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'core'))
+
+from video_combiner_with_subtitles import (
+    get_ffmpeg_binary,
+    batch_combine_with_subtitles,
+    batch_render_with_shared_tail,
+)
+
+def make_synthetic_clip(path, duration, size, source='testsrc', frequency=440):
+    """Create a synthetic clip with a test pattern and a sine tone."""
+    cmd = [
+        get_ffmpeg_binary(), '-y', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', f'{source}=size={size}:rate=24:duration={duration}',
+        '-f', 'lavfi', '-i', f'sine=frequency={frequency}:duration={duration}',
+        '-c:v', 'libx264', '-pix_fmt', 'yuv420p', '-c:a', 'aac', '-shortest',
+        path
+    ]
+    subprocess.run(cmd, check=True, capture_output=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark shared-tail batch rendering')
+    parser.add_argument('--intros', type=int, default=4, help='Number of synthetic intro clips')
+    parser.add_argument('--base-duration', type=int, default=30, help='Base video length in seconds')
+    parser.add_argument('--overlay-duration', type=int, default=6, help='Personalized head length in seconds')
+    parser.add_argument('--size', default='320x240', help='Synthetic clip resolution')
+    parser.add_argument('--workers', type=int, default=None, help='Workers for shared-tail mode')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='video_bench_')
+    try:
+        intros_dir = os.path.join(work_dir, 'intros')
+        os.makedirs(intros_dir)
+
+        print("🎬 Generating synthetic clips...")
+        base_video = os.path.join(work_dir, 'base.mp4')
+        background_video = os.path.join(work_dir, 'background.mp4')
+        make_synthetic_clip(base_video, args.base_duration, args.size, 'testsrc')
+        make_synthetic_clip(background_video, args.overlay_duration, args.size, 'smptebars')
+        for i in range(args.intros):
+            make_synthetic_clip(os.path.join(intros_dir, f'intro_{i:02d}.mp4'),
+                                args.overlay_duration, args.size, 'rgbtestsrc', 220 + 40 * i)
+
+        print("\n⏱️  Sequential full re-encode")
+        started = time.perf_counter()
+        batch_combine_with_subtitles(intros_dir, base_video, background_video,
+                                     os.path.join(work_dir, 'sequential'), args.overlay_duration)
+        sequential = time.perf_counter() - started
+
+        print("\n⏱️  Shared-tail batch render")
+        started = time.perf_counter()
+        batch_render_with_shared_tail(intros_dir, base_video, background_video,
+                                      os.path.join(work_dir, 'shared_tail'), args.overlay_duration, args.workers)
+        shared_tail = time.perf_counter() - started
+
+        print("\n📊 Results")
+        print(f"   Sequential:  {sequential:.2f}s total, {sequential / args.intros:.2f}s per video")
+        print(f"   Shared tail: {shared_tail:.2f}s total, {shared_tail / args.intros:.2f}s per video")
+        if shared_tail > 0:
+            print(f"   Speedup:     {sequential / shared_tail:.2f}x")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()